@@ -1,32 +1,41 @@
 #!/usr/bin/python3
 # Scrape and read Hávamál
-from os import path
+from pathlib import Path
 from urllib import request
 from bs4 import BeautifulSoup
 
+try:
+	from nta.ingest.cache import SourceCache
+except ImportError:
+	# Run from bin/ without the nta package installed: plain file cache only.
+	SourceCache = None
+
 # Save web-page to HTML-file
 HávamálUrl = 'https://heimskringla.no/wiki/H%C3%A1vam%C3%A1l'
-file = '../data/Hávamál.html'
-
-if (path.isfile(file)):
+file = Path('../data/Hávamál.html')
+
+if SourceCache is not None:
+	# Raw bytes are cached by content hash. A cold cache is seeded from the
+	# saved file when there is one; the page is downloaded only when neither exists.
+	cache = SourceCache()
+	data, raw_source = cache.fetch(
+		HávamálUrl,
+		lambda: file.read_bytes() if file.exists() else request.urlopen(HávamálUrl).read(),
+		kind='html',
+	)
+	print(f"Using {raw_source.source_id[:12]} retrieved {raw_source.retrieved_at:%Y-%m-%d}")
+elif file.exists():
 	print("Reading existing file")
-
-	# read and parse file
-	with open (file, 'r') as f:
-		soup = BeautifulSoup(f, "html.parser")
-
+	data = file.read_bytes()
 else:
 	print("Writing file")
+	data = request.urlopen(HávamálUrl).read()
 
-	# Get the page
-	page = request.urlopen(HávamálUrl)
-
-	# save page
-	request.urlretrieve(HávamálUrl, file)
+if not file.exists():
+	file.write_bytes(data)
 
-	# read and parse page
-	html = page.read().decode()
-	soup = BeautifulSoup(html, "html.parser")
+# read and parse page
+soup = BeautifulSoup(data.decode(), "html.parser")
 
 # scrape the poem
 print(soup.dl.get_text())
@@ -0,0 +1,3 @@
+from nta.cli import main
+
+raise SystemExit(main())
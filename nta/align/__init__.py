@@ -0,0 +1 @@
+"""Alignment between editions and translations."""
@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import argparse
+import time
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterator
+from typing import Sequence
+
+from nta.graph.rows import RowSet
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+    from nta.graph.repo import Neo4jRepository
+
+
+DEFAULT_POLICY = "on_folded_v1"
+DEFAULT_MAX_EDITS = 200
+DEFAULT_BATCH_ROWS = 20_000
+# Relationship properties in the MERGE pattern of every collation edge.
+COLLATION_KEYS = ("collation",)
+OP_KINDS = ("equal", "substitution", "omission", "addition")
+
+EDITION_TOKENS_QUERY = """
+MATCH (:Edition {edition_id: $edition_id})-[:HAS_SEGMENT]->(s:Segment)-[:HAS_TOKEN]->(t:Token)
+RETURN t.token_id AS id, t.surface AS surface
+ORDER BY s.position, s.segment_id, t.position
+"""
+
+# Relationship-property indexes (schema.cypher) keep this from scanning.
+CLEAR_QUERIES = (
+    """
+MATCH ()-[r:AGREES_WITH {collation: $collation}]->()
+CALL { WITH r DELETE r } IN TRANSACTIONS OF 10000 ROWS
+""",
+    """
+MATCH ()-[r:VARIANT_OF {collation: $collation}]->()
+CALL { WITH r DELETE r } IN TRANSACTIONS OF 10000 ROWS
+""",
+)
+
+
+@dataclass(slots=True, frozen=True)
+class CollationOp:
+    """
+    One run of a base/witness alignment, as half-open token ranges.
+
+    ``substitution`` has tokens on both sides, ``omission`` only in the base
+    (absent from the witness), ``addition`` only in the witness.
+    """
+
+    kind: str
+    base_start: int
+    base_end: int
+    witness_start: int
+    witness_end: int
+
+
+def _unique_anchors(
+    a: Sequence[int], alo: int, ahi: int, b: Sequence[int], blo: int, bhi: int
+) -> list[tuple[int, int]]:
+    """
+    Pairs of positions of keys occurring exactly once on each side.
+
+    Kept only where they agree in order (longest increasing subsequence of
+    witness positions, patience-sorting style), so every anchor is safe to
+    split on.
+    """
+    a_counts = Counter(a[alo:ahi])
+    b_counts = Counter(b[blo:bhi])
+    b_pos = {b[j]: j for j in range(blo, bhi) if b_counts[b[j]] == 1}
+    pairs = [
+        (i, b_pos[a[i]])
+        for i in range(alo, ahi)
+        if a_counts[a[i]] == 1 and a[i] in b_pos
+    ]
+    if not pairs:
+        return []
+    tails: list[int] = []
+    tail_index: list[int] = []
+    back = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        slot = bisect_left(tails, j)
+        if slot == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[slot] = j
+            tail_index[slot] = index
+        back[index] = tail_index[slot - 1] if slot else -1
+    chain = []
+    index = tail_index[-1]
+    while index != -1:
+        chain.append(pairs[index])
+        index = back[index]
+    return chain[::-1]
+
+
+def _bisect(
+    a: Sequence[int], alo: int, ahi: int, b: Sequence[int], blo: int, bhi: int, max_edits: int
+) -> tuple[int, int] | None:
+    """
+    Myers' middle snake: a split point on an optimal edit path.
+
+    Forward and reverse searches keep one diagonal vector each, so space is
+    linear in the range. When the paths have not met within ``max_edits``,
+    the furthest point the forward search reached is returned instead (GNU
+    diff's "too expensive" heuristic): the split is no longer guaranteed
+    optimal, but runs of repeated text still align.
+    """
+    n = ahi - alo
+    m = bhi - blo
+    max_d = min((n + m + 1) // 2, max_edits)
+    offset = max_d + 1
+    size = 2 * offset + 1
+    v1 = [-1] * size
+    v2 = [-1] * size
+    v1[offset + 1] = 0
+    v2[offset + 1] = 0
+    delta = n - m
+    front = delta % 2 != 0
+    k1start = k1end = k2start = k2end = 0
+    best = (0, 0)
+    for d in range(max_d):
+        for k1 in range(-d + k1start, d + 1 - k1end, 2):
+            k1_offset = offset + k1
+            if k1 == -d or (k1 != d and v1[k1_offset - 1] < v1[k1_offset + 1]):
+                x1 = v1[k1_offset + 1]
+            else:
+                x1 = v1[k1_offset - 1] + 1
+            y1 = x1 - k1
+            while x1 < n and y1 < m and a[alo + x1] == b[blo + y1]:
+                x1 += 1
+                y1 += 1
+            v1[k1_offset] = x1
+            if x1 <= n and y1 <= m and x1 + y1 > best[0] + best[1]:
+                best = (x1, y1)
+            if x1 > n:
+                k1end += 2
+            elif y1 > m:
+                k1start += 2
+            elif front:
+                k2_offset = offset + delta - k1
+                if 0 <= k2_offset < size and v2[k2_offset] != -1 and x1 >= n - v2[k2_offset]:
+                    return alo + x1, blo + y1
+        for k2 in range(-d + k2start, d + 1 - k2end, 2):
+            k2_offset = offset + k2
+            if k2 == -d or (k2 != d and v2[k2_offset - 1] < v2[k2_offset + 1]):
+                x2 = v2[k2_offset + 1]
+            else:
+                x2 = v2[k2_offset - 1] + 1
+            y2 = x2 - k2
+            while x2 < n and y2 < m and a[ahi - 1 - x2] == b[bhi - 1 - y2]:
+                x2 += 1
+                y2 += 1
+            v2[k2_offset] = x2
+            if x2 > n:
+                k2end += 2
+            elif y2 > m:
+                k2start += 2
+            elif not front:
+                k1_offset = offset + delta - k2
+                if 0 <= k1_offset < size and v1[k1_offset] != -1:
+                    x1 = v1[k1_offset]
+                    y1 = offset + x1 - k1_offset
+                    if x1 >= n - x2:
+                        return alo + x1, blo + y1
+    if best == (0, 0):
+        return None
+    return alo + best[0], blo + best[1]
+
+
+def match_pairs(
+    a: Sequence[int], b: Sequence[int], max_edits: int = DEFAULT_MAX_EDITS
+) -> list[tuple[int, int]]:
+    """
+    Matched ``(base, witness)`` positions of two key sequences, in order.
+
+    Ranges are split on rare anchors (keys unique on both sides) first and
+    only the stretches between anchors go to Myers' bisection, so long
+    witnesses cost little more than their differences. Work is an explicit
+    stack of ranges; nothing is sliced or copied.
+    """
+    out: list[tuple[int, int]] = []
+    # (alo, ahi, blo, bhi, anchored) ranges, or a pair to emit.
+    stack: list[Any] = [(0, len(a), 0, len(b), True)]
+    while stack:
+        item = stack.pop()
+        if len(item) == 2:
+            out.append(item)
+            continue
+        alo, ahi, blo, bhi, anchored = item
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            out.append((alo, blo))
+            alo += 1
+            blo += 1
+        suffix = []
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            suffix.append((ahi, bhi))
+        # Pushed in reverse so they pop (and emit) in order.
+        stack.extend(suffix)
+        if alo == ahi or blo == bhi:
+            continue
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi) if anchored else []
+        if anchors:
+            bounds = [(alo - 1, blo - 1)] + anchors + [(ahi, bhi)]
+            for (i0, j0), (i1, j1) in reversed(list(zip(bounds, bounds[1:]))):
+                if (i1, j1) != (ahi, bhi):
+                    stack.append((i1, j1))
+                stack.append((i0 + 1, i1, j0 + 1, j1, True))
+            continue
+        split = _bisect(a, alo, ahi, b, blo, bhi, max_edits)
+        if split is None or split in ((alo, blo), (ahi, bhi)):
+            continue
+        x, y = split
+        stack.append((x, ahi, y, bhi, False))
+        stack.append((alo, x, blo, y, False))
+    return out
+
+
+def collation_ops(
+    pairs: Sequence[tuple[int, int]], base_len: int, witness_len: int
+) -> list[CollationOp]:
+    """Group matched pairs into runs of agreement and the variants between them."""
+    ops: list[CollationOp] = []
+    i = j = 0
+    for pi, pj in list(pairs) + [(base_len, witness_len)]:
+        if pi > i or pj > j:
+            kind = "substitution" if pi > i and pj > j else "omission" if pi > i else "addition"
+            ops.append(CollationOp(kind, i, pi, j, pj))
+        if pi == base_len and pj == witness_len:
+            break
+        if ops and ops[-1].kind == "equal" and ops[-1].base_end == pi:
+            last = ops[-1]
+            ops[-1] = CollationOp("equal", last.base_start, pi + 1, last.witness_start, pj + 1)
+        else:
+            ops.append(CollationOp("equal", pi, pi + 1, pj, pj + 1))
+        i, j = pi + 1, pj + 1
+    return ops
+
+
+def intern_keys(surfaces: Sequence[str], policy: Any, vocab: dict[str, int]) -> list[int]:
+    """Normalized comparison keys as small ints, shared across witnesses via ``vocab``."""
+    return [vocab.setdefault(key, len(vocab)) for key in policy.normalize_many(surfaces)]
+
+
+def collation_id(base_edition: str, witness_edition: str, policy_id: str) -> str:
+    return f"{base_edition}|{witness_edition}|{policy_id}"
+
+
+def collation_rows(
+    ops: Sequence[CollationOp],
+    base_ids: Sequence[str],
+    witness_ids: Sequence[str],
+    base_edition: str,
+    witness_edition: str,
+    collation: str,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> Iterator[RowSet]:
+    """
+    Relationship rows for one collation, in ``RowSet`` chunks.
+
+    - agreement: ``(base Token)-[:AGREES_WITH]->(witness Token)``
+    - substitution: ``(base Token)-[:VARIANT_OF {type}]->(witness Token)``
+      pairwise, with any surplus on either side as omission/addition
+    - omission: ``(base Token)-[:VARIANT_OF]->(witness Edition)``
+    - addition: ``(witness Token)-[:VARIANT_OF]->(base Edition)``
+
+    Every relationship carries ``collation``, which is part of its MERGE key,
+    so collations under different policies keep their own edges; variant
+    ones also ``type`` and ``unit`` (the index of their op, grouping one
+    variation unit).
+    """
+    rows = RowSet()
+    token = ("Token", "token_id")
+    for unit, op in enumerate(ops):
+        base = range(op.base_start, op.base_end)
+        witness = range(op.witness_start, op.witness_end)
+        if op.kind == "equal":
+            for i, j in zip(base, witness):
+                rows.merge_relationship(
+                    "AGREES_WITH",
+                    (*token, base_ids[i]),
+                    (*token, witness_ids[j]),
+                    {"collation": collation},
+                    keys=COLLATION_KEYS,
+                )
+        else:
+            props = {"collation": collation, "unit": unit}
+            paired = min(len(base), len(witness))
+            for i, j in zip(base, witness):
+                rows.merge_relationship(
+                    "VARIANT_OF",
+                    (*token, base_ids[i]),
+                    (*token, witness_ids[j]),
+                    {**props, "type": "substitution"},
+                    keys=COLLATION_KEYS,
+                )
+            for i in base[paired:]:
+                rows.merge_relationship(
+                    "VARIANT_OF",
+                    (*token, base_ids[i]),
+                    ("Edition", "edition_id", witness_edition),
+                    {**props, "type": "omission"},
+                    keys=COLLATION_KEYS,
+                )
+            for j in witness[paired:]:
+                rows.merge_relationship(
+                    "VARIANT_OF",
+                    (*token, witness_ids[j]),
+                    ("Edition", "edition_id", base_edition),
+                    {**props, "type": "addition"},
+                    keys=COLLATION_KEYS,
+                )
+        if len(rows) >= batch_rows:
+            yield rows
+            rows = RowSet()
+    if rows:
+        yield rows
+
+
+@dataclass(slots=True, frozen=True)
+class CollationSummary:
+    base: str
+    witness: str
+    base_tokens: int
+    witness_tokens: int
+    agreements: int
+    units: dict[str, int]
+    seconds: float
+
+    @property
+    def agreement(self) -> float:
+        return self.agreements / max(self.base_tokens, self.witness_tokens, 1)
+
+
+def summarize(
+    base: str,
+    witness: str,
+    ops: Sequence[CollationOp],
+    base_tokens: int,
+    witness_tokens: int,
+    seconds: float,
+) -> CollationSummary:
+    units = Counter(op.kind for op in ops if op.kind != "equal")
+    agreements = sum(op.base_end - op.base_start for op in ops if op.kind == "equal")
+    return CollationSummary(
+        base, witness, base_tokens, witness_tokens, agreements, dict(units), seconds
+    )
+
+
+def load_edition_tokens(session: Any, edition_id: str) -> tuple[list[str], list[str]]:
+    ids: list[str] = []
+    surfaces: list[str] = []
+    for record in session.run(EDITION_TOKENS_QUERY, edition_id=edition_id):
+        ids.append(record["id"])
+        surfaces.append(record["surface"] or "")
+    if not ids:
+        raise ValueError(f"Edition has no tokens: {edition_id}")
+    return ids, surfaces
+
+
+def write_collation(
+    repo: Neo4jRepository, driver: Driver, collation: str, chunks: Iterator[RowSet]
+) -> int:
+    """Replace any earlier result of ``collation``, then bulk-write ``chunks``."""
+    with driver.session() as session:
+        for query in CLEAR_QUERIES:
+            session.run(query, collation=collation).consume()
+    written = 0
+    for rows in chunks:
+        repo.write_rows(rows)
+        written += len(rows)
+    return written
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--edition-id",
+        action="append",
+        required=True,
+        help="Edition to collate; repeat for each witness. The first is the base text.",
+    )
+    parser.add_argument(
+        "--policy",
+        default=DEFAULT_POLICY,
+        help=f"Normalization policy for comparison keys (default: {DEFAULT_POLICY}).",
+    )
+    parser.add_argument(
+        "--max-edits",
+        type=int,
+        default=DEFAULT_MAX_EDITS,
+        help="Edit distance searched per split before settling for a heuristic one "
+        f"(default: {DEFAULT_MAX_EDITS}).",
+    )
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS)
+    parser.add_argument("--dry-run", action="store_true", help="Collate and report only.")
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+    from nta.graph.repo import Neo4jRepository
+    from nta.ingest.normalize import normalization_policy
+
+    if len(args.edition_id) < 2:
+        raise SystemExit("Collation needs at least two --edition-id values.")
+    policy = normalization_policy(args.policy)
+    vocab: dict[str, int] = {}
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        repo = Neo4jRepository(driver)
+        with driver.session() as session:
+            base_id = args.edition_id[0]
+            base_ids, base_surfaces = load_edition_tokens(session, base_id)
+            base_keys = intern_keys(base_surfaces, policy, vocab)
+            witnesses = [
+                (edition_id, *load_edition_tokens(session, edition_id))
+                for edition_id in args.edition_id[1:]
+            ]
+        for witness_id, witness_ids, witness_surfaces in witnesses:
+            start = time.perf_counter()
+            witness_keys = intern_keys(witness_surfaces, policy, vocab)
+            pairs = match_pairs(base_keys, witness_keys, args.max_edits)
+            ops = collation_ops(pairs, len(base_keys), len(witness_keys))
+            summary = summarize(
+                base_id,
+                witness_id,
+                ops,
+                len(base_keys),
+                len(witness_keys),
+                time.perf_counter() - start,
+            )
+            print(
+                f"{base_id} vs {witness_id}: {summary.base_tokens}/{summary.witness_tokens} "
+                f"tokens, {summary.agreement:.1%} agreement, "
+                + ", ".join(f"{summary.units.get(kind, 0)} {kind}s" for kind in OP_KINDS[1:])
+                + f" in {summary.seconds:.2f}s"
+            )
+            if args.dry_run:
+                continue
+            collation = collation_id(base_id, witness_id, policy.policy_id)
+            chunks = collation_rows(
+                ops, base_ids, witness_ids, base_id, witness_id, collation, args.batch_rows
+            )
+            written = write_collation(repo, driver, collation, chunks)
+            print(f"  wrote {written} relationships ({collation})")
+    finally:
+        if owns_driver:
+            driver.close()
@@ -0,0 +1,5 @@
+"""Unified `nta` command-line entry point."""
+
+from nta.cli.main import main
+
+__all__ = ["main"]
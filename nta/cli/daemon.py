@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import secrets
+import sys
+import time
+import traceback
+from multiprocessing.connection import AuthenticationError
+from multiprocessing.connection import Client
+from multiprocessing.connection import Listener
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Sequence
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+
+ADDRESS_ENV = "NTA_DAEMON_ADDRESS"
+DEFAULT_ADDRESS = Path(".nta") / "daemon.sock"
+
+
+def default_address() -> Path:
+    return Path(os.getenv(ADDRESS_ENV) or DEFAULT_ADDRESS).resolve()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "action",
+        choices=("serve", "stop", "status"),
+        help="serve: run the daemon in the foreground; stop/status: control a running one.",
+    )
+    parser.add_argument(
+        "--address",
+        default=None,
+        help=f"Unix socket path (default: ${ADDRESS_ENV} or {DEFAULT_ADDRESS}).",
+    )
+
+
+def run(args: argparse.Namespace) -> int:
+    address = Path(args.address).resolve() if args.address else default_address()
+    if args.action == "serve":
+        serve(address)
+        return 0
+
+    response = _request(address, {"op": "stop" if args.action == "stop" else "status"})
+    if response is None:
+        print(f"No daemon reachable at {address}")
+        return 1
+    print(response["stdout"], end="")
+    return int(response["code"])
+
+
+def serve(address: Path) -> None:
+    """
+    Serve commands over an authenticated Unix socket with one warm driver.
+
+    Requests are handled one at a time: each runs ``nta.cli.main.run_command``
+    in this process with the shared driver, in the client's working directory,
+    and returns captured stdout/stderr plus the exit code. Imported modules
+    and module-level caches stay warm between requests.
+    """
+    from nta.cli.main import run_command
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+
+    driver = get_driver(Neo4jConfig.from_env())
+    driver.verify_connectivity()
+
+    address.parent.mkdir(parents=True, exist_ok=True)
+    key_path = _key_path(address)
+    authkey = secrets.token_bytes(32)
+    for stale in (address, key_path):
+        with contextlib.suppress(FileNotFoundError):
+            stale.unlink()
+    key_path.touch(mode=0o600)
+    key_path.write_bytes(authkey)
+
+    started = time.time()
+    served = 0
+    print(f"nta daemon listening on {address}", flush=True)
+    try:
+        with Listener(str(address), family="AF_UNIX", authkey=authkey) as listener:
+            while True:
+                try:
+                    conn = listener.accept()
+                except AuthenticationError:
+                    continue
+                with conn:
+                    request = conn.recv()
+                    op = request.get("op")
+                    if op == "run":
+                        conn.send(_run_request(run_command, request, driver))
+                        served += 1
+                        continue
+                    status = (
+                        f"pid={os.getpid()} uptime={time.time() - started:.0f}s "
+                        f"requests={served}\n"
+                    )
+                    conn.send({"code": 0, "stdout": status, "stderr": ""})
+                    if op == "stop":
+                        break
+    finally:
+        driver.close()
+        with contextlib.suppress(FileNotFoundError):
+            key_path.unlink()
+        with contextlib.suppress(FileNotFoundError):
+            address.unlink()
+
+
+def try_remote(argv: Sequence[str], address: Path | None = None) -> int | None:
+    """Run ``argv`` on a running daemon; return None if no daemon is reachable."""
+    response = _request(
+        address or default_address(),
+        {"op": "run", "argv": list(argv), "cwd": os.getcwd()},
+    )
+    if response is None:
+        return None
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return int(response["code"])
+
+
+def _run_request(run_command: Any, request: dict[str, Any], driver: Driver) -> dict[str, Any]:
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    previous_cwd = os.getcwd()
+    code = 1
+    try:
+        os.chdir(request.get("cwd") or previous_cwd)
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                code = run_command(request["argv"], driver=driver)
+            except SystemExit as exc:
+                # Commands and argparse exit on bad input; that ends the
+                # request, never the serve loop.
+                code = _exit_code(exc)
+            except Exception:
+                traceback.print_exc()
+    finally:
+        os.chdir(previous_cwd)
+    return {"code": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def _exit_code(exc: SystemExit) -> int:
+    """The status the interpreter would exit with; a message goes to stderr."""
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def _request(address: Path, payload: dict[str, Any]) -> dict[str, Any] | None:
+    key_path = _key_path(address)
+    if not key_path.exists() or not address.exists():
+        return None
+    try:
+        with Client(str(address), family="AF_UNIX", authkey=key_path.read_bytes()) as conn:
+            conn.send(payload)
+            return conn.recv()
+    except (OSError, EOFError, AuthenticationError):
+        return None
+
+
+def _key_path(address: Path) -> Path:
+    return address.with_name(address.name + ".key")
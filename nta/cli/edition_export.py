@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import TYPE_CHECKING
+
+from nta.graph.transfer import DEFAULT_PAGE_SIZE
+from nta.graph.transfer import TransferReport
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--edition-id", required=True)
+    parser.add_argument("--output", required=True, help="Export file (.jsonl.gz).")
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"Segments per keyset page (default: {DEFAULT_PAGE_SIZE}).",
+    )
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+    from nta.graph.transfer import GraphReader
+    from nta.graph.transfer import export_records
+    from nta.graph.transfer import write_export
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    start = time.perf_counter()
+    try:
+        with driver.session() as session:
+            records = export_records(GraphReader(session), args.edition_id, args.page_size)
+            report = write_export(args.output, args.edition_id, records, args.page_size)
+    finally:
+        if owns_driver:
+            driver.close()
+    print_report(f"Exported {args.edition_id}", report, args.output, time.perf_counter() - start)
+
+
+def print_report(action: str, report: TransferReport, path: str, seconds: float) -> None:
+    nodes = sum(report.nodes.values())
+    rels = sum(report.relationships.values())
+    print(f"{action}: {nodes} nodes, {rels} relationships ({path}) in {seconds:.1f}s")
+    for label, count in sorted(report.nodes.items()):
+        print(f"  {label}: {count}")
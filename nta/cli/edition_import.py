@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import TYPE_CHECKING
+
+from nta.cli.edition_export import print_report
+from nta.graph.transfer import DEFAULT_IMPORT_ROWS
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--input", required=True, help="File from 'nta edition export'.")
+    parser.add_argument(
+        "--batch-rows",
+        type=int,
+        default=DEFAULT_IMPORT_ROWS,
+        help=f"Rows coalesced per write round (default: {DEFAULT_IMPORT_ROWS}).",
+    )
+    parser.add_argument(
+        "--no-schema",
+        action="store_true",
+        help="Do not apply constraints first (MERGE without them is slow).",
+    )
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+    from nta.graph.repo import Neo4jRepository
+    from nta.graph.transfer import import_records
+    from nta.graph.transfer import read_export
+
+    header, records = read_export(args.input)
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    start = time.perf_counter()
+    try:
+        repo = Neo4jRepository(driver)
+        if not args.no_schema:
+            repo.apply_schema()
+        report = import_records(repo, records, args.batch_rows)
+    finally:
+        if owns_driver:
+            driver.close()
+    seconds = time.perf_counter() - start
+    print_report(f"Imported {header['edition_id']}", report, args.input, seconds)
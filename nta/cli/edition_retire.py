@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import TYPE_CHECKING
+
+from nta.graph.rebuild import DEFAULT_RETIRE_ROWS
+from nta.graph.rebuild import RETIRED_LABEL
+from nta.graph.rebuild import STAGED_LABEL
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--edition-id", required=True, help="Live edition ID the versions belong to."
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Discard staged (never promoted) rebuilds instead of retired versions.",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=DEFAULT_RETIRE_ROWS,
+        help=f"Segments deleted per transaction (default: {DEFAULT_RETIRE_ROWS}).",
+    )
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+    from nta.graph.rebuild import pending_retirements
+    from nta.graph.rebuild import retire
+
+    label = STAGED_LABEL if args.staged else RETIRED_LABEL
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        with driver.session() as session:
+            versions = pending_retirements(session, args.edition_id, staged=args.staged)
+        if not versions:
+            print(f"No {label} versions of {args.edition_id}.")
+        for version in versions:
+            start = time.perf_counter()
+            retire(driver, label, version, args.rows)
+            print(f"Deleted {label} {version} in {time.perf_counter() - start:.1f}s")
+    finally:
+        if owns_driver:
+            driver.close()
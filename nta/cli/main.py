@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import Sequence
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+
+@dataclass(slots=True, frozen=True)
+class Command:
+    """A subcommand backed by a module exposing ``add_arguments`` and ``run``."""
+
+    module: str
+    help: str
+    uses_driver: bool = True
+
+
+# Modules are imported only when their subcommand is invoked, so `nta --help`
+# and non-graph commands never pay for importing the Neo4j driver.
+COMMANDS: dict[tuple[str, ...], Command] = {
+    ("ingest", "plaintext"): Command("nta.ingest.plaintext", "Ingest a UTF-8 plaintext file."),
+    ("ingest", "havamal"): Command("nta.ingest.havamal", "Ingest Hávamál JSON."),
+    ("ingest", "tei"): Command("nta.ingest.tei", "Ingest a TEI XML file."),
+    ("ingest", "corpus"): Command(
+        "nta.ingest.corpus", "Ingest a directory or manifest of sources in parallel."
+    ),
+    ("report", "inflections"): Command(
+        "nta.reports.inflections", "Report inflection observations for a lemma."
+    ),
+    ("report", "distinct"): Command(
+        "nta.reports.distinct", "Estimate distinct forms/lemmas/surfaces from edition sketches."
+    ),
+    ("report", "collocations"): Command(
+        "nta.reports.collocations",
+        "Rank n-gram and window collocations from corpus sources.",
+        uses_driver=False,
+    ),
+    ("align", "demo"): Command(
+        "nta.align.demo", "Create a manual segment-level translation alignment demo."
+    ),
+    ("align", "collate"): Command(
+        "nta.align.collate", "Collate the token streams of two or more editions."
+    ),
+    ("query",): Command("nta.graph.query", "Stream a named read query as JSON lines."),
+    ("search", "build"): Command(
+        "nta.search.build", "Build a local BM25 segment index.", uses_driver=False
+    ),
+    ("search", "query"): Command(
+        "nta.search.query", "Search a local BM25 segment index.", uses_driver=False
+    ),
+    ("forms", "build"): Command(
+        "nta.search.forms_build", "Build a suffix-array index over Form orthographies."
+    ),
+    ("forms", "search"): Command(
+        "nta.search.forms_query", "Find forms by prefix, suffix or infix in a form index."
+    ),
+    ("edition", "export"): Command(
+        "nta.cli.edition_export", "Export an edition subgraph to compressed JSON lines."
+    ),
+    ("edition", "import"): Command(
+        "nta.cli.edition_import", "Import an edition subgraph exported by 'edition export'."
+    ),
+    ("edition", "rebuild"): Command(
+        "nta.graph.rebuild", "Rebuild an edition into a staging copy and swap it in atomically."
+    ),
+    ("edition", "retire"): Command(
+        "nta.cli.edition_retire", "Delete retired or abandoned staged versions of an edition."
+    ),
+    ("schema", "apply"): Command("nta.cli.schema", "Apply graph constraints and indexes."),
+    ("ids", "migrate"): Command(
+        "nta.graph.idmigrate", "Plan or apply a migration to a compact ID scheme."
+    ),
+    ("tokens", "renormalize"): Command(
+        "nta.graph.renormalize", "Apply a normalization policy to existing tokens, resumably."
+    ),
+    ("lemmas", "remap"): Command(
+        "nta.graph.remap", "Apply a Form->Lemma mapping file as versioned REALIZES edges."
+    ),
+    ("count",): Command("nta.reports.counts", "Count word occurrences (graph or JSON)."),
+    ("daemon",): Command(
+        "nta.cli.daemon", "Run or control the warm local daemon.", uses_driver=False
+    ),
+}
+
+DAEMON_ENV = "NTA_DAEMON"
+
+
+def resolve_command(argv: Sequence[str]) -> tuple[tuple[str, ...], Command, list[str]] | None:
+    """Longest-prefix match of ``argv`` against the command table."""
+    for length in range(min(len(argv), 2), 0, -1):
+        path = tuple(argv[:length])
+        command = COMMANDS.get(path)
+        if command is not None:
+            return path, command, list(argv[length:])
+    return None
+
+
+def run_command(
+    argv: Sequence[str],
+    driver: Driver | None = None,
+    prog: str = "nta",
+) -> int:
+    """Parse and run one subcommand in-process; ``driver`` is reused if given."""
+    resolved = resolve_command(argv)
+    if resolved is None:
+        _print_usage(prog)
+        return 2
+
+    path, command, rest = resolved
+    module = importlib.import_module(command.module)
+    parser = argparse.ArgumentParser(prog=f"{prog} {' '.join(path)}", description=command.help)
+    module.add_arguments(parser)
+    try:
+        args = parser.parse_args(rest)
+    except SystemExit as exc:
+        return int(exc.code or 0)
+
+    if command.uses_driver:
+        module.run(args, driver=driver)
+    else:
+        result = module.run(args)
+        if isinstance(result, int):
+            return result
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    use_daemon = os.getenv(DAEMON_ENV, "") not in ("", "0")
+    if argv and argv[0] in ("--daemon", "--no-daemon"):
+        use_daemon = argv.pop(0) == "--daemon"
+
+    if not argv or argv[0] in ("-h", "--help"):
+        _print_usage("nta")
+        return 0 if argv else 2
+
+    resolved = resolve_command(argv)
+    if use_daemon and resolved is not None and resolved[1].uses_driver:
+        from nta.cli.daemon import try_remote
+
+        code = try_remote(argv)
+        if code is not None:
+            return code
+
+    return run_command(argv)
+
+
+def _print_usage(prog: str) -> None:
+    print(f"usage: {prog} [--daemon | --no-daemon] <command> [options]\n")
+    print("commands:")
+    for path, command in COMMANDS.items():
+        print(f"  {' '.join(path):<20} {command.help}")
+    print(
+        f"\n--daemon (or {DAEMON_ENV}=1) sends graph commands to a running "
+        f"`{prog} daemon serve` and falls back to a local run if none is reachable."
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
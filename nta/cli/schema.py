@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import argparse
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--schema-path",
+        default=None,
+        help="Optional schema file (default: bundled nta/graph/schema.cypher).",
+    )
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import apply_schema
+    from nta.graph.db import backfill_edition_periods
+    from nta.graph.db import get_driver
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        apply_schema(driver, args.schema_path)
+        backfill_edition_periods(driver)
+    finally:
+        if owns_driver:
+            driver.close()
+
+    print("Neo4j schema applied.")
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import atexit
+import time
+import warnings
+from typing import Any
+from typing import Callable
+from typing import Mapping
+
+from nta.graph.repo import BULK_BATCH_SIZE
+from nta.graph.repo import Neo4jRepository
+from nta.graph.rows import Endpoint
+from nta.graph.rows import RowSet
+
+
+DEFAULT_MAX_PENDING = 20_000
+DEFAULT_MAX_AGE_SECONDS = 5.0
+
+# Buffers with unflushed rows, held strongly until they flush: one dropped
+# without close() must survive until the atexit hook writes its rows.
+_OPEN_BUFFERS: set[WriteBehindBuffer] = set()
+
+
+class WriteBehindBuffer:
+    """
+    Coalescing write-behind buffer for node and relationship MERGEs.
+
+    Within one flush window, identical node upserts (same label + key) and
+    relationship upserts (same type + endpoints) collapse into one row whose
+    properties are merged in call order, so the last write wins exactly as it
+    would with sequential ``SET`` statements. A flush writes all nodes first,
+    then all relationships, as batched UNWIND statements.
+
+    Flushes happen when ``max_pending`` distinct rows are queued, when the
+    oldest queued write is older than ``max_age_seconds`` (checked on enqueue),
+    on ``flush()``/``close()``, and on leaving a ``with`` block, including on
+    error. Buffers still holding writes at interpreter exit, even ones no
+    longer referenced, are flushed by an ``atexit`` hook as a last resort.
+    """
+
+    def __init__(
+        self,
+        repo: Neo4jRepository,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_age_seconds: float | None = DEFAULT_MAX_AGE_SECONDS,
+        batch_size: int = BULK_BATCH_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be >= 1")
+        self._repo = repo
+        self._max_pending = max_pending
+        self._max_age_seconds = max_age_seconds
+        self._batch_size = batch_size
+        self._clock = clock
+
+        self._rows = RowSet()
+        self._oldest: float | None = None
+        self._closed = False
+
+        self.stats: dict[str, int] = {
+            "enqueued": 0,
+            "rows_flushed": 0,
+            "statements": 0,
+            "flushes": 0,
+        }
+
+    @property
+    def pending(self) -> int:
+        """Distinct node and relationship rows waiting to be flushed."""
+        return len(self._rows)
+
+    def merge_node(
+        self,
+        label: str,
+        key: str,
+        key_value: Any,
+        properties: Mapping[str, Any] | None = None,
+        on_create: Mapping[str, Any] | None = None,
+    ) -> None:
+        self._ensure_open()
+        self._rows.merge_node(label, key, key_value, properties, on_create)
+        self._enqueued(1)
+
+    def merge_relationship(
+        self,
+        rel_type: str,
+        start: Endpoint,
+        end: Endpoint,
+        properties: Mapping[str, Any] | None = None,
+        keys: tuple[str, ...] = (),
+    ) -> None:
+        """Queue ``(start)-[:rel_type]->(end)``; see ``RowSet.merge_relationship``."""
+        self._ensure_open()
+        self._rows.merge_relationship(rel_type, start, end, properties, keys)
+        self._enqueued(1)
+
+    def merge_rows(self, rows: RowSet) -> None:
+        """Queue every row of a pre-built RowSet (for example a planned ingest batch)."""
+        self._ensure_open()
+        self._rows.update(rows)
+        self._enqueued(len(rows))
+
+    def flush(self) -> None:
+        """Write all queued rows; on failure they stay queued (MERGE makes retry safe)."""
+        if not self._rows:
+            return
+
+        statements = self._repo.write_rows(self._rows, batch_size=self._batch_size)
+        self.stats["rows_flushed"] += len(self._rows)
+        self.stats["statements"] += statements
+        self.stats["flushes"] += 1
+        self._rows = RowSet()
+        self._oldest = None
+        _OPEN_BUFFERS.discard(self)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+
+    def __enter__(self) -> "WriteBehindBuffer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Write-behind buffer is closed.")
+
+    def _enqueued(self, count: int) -> None:
+        self.stats["enqueued"] += count
+        if self._oldest is None and self._rows:
+            self._oldest = self._clock()
+            _OPEN_BUFFERS.add(self)
+        if len(self._rows) >= self._max_pending:
+            self.flush()
+        elif (
+            self._max_age_seconds is not None
+            and self._oldest is not None
+            and self._clock() - self._oldest >= self._max_age_seconds
+        ):
+            self.flush()
+
+
+@atexit.register
+def _flush_open_buffers() -> None:
+    for buffer in list(_OPEN_BUFFERS):
+        if buffer.pending == 0:
+            continue
+        try:
+            buffer.close()
+        except Exception as exc:  # pragma: no cover - last-resort path
+            warnings.warn(
+                f"Write-behind buffer lost {buffer.pending} pending rows at exit: {exc}",
+                RuntimeWarning,
+                stacklevel=1,
+            )
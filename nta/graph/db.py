@@ -40,3 +40,30 @@ def apply_schema(driver: Driver, schema_path: str | Path | None = None) -> None:
     with driver.session() as session:
         for statement in statements:
             session.run(statement).consume()
+
+
+# Editions ingested before date_lo/date_hi existed; both statements are
+# idempotent and only touch editions that still need them.
+BACKFILL_EDITION_PERIODS = (
+    """
+MATCH (e:Edition)
+WHERE e.date_lo IS NULL OR e.date_hi IS NULL OR e.undated IS NULL
+SET e.date_lo = COALESCE(e.date_start, e.date_end, -999999),
+    e.date_hi = COALESCE(e.date_end, e.date_start, 999999),
+    e.undated = e.date_start IS NULL AND e.date_end IS NULL
+""",
+    """
+MATCH (e:Edition {undated: false})
+WHERE NOT (e)-[:IN_CENTURY]->(:Century)
+UNWIND range(toInteger(floor(e.date_lo / 100.0)), toInteger(floor(e.date_hi / 100.0))) AS bucket
+MERGE (c:Century {century: bucket})
+  ON CREATE SET c.start = bucket * 100, c.end = bucket * 100 + 99
+MERGE (e)-[:IN_CENTURY]->(c)
+""",
+)
+
+
+def backfill_edition_periods(driver: Driver) -> None:
+    with driver.session() as session:
+        for statement in BACKFILL_EDITION_PERIODS:
+            session.run(statement).consume()
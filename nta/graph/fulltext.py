@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+# Index names match nta/graph/schema.cypher.
+EDITION_SOURCE_LABEL_INDEX = "edition_source_label_fulltext"
+SEGMENT_TEXT_INDEX = "segment_text_fulltext"
+
+# standard-no-stop-words: Unicode (UAX #29) word breaks plus lowercasing, with
+# no ASCII folding (ð, þ, æ, ǫ stay distinct from d, th, ae, o) and no
+# English stop list ("at", "a", "en" are Old Norse words).
+FULLTEXT_ANALYZER = "standard-no-stop-words"
+
+FULLTEXT_MODES = ("prefix", "all", "phrase")
+
+_TERM = re.compile(r"\w+")
+
+EDITION_IDS_QUERY = """
+CALL db.index.fulltext.queryNodes($index, $query) YIELD node
+RETURN node.edition_id AS edition_id
+"""
+
+
+def fulltext_query(text: str, mode: str = "prefix") -> str:
+    """
+    Build a Lucene query from plain user text.
+
+    Terms are the Unicode word runs of ``text``, lowercased like the
+    analyzer does, so no user input is parsed as Lucene syntax:
+
+    - ``prefix``: every term must occur, the last may be a prefix
+      (``"háva"`` finds ``Hávamál``); closest to the old substring filter
+    - ``all``: every term must occur as a whole word
+    - ``phrase``: the terms must occur adjacent and in order
+    """
+    if mode not in FULLTEXT_MODES:
+        raise ValueError(f"Unsupported full-text mode: {mode}")
+    terms = [term.lower() for term in _TERM.findall(text)]
+    if not terms:
+        raise ValueError(f"No searchable terms in {text!r}")
+    if mode == "phrase":
+        return '"' + " ".join(terms) + '"'
+    if mode == "prefix":
+        terms[-1] += "*"
+    return " AND ".join(terms)
+
+
+def matching_edition_ids(session: Any, text: str, mode: str = "prefix") -> list[str]:
+    """Edition IDs whose ``source_label`` matches, via the full-text index."""
+    # A parameters map: "query" as a keyword would clash with Session.run(query, ...).
+    result = session.run(
+        EDITION_IDS_QUERY,
+        {"index": EDITION_SOURCE_LABEL_INDEX, "query": fulltext_query(text, mode)},
+    )
+    return [record["edition_id"] for record in result]
@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import re
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Sequence
+
+from nta.model import ids
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+
+DEFAULT_PAGE_SIZE = 5000
+DEFAULT_MAPPING_DIR = Path(".nta") / "id-migrations"
+
+SEGMENTS_PAGE_QUERY = """
+MATCH (:Edition {edition_id: $edition_id})-[:HAS_SEGMENT]->(s:Segment)
+WHERE s.segment_id > $after
+RETURN s.segment_id AS id, s.position AS position
+ORDER BY s.segment_id
+LIMIT $limit
+"""
+
+TOKENS_QUERY = """
+UNWIND $segment_ids AS segment_id
+MATCH (:Segment {segment_id: segment_id})-[:HAS_TOKEN]->(t:Token)
+OPTIONAL MATCH (t)-[:HAS_ANALYSIS]->(m:MorphAnalysis)
+RETURN segment_id, t.token_id AS id, t.position AS position,
+       collect(m.analysis_id) AS analysis_ids
+"""
+
+FORMS_PAGE_QUERY = """
+MATCH (n:Form)
+WHERE n.form_id > $after
+RETURN n.form_id AS id, n.language AS language, n.orthography AS text
+ORDER BY n.form_id
+LIMIT $limit
+"""
+
+LEMMAS_PAGE_QUERY = """
+MATCH (n:Lemma)
+WHERE n.lemma_id > $after
+RETURN n.lemma_id AS id, n.language AS language, n.headword AS text
+ORDER BY n.lemma_id
+LIMIT $limit
+"""
+
+# Already-compact keys are left alone, so a migration can be re-run.
+_V2_PATTERNS = {
+    "Segment": re.compile(r"[a-z2-7]{8}\.[0-9a-z]+"),
+    "Token": re.compile(r"[a-z2-7]{8}\.[0-9a-z]+\.[0-9a-z]+"),
+    "Form": re.compile(r"f[a-z2-7]{16}"),
+    "Lemma": re.compile(r"l[a-z2-7]{16}"),
+}
+
+_KEYS = {
+    "Segment": "segment_id",
+    "Token": "token_id",
+    "MorphAnalysis": "analysis_id",
+    "Form": "form_id",
+    "Lemma": "lemma_id",
+}
+
+FetchPage = Callable[[str, int], Sequence[dict[str, Any]]]
+
+
+@dataclass(slots=True, frozen=True)
+class IdMapping:
+    label: str
+    old: str
+    new: str
+    conflict: str | None = None
+
+    @property
+    def key(self) -> str:
+        return _KEYS[self.label]
+
+
+@dataclass(slots=True)
+class MigrationReport:
+    counts: dict[str, int] = field(default_factory=dict)
+    conflicts: dict[str, int] = field(default_factory=dict)
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+    def add(self, mapping: IdMapping) -> None:
+        if mapping.conflict is not None:
+            self.conflicts[mapping.label] = self.conflicts.get(mapping.label, 0) + 1
+            return
+        self.counts[mapping.label] = self.counts.get(mapping.label, 0) + 1
+        self.bytes_before += len(mapping.old.encode("utf-8"))
+        self.bytes_after += len(mapping.new.encode("utf-8"))
+
+
+def iter_pages(fetch_page: FetchPage, page_size: int) -> Iterator[dict[str, Any]]:
+    """Keyset pagination over ``id``: ``fetch_page(after, limit)`` until empty."""
+    after = ""
+    while True:
+        page = fetch_page(after, page_size)
+        if not page:
+            return
+        yield from page
+        after = page[-1]["id"]
+
+
+def plan_edition_mappings(
+    edition_id: str,
+    segment_rows: Iterable[dict[str, Any]],
+    fetch_tokens: Callable[[list[str]], Sequence[dict[str, Any]]],
+    scheme: ids.IdScheme,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[IdMapping]:
+    """
+    Map an edition's Segment, Token and MorphAnalysis keys to ``scheme``.
+
+    Segment rows must arrive ordered by old ``segment_id``; segments without a
+    ``position`` fall back to their 1-based rank in that order. Analysis IDs
+    that extend the old token ID keep their suffix on the new token ID.
+    """
+    seen: set[str] = set()
+    pattern = _V2_PATTERNS["Segment"]
+    rank = 0
+    pending: dict[str, str] = {}
+
+    def flush() -> Iterator[IdMapping]:
+        yield from _plan_tokens(pending, fetch_tokens(list(pending)), scheme)
+        pending.clear()
+
+    for row in segment_rows:
+        rank += 1
+        old = row["id"]
+        if pattern.fullmatch(old):
+            continue
+        position = row.get("position")
+        new = scheme.segment_id(edition_id, position if position is not None else rank)
+        if new in seen:
+            yield IdMapping("Segment", old, new, conflict="duplicate position")
+            continue
+        seen.add(new)
+        pending[old] = new
+        yield IdMapping("Segment", old, new)
+        if len(pending) >= page_size:
+            yield from flush()
+    if pending:
+        yield from flush()
+
+
+def _plan_tokens(
+    segments: dict[str, str], token_rows: Sequence[dict[str, Any]], scheme: ids.IdScheme
+) -> Iterator[IdMapping]:
+    seen: set[str] = set()
+    for row in token_rows:
+        old = row["id"]
+        if row.get("position") is None:
+            yield IdMapping("Token", old, old, conflict="missing position")
+            continue
+        new = scheme.token_id(segments[row["segment_id"]], row["position"])
+        if new in seen:
+            yield IdMapping("Token", old, new, conflict="duplicate position")
+            continue
+        seen.add(new)
+        yield IdMapping("Token", old, new)
+        for analysis_id in row.get("analysis_ids") or ():
+            if analysis_id.startswith(old):
+                yield IdMapping("MorphAnalysis", analysis_id, new + analysis_id[len(old) :])
+
+
+def plan_vocabulary_mappings(
+    label: str,
+    rows: Iterable[dict[str, Any]],
+    make_id: Callable[[str, str], str],
+    existing: Callable[[list[str]], set[str]] = lambda new_ids: set(),
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[IdMapping]:
+    """
+    Map global Form/Lemma keys (``{id, language, text}`` rows) to compact IDs.
+
+    Two old nodes that land on the same new key, or a new key that already
+    exists in the graph, would need a node merge; they are reported as
+    conflicts and left untouched.
+    """
+    pattern = _V2_PATTERNS[label]
+    seen: set[str] = set()
+    page: list[IdMapping] = []
+
+    def checked() -> Iterator[IdMapping]:
+        taken = existing([m.new for m in page])
+        for mapping in page:
+            if mapping.new in taken:
+                yield IdMapping(label, mapping.old, mapping.new, conflict="target exists")
+            else:
+                yield mapping
+        page.clear()
+
+    for row in rows:
+        old = row["id"]
+        if pattern.fullmatch(old):
+            continue
+        if row.get("language") is None or row.get("text") is None:
+            yield IdMapping(label, old, old, conflict="missing language/text")
+            continue
+        new = make_id(row["language"], row["text"])
+        if new in seen:
+            yield IdMapping(label, old, new, conflict="duplicate target")
+            continue
+        seen.add(new)
+        page.append(IdMapping(label, old, new))
+        if len(page) >= page_size:
+            yield from checked()
+    if page:
+        yield from checked()
+
+
+def write_mapping(path: Path, mappings: Iterable[IdMapping]) -> MigrationReport:
+    """Stream mappings to a gzip JSONL file (old -> new per node)."""
+    report = MigrationReport()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        for mapping in mappings:
+            report.add(mapping)
+            record = {"label": mapping.label, "key": mapping.key, "old": mapping.old, "new": mapping.new}
+            if mapping.conflict is not None:
+                record["conflict"] = mapping.conflict
+            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return report
+
+
+def read_mapping(path: Path) -> Iterator[IdMapping]:
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            record = json.loads(line)
+            yield IdMapping(record["label"], record["old"], record["new"], record.get("conflict"))
+
+
+def apply_mapping(driver: Driver, path: Path, page_size: int = DEFAULT_PAGE_SIZE) -> int:
+    """Rename keys from a mapping file in batches; conflicts are skipped."""
+    renamed = 0
+    batches: dict[str, list[dict[str, str]]] = {}
+    with driver.session() as session:
+        for mapping in read_mapping(path):
+            if mapping.conflict is not None:
+                continue
+            batch = batches.setdefault(mapping.label, [])
+            batch.append({"old": mapping.old, "new": mapping.new})
+            if len(batch) >= page_size:
+                renamed += _rename(session, mapping.label, batch)
+                batch.clear()
+        for label, batch in batches.items():
+            if batch:
+                renamed += _rename(session, label, batch)
+    return renamed
+
+
+def _rename(session: Any, label: str, rows: list[dict[str, str]]) -> int:
+    key = _KEYS[label]
+    query = f"""
+    UNWIND $rows AS row
+    MATCH (n:{label} {{{key}: row.old}})
+    SET n.{key} = row.new
+    RETURN count(n) AS renamed
+    """
+    return session.run(query, rows=rows).single()["renamed"]
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--edition-id",
+        action="append",
+        default=[],
+        help="Migrate this edition's Segment/Token/MorphAnalysis keys (repeatable).",
+    )
+    parser.add_argument("--forms", action="store_true", help="Migrate all Form keys.")
+    parser.add_argument("--lemmas", action="store_true", help="Migrate all Lemma keys.")
+    parser.add_argument(
+        "--to",
+        choices=[name for name in ids.ID_SCHEMES if name != "v1"],
+        default="v2",
+        help="Target ID scheme (default: v2).",
+    )
+    parser.add_argument(
+        "--mapping",
+        default=None,
+        help=f"Mapping file to write (default: {DEFAULT_MAPPING_DIR}/<timestamp>.jsonl.gz).",
+    )
+    parser.add_argument(
+        "--apply",
+        default=None,
+        metavar="MAPPING",
+        help="Apply an existing mapping file instead of planning a new one.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Write the mapping and report, but do not rename anything.",
+    )
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    from datetime import datetime
+    from datetime import timezone
+
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        if args.apply:
+            renamed = apply_mapping(driver, Path(args.apply), args.page_size)
+            print(f"Renamed {renamed} keys from {args.apply}")
+            return
+
+        if not (args.edition_id or args.forms or args.lemmas):
+            print("Nothing to migrate: pass --edition-id, --forms and/or --lemmas.")
+            return
+
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = Path(args.mapping or DEFAULT_MAPPING_DIR / f"{stamp}.jsonl.gz")
+        scheme = ids.id_scheme(args.to)
+        with driver.session() as session:
+            report = write_mapping(path, _plan_all(session, args, scheme))
+        _print_report(report, path)
+        if args.dry_run:
+            return
+
+        renamed = apply_mapping(driver, path, args.page_size)
+        if args.edition_id:
+            with driver.session() as session:
+                session.run(
+                    "UNWIND $edition_ids AS edition_id "
+                    "MATCH (e:Edition {edition_id: edition_id}) SET e.id_scheme = $scheme",
+                    edition_ids=args.edition_id,
+                    scheme=scheme.name,
+                ).consume()
+        print(f"Renamed {renamed} keys.")
+    finally:
+        if owns_driver:
+            driver.close()
+
+
+def _plan_all(session: Any, args: argparse.Namespace, scheme: ids.IdScheme) -> Iterator[IdMapping]:
+    def fetch(query: str, **params: Any) -> Callable[[str, int], list[dict[str, Any]]]:
+        return lambda after, limit: [
+            record.data() for record in session.run(query, after=after, limit=limit, **params)
+        ]
+
+    def fetch_tokens(segment_ids: list[str]) -> list[dict[str, Any]]:
+        return [record.data() for record in session.run(TOKENS_QUERY, segment_ids=segment_ids)]
+
+    def existing(label: str) -> Callable[[list[str]], set[str]]:
+        key = _KEYS[label]
+        query = f"UNWIND $ids AS id MATCH (n:{label} {{{key}: id}}) RETURN id"
+        return lambda new_ids: {record["id"] for record in session.run(query, ids=new_ids)}
+
+    # Everything is read (and the mapping fully written) before any rename, so
+    # keyset pagination never sees already-renamed keys.
+    for edition_id in args.edition_id:
+        segment_rows = iter_pages(fetch(SEGMENTS_PAGE_QUERY, edition_id=edition_id), args.page_size)
+        yield from plan_edition_mappings(
+            edition_id, segment_rows, fetch_tokens, scheme, args.page_size
+        )
+    if args.forms:
+        rows = iter_pages(fetch(FORMS_PAGE_QUERY), args.page_size)
+        yield from plan_vocabulary_mappings(
+            "Form", rows, scheme.form_id, existing("Form"), args.page_size
+        )
+    if args.lemmas:
+        rows = iter_pages(fetch(LEMMAS_PAGE_QUERY), args.page_size)
+        yield from plan_vocabulary_mappings(
+            "Lemma", rows, scheme.lemma_id, existing("Lemma"), args.page_size
+        )
+
+
+def _print_report(report: MigrationReport, path: Path) -> None:
+    print(f"Mapping written to {path}")
+    for label in sorted(set(report.counts) | set(report.conflicts)):
+        print(
+            f"  {label}: {report.counts.get(label, 0)} mapped, "
+            f"{report.conflicts.get(label, 0)} conflicts"
+        )
+    if report.bytes_before:
+        saved = 1 - report.bytes_after / report.bytes_before
+        print(
+            f"  key bytes: {report.bytes_before} -> {report.bytes_after} "
+            f"({saved:.0%} smaller, before index overhead)"
+        )
@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Iterator
+
+from nta.graph.fulltext import EDITION_SOURCE_LABEL_INDEX
+from nta.graph.fulltext import SEGMENT_TEXT_INDEX
+from nta.graph.fulltext import fulltext_query
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+
+DEFAULT_FETCH_SIZE = 1000
+DEFAULT_PAGE_SIZE = 5000
+
+
+@dataclass(slots=True, frozen=True)
+class NamedQuery:
+    """
+    A named, parameterized read query.
+
+    Keyset queries (``cursor`` set) must:
+
+    - accept ``$after`` (``null`` on the first page, else a map of the last
+      row's cursor columns) and ``$limit``
+    - ``ORDER BY`` exactly the cursor columns and return them under those names
+
+    so no page re-reads and discards ``SKIP`` rows. Where the cursor columns
+    are the start of an indexed scan (``forms`` over ``form_id``), each page
+    starts with an index seek past the previous one. Queries anchored
+    elsewhere (``lemma_attestations`` starts at its Lemma) still expand and
+    sort the anchor's whole neighbourhood on every page: cost per page grows
+    with the anchor's fan-out, not with the page number.
+
+    ``prepare`` may rewrite user-facing parameters before the query runs (for
+    example plain search text into a Lucene query).
+    """
+
+    name: str
+    cypher: str
+    params: tuple[str, ...] = ()
+    cursor: tuple[str, ...] = ()
+    description: str = ""
+    prepare: Callable[[dict[str, Any]], dict[str, Any]] | None = None
+
+
+QUERIES: dict[str, NamedQuery] = {}
+
+
+def register_query(query: NamedQuery) -> NamedQuery:
+    if query.name in QUERIES:
+        raise ValueError(f"Query already registered: {query.name}")
+    QUERIES[query.name] = query
+    return query
+
+
+def get_query(name: str) -> NamedQuery:
+    try:
+        return QUERIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown query: {name!r} (expected one of {sorted(QUERIES)})") from None
+
+
+register_query(
+    NamedQuery(
+        name="form_attestations",
+        description="Every token of one Form, with its segment and edition.",
+        params=("form_id",),
+        cursor=("segment_id", "token_id"),
+        cypher="""
+MATCH (:Form {form_id: $form_id})<-[:INSTANCE_OF_FORM]-(t:Token)<-[:HAS_TOKEN]-(s:Segment)
+WHERE $after IS NULL
+   OR s.segment_id > $after.segment_id
+   OR (s.segment_id = $after.segment_id AND t.token_id > $after.token_id)
+MATCH (e:Edition)-[:HAS_SEGMENT]->(s)
+RETURN s.segment_id AS segment_id,
+       t.token_id AS token_id,
+       e.edition_id AS edition_id,
+       s.ref AS segment_ref,
+       t.surface AS surface,
+       s.text AS segment_text
+ORDER BY segment_id, token_id
+LIMIT $limit
+""",
+    )
+)
+
+register_query(
+    NamedQuery(
+        name="lemma_attestations",
+        description="Every token realizing one Lemma, with its segment and edition.",
+        params=("lemma_id",),
+        cursor=("segment_id", "token_id"),
+        cypher="""
+MATCH (:Lemma {lemma_id: $lemma_id})<-[r:REALIZES]-(f:Form)<-[:INSTANCE_OF_FORM]-(t:Token)
+WHERE coalesce(r.is_active, true)
+MATCH (s:Segment)-[:HAS_TOKEN]->(t)
+WHERE $after IS NULL
+   OR s.segment_id > $after.segment_id
+   OR (s.segment_id = $after.segment_id AND t.token_id > $after.token_id)
+MATCH (e:Edition)-[:HAS_SEGMENT]->(s)
+RETURN s.segment_id AS segment_id,
+       t.token_id AS token_id,
+       e.edition_id AS edition_id,
+       f.form_id AS form_id,
+       s.ref AS segment_ref,
+       t.surface AS surface,
+       s.text AS segment_text
+ORDER BY segment_id, token_id
+LIMIT $limit
+""",
+    )
+)
+
+register_query(
+    NamedQuery(
+        name="forms_attestations",
+        description="Every token of a list of Forms (e.g. from 'nta forms search').",
+        params=("form_ids",),
+        cursor=("segment_id", "token_id"),
+        cypher="""
+UNWIND $form_ids AS form_id
+MATCH (f:Form {form_id: form_id})<-[:INSTANCE_OF_FORM]-(t:Token)<-[:HAS_TOKEN]-(s:Segment)
+WHERE $after IS NULL
+   OR s.segment_id > $after.segment_id
+   OR (s.segment_id = $after.segment_id AND t.token_id > $after.token_id)
+MATCH (e:Edition)-[:HAS_SEGMENT]->(s)
+RETURN s.segment_id AS segment_id,
+       t.token_id AS token_id,
+       e.edition_id AS edition_id,
+       f.form_id AS form_id,
+       s.ref AS segment_ref,
+       t.surface AS surface,
+       s.text AS segment_text
+ORDER BY segment_id, token_id
+LIMIT $limit
+""",
+    )
+)
+
+register_query(
+    NamedQuery(
+        name="forms",
+        description="Every Form's ID, language and orthography (for 'nta forms build').",
+        cursor=("form_id",),
+        cypher="""
+MATCH (f:Form)
+WHERE $after IS NULL OR f.form_id > $after.form_id
+RETURN f.form_id AS form_id,
+       f.language AS language,
+       f.orthography AS orthography
+ORDER BY form_id
+LIMIT $limit
+""",
+    )
+)
+
+register_query(
+    NamedQuery(
+        name="edition_segments",
+        description="Segments of one edition in segment_id order.",
+        params=("edition_id",),
+        cursor=("segment_id",),
+        cypher="""
+MATCH (:Edition {edition_id: $edition_id})-[:HAS_SEGMENT]->(s:Segment)
+WHERE $after IS NULL OR s.segment_id > $after.segment_id
+RETURN s.segment_id AS segment_id,
+       s.position AS position,
+       s.ref AS ref,
+       s.text AS text
+ORDER BY segment_id
+LIMIT $limit
+""",
+    )
+)
+
+register_query(
+    NamedQuery(
+        name="top_surfaces",
+        description="Most frequent token surfaces (single aggregate, not paged).",
+        params=("limit",),
+        cypher="""
+MATCH (t:Token)
+WHERE t.surface IS NOT NULL AND t.surface <> ''
+RETURN t.surface AS surface, count(*) AS freq
+ORDER BY freq DESC, surface ASC
+LIMIT $limit
+""",
+    )
+)
+
+
+def _search_params(params: dict[str, Any]) -> dict[str, Any]:
+    prepared = dict(params)
+    prepared["query"] = fulltext_query(str(params["text"]), params.get("mode", "prefix"))
+    prepared.setdefault("limit", 100)
+    return prepared
+
+
+register_query(
+    NamedQuery(
+        name="segment_search",
+        description="Full-text search over Segment.text (mode: prefix, all, phrase).",
+        params=("text",),
+        prepare=_search_params,
+        cypher=f"""
+CALL db.index.fulltext.queryNodes("{SEGMENT_TEXT_INDEX}", $query) YIELD node AS s, score
+MATCH (e:Edition)-[:HAS_SEGMENT]->(s)
+RETURN e.edition_id AS edition_id,
+       s.segment_id AS segment_id,
+       s.ref AS ref,
+       s.text AS text,
+       score
+ORDER BY score DESC, segment_id
+LIMIT $limit
+""",
+    )
+)
+
+register_query(
+    NamedQuery(
+        name="edition_search",
+        description="Full-text search over Edition.source_label (mode: prefix, all, phrase).",
+        params=("text",),
+        prepare=_search_params,
+        cypher=f"""
+CALL db.index.fulltext.queryNodes("{EDITION_SOURCE_LABEL_INDEX}", $query) YIELD node AS e, score
+RETURN e.edition_id AS edition_id,
+       e.source_label AS source_label,
+       e.date_lo AS date_lo,
+       e.date_hi AS date_hi,
+       score
+ORDER BY score DESC, edition_id
+LIMIT $limit
+""",
+    )
+)
+
+
+class QueryService:
+    """
+    Streaming reads over named queries.
+
+    ``stream`` yields one dict per record as the driver pulls them in
+    ``fetch_size`` batches; ``paginate`` runs keyset queries page by page, each
+    page in its own short auto-commit transaction. Neither keeps more than one
+    fetch batch or page of rows on the client.
+    """
+
+    def __init__(
+        self,
+        driver: Driver,
+        database: str | None = None,
+        fetch_size: int = DEFAULT_FETCH_SIZE,
+    ) -> None:
+        self.driver = driver
+        self.database = database
+        self.fetch_size = fetch_size
+
+    def _session(self, fetch_size: int | None = None) -> Any:
+        config: dict[str, Any] = {"fetch_size": fetch_size or self.fetch_size}
+        if self.database is not None:
+            config["database"] = self.database
+        return self.driver.session(**config)
+
+    def stream(
+        self, name: str, fetch_size: int | None = None, **params: Any
+    ) -> Iterator[dict[str, Any]]:
+        """Run a query once and yield its records lazily."""
+        query = get_query(name)
+        if query.cursor:
+            raise ValueError(f"Query {name!r} is keyset-paged; use paginate()")
+        _check_params(query, params)
+        if query.prepare is not None:
+            params = query.prepare(params)
+        with self._session(fetch_size) as session:
+            for record in session.run(query.cypher, params):
+                yield record.data()
+
+    def paginate(
+        self,
+        name: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        after: dict[str, Any] | None = None,
+        **params: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yield every row of a keyset query, ``page_size`` rows per round trip.
+
+        ``after`` resumes from a saved cursor (the cursor columns of the last
+        row already seen).
+        """
+        query = get_query(name)
+        if not query.cursor:
+            raise ValueError(f"Query {name!r} has no keyset cursor; use stream()")
+        _check_params(query, params)
+        if query.prepare is not None:
+            params = query.prepare(params)
+        with self._session(min(page_size, self.fetch_size)) as session:
+            while True:
+                rows = 0
+                last = None
+                page_params = {**params, "after": after, "limit": page_size}
+                for record in session.run(query.cypher, page_params):
+                    last = record.data()
+                    rows += 1
+                    yield last
+                if rows < page_size or last is None:
+                    return
+                after = {column: last[column] for column in query.cursor}
+
+
+def _check_params(query: NamedQuery, params: dict[str, Any]) -> None:
+    missing = [name for name in query.params if name not in params]
+    if missing:
+        raise ValueError(f"Query {query.name!r} needs parameters: {', '.join(missing)}")
+
+
+def _parse_param(text: str) -> tuple[str, Any]:
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Expected key=value, got {text!r}")
+    try:
+        return key, json.loads(value)
+    except json.JSONDecodeError:
+        return key, value
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("name", nargs="?", help="Named query to run (omit to list queries).")
+    parser.add_argument(
+        "--param",
+        action="append",
+        type=_parse_param,
+        default=[],
+        help="Query parameter as key=value (value parsed as JSON when possible; repeatable).",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"Rows per keyset page (default: {DEFAULT_PAGE_SIZE}).",
+    )
+    parser.add_argument(
+        "--fetch-size",
+        type=int,
+        default=DEFAULT_FETCH_SIZE,
+        help=f"Records pulled per driver round trip (default: {DEFAULT_FETCH_SIZE}).",
+    )
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    """Write query rows to stdout as JSON lines."""
+    if args.name is None:
+        for query in QUERIES.values():
+            params = ", ".join(query.params) or "-"
+            paged = " (keyset)" if query.cursor else ""
+            print(f"{query.name:<22} params: {params:<12} {query.description}{paged}")
+        return
+
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+
+    query = get_query(args.name)
+    params = dict(args.param)
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        service = QueryService(driver, fetch_size=args.fetch_size)
+        if query.cursor:
+            rows = service.paginate(query.name, page_size=args.page_size, **params)
+        else:
+            rows = service.stream(query.name, **params)
+        write = sys.stdout.write
+        for row in rows:
+            write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+    finally:
+        if owns_driver:
+            driver.close()
@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+
+from nta.graph.rows import RowSet
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+    from nta.graph.repo import Neo4jRepository
+    from nta.ingest.pipeline import PlannedBatch
+
+# Staged and retired editions drop the Edition label, so nothing that matches
+# (:Edition) or walks Work-[:HAS_EDITION]-> sees them.
+STAGED_LABEL = "StagedEdition"
+RETIRED_LABEL = "RetiredEdition"
+DEFAULT_MIN_TOKEN_RATIO = 0.5
+DEFAULT_RETIRE_ROWS = 500
+
+COUNTS_QUERY = """
+MATCH (e:{label} {{edition_id: $edition_id}})
+OPTIONAL MATCH (e)-[:HAS_SEGMENT]->(s:Segment)
+OPTIONAL MATCH (s)-[:HAS_TOKEN]->(t:Token)
+RETURN count(DISTINCT e) AS editions, count(DISTINCT s) AS segments, count(t) AS tokens
+"""
+
+LIVE_WORK_QUERY = """
+MATCH (w:Work)-[:HAS_EDITION]->(:Edition {edition_id: $edition_id})
+RETURN collect(DISTINCT w.work_id) AS work_ids
+"""
+
+RETIRE_OLD_QUERY = """
+MATCH (old:Edition {edition_id: $edition_id})
+OPTIONAL MATCH (:Work)-[h:HAS_EDITION]->(old)
+DELETE h
+WITH DISTINCT old
+REMOVE old:Edition
+SET old:RetiredEdition,
+    old.edition_id = $retired_id,
+    old.retired_from = $edition_id,
+    old.retired_at = datetime()
+RETURN count(old) AS retired
+"""
+
+PROMOTE_QUERY = """
+MATCH (new:StagedEdition {edition_id: $staging_id})
+MERGE (w:Work {work_id: $work_id})
+REMOVE new:StagedEdition, new.staging_for
+SET new:Edition,
+    new.edition_id = $edition_id,
+    new.id_base = $staging_id,
+    new.supersedes = $retired_id,
+    new.promoted_at = datetime()
+MERGE (w)-[:HAS_EDITION]->(new)
+RETURN count(new) AS promoted
+"""
+
+# Edition-level links are few, so they move inside the swap transaction.
+MOVE_TRANSLATES_QUERIES = (
+    """
+MATCH (old:RetiredEdition {edition_id: $retired_id})-[t:TRANSLATES]->(other)
+MATCH (new:Edition {edition_id: $edition_id})
+MERGE (new)-[:TRANSLATES]->(other)
+DELETE t
+""",
+    """
+MATCH (other)-[t:TRANSLATES]->(old:RetiredEdition {edition_id: $retired_id})
+MATCH (new:Edition {edition_id: $edition_id})
+MERGE (other)-[:TRANSLATES]->(new)
+DELETE t
+""",
+)
+
+PENDING_QUERY = """
+MATCH (e:{label})
+WHERE e.{link} = $edition_id
+RETURN e.edition_id AS edition_id
+ORDER BY edition_id
+"""
+
+# Runs in an auto-commit transaction (required by CALL ... IN TRANSACTIONS);
+# each inner transaction deletes one batch of segments with their tokens and
+# analyses, so locks and transaction state stay small while queries run.
+RETIRE_SEGMENTS_QUERY = """
+MATCH (:{label} {{edition_id: $edition_id}})-[:HAS_SEGMENT]->(s:Segment)
+CALL {{
+  WITH s
+  OPTIONAL MATCH (s)-[:HAS_TOKEN]->(t:Token)
+  OPTIONAL MATCH (t)-[:HAS_ANALYSIS]->(m:MorphAnalysis)
+  WITH s, collect(DISTINCT t) AS tokens, collect(DISTINCT m) AS analyses
+  FOREACH (m IN analyses | DETACH DELETE m)
+  FOREACH (t IN tokens | DETACH DELETE t)
+  DETACH DELETE s
+}} IN TRANSACTIONS OF {rows} ROWS
+"""
+
+DELETE_EDITION_QUERY = """
+MATCH (e:{label} {{edition_id: $edition_id}})
+DETACH DELETE e
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class RebuildIds:
+    """The live edition ID and the revision-qualified IDs a rebuild uses."""
+
+    edition_id: str
+    revision: str
+
+    @property
+    def staging_id(self) -> str:
+        # Also the ID base of the new Segment/Token keys, so they can never
+        # collide with the live edition's.
+        return f"{self.edition_id}~{self.revision}"
+
+    @property
+    def retired_id(self) -> str:
+        return f"{self.edition_id}~retired-{self.revision}"
+
+
+@dataclass(slots=True, frozen=True)
+class EditionCounts:
+    segments: int = 0
+    tokens: int = 0
+    exists: bool = False
+
+
+def default_revision() -> str:
+    return datetime.now(timezone.utc).strftime("r%Y%m%dT%H%M%SZ")
+
+
+def stage_rows(rows: RowSet, edition_id: str, revision: str) -> RowSet:
+    """
+    Rewrite one planned batch for the staging edition.
+
+    ``Edition`` rows become ``StagedEdition`` rows (tagged with
+    ``staging_for``/``revision``) and ``HAS_EDITION`` is dropped, so the
+    staged version is unreachable until the swap.
+    """
+    staged = RowSet()
+    for (label, key), group in rows.nodes.items():
+        staged_label = STAGED_LABEL if label == "Edition" else label
+        for key_value, row in group.items():
+            props = row["props"]
+            if label == "Edition":
+                props = {**props, "staging_for": edition_id, "revision": revision}
+            staged.merge_node(staged_label, key, key_value, props, row["create"])
+    for (rel_type, sl, sk, el, ek, keys), group in rows.relationships.items():
+        if rel_type == "HAS_EDITION":
+            continue
+        sl = STAGED_LABEL if sl == "Edition" else sl
+        el = STAGED_LABEL if el == "Edition" else el
+        for (start, end, *_), props in group.items():
+            staged.merge_relationship(rel_type, (sl, sk, start), (el, ek, end), props, keys)
+    return staged
+
+
+def stage_batches(
+    batches: Iterable[PlannedBatch], edition_id: str, revision: str
+) -> Iterator[PlannedBatch]:
+    """``stage_rows`` for every batch; sketches are taken before relabelling."""
+    from nta.ingest.pipeline import batch_sketches
+
+    for batch in batches:
+        if batch.sketches is None:
+            batch.sketches = batch_sketches(batch.rows)
+        batch.rows = stage_rows(batch.rows, edition_id, revision)
+        yield batch
+
+
+def write_staged(
+    repo: Neo4jRepository, staging_id: str, batches: Iterable[PlannedBatch]
+) -> EditionCounts:
+    segments = 0
+    tokens = 0
+    for batch in batches:
+        repo.write_rows(batch.rows)
+        if batch.segments and batch.sketches is not None:
+            repo.merge_edition_sketches(staging_id, batch.sketches, label=STAGED_LABEL)
+        segments += batch.segments
+        tokens += batch.tokens
+    return EditionCounts(segments, tokens, exists=True)
+
+
+def edition_counts(session: Any, label: str, edition_id: str) -> EditionCounts:
+    record = session.run(COUNTS_QUERY.format(label=label), edition_id=edition_id).single()
+    return EditionCounts(record["segments"], record["tokens"], bool(record["editions"]))
+
+
+def live_work_ids(session: Any, edition_id: str) -> list[str]:
+    """Works the live edition hangs under (normally one; none for a new edition)."""
+    return sorted(session.run(LIVE_WORK_QUERY, edition_id=edition_id).single()["work_ids"])
+
+
+def validate_stage(
+    planned: EditionCounts,
+    staged: EditionCounts,
+    live: EditionCounts,
+    min_token_ratio: float = DEFAULT_MIN_TOKEN_RATIO,
+) -> list[str]:
+    """
+    Reasons not to swap; empty when the staged edition is safe to promote.
+
+    - the staged graph must hold exactly what was planned (a short count
+      means a lost write)
+    - the new version must not be empty, nor shrink below
+      ``min_token_ratio`` of the live token count
+    """
+    problems = []
+    if not staged.exists:
+        problems.append("staged edition not found")
+    if (staged.segments, staged.tokens) != (planned.segments, planned.tokens):
+        problems.append(
+            f"staged graph has {staged.segments} segments/{staged.tokens} tokens, "
+            f"planned {planned.segments}/{planned.tokens}"
+        )
+    if not planned.segments:
+        problems.append("new version has no segments")
+    if live.exists and live.tokens and planned.tokens < live.tokens * min_token_ratio:
+        problems.append(
+            f"new version has {planned.tokens} tokens, below {min_token_ratio:.0%} "
+            f"of the live {live.tokens}"
+        )
+    return problems
+
+
+def swap(driver: Driver, ids: RebuildIds, work_id: str) -> bool:
+    """
+    Promote the staged edition and retire the live one in one transaction.
+
+    Only Edition nodes and their few edition-level relationships change, so
+    the transaction is tiny: readers see either the old edition or the new
+    one under ``edition_id``, never both or neither. Refuses to move the
+    edition to a different Work. Returns whether a live edition was retired.
+    """
+    params = {
+        "edition_id": ids.edition_id,
+        "staging_id": ids.staging_id,
+        "retired_id": ids.retired_id,
+        "work_id": work_id,
+    }
+
+    def work(tx: Any) -> bool:
+        live_works = live_work_ids(tx, ids.edition_id)
+        if live_works and work_id not in live_works:
+            raise RuntimeError(
+                f"Edition {ids.edition_id} belongs to Work {', '.join(live_works)}, "
+                f"not {work_id}"
+            )
+        retired = tx.run(RETIRE_OLD_QUERY, **params).single()["retired"]
+        if tx.run(PROMOTE_QUERY, **params).single()["promoted"] != 1:
+            raise RuntimeError(f"Staged edition not found: {ids.staging_id}")
+        for query in MOVE_TRANSLATES_QUERIES:
+            tx.run(query, **params).consume()
+        return bool(retired)
+
+    with driver.session() as session:
+        return session.execute_write(work)
+
+
+def pending_retirements(session: Any, edition_id: str, staged: bool = False) -> list[str]:
+    """Retired versions of ``edition_id`` (or abandoned staged ones) still in the graph."""
+    label, link = (STAGED_LABEL, "staging_for") if staged else (RETIRED_LABEL, "retired_from")
+    result = session.run(PENDING_QUERY.format(label=label, link=link), edition_id=edition_id)
+    return [record["edition_id"] for record in result]
+
+
+def retire(
+    driver: Driver, label: str, edition_id: str, rows: int = DEFAULT_RETIRE_ROWS
+) -> None:
+    """Delete a retired or staged edition's subgraph in small batches."""
+    if label not in (STAGED_LABEL, RETIRED_LABEL):
+        raise ValueError(f"Refusing to retire {label} nodes")
+    if rows < 1:
+        raise ValueError("rows must be >= 1")
+    with driver.session() as session:
+        session.run(
+            RETIRE_SEGMENTS_QUERY.format(label=label, rows=int(rows)), edition_id=edition_id
+        ).consume()
+        session.run(DELETE_EDITION_QUERY.format(label=label), edition_id=edition_id).consume()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--edition-id", required=True, help="Live edition to rebuild.")
+    parser.add_argument("--path", required=True, help="Source file of the new version.")
+    parser.add_argument(
+        "--kind", choices=["plaintext", "tei"], default=None, help="Default: from the suffix."
+    )
+    parser.add_argument("--work-id", default=None)
+    parser.add_argument("--source-label", default=None)
+    parser.add_argument("--language-stage", default=None)
+    parser.add_argument("--segment", default="line", help="Segmentation mode (plaintext).")
+    parser.add_argument("--date-start", type=int, default=None)
+    parser.add_argument("--date-end", type=int, default=None)
+    parser.add_argument("--id-scheme", default=None)
+    parser.add_argument(
+        "--revision", default=None, help="Revision tag (default: UTC timestamp, rYYYYMMDDTHHMMSSZ)."
+    )
+    parser.add_argument("--batch-segments", type=int, default=None)
+    parser.add_argument(
+        "--min-token-ratio",
+        type=float,
+        default=DEFAULT_MIN_TOKEN_RATIO,
+        help="Refuse to swap if the new version has fewer tokens than this share of the live one.",
+    )
+    parser.add_argument("--force", action="store_true", help="Swap despite validation problems.")
+    parser.add_argument(
+        "--no-retire",
+        action="store_true",
+        help="Leave the old subgraph for a later 'nta edition retire'.",
+    )
+    parser.add_argument(
+        "--retire-rows",
+        type=int,
+        default=DEFAULT_RETIRE_ROWS,
+        help=f"Segments deleted per transaction (default: {DEFAULT_RETIRE_ROWS}).",
+    )
+
+
+def _source(
+    args: argparse.Namespace, work_id: str | None = None, id_scheme: str | None = None
+) -> Any:
+    from nta.ingest.corpus import DISCOVERY_SUFFIXES
+    from nta.ingest.corpus import CorpusSource
+    from nta.ingest.corpus import _with_defaults
+
+    kind = args.kind or DISCOVERY_SUFFIXES.get(Path(args.path).suffix.lower())
+    if kind not in ("plaintext", "tei"):
+        # Hávamál JSON always plans the same fixed edition_id.
+        raise SystemExit(f"Cannot rebuild from {args.path}: use a plaintext or TEI source.")
+    return _with_defaults(
+        CorpusSource(
+            kind=kind,
+            path=args.path,
+            work_id=work_id,
+            edition_id=args.edition_id,
+            source_label=args.source_label,
+            language_stage=args.language_stage,
+            segment=args.segment,
+            date_start=args.date_start,
+            date_end=args.date_end,
+            id_scheme=id_scheme,
+        )
+    )
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    from dataclasses import replace
+
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+    from nta.graph.repo import Neo4jRepository
+    from nta.ingest.corpus import plan_source
+    from nta.ingest.pipeline import DEFAULT_BATCH_SEGMENTS
+    from nta.ingest.pipeline import resolve_id_scheme
+
+    ids = RebuildIds(args.edition_id, args.revision or default_revision())
+    batch_segments = args.batch_segments or DEFAULT_BATCH_SEGMENTS
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        # The rebuilt edition stays under its live Work; without --work-id the
+        # file name would otherwise pick the Work.
+        with driver.session() as session:
+            live_works = live_work_ids(session, ids.edition_id)
+        if args.work_id and live_works and args.work_id not in live_works:
+            raise SystemExit(
+                f"Edition {ids.edition_id} belongs to Work {', '.join(live_works)}, "
+                f"not {args.work_id}; refusing to rebuild it under another Work."
+            )
+        # New IDs use the live edition's scheme, like its shared vocabulary.
+        source = _source(
+            args,
+            args.work_id or (live_works[0] if live_works else None),
+            resolve_id_scheme(driver, ids.edition_id, args.id_scheme, rebuild=True),
+        )
+
+        start = time.perf_counter()
+        staged_source = replace(source, edition_id=ids.staging_id)
+        batches = stage_batches(
+            plan_source(staged_source, batch_segments), ids.edition_id, ids.revision
+        )
+        planned = write_staged(Neo4jRepository(driver), ids.staging_id, batches)
+        print(
+            f"Staged {ids.staging_id}: {planned.segments} segments, {planned.tokens} tokens "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+
+        with driver.session() as session:
+            staged = edition_counts(session, STAGED_LABEL, ids.staging_id)
+            live = edition_counts(session, "Edition", ids.edition_id)
+        if live.exists:
+            print(f"Live {ids.edition_id}: {live.segments} segments, {live.tokens} tokens")
+        problems = validate_stage(planned, staged, live, args.min_token_ratio)
+        for problem in problems:
+            print(f"  validation: {problem}")
+        if problems and not args.force:
+            print(
+                f"Not swapped. Inspect {STAGED_LABEL} {ids.staging_id}, then re-run with "
+                f"--force or discard it with 'nta edition retire --edition-id "
+                f"{ids.edition_id} --staged'."
+            )
+            return
+
+        retired = swap(driver, ids, source.work_id)
+        print(f"Swapped: {ids.edition_id} now serves revision {ids.revision}.")
+        if not retired:
+            return
+        if args.no_retire:
+            print(f"Old version kept as {RETIRED_LABEL} {ids.retired_id}.")
+            return
+        start = time.perf_counter()
+        retire(driver, RETIRED_LABEL, ids.retired_id, args.retire_rows)
+        print(f"Retired {ids.retired_id} in {time.perf_counter() - start:.1f}s")
+    finally:
+        if owns_driver:
+            driver.close()
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Mapping
+
+# Returns the records a stand-in statement should yield; the default yields none.
+Responder = Callable[[str, Mapping[str, Any]], list[dict[str, Any]]]
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _no_records(query: str, params: Mapping[str, Any]) -> list[dict[str, Any]]:
+    return []
+
+
+def _size(value: Any) -> int:
+    return len(value) if isinstance(value, (list, tuple, dict, set)) else 1
+
+
+@dataclass(slots=True, frozen=True)
+class RecordedStatement:
+    """
+    One statement sent through a ``RecordingDriver``.
+
+    ``parameters`` maps each parameter to its size (list/map length, else 1);
+    ``transaction`` numbers the transaction it ran in, and ``explicit`` tells
+    whether that was an explicit/managed transaction rather than auto-commit.
+    """
+
+    query: str
+    parameters: dict[str, int]
+    session: int
+    transaction: int
+    explicit: bool
+
+    @property
+    def rows(self) -> int:
+        """Size of ``$rows``, the UNWIND list of bulk statements (0 if absent)."""
+        return self.parameters.get("rows", 0)
+
+    @property
+    def shape(self) -> str:
+        return _WHITESPACE_RE.sub(" ", self.query).strip()
+
+
+class RecordingRecord(dict):
+    """Dict with the ``neo4j.Record`` accessors the repo code uses."""
+
+    def data(self) -> dict[str, Any]:
+        return dict(self)
+
+    def value(self, key: str | int = 0) -> Any:
+        return list(self.values())[key] if isinstance(key, int) else self[key]
+
+
+class RecordingResult:
+    def __init__(self, records: list[dict[str, Any]]) -> None:
+        self._records = [RecordingRecord(record) for record in records]
+
+    def __iter__(self) -> Iterator[RecordingRecord]:
+        return iter(self._records)
+
+    def single(self) -> RecordingRecord | None:
+        return self._records[0] if self._records else None
+
+    def data(self) -> list[dict[str, Any]]:
+        return [record.data() for record in self._records]
+
+    def consume(self) -> None:
+        self._records = []
+
+
+class RecordingTransaction:
+    def __init__(self, session: RecordingSession, explicit: bool = True) -> None:
+        self._session = session
+        self.number = session.driver._next_transaction()
+        self.explicit = explicit
+        self.closed = False
+
+    def run(self, query: str, parameters: Mapping[str, Any] | None = None, **kwargs: Any):
+        if self.closed:
+            raise RuntimeError("Transaction is closed")
+        return self._session.driver._record(
+            query, {**(parameters or {}), **kwargs}, self._session.number, self
+        )
+
+    def commit(self) -> None:
+        self.closed = True
+        self._session.driver.commits += 1
+
+    def rollback(self) -> None:
+        self.closed = True
+        self._session.driver.rollbacks += 1
+
+    def close(self) -> None:
+        if not self.closed:
+            self.rollback()
+
+    def __enter__(self) -> RecordingTransaction:
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        if not self.closed:
+            self.commit() if exc_type is None else self.rollback()
+
+
+class RecordingSession:
+    def __init__(self, driver: RecordingDriver, number: int) -> None:
+        self.driver = driver
+        self.number = number
+
+    def run(self, query: str, parameters: Mapping[str, Any] | None = None, **kwargs: Any):
+        tx = RecordingTransaction(self, explicit=False)
+        result = tx.run(query, parameters, **kwargs)
+        tx.commit()
+        return result
+
+    def begin_transaction(self, **kwargs: Any) -> RecordingTransaction:
+        return RecordingTransaction(self)
+
+    def execute_write(self, work: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self.begin_transaction() as tx:
+            return work(tx, *args, **kwargs)
+
+    execute_read = execute_write
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> RecordingSession:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+@dataclass
+class RecordingDriver:
+    """
+    Stand-in for ``neo4j.Driver`` that records statements instead of sending them.
+
+    Covers the surface ``Neo4jRepository`` and the CLI commands use: sessions
+    with ``run``, ``begin_transaction``, ``execute_write``/``execute_read``,
+    and ``execute_query``. Every statement returns the records ``responder``
+    gives it (none by default), so write paths run unchanged and round trips
+    can be counted without a database.
+    """
+
+    responder: Responder = _no_records
+    statements: list[RecordedStatement] = field(default_factory=list)
+    sessions: int = 0
+    transactions: int = 0
+    commits: int = 0
+    rollbacks: int = 0
+    closed: bool = False
+
+    def session(self, **kwargs: Any) -> RecordingSession:
+        self.sessions += 1
+        return RecordingSession(self, self.sessions)
+
+    def execute_query(
+        self, query: str, parameters: Mapping[str, Any] | None = None, **kwargs: Any
+    ) -> RecordingResult:
+        params = {k: v for k, v in kwargs.items() if not k.endswith("_")}
+        with self.session() as session:
+            return session.run(query, parameters, **params)
+
+    def verify_connectivity(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def reset(self) -> None:
+        self.statements.clear()
+        self.sessions = self.transactions = self.commits = self.rollbacks = 0
+
+    def _next_transaction(self) -> int:
+        self.transactions += 1
+        return self.transactions
+
+    def _record(
+        self, query: str, params: dict[str, Any], session: int, tx: RecordingTransaction
+    ) -> RecordingResult:
+        self.statements.append(
+            RecordedStatement(
+                query=query,
+                parameters={name: _size(value) for name, value in params.items()},
+                session=session,
+                transaction=tx.number,
+                explicit=tx.explicit,
+            )
+        )
+        return RecordingResult(self.responder(query, params))
+
+    def shapes(self) -> Counter[str]:
+        """Statement count per whitespace-normalized query text."""
+        return Counter(statement.shape for statement in self.statements)
+
+    def per_1k(self, tokens: int) -> float:
+        return len(self.statements) * 1000 / tokens if tokens else float(len(self.statements))
+
+
+def assert_statement_budget(
+    driver: RecordingDriver,
+    tokens: int | None = None,
+    per_1k_tokens: float | None = None,
+    max_statements: int | None = None,
+    max_transactions: int | None = None,
+    max_rows: int | None = None,
+) -> None:
+    """
+    Fail with the busiest statement shapes when a recorded run is over budget.
+
+    - ``per_1k_tokens``: statements per 1000 ``tokens`` (catches per-token
+      queries creeping back into bulk paths)
+    - ``max_statements`` / ``max_transactions``: absolute round trips
+    - ``max_rows``: largest ``$rows`` list of any one statement
+    """
+    problems = []
+    count = len(driver.statements)
+    if per_1k_tokens is not None:
+        if tokens is None:
+            raise ValueError("per_1k_tokens needs tokens")
+        if driver.per_1k(tokens) > per_1k_tokens:
+            problems.append(
+                f"{count} statements for {tokens} tokens "
+                f"({driver.per_1k(tokens):.1f}/1k > {per_1k_tokens}/1k)"
+            )
+    if max_statements is not None and count > max_statements:
+        problems.append(f"{count} statements > {max_statements}")
+    if max_transactions is not None and driver.transactions > max_transactions:
+        problems.append(f"{driver.transactions} transactions > {max_transactions}")
+    if max_rows is not None:
+        rows = max((statement.rows for statement in driver.statements), default=0)
+        if rows > max_rows:
+            problems.append(f"a statement carried {rows} rows > {max_rows}")
+    if problems:
+        busiest = "\n".join(
+            f"  {n:>6}x {shape[:120]}" for shape, n in driver.shapes().most_common(5)
+        )
+        raise AssertionError("Statement budget exceeded: " + "; ".join(problems) + "\n" + busiest)
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Sequence
+
+from nta.model import ids
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_ASSIGNED_BY = "lexicon-remap"
+CLAIM_TYPE = "form_lemma_remap"
+
+# Ingest writes REALIZES without properties, so a missing is_active counts as
+# active everywhere (see also nta.reports.distinct).
+ACTIVE_QUERY = """
+UNWIND $rows AS row
+OPTIONAL MATCH (f:Form {form_id: row.form_id})
+OPTIONAL MATCH (l:Lemma {lemma_id: row.lemma_id})
+RETURN row.form_id AS form_id,
+       f IS NOT NULL AS form_exists,
+       l IS NOT NULL AS lemma_exists,
+       [(f)-[r:REALIZES]->(a:Lemma) WHERE coalesce(r.is_active, true) | a.lemma_id] AS active
+"""
+
+# One round per chunk: deactivate every other active edge of the form, then
+# CREATE (not MERGE) the new edge unless one to the target is already active,
+# so returning to an earlier lemma adds a fresh edge and leaves the old,
+# inactive one as history.
+APPLY_QUERY = """
+UNWIND $rows AS row
+MATCH (f:Form {form_id: row.form_id})
+MATCH (l:Lemma {lemma_id: row.lemma_id})
+OPTIONAL MATCH (f)-[old:REALIZES]->(prior:Lemma)
+WHERE coalesce(old.is_active, true) AND prior.lemma_id <> row.lemma_id
+SET old.is_active = false, old.deactivated_at = $created_at, old.superseded_by = row.lemma_id
+WITH DISTINCT row, f, l
+OPTIONAL MATCH (f)-[current:REALIZES]->(l)
+WHERE coalesce(current.is_active, true)
+WITH row, f, l, count(current) AS active
+FOREACH (_ IN CASE WHEN active = 0 THEN [1] ELSE [] END |
+  CREATE (f)-[:REALIZES {
+    is_active: true,
+    assigned_by: $assigned_by,
+    confidence: row.confidence,
+    created_at: $created_at,
+    claim_id: $claim_id
+  }]->(l)
+)
+FOREACH (_ IN CASE WHEN $claim_id IS NULL THEN [] ELSE [1] END |
+  MERGE (c:Claim {claim_id: $claim_id})
+  MERGE (c)-[:ASSERTS]->(l)
+)
+RETURN count(*) AS applied
+"""
+
+CLAIM_QUERY = """
+MERGE (c:Claim {claim_id: $claim_id})
+SET c.type = $type, c.statement = $statement, c.status = "accepted"
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class Assignment:
+    """One row of a mapping file: ``form_id`` should realize ``lemma_id``."""
+
+    form_id: str
+    lemma_id: str
+    confidence: float | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class RemapChange:
+    """
+    The diff of one assignment against the form's active ``REALIZES`` edges.
+
+    ``kind`` is ``add`` (no active lemma), ``change`` (other active lemmas,
+    listed in ``previous``), ``unchanged`` or ``conflict``.
+    """
+
+    assignment: Assignment
+    kind: str
+    previous: tuple[str, ...] = ()
+    conflict: str | None = None
+
+    def as_row(self) -> dict[str, Any]:
+        return {
+            "form_id": self.assignment.form_id,
+            "lemma_id": self.assignment.lemma_id,
+            "confidence": self.assignment.confidence,
+        }
+
+
+@dataclass(slots=True)
+class RemapReport:
+    counts: dict[str, int] = field(default_factory=dict)
+    conflicts: dict[str, int] = field(default_factory=dict)
+
+    def add(self, change: RemapChange) -> None:
+        if change.conflict is not None:
+            self.conflicts[change.conflict] = self.conflicts.get(change.conflict, 0) + 1
+        self.counts[change.kind] = self.counts.get(change.kind, 0) + 1
+
+    @property
+    def applied(self) -> int:
+        return self.counts.get("add", 0) + self.counts.get("change", 0)
+
+
+def read_assignments(path: str | Path) -> Iterator[Assignment]:
+    """
+    Stream ``form_id``/``lemma_id``/optional ``confidence`` rows.
+
+    ``.jsonl`` files hold one object per line; anything else is read as TSV
+    (CSV for ``.csv``) with a header row naming those columns.
+    """
+    path = Path(path)
+    with path.open(encoding="utf-8", newline="") as fh:
+        if path.suffix.lower() == ".jsonl":
+            rows: Iterable[dict[str, Any]] = (json.loads(line) for line in fh if line.strip())
+        else:
+            rows = csv.DictReader(fh, delimiter="," if path.suffix.lower() == ".csv" else "\t")
+        for number, row in enumerate(rows, start=1):
+            form_id, lemma_id = row.get("form_id"), row.get("lemma_id")
+            if not form_id or not lemma_id:
+                raise ValueError(f"{path}: row {number} needs form_id and lemma_id")
+            confidence = row.get("confidence")
+            yield Assignment(
+                form_id,
+                lemma_id,
+                float(confidence) if confidence not in (None, "") else None,
+            )
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    chunk: list[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def diff_chunk(
+    chunk: Sequence[Assignment], state: dict[str, dict[str, Any]], seen: set[str]
+) -> Iterator[RemapChange]:
+    """
+    Classify ``chunk`` against ``ACTIVE_QUERY`` rows keyed by form ID.
+
+    A form listed twice in a mapping keeps its first assignment (``seen``
+    spans the whole file). Missing forms or lemmas are conflicts: Lemma
+    nodes need a headword, so the engine never creates them.
+    """
+    for assignment in chunk:
+        row = state.get(assignment.form_id, {})
+        if assignment.form_id in seen:
+            yield RemapChange(assignment, "conflict", conflict="duplicate form")
+            continue
+        seen.add(assignment.form_id)
+        if not row.get("form_exists"):
+            yield RemapChange(assignment, "conflict", conflict="missing form")
+            continue
+        if not row.get("lemma_exists"):
+            yield RemapChange(assignment, "conflict", conflict="missing lemma")
+            continue
+        active = tuple(sorted(set(row.get("active") or ())))
+        if active == (assignment.lemma_id,):
+            yield RemapChange(assignment, "unchanged", active)
+            continue
+        previous = tuple(lemma for lemma in active if lemma != assignment.lemma_id)
+        yield RemapChange(assignment, "change" if previous else "add", previous)
+
+
+def plan_remap(
+    assignments: Iterable[Assignment],
+    fetch_active: Callable[[list[dict[str, Any]]], Sequence[dict[str, Any]]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[list[RemapChange]]:
+    """
+    Diff assignments against the graph one chunk at a time.
+
+    Each chunk costs one ``ACTIVE_QUERY`` round (index seeks on Form and
+    Lemma keys), and yields its changes so they can be applied before the
+    next chunk is read.
+    """
+    seen: set[str] = set()
+    for chunk in chunked(assignments, chunk_size):
+        rows = fetch_active([{"form_id": a.form_id, "lemma_id": a.lemma_id} for a in chunk])
+        state = {row["form_id"]: row for row in rows}
+        yield list(diff_chunk(chunk, state, seen))
+
+
+def remap_claim_id(assigned_by: str, statement: str, created_at: datetime) -> str:
+    return ids.claim_id(CLAIM_TYPE, assigned_by, statement, created_at.isoformat())
+
+
+def remap(
+    driver: Driver,
+    assignments: Iterable[Assignment],
+    assigned_by: str = DEFAULT_ASSIGNED_BY,
+    claim: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+    on_change: Callable[[RemapChange], None] | None = None,
+) -> RemapReport:
+    """
+    Apply a mapping file's changes as versioned ``REALIZES`` edges.
+
+    - unchanged and conflicting rows are never written
+    - each chunk's changes commit in one write transaction, so an interrupted
+      run can simply be re-run: finished chunks diff as unchanged
+    - all new edges of a run share ``created_at`` (and ``claim_id`` when
+      ``claim`` is given), which identifies the run afterwards
+    """
+    created_at = datetime.now(timezone.utc)
+    claim_id = remap_claim_id(assigned_by, claim, created_at) if claim else None
+    params = {"assigned_by": assigned_by, "created_at": created_at, "claim_id": claim_id}
+    report = RemapReport()
+
+    with driver.session() as session:
+
+        def fetch_active(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+            return [record.data() for record in session.run(ACTIVE_QUERY, rows=rows)]
+
+        if claim_id is not None and not dry_run:
+            session.run(
+                CLAIM_QUERY, claim_id=claim_id, type=CLAIM_TYPE, statement=claim
+            ).consume()
+        for changes in plan_remap(assignments, fetch_active, chunk_size):
+            for change in changes:
+                report.add(change)
+                if on_change is not None:
+                    on_change(change)
+            rows = [change.as_row() for change in changes if change.kind in ("add", "change")]
+            if rows and not dry_run:
+                session.execute_write(
+                    lambda tx: tx.run(APPLY_QUERY, rows=rows, **params).consume()
+                )
+    return report
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--mapping",
+        required=True,
+        help="TSV/CSV (form_id, lemma_id[, confidence] header) or JSONL assignments.",
+    )
+    parser.add_argument(
+        "--assigned-by",
+        default=DEFAULT_ASSIGNED_BY,
+        help=f"Recorded on new REALIZES edges (default: {DEFAULT_ASSIGNED_BY}).",
+    )
+    parser.add_argument(
+        "--claim", default=None, help="Statement of a Claim explaining this remap."
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Assignments diffed and applied per transaction (default: {DEFAULT_CHUNK_SIZE}).",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Diff and report only.")
+    parser.add_argument(
+        "--conflicts", default=None, help="Write conflicting rows to this JSONL file."
+    )
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    import time
+
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    conflicts = open(args.conflicts, "w", encoding="utf-8") if args.conflicts else None
+
+    def record_conflict(change: RemapChange) -> None:
+        if conflicts is not None and change.conflict is not None:
+            row = {**change.as_row(), "conflict": change.conflict}
+            conflicts.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    start = time.perf_counter()
+    try:
+        report = remap(
+            driver,
+            read_assignments(args.mapping),
+            assigned_by=args.assigned_by,
+            claim=args.claim,
+            chunk_size=args.chunk_size,
+            dry_run=args.dry_run,
+            on_change=record_conflict,
+        )
+    finally:
+        if conflicts is not None:
+            conflicts.close()
+        if owns_driver:
+            driver.close()
+
+    verb = "Would apply" if args.dry_run else "Applied"
+    print(f"{verb} {report.applied} remaps in {time.perf_counter() - start:.1f}s")
+    for kind in ("add", "change", "unchanged", "conflict"):
+        print(f"  {kind}: {report.counts.get(kind, 0)}")
+    for reason, count in sorted(report.conflicts.items()):
+        print(f"    {reason}: {count}")
+    if report.applied and not args.dry_run:
+        print("Lemma sketches are now stale; run 'nta report distinct --backfill all'.")
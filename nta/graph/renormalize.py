@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Sequence
+
+from nta.ingest.checkpoint import DEFAULT_CHECKPOINT_DIR
+from nta.ingest.normalize import CompiledPolicy
+from nta.model import ids
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+    from nta.graph.repo import Neo4jRepository
+
+
+DEFAULT_PAGE_SIZE = 5000
+UNKNOWN_LANGUAGE = "UNKNOWN"
+
+# Whole-graph mode: keyset over the token_id uniqueness index.
+TOKENS_PAGE_QUERY = """
+MATCH (t:Token)
+WHERE t.token_id > $after
+WITH t
+ORDER BY t.token_id
+LIMIT $limit
+OPTIONAL MATCH (t)-[:INSTANCE_OF_FORM]->(f:Form)
+RETURN t.token_id AS id, t.surface AS surface, f.form_id AS form_id, f.language AS language
+ORDER BY id
+"""
+
+# Edition mode: keyset over the edition's segments, tokens fetched per page.
+SEGMENTS_PAGE_QUERY = """
+MATCH (:Edition {edition_id: $edition_id})-[:HAS_SEGMENT]->(s:Segment)
+WHERE s.segment_id > $after
+RETURN s.segment_id AS id
+ORDER BY s.segment_id
+LIMIT $limit
+"""
+
+SEGMENT_TOKENS_QUERY = """
+UNWIND $segment_ids AS segment_id
+MATCH (:Segment {segment_id: segment_id})-[:HAS_TOKEN]->(t:Token)
+OPTIONAL MATCH (t)-[:INSTANCE_OF_FORM]->(f:Form)
+RETURN t.token_id AS id, t.surface AS surface, f.form_id AS form_id, f.language AS language
+"""
+
+# Returns one page of token rows and the cursor to resume after it, or an
+# empty page when done.
+FetchTokens = Callable[[str, int], tuple[Sequence[dict[str, Any]], str]]
+
+
+@dataclass(slots=True, frozen=True)
+class RenormalizeCheckpoint:
+    """Cursor of one re-normalization job (policy + scope)."""
+
+    policy: str
+    scope: str
+    after: str = ""
+    tokens: int = 0
+    written: int = 0
+    completed: bool = False
+    updated_at: str | None = None
+
+
+class RenormalizeJournal:
+    """
+    Local cursor journal, one JSON file per (policy, scope) job.
+
+    Same atomic temp-file-and-rename writes as the ingest checkpoint journal;
+    the cursor is a token or segment ID rather than an ordinal.
+    """
+
+    def __init__(self, directory: str | Path = DEFAULT_CHECKPOINT_DIR) -> None:
+        self._directory = Path(directory)
+
+    def _path(self, policy: str, scope: str) -> Path:
+        digest = hashlib.sha1(f"{policy}\t{scope}".encode("utf-8")).hexdigest()[:16]
+        return self._directory / f"renormalize-{digest}.json"
+
+    def load(self, policy: str, scope: str) -> RenormalizeCheckpoint | None:
+        path = self._path(policy, scope)
+        if not path.exists():
+            return None
+        return RenormalizeCheckpoint(**json.loads(path.read_text(encoding="utf-8")))
+
+    def record(self, checkpoint: RenormalizeCheckpoint) -> RenormalizeCheckpoint:
+        stamped = RenormalizeCheckpoint(
+            **{**asdict(checkpoint), "updated_at": datetime.now(timezone.utc).isoformat()}
+        )
+        path = self._path(checkpoint.policy, checkpoint.scope)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(
+            json.dumps(asdict(stamped), ensure_ascii=False, indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+        return stamped
+
+    def clear(self, policy: str, scope: str) -> None:
+        self._path(policy, scope).unlink(missing_ok=True)
+
+
+def form_id_for(surface_form_id: str | None, language: str, orthography: str) -> str:
+    """
+    A Form ID in the same scheme and layout as the token's surface Form.
+
+    v1 Forms are either ``ids.form_id`` keys (``form:...``) or the adapters'
+    own ``<prefix>:<orthography>`` keys (plaintext ``<language>:``, Hávamál
+    ``non:``); the latter keep their prefix, as ingest does for normalized
+    Forms.
+    """
+    if surface_form_id is None or surface_form_id.startswith("form:"):
+        return ids.form_id(language, orthography)
+    if ids.form_id_scheme(surface_form_id) == "v2":
+        return ids.form_id_v2(language, orthography)
+    prefix, _, _ = surface_form_id.partition(":")
+    return f"{prefix}:{orthography}"
+
+
+def plan_normalizations(
+    rows: Sequence[dict[str, Any]], policy: CompiledPolicy
+) -> list[dict[str, Any]]:
+    """
+    ``merge_token_normalizations`` rows for tokens the policy changes.
+
+    Like ingest, tokens whose normalization equals their surface get no
+    edge; empty results (pure punctuation) are skipped too.
+    """
+    surfaces = [row.get("surface") or "" for row in rows]
+    out = []
+    for row, surface, normalized in zip(rows, surfaces, policy.normalize_many(surfaces)):
+        if not normalized or normalized == surface:
+            continue
+        language = row.get("language") or UNKNOWN_LANGUAGE
+        out.append(
+            {
+                "token_id": row["id"],
+                "form_id": form_id_for(row.get("form_id"), language, normalized),
+                "orthography": normalized,
+                "language": language,
+            }
+        )
+    return out
+
+
+def iter_token_pages(
+    fetch: FetchTokens, page_size: int, after: str = ""
+) -> Iterator[tuple[Sequence[dict[str, Any]], str]]:
+    while True:
+        rows, cursor = fetch(after, page_size)
+        if not rows and cursor == after:
+            return
+        yield rows, cursor
+        after = cursor
+
+
+def renormalize(
+    repo: Neo4jRepository,
+    fetch: FetchTokens,
+    policy: CompiledPolicy,
+    journal: RenormalizeJournal,
+    scope: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    resume: bool = False,
+    pause: float = 0.0,
+    on_page: Callable[[RenormalizeCheckpoint], None] | None = None,
+) -> RenormalizeCheckpoint:
+    """
+    Apply ``policy`` to existing tokens page by page, checkpointing each page.
+
+    Every page is one read plus one UNWIND write per ``BULK_BATCH_SIZE``
+    rows, and the cursor is recorded only after its writes return, so a
+    resumed job re-reads at most one page. Writes are MERGEs, making that
+    overlap harmless. ``pause`` sleeps between pages to leave headroom for
+    live queries.
+    """
+    state = journal.load(policy.policy_id, scope) if resume else None
+    if state is None or state.completed:
+        state = RenormalizeCheckpoint(policy.policy_id, scope)
+    for rows, cursor in iter_token_pages(fetch, page_size, state.after):
+        planned = plan_normalizations(rows, policy)
+        if planned:
+            repo.merge_token_normalizations(policy.policy_id, planned)
+        state = journal.record(
+            RenormalizeCheckpoint(
+                policy.policy_id,
+                scope,
+                after=cursor,
+                tokens=state.tokens + len(rows),
+                written=state.written + len(planned),
+            )
+        )
+        if on_page is not None:
+            on_page(state)
+        if pause:
+            time.sleep(pause)
+    return journal.record(
+        RenormalizeCheckpoint(
+            policy.policy_id, scope, state.after, state.tokens, state.written, completed=True
+        )
+    )
+
+
+def graph_fetcher(session: Any, edition_id: str | None = None) -> FetchTokens:
+    """Token pages from the whole graph, or from one edition's segments."""
+    if edition_id is None:
+
+        def fetch_tokens(after: str, limit: int) -> tuple[list[dict[str, Any]], str]:
+            rows = [r.data() for r in session.run(TOKENS_PAGE_QUERY, after=after, limit=limit)]
+            return rows, rows[-1]["id"] if rows else after
+
+        return fetch_tokens
+
+    def fetch_segments(after: str, limit: int) -> tuple[list[dict[str, Any]], str]:
+        segment_ids = [
+            record["id"]
+            for record in session.run(
+                SEGMENTS_PAGE_QUERY, edition_id=edition_id, after=after, limit=limit
+            )
+        ]
+        if not segment_ids:
+            return [], after
+        result = session.run(SEGMENT_TOKENS_QUERY, segment_ids=segment_ids)
+        return [record.data() for record in result], segment_ids[-1]
+
+    return fetch_segments
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--policy", required=True, help="Normalization policy ID to apply.")
+    parser.add_argument(
+        "--edition-id",
+        default=None,
+        help="Only this edition's tokens (pages by segment); default: every Token.",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"Tokens (or segments with --edition-id) per page (default: {DEFAULT_PAGE_SIZE}).",
+    )
+    parser.add_argument("--resume", action="store_true", help="Continue after the last page.")
+    parser.add_argument(
+        "--pause", type=float, default=0.0, help="Seconds to sleep between pages."
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=str(DEFAULT_CHECKPOINT_DIR),
+        help=f"Progress journal directory (default: {DEFAULT_CHECKPOINT_DIR}).",
+    )
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+    from nta.graph.repo import Neo4jRepository
+    from nta.ingest.normalize import normalization_policy
+
+    policy = normalization_policy(args.policy)
+    scope = f"edition:{args.edition_id}" if args.edition_id else "all"
+    journal = RenormalizeJournal(args.checkpoint_dir)
+    if args.resume:
+        checkpoint = journal.load(policy.policy_id, scope)
+        if checkpoint is not None and not checkpoint.completed:
+            print(f"Resuming after {checkpoint.after!r} ({checkpoint.tokens} tokens done)")
+
+    def report(state: RenormalizeCheckpoint) -> None:
+        print(f"  {state.tokens} tokens, {state.written} edges (after {state.after})")
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    start = time.perf_counter()
+    try:
+        with driver.session() as session:
+            state = renormalize(
+                Neo4jRepository(driver),
+                graph_fetcher(session, args.edition_id),
+                policy,
+                journal,
+                scope,
+                page_size=args.page_size,
+                resume=args.resume,
+                pause=args.pause,
+                on_page=report,
+            )
+    finally:
+        if owns_driver:
+            driver.close()
+    print(
+        f"Normalized {state.tokens} tokens with {policy.policy_id}: "
+        f"{state.written} NORMALIZED_TO edges in {time.perf_counter() - start:.1f}s"
+    )
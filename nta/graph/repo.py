@@ -3,10 +3,16 @@ from __future__ import annotations
 import re
 from pathlib import Path
 from typing import Any
+from typing import Mapping
+from typing import Sequence
 
 from neo4j import Driver
 
 from nta.graph.db import apply_schema as apply_schema_statements
+from nta.graph.rows import RowSet
+from nta.model.hll import EDITION_SKETCHES
+from nta.model.hll import HyperLogLog
+from nta.model.hll import sketch_property
 from nta.model.types import Claim
 from nta.model.types import Edition
 from nta.model.types import Feature
@@ -21,6 +27,8 @@ from nta.model.types import Work
 
 _IDENTIFIER_RE = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
 
+BULK_BATCH_SIZE = 1000
+
 
 class Neo4jRepository:
     """Thin persistence layer for graph upserts and links."""
@@ -32,6 +40,178 @@ class Neo4jRepository:
     def apply_schema(self) -> None:
         apply_schema_statements(self._driver, self._schema_path)
 
+    def flush(self) -> None:
+        """No-op: writes are committed as they are issued."""
+
+    def merge_nodes(
+        self,
+        label: str,
+        key: str,
+        rows: Sequence[Mapping[str, Any]],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> int:
+        """
+        Bulk MERGE nodes by key with one UNWIND statement per batch.
+
+        Row shape: ``{"key": <id>, "props": {...}, "create": {...}}``; ``create``
+        is applied only when the node is new. Returns statements issued.
+        """
+        self._validate_identifier(label)
+        self._validate_identifier(key)
+        query = f"""
+        UNWIND $rows AS row
+        MERGE (n:{label} {{{key}: row.key}})
+        ON CREATE SET n += row.create
+        SET n += row.props
+        """
+        normalized = [
+            {
+                "key": row["key"],
+                "props": dict(row.get("props") or {}),
+                "create": dict(row.get("create") or {}),
+            }
+            for row in rows
+        ]
+        return self._execute_batched(query, normalized, batch_size)
+
+    def write_rows(self, rows: RowSet, batch_size: int = BULK_BATCH_SIZE) -> int:
+        """Write a RowSet: all node groups first, then relationship groups."""
+        statements = 0
+        for label, key, node_rows in rows.node_groups():
+            statements += self.merge_nodes(label, key, node_rows, batch_size=batch_size)
+        for rel_type, sl, sk, el, ek, keys, rel_rows in rows.relationship_groups():
+            statements += self.merge_relationships(
+                rel_type, sl, sk, el, ek, rel_rows, batch_size=batch_size, keys=keys
+            )
+        return statements
+
+    def merge_relationships(
+        self,
+        rel_type: str,
+        start_label: str,
+        start_key: str,
+        end_label: str,
+        end_key: str,
+        rows: Sequence[Mapping[str, Any]],
+        batch_size: int = BULK_BATCH_SIZE,
+        keys: Sequence[str] = (),
+    ) -> int:
+        """
+        Bulk MERGE relationships between keyed endpoints.
+
+        Row shape: ``{"start": <id>, "end": <id>, "props": {...}}``. ``keys``
+        names props that go into the MERGE pattern, so edges that differ only
+        in them (one ``NORMALIZED_TO`` per policy) are not merged into one.
+        Returns statements issued.
+        """
+        for identifier in (rel_type, start_label, start_key, end_label, end_key, *keys):
+            self._validate_identifier(identifier)
+        pattern = ", ".join(f"{name}: row.props.{name}" for name in keys)
+        pattern = f" {{{pattern}}}" if pattern else ""
+        query = f"""
+        UNWIND $rows AS row
+        MERGE (a:{start_label} {{{start_key}: row.start}})
+        MERGE (b:{end_label} {{{end_key}: row.end}})
+        MERGE (a)-[r:{rel_type}{pattern}]->(b)
+        SET r += row.props
+        """
+        normalized = [
+            {"start": row["start"], "end": row["end"], "props": dict(row.get("props") or {})}
+            for row in rows
+        ]
+        return self._execute_batched(query, normalized, batch_size)
+
+    def merge_analysis_features(
+        self, rows: Sequence[Mapping[str, Any]], batch_size: int = BULK_BATCH_SIZE
+    ) -> int:
+        """
+        Bulk MERGE ``(MorphAnalysis)-[:HAS_FEATURE]->(Feature)`` links.
+
+        Row shape: ``{"start": <analysis_id>, "key", "value", "props", "node"}``;
+        ``node`` properties are set on the Feature, which is keyed by
+        ``(key, value)``. Returns statements issued.
+        """
+        query = """
+        UNWIND $rows AS row
+        MERGE (m:MorphAnalysis {analysis_id: row.start})
+        MERGE (f:Feature {key: row.key, value: row.value})
+        SET f += row.node
+        MERGE (m)-[r:HAS_FEATURE]->(f)
+        SET r += row.props
+        """
+        normalized = [
+            {
+                "start": row["start"],
+                "key": row["key"],
+                "value": row["value"],
+                "props": dict(row.get("props") or {}),
+                "node": dict(row.get("node") or {}),
+            }
+            for row in rows
+        ]
+        return self._execute_batched(query, normalized, batch_size)
+
+    def merge_token_normalizations(
+        self,
+        policy: str,
+        rows: Sequence[Mapping[str, Any]],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> int:
+        """
+        Bulk MERGE ``(Token)-[:NORMALIZED_TO {policy}]->(Form)`` for one policy.
+
+        Row shape: ``{"token_id", "form_id", "orthography", "language"}``. The
+        policy is part of the MERGE pattern, so each policy keeps its own edge
+        even when two policies agree on a Form. Tokens are matched, never
+        created. Returns statements issued.
+        """
+        query = """
+        UNWIND $rows AS row
+        MATCH (t:Token {token_id: row.token_id})
+        MERGE (f:Form {form_id: row.form_id})
+        ON CREATE SET f.orthography = row.orthography, f.language = row.language
+        MERGE (t)-[:NORMALIZED_TO {policy: $policy}]->(f)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        statements = 0
+        with self._driver.session() as session:
+            for start in range(0, len(rows), batch_size):
+                batch = [dict(row) for row in rows[start : start + batch_size]]
+                session.run(query, rows=batch, policy=policy).consume()
+                statements += 1
+        return statements
+
+    def merge_edition_sketches(
+        self, edition_id: str, sketches: Mapping[str, HyperLogLog], label: str = "Edition"
+    ) -> None:
+        """
+        Fold distinct-count sketches into ``Edition.hll_*`` by register-wise max.
+
+        A stored sketch of another precision is replaced rather than merged;
+        ``label`` targets staged editions during a rebuild.
+        """
+        self._validate_identifier(label)
+        params: dict[str, Any] = {"edition_id": edition_id}
+        assignments = []
+        for name in EDITION_SKETCHES:
+            if name not in sketches:
+                continue
+            prop = sketch_property(name)
+            params[name] = sketches[name].to_list()
+            assignments.append(
+                f"e.{prop} = CASE WHEN e.{prop} IS NULL OR size(e.{prop}) <> size(${name}) "
+                f"THEN ${name} ELSE [i IN range(0, size(${name}) - 1) | "
+                f"CASE WHEN e.{prop}[i] >= ${name}[i] THEN e.{prop}[i] ELSE ${name}[i] END] END"
+            )
+        if not assignments:
+            return
+        query = f"""
+        MERGE (e:{label} {{edition_id: $edition_id}})
+        SET {", ".join(assignments)}
+        """
+        self._execute(query, **params)
+
     def upsert_work(self, work: Work) -> None:
         self._execute(
             """
@@ -317,8 +497,7 @@ class Neo4jRepository:
             """
             MERGE (t:Token {token_id: $token_id})
             MERGE (f:Form {form_id: $form_id})
-            MERGE (t)-[r:NORMALIZED_TO]->(f)
-            SET r.policy = $policy
+            MERGE (t)-[:NORMALIZED_TO {policy: $policy}]->(f)
             """,
             token_id=token_id,
             form_id=form_id,
@@ -402,6 +581,19 @@ class Neo4jRepository:
         with self._driver.session() as session:
             session.run(query, **params).consume()
 
+    def _execute_batched(
+        self, query: str, rows: Sequence[Mapping[str, Any]], batch_size: int
+    ) -> int:
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        statements = 0
+        with self._driver.session() as session:
+            for start in range(0, len(rows), batch_size):
+                batch = list(rows[start : start + batch_size])
+                session.run(query, rows=batch).consume()
+                statements += 1
+        return statements
+
     @staticmethod
     def _validate_identifier(value: str) -> None:
         if not _IDENTIFIER_RE.match(value):
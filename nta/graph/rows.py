@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Iterator
+from typing import Mapping
+
+
+NodeGroup = tuple[str, str]
+RelGroup = tuple[str, str, str, str, str, tuple[str, ...]]
+Endpoint = tuple[str, str, Any]
+
+
+class RowSet:
+    """
+    Coalesced node and relationship MERGE rows, grouped for bulk UNWIND writes.
+
+    Nodes are keyed by ``(label, key_field, key_value)`` and relationships by
+    ``(type, start endpoint, end endpoint)`` plus the values of their ``keys``
+    properties, if any. Repeated merges of the same key
+    collapse into one row; properties merge in call order (last write wins),
+    ``on_create`` properties keep their first value. Plain dicts only, so a
+    RowSet pickles cheaply between processes.
+    """
+
+    __slots__ = ("nodes", "relationships", "size")
+
+    def __init__(self) -> None:
+        self.nodes: dict[NodeGroup, dict[Any, dict[str, dict[str, Any]]]] = {}
+        self.relationships: dict[RelGroup, dict[tuple[Any, ...], dict[str, Any]]] = {}
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def merge_node(
+        self,
+        label: str,
+        key: str,
+        key_value: Any,
+        properties: Mapping[str, Any] | None = None,
+        on_create: Mapping[str, Any] | None = None,
+    ) -> bool:
+        """Merge one node row; return True if the row is new to this set."""
+        group = self.nodes.setdefault((label, key), {})
+        row = group.get(key_value)
+        added = row is None
+        if row is None:
+            row = {"props": {}, "create": {}}
+            group[key_value] = row
+            self.size += 1
+        if properties:
+            row["props"].update(properties)
+        if on_create:
+            for name, value in on_create.items():
+                row["create"].setdefault(name, value)
+        return added
+
+    def merge_relationship(
+        self,
+        rel_type: str,
+        start: Endpoint,
+        end: Endpoint,
+        properties: Mapping[str, Any] | None = None,
+        keys: tuple[str, ...] = (),
+    ) -> bool:
+        """
+        Merge ``(start)-[:rel_type]->(end)``; endpoints are ``(label, key, value)``.
+
+        ``keys`` names properties that are part of the relationship's identity
+        (written into the MERGE pattern), so parallel edges between the same
+        endpoints stay apart; they must be present in ``properties``.
+        """
+        start_label, start_key, start_value = start
+        end_label, end_key, end_value = end
+        missing = [name for name in keys if name not in (properties or {})]
+        if missing:
+            raise ValueError(f"{rel_type} key properties missing: {', '.join(missing)}")
+        group = self.relationships.setdefault(
+            (rel_type, start_label, start_key, end_label, end_key, tuple(keys)), {}
+        )
+        row_key = (start_value, end_value, *(properties[name] for name in keys))
+        props = group.get(row_key)
+        added = props is None
+        if props is None:
+            props = {}
+            group[row_key] = props
+            self.size += 1
+        if properties:
+            props.update(properties)
+        return added
+
+    def update(self, other: RowSet) -> int:
+        """Merge another RowSet into this one; return the number of new rows."""
+        added = 0
+        for (label, key), group in other.nodes.items():
+            for key_value, row in group.items():
+                added += self.merge_node(label, key, key_value, row["props"], row["create"])
+        for (rel_type, sl, sk, el, ek, keys), group in other.relationships.items():
+            for (start, end, *_), props in group.items():
+                added += self.merge_relationship(
+                    rel_type, (sl, sk, start), (el, ek, end), props, keys
+                )
+        return added
+
+    def node_groups(self) -> Iterator[tuple[str, str, list[dict[str, Any]]]]:
+        for (label, key), group in self.nodes.items():
+            yield label, key, [{"key": value, **row} for value, row in group.items()]
+
+    def relationship_groups(
+        self,
+    ) -> Iterator[tuple[str, str, str, str, str, tuple[str, ...], list[dict[str, Any]]]]:
+        for (rel_type, sl, sk, el, ek, keys), group in self.relationships.items():
+            rows = [{"start": s, "end": e, "props": props} for (s, e, *_), props in group.items()]
+            yield rel_type, sl, sk, el, ek, keys, rows
+
+    def clear(self) -> None:
+        self.nodes = {}
+        self.relationships = {}
+        self.size = 0
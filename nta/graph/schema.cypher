@@ -10,6 +10,15 @@ CREATE CONSTRAINT edition_edition_id_unique IF NOT EXISTS
 FOR (e:Edition)
 REQUIRE e.edition_id IS UNIQUE;
 
+// Staged rebuilds and retired versions of an edition (nta/graph/rebuild.py).
+CREATE CONSTRAINT staged_edition_edition_id_unique IF NOT EXISTS
+FOR (e:StagedEdition)
+REQUIRE e.edition_id IS UNIQUE;
+
+CREATE CONSTRAINT retired_edition_edition_id_unique IF NOT EXISTS
+FOR (e:RetiredEdition)
+REQUIRE e.edition_id IS UNIQUE;
+
 CREATE CONSTRAINT segment_segment_id_unique IF NOT EXISTS
 FOR (s:Segment)
 REQUIRE s.segment_id IS UNIQUE;
@@ -146,10 +155,42 @@ CREATE INDEX edition_date_end_idx IF NOT EXISTS
 FOR (e:Edition)
 ON (e.date_end);
 
+// Normalized, never-null bounds written at ingest (nta.model.periods); year
+// filters compare these directly instead of COALESCE(date_start, ...).
+CREATE INDEX edition_date_lo_idx IF NOT EXISTS
+FOR (e:Edition)
+ON (e.date_lo);
+
+CREATE INDEX edition_date_hi_idx IF NOT EXISTS
+FOR (e:Edition)
+ON (e.date_hi);
+
+CREATE INDEX edition_undated_idx IF NOT EXISTS
+FOR (e:Edition)
+ON (e.undated);
+
+// Time buckets: (Edition)-[:IN_CENTURY]->(Century {century: year // 100}).
+CREATE CONSTRAINT century_century_unique IF NOT EXISTS
+FOR (c:Century)
+REQUIRE c.century IS UNIQUE;
+
 CREATE INDEX edition_source_label_idx IF NOT EXISTS
 FOR (e:Edition)
 ON (e.source_label);
 
+// Full-text (Lucene) indexes for source-label and segment-text search; see
+// nta/graph/fulltext.py. standard-no-stop-words keeps Old Norse letters
+// (ð, þ, æ, ǫ) unfolded and has no English stop list.
+CREATE FULLTEXT INDEX edition_source_label_fulltext IF NOT EXISTS
+FOR (e:Edition)
+ON EACH [e.source_label]
+OPTIONS {indexConfig: {`fulltext.analyzer`: 'standard-no-stop-words'}};
+
+CREATE FULLTEXT INDEX segment_text_fulltext IF NOT EXISTS
+FOR (s:Segment)
+ON EACH [s.text]
+OPTIONS {indexConfig: {`fulltext.analyzer`: 'standard-no-stop-words'}};
+
 CREATE INDEX aligned_to_method_idx IF NOT EXISTS
 FOR ()-[r:ALIGNED_TO]-()
 ON (r.method);
@@ -158,6 +199,16 @@ CREATE INDEX aligned_to_confidence_idx IF NOT EXISTS
 FOR ()-[r:ALIGNED_TO]-()
 ON (r.confidence);
 
+// Witness collation (nta/align/collate.py): token-level agreement and variant
+// edges, replaced per collation run.
+CREATE INDEX agrees_with_collation_idx IF NOT EXISTS
+FOR ()-[r:AGREES_WITH]-()
+ON (r.collation);
+
+CREATE INDEX variant_of_collation_idx IF NOT EXISTS
+FOR ()-[r:VARIANT_OF]-()
+ON (r.collation);
+
 // REALIZES relationship properties support non-destructive Form->Lemma remapping.
 // Expected properties: is_active, assigned_by, confidence, created_at.
 CREATE INDEX realizes_is_active_idx IF NOT EXISTS
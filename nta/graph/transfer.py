@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import date
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Protocol
+from typing import Sequence
+
+from nta.graph.rows import RowSet
+
+
+EXPORT_FORMAT = "nta-edition-export"
+EXPORT_VERSION = 1
+DEFAULT_PAGE_SIZE = 2000
+DEFAULT_IMPORT_ROWS = 20_000
+
+# Merge key of every label an edition export can contain. Feature is keyed
+# by (key, value); its rows travel embedded in HAS_FEATURE records.
+NODE_KEYS: dict[str, str | tuple[str, str]] = {
+    "Work": "work_id",
+    "Edition": "edition_id",
+    "Century": "century",
+    "Segment": "segment_id",
+    "Token": "token_id",
+    "Form": "form_id",
+    "Lemma": "lemma_id",
+    "MorphAnalysis": "analysis_id",
+    "Analyzer": "analyzer_id",
+    "Feature": ("key", "value"),
+}
+
+# Shared across editions: exported once per file and never re-expanded.
+VOCABULARY_LABELS = frozenset({"Century", "Form", "Lemma", "Analyzer", "Feature"})
+
+
+@dataclass(slots=True, frozen=True)
+class Hop:
+    """
+    Outgoing relationships followed from each page's nodes of ``label``.
+
+    With ``follow=False`` the end node is only referenced (its key), e.g.
+    ``ALIGNED_TO`` targets in other editions; importing MERGEs a key-only
+    node until that edition arrives.
+    """
+
+    label: str
+    types: tuple[str, ...]
+    follow: bool = True
+
+
+# Applied in order to every page of segments; later hops see the nodes that
+# earlier hops reached.
+EXPORT_HOPS = (
+    Hop("Segment", ("HAS_TOKEN",)),
+    Hop("Segment", ("ALIGNED_TO",), follow=False),
+    Hop("Token", ("INSTANCE_OF_FORM", "NORMALIZED_TO", "HAS_ANALYSIS")),
+    Hop("Token", ("AGREES_WITH", "VARIANT_OF"), follow=False),
+    Hop("MorphAnalysis", ("PRODUCED_BY", "HAS_FEATURE", "ANALYZES_AS")),
+    Hop("Form", ("REALIZES", "ORTHOGRAPHIC_VARIANT_OF")),
+)
+# Relationship properties that are part of the edge's identity; import MERGEs
+# on them so parallel edges (one NORMALIZED_TO per policy, one AGREES_WITH
+# per collation) survive a replay.
+REL_KEYS = {
+    "NORMALIZED_TO": ("policy",),
+    "AGREES_WITH": ("collation",),
+    "VARIANT_OF": ("collation",),
+}
+EDITION_HOPS = (
+    Hop("Edition", ("IN_CENTURY",)),
+    Hop("Edition", ("TRANSLATES",), follow=False),
+)
+
+EDITION_QUERY = """
+MATCH (e:Edition {edition_id: $edition_id})
+OPTIONAL MATCH (w:Work)-[r:HAS_EDITION]->(e)
+RETURN properties(e) AS edition, w.work_id AS work_id, properties(w) AS work,
+       properties(r) AS props
+"""
+
+SEGMENTS_PAGE_QUERY = """
+MATCH (:Edition {edition_id: $edition_id})-[r:HAS_SEGMENT]->(s:Segment)
+WHERE s.segment_id > $after
+RETURN s.segment_id AS id, properties(s) AS node, properties(r) AS props
+ORDER BY s.segment_id
+LIMIT $limit
+"""
+
+
+class SubgraphReader(Protocol):
+    def edition(self, edition_id: str) -> list[dict[str, Any]]: ...
+
+    def segments(self, edition_id: str, after: str, limit: int) -> list[dict[str, Any]]: ...
+
+    def expand(self, hop: Hop, keys: Sequence[Any]) -> list[dict[str, Any]]: ...
+
+
+class GraphReader:
+    """``SubgraphReader`` over a Neo4j session."""
+
+    def __init__(self, session: Any) -> None:
+        self._session = session
+
+    def _rows(self, query: str, **params: Any) -> list[dict[str, Any]]:
+        return [record.data() for record in self._session.run(query, **params)]
+
+    def edition(self, edition_id: str) -> list[dict[str, Any]]:
+        return self._rows(EDITION_QUERY, edition_id=edition_id)
+
+    def segments(self, edition_id: str, after: str, limit: int) -> list[dict[str, Any]]:
+        return self._rows(SEGMENTS_PAGE_QUERY, edition_id=edition_id, after=after, limit=limit)
+
+    def expand(self, hop: Hop, keys: Sequence[Any]) -> list[dict[str, Any]]:
+        key = NODE_KEYS[hop.label]
+        query = f"""
+        UNWIND $keys AS key
+        MATCH (a:{hop.label} {{{key}: key}})-[r:{"|".join(hop.types)}]->(b)
+        RETURN key AS start, type(r) AS type, properties(r) AS props,
+               labels(b) AS labels, properties(b) AS node
+        """
+        return self._rows(query, keys=list(keys))
+
+
+@dataclass(slots=True)
+class TransferReport:
+    nodes: dict[str, int] = field(default_factory=dict)
+    relationships: dict[str, int] = field(default_factory=dict)
+
+    def count(self, record: dict[str, Any]) -> None:
+        if "node" in record:
+            self.nodes[record["node"]] = self.nodes.get(record["node"], 0) + 1
+            return
+        self.relationships[record["rel"]] = self.relationships.get(record["rel"], 0) + 1
+        if record.get("end_node") is not None:
+            label = record["end"][0]
+            self.nodes[label] = self.nodes.get(label, 0) + 1
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "nodes": dict(sorted(self.nodes.items())),
+            "relationships": dict(sorted(self.relationships.items())),
+        }
+
+
+def _node(label: str, key: Any, props: dict[str, Any]) -> dict[str, Any]:
+    return {"node": label, "id": key, "props": props}
+
+
+def _rel(
+    rel_type: str, start: tuple[str, Any], end: tuple[str, Any], props: dict[str, Any] | None
+) -> dict[str, Any]:
+    return {"rel": rel_type, "start": list(start), "end": list(end), "props": props or {}}
+
+
+def _end_key(labels: Sequence[str], node: dict[str, Any]) -> tuple[str, Any]:
+    for label in labels:
+        key = NODE_KEYS.get(label)
+        if isinstance(key, tuple):
+            return label, [node.get(part) for part in key]
+        if key is not None:
+            return label, node.get(key)
+    raise ValueError(f"No export key for labels {list(labels)}")
+
+
+def export_records(
+    reader: SubgraphReader, edition_id: str, page_size: int = DEFAULT_PAGE_SIZE
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream an edition's subgraph as node and relationship records.
+
+    Segments are paged by ``segment_id`` (keyset, so every page is an index
+    seek); each page is expanded along ``EXPORT_HOPS`` before the next one is
+    read. Vocabulary nodes (Forms, Lemmas, ...) are emitted the first time
+    they are reached, which keeps one set of their keys in memory.
+    """
+    rows = reader.edition(edition_id)
+    if not rows:
+        raise ValueError(f"Edition not found: {edition_id}")
+    yield _node("Edition", edition_id, rows[0]["edition"])
+    for row in rows:
+        if row.get("work_id") is not None:
+            yield _node("Work", row["work_id"], row["work"])
+            yield _rel(
+                "HAS_EDITION", ("Work", row["work_id"]), ("Edition", edition_id), row["props"]
+            )
+
+    seen: set[tuple[str, Any]] = set()
+    yield from _expand(reader, EDITION_HOPS, {"Edition": [edition_id]}, seen)
+
+    after = ""
+    while True:
+        page = reader.segments(edition_id, after, page_size)
+        if not page:
+            return
+        for row in page:
+            yield _node("Segment", row["id"], row["node"])
+            yield _rel("HAS_SEGMENT", ("Edition", edition_id), ("Segment", row["id"]), row["props"])
+        yield from _expand(reader, EXPORT_HOPS, {"Segment": [row["id"] for row in page]}, seen)
+        after = page[-1]["id"]
+
+
+def _expand(
+    reader: SubgraphReader,
+    hops: Sequence[Hop],
+    frontier: dict[str, list[Any]],
+    seen: set[tuple[str, Any]],
+) -> Iterator[dict[str, Any]]:
+    for hop in hops:
+        keys = frontier.get(hop.label)
+        if not keys:
+            continue
+        for row in reader.expand(hop, keys):
+            label, key = _end_key(row["labels"], row["node"])
+            record = _rel(row["type"], (hop.label, row["start"]), (label, key), row["props"])
+            new = hop.follow
+            if label in VOCABULARY_LABELS:
+                marker = (label, tuple(key) if isinstance(key, list) else key)
+                new = new and marker not in seen
+                if new:
+                    seen.add(marker)
+            if new and isinstance(NODE_KEYS[label], tuple):
+                record["end_node"] = row["node"]
+            elif new:
+                yield _node(label, key, row["node"])
+                frontier.setdefault(label, []).append(key)
+            yield record
+
+
+def _json_default(value: Any) -> Any:
+    # Neo4j temporal values (e.g. MorphAnalysis.created_at) round-trip as
+    # tagged ISO strings.
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Cannot export {type(value).__name__} values")
+
+
+def _json_object(obj: dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if "$datetime" in obj:
+            return datetime.fromisoformat(obj["$datetime"])
+        if "$date" in obj:
+            return date.fromisoformat(obj["$date"])
+    return obj
+
+
+def write_export(
+    path: str | Path,
+    edition_id: str,
+    records: Iterable[dict[str, Any]],
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> TransferReport:
+    """
+    Write ``records`` to gzip JSONL between a header and a summary line.
+
+    The summary doubles as an end marker: an import of a file without it
+    (an interrupted export) fails after replaying what is there.
+    """
+    report = TransferReport()
+    header = {
+        "format": EXPORT_FORMAT,
+        "version": EXPORT_VERSION,
+        "edition_id": edition_id,
+        "page_size": page_size,
+    }
+    with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as fh:
+        fh.write(json.dumps(header) + "\n")
+        for record in records:
+            report.count(record)
+            fh.write(json.dumps(record, ensure_ascii=False, default=_json_default) + "\n")
+        fh.write(json.dumps({"summary": report.summary()}) + "\n")
+    return report
+
+
+def read_export(path: str | Path) -> tuple[dict[str, Any], Iterator[dict[str, Any]]]:
+    """The header and a stream of records; the stream checks the end marker."""
+    fh = gzip.open(path, "rt", encoding="utf-8")
+    header = json.loads(fh.readline() or "{}")
+    if header.get("format") != EXPORT_FORMAT or header.get("version") != EXPORT_VERSION:
+        fh.close()
+        raise ValueError(f"Not an edition export (format {EXPORT_VERSION}): {path}")
+
+    def records() -> Iterator[dict[str, Any]]:
+        with fh:
+            for line in fh:
+                record = json.loads(line, object_hook=_json_object)
+                if "summary" in record:
+                    return
+                yield record
+        raise ValueError(f"Truncated export (no summary line): {path}")
+
+    return header, records()
+
+
+def import_records(
+    repo: Any, records: Iterable[dict[str, Any]], batch_rows: int = DEFAULT_IMPORT_ROWS
+) -> TransferReport:
+    """
+    Replay export records through the bulk MERGE writers.
+
+    Records coalesce into a ``RowSet`` and are written every ``batch_rows``
+    rows as UNWIND statements, the same path ingest uses; Feature links go
+    through ``merge_analysis_features``. Replaying a file twice is a no-op.
+    """
+    report = TransferReport()
+    rows = RowSet()
+    features: list[dict[str, Any]] = []
+
+    def flush() -> None:
+        if rows:
+            repo.write_rows(rows)
+            rows.clear()
+        if features:
+            repo.merge_analysis_features(features)
+            features.clear()
+
+    for record in records:
+        report.count(record)
+        if "node" in record:
+            rows.merge_node(
+                record["node"], NODE_KEYS[record["node"]], record["id"], record["props"]
+            )
+        elif record["end"][0] == "Feature":
+            (_, start), (_, (key, value)) = record["start"], record["end"]
+            features.append(
+                {
+                    "start": start,
+                    "key": key,
+                    "value": value,
+                    "props": record["props"],
+                    "node": record.get("end_node") or {},
+                }
+            )
+        else:
+            (start_label, start), (end_label, end) = record["start"], record["end"]
+            keys = REL_KEYS.get(record["rel"], ())
+            rows.merge_relationship(
+                record["rel"],
+                (start_label, NODE_KEYS[start_label], start),
+                (end_label, NODE_KEYS[end_label], end),
+                record["props"],
+                tuple(name for name in keys if name in record["props"]),
+            )
+        if len(rows) + len(features) >= batch_rows:
+            flush()
+    flush()
+    return report
@@ -5,6 +5,9 @@ from abc import abstractmethod
 from dataclasses import dataclass
 from dataclasses import field
 from datetime import datetime
+from typing import Any
+from typing import Iterable
+from typing import Mapping
 from typing import Protocol
 from typing import Sequence
 from typing import runtime_checkable
@@ -38,6 +41,8 @@ class AdapterEditionMetadata:
     date_end: int | None = None
     normalization_policy: str | None = None
     version: str | None = None
+    id_scheme: str | None = None
+    properties: Mapping[str, Any] = field(default_factory=dict)
 
 
 @dataclass(slots=True, frozen=True)
@@ -48,6 +53,8 @@ class AdapterTokenRecord:
     token_id: str | None = None
     char_start: int | None = None
     char_end: int | None = None
+    form_id: str | None = None
+    normalized_form_id: str | None = None
 
 
 @dataclass(slots=True, frozen=True)
@@ -64,11 +71,16 @@ class AdapterSegmentRecord:
 
 @dataclass(slots=True, frozen=True)
 class AdapterOutput:
-    """Deterministic output emitted by any source adapter."""
+    """
+    Deterministic output emitted by any source adapter.
+
+    ``segments`` may be a lazy, single-pass iterator so large sources stream
+    through the pipeline without being materialized.
+    """
 
     work: AdapterWorkMetadata
     edition: AdapterEditionMetadata
-    segments: Sequence[AdapterSegmentRecord] = field(default_factory=tuple)
+    segments: Iterable[AdapterSegmentRecord] = field(default_factory=tuple)
 
 
 @runtime_checkable
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import fields
+from pathlib import Path
+from typing import Any
+from typing import Iterator
+from typing import Mapping
+
+from nta.ingest.adapters.base import AdapterEditionMetadata
+from nta.ingest.adapters.base import AdapterOutput
+from nta.ingest.adapters.base import AdapterSegmentRecord
+from nta.ingest.adapters.base import AdapterTokenRecord
+from nta.ingest.adapters.base import AdapterWorkMetadata
+from nta.ingest.adapters.base import BaseSourceAdapter
+from nta.ingest.adapters.base import RawSource
+from nta.ingest.text import NORMALIZATION_POLICY_V0
+from nta.ingest.text import normalize_v0
+from nta.ingest.text import tokenize_v0
+
+
+ADAPTER_VERSION = "tei_v1"
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+SEGMENT_TAGS = ("l", "p")
+CONTAINER_TAGS = ("div", "lg")
+EXCLUDED_TAGS = ("note", "del", "fw")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _local(tag: Any) -> str:
+    # Comments/processing instructions have non-string tags.
+    if not isinstance(tag, str):
+        return ""
+    return tag.rsplit("}", 1)[-1]
+
+
+@dataclass(slots=True, frozen=True)
+class TeiHeader:
+    title: str
+    language: str | None = None
+
+
+def read_header(path: str | Path) -> TeiHeader:
+    """Read the ``titleStmt`` title and ``<text xml:lang>``; stops at ``<text>``."""
+    title = None
+    language = None
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        local = _local(elem.tag)
+        if event == "start" and local == "text":
+            language = elem.get(XML_LANG)
+            break
+        if event == "end" and local == "title" and title is None:
+            title = _WHITESPACE.sub(" ", "".join(elem.itertext())).strip() or None
+        if event == "start" and local == "TEI" and language is None:
+            language = elem.get(XML_LANG)
+    return TeiHeader(title=title or Path(path).stem, language=language)
+
+
+@dataclass(slots=True)
+class _Open:
+    local: str
+    n: str | None
+    index: int
+    counters: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class TeiAdapter(BaseSourceAdapter):
+    """
+    Streaming L2 (markup-derived) adapter for TEI XML.
+
+    Parses with ``iterparse`` and detaches every finished element from its
+    parent, so memory depends on nesting depth and the largest single segment,
+    not on document size. Each ``<l>`` or ``<p>`` inside ``<text>`` becomes
+    one segment:
+
+    - ``ref``: the ``div``/``lg``/segment path, each step its ``@n`` or its
+      1-based position among same-named siblings, joined with ``.``
+    - ``verse``: nearest ``<div>`` step, ``strophe``: nearest ``<lg>`` step,
+      ``line``: the ``<l>`` step
+    - ``segment_id``/``token_id``: pipeline ordinal fallbacks in the edition's
+      ``id_scheme`` (stable across markup edits that keep segment order)
+
+    Text inside ``<note>``, ``<del>`` and ``<fw>`` is skipped.
+    """
+
+    work_id: str
+    edition_id: str
+    language: str | None = None
+    source_label: str | None = None
+    date_start: int | None = None
+    date_end: int | None = None
+    segment_tags: tuple[str, ...] = SEGMENT_TAGS
+    id_scheme: str | None = None
+    edition_properties: Mapping[str, Any] = field(default_factory=dict)
+
+    def cache_settings(self) -> dict[str, Any]:
+        """Settings that change this adapter's output (for cache keys)."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def adapt(self, raw_source: RawSource) -> AdapterOutput:
+        path = Path(raw_source.origin)
+        header = read_header(path)
+        return AdapterOutput(
+            work=AdapterWorkMetadata(work_id=self.work_id, title=header.title),
+            edition=AdapterEditionMetadata(
+                edition_id=self.edition_id,
+                title=header.title,
+                source_label=self.source_label,
+                language=self.language or header.language,
+                date_start=self.date_start,
+                date_end=self.date_end,
+                normalization_policy=NORMALIZATION_POLICY_V0,
+                version=ADAPTER_VERSION,
+                id_scheme=self.id_scheme,
+                properties=dict(self.edition_properties),
+            ),
+            segments=self.iter_segments(path),
+        )
+
+    def iter_segments(self, path: str | Path) -> Iterator[AdapterSegmentRecord]:
+        stack: list[_Open] = []
+        elements: list[ET.Element] = []
+        in_text = 0
+        in_segment = 0
+        ordinal = 0
+
+        for event, elem in ET.iterparse(path, events=("start", "end")):
+            local = _local(elem.tag)
+            if event == "start":
+                parent = stack[-1] if stack else None
+                index = 1
+                if parent is not None:
+                    index = parent.counters.get(local, 0) + 1
+                    parent.counters[local] = index
+                stack.append(_Open(local=local, n=elem.get("n"), index=index))
+                elements.append(elem)
+                in_text += local == "text"
+                in_segment += in_text > 0 and local in self.segment_tags
+                continue
+
+            opened = stack.pop()
+            elements.pop()
+            if in_text and local in self.segment_tags:
+                in_segment -= 1
+                if not in_segment:
+                    text = _WHITESPACE.sub(" ", _element_text(elem)).strip()
+                    if text:
+                        ordinal += 1
+                        yield self._segment(ordinal, text, stack, opened)
+            in_text -= local == "text"
+
+            # Children of an open segment are kept until the segment itself ends.
+            if not in_segment:
+                elem.clear()
+                if elements:
+                    elements[-1].remove(elem)
+
+    def _segment(
+        self, ordinal: int, text: str, ancestors: list[_Open], opened: _Open
+    ) -> AdapterSegmentRecord:
+        steps = [entry for entry in ancestors if entry.local in CONTAINER_TAGS]
+        verse = next((_step(e) for e in reversed(steps) if e.local == "div"), None)
+        strophe = next((_step(e) for e in reversed(steps) if e.local == "lg"), None)
+        tokens = [
+            AdapterTokenRecord(surface=surface, normalized=normalize_v0(surface), position=position)
+            for position, surface in enumerate(tokenize_v0(text))
+        ]
+        return AdapterSegmentRecord(
+            text=text,
+            ordinal=ordinal,
+            tokens=tokens,
+            ref=".".join([*(_step(e) for e in steps), _step(opened)]),
+            verse=verse,
+            strophe=strophe,
+            line=_step(opened) if opened.local == "l" else None,
+        )
+
+
+def _step(entry: _Open) -> str:
+    return entry.n if entry.n else str(entry.index)
+
+
+def _element_text(elem: ET.Element) -> str:
+    parts: list[str] = []
+    _collect_text(elem, parts)
+    return "".join(parts)
+
+
+def _collect_text(elem: ET.Element, parts: list[str]) -> None:
+    if _local(elem.tag) not in EXCLUDED_TAGS:
+        if elem.text:
+            parts.append(elem.text)
+        for child in elem:
+            _collect_text(child, parts)
+            if child.tail:
+                parts.append(child.tail)
+    # `<lb/>` marks a line break inside prose; keep words apart.
+    if _local(elem.tag) == "lb":
+        parts.append(" ")
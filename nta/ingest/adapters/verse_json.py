@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import fields
+from pathlib import Path
+from typing import Any
+from typing import Iterator
+from typing import Mapping
+
+from nta.ingest.adapters.base import AdapterEditionMetadata
+from nta.ingest.adapters.base import AdapterOutput
+from nta.ingest.adapters.base import AdapterSegmentRecord
+from nta.ingest.adapters.base import AdapterTokenRecord
+from nta.ingest.adapters.base import AdapterWorkMetadata
+from nta.ingest.adapters.base import BaseSourceAdapter
+from nta.ingest.adapters.base import RawSource
+from nta.ingest.jsonstream import DEFAULT_CHUNK_SIZE
+from nta.ingest.jsonstream import iter_json_path
+from nta.ingest.text import NORMALIZATION_POLICY_V0
+from nta.ingest.text import normalize_v0
+from nta.ingest.text import tokenize_v0
+from nta.model import ids
+
+
+VERSES_PATH = ("poem", "verses")
+ADAPTER_VERSION = "verse_json_v1"
+
+
+@dataclass(slots=True, frozen=True)
+class VerseJsonHeader:
+    title: str
+    cover: tuple[str, ...] = ()
+    writer: tuple[str, ...] = ()
+
+
+def read_header(path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> VerseJsonHeader:
+    """
+    Read ``poem.title`` and ``information.cover/writer`` without loading verses.
+
+    Stops at the first verse when the header precedes ``poem.verses`` (the
+    usual layout); otherwise streams past the verses to find it.
+    """
+    found: dict[tuple[str, ...], Any] = {}
+    with open(path, "r", encoding="utf-8") as fh:
+        for kind, key_path, value in iter_json_path(fh, VERSES_PATH, chunk_size):
+            if kind == "field":
+                found[key_path] = value
+            elif ("poem", "title") in found and ("information",) in found:
+                break
+
+    if ("poem", "title") not in found:
+        raise ValueError(f"{path}: missing poem.title")
+    information = found.get(("information",)) or {}
+    return VerseJsonHeader(
+        title=str(found[("poem", "title")]),
+        cover=tuple(str(x) for x in information.get("cover", ())),
+        writer=tuple(str(x) for x in information.get("writer", ())),
+    )
+
+
+@dataclass(slots=True)
+class VerseJsonAdapter(BaseSourceAdapter):
+    """
+    Streaming adapter for verse/strophe/lines JSON (the Hávamál layout).
+
+    ``adapt`` reads only the header eagerly; segments are parsed verse by
+    verse from disk as the pipeline consumes them, one segment per line.
+    Under ID scheme v1 (the default), IDs follow the established verse layout:
+
+    - segment_id: <edition_id>:v<verse>:s<strophe>:l<line_index>
+    - token_id: <segment_id>:t<token_index>
+    - form_id: <form_prefix>:<surface> when ``form_prefix`` is set
+
+    Other schemes build all three through ``ids.id_scheme``, with
+    ``form_prefix`` as the Form language, so the keys match what plaintext
+    and TEI ingest write under the same scheme.
+    """
+
+    work_id: str
+    edition_id: str
+    language: str | None = None
+    source_label: str | None = None
+    date_start: int | None = None
+    date_end: int | None = None
+    form_prefix: str | None = None
+    edition_properties: Mapping[str, Any] = field(default_factory=dict)
+    id_scheme: str | None = None
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    def cache_settings(self) -> dict[str, Any]:
+        """Settings that change this adapter's output (for cache keys)."""
+        # chunk_size only affects parsing speed, not the emitted records.
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "chunk_size"}
+
+    def adapt(self, raw_source: RawSource) -> AdapterOutput:
+        path = Path(raw_source.origin)
+        header = read_header(path, self.chunk_size)
+        return AdapterOutput(
+            work=AdapterWorkMetadata(work_id=self.work_id, title=header.title),
+            edition=AdapterEditionMetadata(
+                edition_id=self.edition_id,
+                title=header.title,
+                source_label=self.source_label,
+                language=self.language,
+                date_start=self.date_start,
+                date_end=self.date_end,
+                normalization_policy=NORMALIZATION_POLICY_V0,
+                version=ADAPTER_VERSION,
+                id_scheme=self.id_scheme,
+                properties={
+                    "cover": list(header.cover),
+                    "writer": list(header.writer),
+                    **self.edition_properties,
+                },
+            ),
+            segments=self.iter_segments(path),
+        )
+
+    def iter_segments(self, path: str | Path) -> Iterator[AdapterSegmentRecord]:
+        ordinal = 0
+        with open(path, "r", encoding="utf-8") as fh:
+            for kind, _, verse in iter_json_path(fh, VERSES_PATH, self.chunk_size):
+                if kind != "item":
+                    continue
+                verse_ref = str(verse["verse"])
+                for strophe in verse["strophes"]:
+                    strophe_ref = str(strophe["strophe"])
+                    for line_index, line in enumerate(strophe["lines"]):
+                        ordinal += 1
+                        yield self._segment(ordinal, verse_ref, strophe_ref, line_index, str(line))
+
+    def _segment(
+        self, ordinal: int, verse: str, strophe: str, line_index: int, text: str
+    ) -> AdapterSegmentRecord:
+        scheme = ids.id_scheme(self.id_scheme)
+        if scheme.name == "v1":
+            segment_id = f"{self.edition_id}:v{verse}:s{strophe}:l{line_index}"
+        else:
+            segment_id = scheme.segment_id(self.edition_id, ordinal)
+        tokens = []
+        for position, surface in enumerate(tokenize_v0(text)):
+            normalized = normalize_v0(surface)
+            if scheme.name == "v1":
+                token_id = f"{segment_id}:t{position}"
+            else:
+                token_id = scheme.token_id(segment_id, position)
+            tokens.append(
+                AdapterTokenRecord(
+                    surface=surface,
+                    normalized=normalized,
+                    position=position,
+                    token_id=token_id,
+                    form_id=self._form_id(scheme, surface),
+                    normalized_form_id=self._form_id(scheme, normalized),
+                )
+            )
+        return AdapterSegmentRecord(
+            text=text,
+            ordinal=ordinal,
+            tokens=tokens,
+            ref=f"{verse}{strophe}{line_index}",
+            segment_id=segment_id,
+            verse=verse,
+            strophe=strophe,
+            line=str(line_index),
+        )
+
+    def _form_id(self, scheme: ids.IdScheme, orthography: str) -> str | None:
+        if self.form_prefix is None:
+            return None
+        if scheme.name == "v1":
+            return f"{self.form_prefix}:{orthography}"
+        return scheme.form_id(self.form_prefix, orthography)
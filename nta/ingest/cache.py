@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import fields
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+
+from nta.ingest.adapters.base import AdapterEditionMetadata
+from nta.ingest.adapters.base import AdapterOutput
+from nta.ingest.adapters.base import AdapterSegmentRecord
+from nta.ingest.adapters.base import AdapterTokenRecord
+from nta.ingest.adapters.base import AdapterWorkMetadata
+from nta.ingest.adapters.base import RawSource
+from nta.ingest.adapters.base import SourceAdapter
+
+
+DEFAULT_CACHE_DIR = Path(".nta") / "cache"
+CACHE_FORMAT = 1
+HASH_BLOCK_SIZE = 1 << 20
+
+# Token fields that usually repeat another value are stored relative to it:
+# field -> (base field, base is a prefix?); "segment_id" refers to the segment.
+_TOKEN_RELATIONS = {
+    "normalized": ("surface", True),
+    "token_id": ("segment_id", True),
+    "form_id": ("surface", False),
+    "normalized_form_id": ("normalized", False),
+}
+_ELIDED = "\x00"
+
+_SEGMENT_FIELDS = tuple(f.name for f in fields(AdapterSegmentRecord) if f.name != "tokens")
+_TOKEN_FIELDS = tuple(f.name for f in fields(AdapterTokenRecord))
+_WORK_FIELDS = tuple(f.name for f in fields(AdapterWorkMetadata))
+_EDITION_FIELDS = tuple(f.name for f in fields(AdapterEditionMetadata))
+_RELATION_INDEXES = tuple(
+    (
+        _TOKEN_FIELDS.index(name),
+        None if base == "segment_id" else _TOKEN_FIELDS.index(base),
+        is_prefix,
+    )
+    for name, (base, is_prefix) in _TOKEN_RELATIONS.items()
+)
+
+
+def file_digest(path: str | Path) -> str:
+    """sha256 of a file's bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def output_key(
+    content_digest: str,
+    adapter: str,
+    adapter_version: str,
+    normalization_policy: str | None,
+    settings: Mapping[str, Any] | None = None,
+) -> str:
+    """Cache key for one adapter run over one exact input."""
+    payload = json.dumps(
+        {
+            "format": CACHE_FORMAT,
+            "content": content_digest,
+            "adapter": adapter,
+            "adapter_version": adapter_version,
+            "normalization_policy": normalization_policy,
+            "settings": dict(settings or {}),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SourceCache:
+    """
+    Local content-addressed cache for raw sources and adapter output.
+
+    - ``raw/``: source bytes stored under their sha256, plus an origin index
+      (URL or path -> digest, retrieval time) so acquisitions are not repeated.
+    - ``outputs/``: serialized ``AdapterOutput`` keyed by ``output_key``
+      (content digest + adapter name/version + normalization policy +
+      settings). Entries are a gzip stream of pickled field tuples, written
+      incrementally and published atomically only when complete.
+
+    The cache is local and trusted (entries are unpickled); share it only
+    between your own runs.
+    """
+
+    def __init__(self, directory: str | Path = DEFAULT_CACHE_DIR) -> None:
+        self.directory = Path(directory)
+
+    # Raw sources ---------------------------------------------------------
+
+    def put_raw(self, data: bytes, origin: str | None = None, kind: str = "raw") -> RawSource:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._raw_path(digest)
+        if not path.exists():
+            _atomic_write_bytes(path, data)
+        retrieved_at = datetime.now(timezone.utc)
+        if origin is not None:
+            entry = {"digest": digest, "kind": kind, "retrieved_at": retrieved_at.isoformat()}
+            _atomic_write_bytes(
+                self._origin_path(origin),
+                json.dumps({"origin": origin, **entry}, ensure_ascii=False).encode("utf-8"),
+            )
+        return RawSource(
+            source_id=digest, kind=kind, origin=origin or str(path), retrieved_at=retrieved_at
+        )
+
+    def get_raw(self, digest: str) -> bytes | None:
+        path = self._raw_path(digest)
+        return path.read_bytes() if path.exists() else None
+
+    def fetch(
+        self,
+        origin: str,
+        acquire: Callable[[], bytes],
+        kind: str = "raw",
+        refresh: bool = False,
+    ) -> tuple[bytes, RawSource]:
+        """Return cached bytes for ``origin``, calling ``acquire`` only on a miss."""
+        index_path = self._origin_path(origin)
+        if not refresh and index_path.exists():
+            entry = json.loads(index_path.read_text(encoding="utf-8"))
+            data = self.get_raw(entry["digest"])
+            if data is not None:
+                return data, RawSource(
+                    source_id=entry["digest"],
+                    kind=entry["kind"],
+                    origin=origin,
+                    retrieved_at=datetime.fromisoformat(entry["retrieved_at"]),
+                )
+        data = acquire()
+        return data, self.put_raw(data, origin=origin, kind=kind)
+
+    # Adapter output ------------------------------------------------------
+
+    def load_output(self, key: str) -> AdapterOutput | None:
+        """Open a cached output; segments are streamed lazily from disk."""
+        path = self._output_path(key)
+        if not path.exists():
+            return None
+        with gzip.open(path, "rb") as fh:
+            header = pickle.load(fh)
+        schema = (CACHE_FORMAT, _SEGMENT_FIELDS, _TOKEN_FIELDS, _WORK_FIELDS)
+        if header[:4] != schema or header[5] != _EDITION_FIELDS:
+            # Written by an older record layout; treat as a miss.
+            return None
+        work = AdapterWorkMetadata(*header[4])
+        edition = AdapterEditionMetadata(*header[6])
+        return AdapterOutput(work=work, edition=edition, segments=_read_segments(path))
+
+    def store_output(self, key: str, output: AdapterOutput) -> AdapterOutput:
+        """
+        Return ``output`` with its segments written through to the cache.
+
+        The entry becomes visible only once the segment stream is fully
+        consumed; an abandoned or failed run leaves no partial entry.
+        """
+        header = (
+            CACHE_FORMAT,
+            _SEGMENT_FIELDS,
+            _TOKEN_FIELDS,
+            _WORK_FIELDS,
+            _values(output.work, _WORK_FIELDS),
+            _EDITION_FIELDS,
+            _values(output.edition, _EDITION_FIELDS, properties=dict(output.edition.properties)),
+        )
+        return AdapterOutput(
+            work=output.work,
+            edition=output.edition,
+            segments=self._write_segments(self._output_path(key), header, output.segments),
+        )
+
+    def _write_segments(
+        self, path: Path, header: tuple[Any, ...], segments: Iterable[AdapterSegmentRecord]
+    ) -> Iterator[AdapterSegmentRecord]:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        complete = False
+        try:
+            with gzip.open(tmp_path, "wb", compresslevel=6) as fh:
+                pickle.dump(header, fh, protocol=pickle.HIGHEST_PROTOCOL)
+                for segment in segments:
+                    pickle.dump(_segment_tuple(segment), fh, protocol=pickle.HIGHEST_PROTOCOL)
+                    yield segment
+            os.replace(tmp_path, path)
+            complete = True
+        finally:
+            if not complete:
+                with contextlib.suppress(FileNotFoundError):
+                    tmp_path.unlink()
+
+    def _raw_path(self, digest: str) -> Path:
+        return self.directory / "raw" / digest[:2] / digest[2:]
+
+    def _origin_path(self, origin: str) -> Path:
+        digest = hashlib.sha256(origin.encode("utf-8")).hexdigest()
+        return self.directory / "origins" / f"{digest}.json"
+
+    def _output_path(self, key: str) -> Path:
+        return self.directory / "outputs" / key[:2] / f"{key[2:]}.nac"
+
+
+def cached_adapt(
+    adapter: SourceAdapter,
+    raw_source: RawSource,
+    cache: SourceCache | None,
+    adapter_name: str,
+    adapter_version: str,
+    normalization_policy: str | None,
+    settings: Mapping[str, Any] | None = None,
+) -> AdapterOutput:
+    """
+    ``adapter.adapt(raw_source)`` with a content-addressed cache in front.
+
+    ``raw_source.origin`` must be a local file path; its bytes are hashed, so
+    a renamed but unchanged file still hits. With ``cache=None`` this is a
+    plain ``adapt`` call.
+    """
+    if cache is None:
+        return adapter.adapt(raw_source)
+    key = output_key(
+        file_digest(raw_source.origin),
+        adapter_name,
+        adapter_version,
+        normalization_policy,
+        settings,
+    )
+    cached = cache.load_output(key)
+    if cached is not None:
+        return cached
+    return cache.store_output(key, adapter.adapt(raw_source))
+
+
+def _values(obj: Any, names: tuple[str, ...], **overrides: Any) -> tuple[Any, ...]:
+    return tuple(overrides[name] if name in overrides else getattr(obj, name) for name in names)
+
+
+def _elide(value: Any, base: Any, is_prefix: bool) -> Any:
+    if not isinstance(value, str):
+        return value
+    if value.startswith(_ELIDED):
+        return (value,)
+    if isinstance(base, str) and (value.startswith(base) if is_prefix else value.endswith(base)):
+        rest = value[len(base) :] if is_prefix else value[: len(value) - len(base)]
+        return _ELIDED + rest
+    return value
+
+
+def _token_values(token: AdapterTokenRecord, segment_id: str | None) -> tuple[Any, ...]:
+    values = []
+    for name in _TOKEN_FIELDS:
+        value = getattr(token, name)
+        relation = _TOKEN_RELATIONS.get(name)
+        if relation is not None:
+            base_name, is_prefix = relation
+            base = segment_id if base_name == "segment_id" else getattr(token, base_name)
+            value = _elide(value, base, is_prefix)
+        values.append(value)
+    return tuple(values)
+
+
+def _token_record(values: tuple[Any, ...], segment_id: str | None) -> AdapterTokenRecord:
+    restored = list(values)
+    # Relations are listed in field order, so every base is already restored.
+    # This is the hot path of a cache hit, hence _restore inlined.
+    for index, base_index, is_prefix in _RELATION_INDEXES:
+        value = restored[index]
+        if value.__class__ is str and value[:1] == _ELIDED:
+            base = segment_id if base_index is None else restored[base_index]
+            restored[index] = base + value[1:] if is_prefix else value[1:] + base
+        elif value.__class__ is tuple:
+            restored[index] = value[0]
+    return AdapterTokenRecord(*restored)
+
+
+def _segment_tuple(segment: AdapterSegmentRecord) -> tuple[Any, ...]:
+    tokens = tuple(_token_values(token, segment.segment_id) for token in segment.tokens)
+    return (*_values(segment, _SEGMENT_FIELDS), tokens)
+
+
+def _read_segments(path: Path) -> Iterator[AdapterSegmentRecord]:
+    with gzip.open(path, "rb") as fh:
+        pickle.load(fh)  # header
+        while True:
+            try:
+                record = pickle.load(fh)
+            except EOFError:
+                return
+            values = dict(zip(_SEGMENT_FIELDS, record[:-1]))
+            segment_id = values["segment_id"]
+            tokens = [_token_record(token, segment_id) for token in record[-1]]
+            yield AdapterSegmentRecord(tokens=tokens, **values)
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+
+
+DEFAULT_CHECKPOINT_DIR = Path(".nta") / "checkpoints"
+DEFAULT_CHECKPOINT_EVERY = 500
+
+
+@dataclass(slots=True, frozen=True)
+class IngestCheckpoint:
+    """Last committed segment ordinal for one edition + adapter configuration."""
+
+    edition_id: str
+    config_hash: str
+    last_ordinal: int
+    segments: int = 0
+    tokens: int = 0
+    completed: bool = False
+    updated_at: str | None = None
+
+
+def config_hash(**settings: Any) -> str:
+    """Stable hash over adapter settings; any change invalidates old checkpoints."""
+    payload = json.dumps(settings, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def source_fingerprint(path: str | Path) -> dict[str, Any]:
+    """Cheap identity of an input file (name, size, mtime) for config hashing."""
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    return {"path": str(resolved), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class CheckpointJournal:
+    """
+    Local progress journal, one JSON file per edition.
+
+    Each file maps adapter config hashes to the last committed checkpoint.
+    Writes are atomic (write temp file + rename), so a crash never leaves a
+    half-written journal behind.
+    """
+
+    def __init__(self, directory: str | Path = DEFAULT_CHECKPOINT_DIR) -> None:
+        self._directory = Path(directory)
+
+    def load(self, edition_id: str, config_hash: str) -> IngestCheckpoint | None:
+        entry = self._read(edition_id).get(config_hash)
+        if entry is None:
+            return None
+        return IngestCheckpoint(**entry)
+
+    def record(self, checkpoint: IngestCheckpoint) -> IngestCheckpoint:
+        stamped = IngestCheckpoint(
+            edition_id=checkpoint.edition_id,
+            config_hash=checkpoint.config_hash,
+            last_ordinal=checkpoint.last_ordinal,
+            segments=checkpoint.segments,
+            tokens=checkpoint.tokens,
+            completed=checkpoint.completed,
+            updated_at=datetime.now(timezone.utc).isoformat(),
+        )
+        entries = self._read(checkpoint.edition_id)
+        entries[checkpoint.config_hash] = asdict(stamped)
+        self._write(checkpoint.edition_id, entries)
+        return stamped
+
+    def clear(self, edition_id: str, config_hash: str) -> None:
+        entries = self._read(edition_id)
+        if entries.pop(config_hash, None) is not None:
+            self._write(edition_id, entries)
+
+    def _path(self, edition_id: str) -> Path:
+        digest = hashlib.sha1(edition_id.encode("utf-8")).hexdigest()[:16]
+        return self._directory / f"{digest}.json"
+
+    def _read(self, edition_id: str) -> dict[str, dict[str, Any]]:
+        path = self._path(edition_id)
+        if not path.exists():
+            return {}
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return dict(payload.get("checkpoints", {}))
+
+    def _write(self, edition_id: str, entries: dict[str, dict[str, Any]]) -> None:
+        path = self._path(edition_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+        payload = {"edition_id": edition_id, "checkpoints": entries}
+        tmp_path.write_text(
+            json.dumps(payload, ensure_ascii=False, indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+
+
+class SegmentCheckpointer:
+    """
+    Tracks segment progress for one ingest run and records batch checkpoints.
+
+    Segment ordinals must be emitted in increasing order. With ``resume=True``
+    ingest skips every ordinal up to and including the last committed one.
+    """
+
+    def __init__(
+        self,
+        journal: CheckpointJournal,
+        edition_id: str,
+        config_hash: str,
+        every: int = DEFAULT_CHECKPOINT_EVERY,
+        resume: bool = False,
+    ) -> None:
+        if every < 1:
+            raise ValueError("Checkpoint interval must be >= 1.")
+        self._journal = journal
+        self._edition_id = edition_id
+        self._config_hash = config_hash
+        self._every = every
+
+        previous = journal.load(edition_id, config_hash) if resume else None
+        self.resumed_from = previous
+        self.start_after = previous.last_ordinal if previous is not None else 0
+        self._last_ordinal = self.start_after
+        self._segments = previous.segments if previous is not None else 0
+        self._tokens = previous.tokens if previous is not None else 0
+        self._pending = 0
+
+    @property
+    def every(self) -> int:
+        return self._every
+
+    @property
+    def segments(self) -> int:
+        return self._segments
+
+    @property
+    def tokens(self) -> int:
+        return self._tokens
+
+    def should_skip(self, ordinal: int) -> bool:
+        return ordinal <= self.start_after
+
+    def segment_done(self, ordinal: int, token_count: int) -> bool:
+        """Register a written segment; return True when a batch boundary is reached."""
+        self._last_ordinal = ordinal
+        self._segments += 1
+        self._tokens += token_count
+        self._pending += 1
+        return self._pending >= self._every
+
+    def batch_done(self, last_ordinal: int, segments: int, tokens: int) -> None:
+        """Register an already committed batch of segments and record it."""
+        self._last_ordinal = last_ordinal
+        self._segments += segments
+        self._tokens += tokens
+        self.commit()
+
+    def commit(self) -> None:
+        """Record progress; call only after the batch's writes are committed."""
+        self._pending = 0
+        self._journal.record(self._checkpoint(completed=False))
+
+    def finish(self) -> None:
+        self._pending = 0
+        self._journal.record(self._checkpoint(completed=True))
+
+    def _checkpoint(self, completed: bool) -> IngestCheckpoint:
+        return IngestCheckpoint(
+            edition_id=self._edition_id,
+            config_hash=self._config_hash,
+            last_ordinal=self._last_ordinal,
+            segments=self._segments,
+            tokens=self._tokens,
+            completed=completed,
+        )
@@ -0,0 +1,525 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from multiprocessing import Manager
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterator
+from typing import Sequence
+
+from nta.ingest.cache import DEFAULT_CACHE_DIR
+from nta.ingest.cache import SourceCache
+from nta.ingest.checkpoint import DEFAULT_CHECKPOINT_DIR
+from nta.ingest.checkpoint import DEFAULT_CHECKPOINT_EVERY
+from nta.ingest.checkpoint import CheckpointJournal
+from nta.ingest.checkpoint import SegmentCheckpointer
+from nta.ingest.segment import SEGMENT_MODES
+from nta.model import ids
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+    from nta.graph.repo import Neo4jRepository
+    from nta.ingest.pipeline import PlannedBatch
+    from nta.ingest.plaintext import PlaintextOptions
+    from nta.ingest.tei import TeiOptions
+
+
+SOURCE_KINDS = ("plaintext", "havamal_json", "tei")
+DISCOVERY_SUFFIXES = {".txt": "plaintext", ".json": "havamal_json", ".xml": "tei"}
+DEFAULT_QUEUE_SIZE = 8
+WRITE_RETRIES = 3
+
+
+@dataclass(slots=True, frozen=True)
+class CorpusSource:
+    """One input file of a corpus ingest plus its adapter options."""
+
+    kind: str
+    path: str
+    work_id: str | None = None
+    edition_id: str | None = None
+    source_label: str | None = None
+    language_stage: str | None = None
+    segment: str = "line"
+    date_start: int | None = None
+    date_end: int | None = None
+    id_scheme: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.kind not in SOURCE_KINDS:
+            raise ValueError(f"Unsupported source kind: {self.kind}")
+        if self.segment not in SEGMENT_MODES:
+            raise ValueError(f"Unsupported segment mode: {self.segment}")
+
+
+@dataclass(slots=True)
+class SourceStatus:
+    source: CorpusSource
+    edition_id: str
+    segments: int = 0
+    tokens: int = 0
+    status: str = "pending"
+    seconds: float = 0.0
+    error: str | None = None
+    started: float = field(default=0.0, repr=False)
+
+
+def load_manifest(path: str | Path, defaults: dict[str, Any] | None = None) -> list[CorpusSource]:
+    """
+    Read sources from a JSON array or JSONL manifest.
+
+    Each entry needs ``path``; ``kind`` defaults from the file suffix. Relative
+    paths resolve against the manifest's directory.
+    """
+    manifest_path = Path(path)
+    text = manifest_path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        entries = json.loads(text)
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    sources = []
+    for entry in entries:
+        source_path = Path(entry["path"])
+        if not source_path.is_absolute():
+            source_path = manifest_path.parent / source_path
+        merged = {**(defaults or {}), **entry, "path": str(source_path)}
+        merged.setdefault("kind", DISCOVERY_SUFFIXES.get(source_path.suffix.lower()))
+        sources.append(_with_defaults(CorpusSource(**merged)))
+    return sources
+
+
+def discover_sources(
+    directory: str | Path, defaults: dict[str, Any] | None = None
+) -> list[CorpusSource]:
+    """Collect ``*.txt`` (plaintext), ``*.json`` (Hávamál-style) and ``*.xml`` (TEI) files."""
+    sources = []
+    for path in sorted(Path(directory).rglob("*")):
+        kind = DISCOVERY_SUFFIXES.get(path.suffix.lower())
+        if kind is None or not path.is_file():
+            continue
+        merged = {**(defaults or {}), "kind": kind, "path": str(path)}
+        sources.append(_with_defaults(CorpusSource(**merged)))
+    return sources
+
+
+def _with_defaults(source: CorpusSource) -> CorpusSource:
+    if source.kind == "plaintext" and source.language_stage is None:
+        raise ValueError(f"{source.path}: plaintext sources need a language_stage")
+    work_id = source.work_id or ids.work_id(Path(source.path).stem)
+    stage = f"{source.language_stage}:" if source.language_stage else ""
+    return CorpusSource(
+        kind=source.kind,
+        path=source.path,
+        work_id=work_id,
+        edition_id=source.edition_id or f"{work_id}:{stage}{source.kind}",
+        source_label=source.source_label or Path(source.path).name,
+        language_stage=source.language_stage,
+        segment=source.segment,
+        date_start=source.date_start,
+        date_end=source.date_end,
+        id_scheme=source.id_scheme,
+    )
+
+
+def _plaintext_options(source: CorpusSource) -> PlaintextOptions:
+    from nta.ingest.plaintext import PlaintextOptions
+
+    return PlaintextOptions(
+        path=source.path,
+        work_id=source.work_id,
+        edition_id=source.edition_id,
+        source_label=source.source_label,
+        language_stage=source.language_stage,
+        segment=source.segment,
+        date_start=source.date_start,
+        date_end=source.date_end,
+        id_scheme=source.id_scheme,
+    )
+
+
+def _tei_options(source: CorpusSource) -> TeiOptions:
+    from nta.ingest.tei import TeiOptions
+
+    return TeiOptions(
+        path=source.path,
+        work_id=source.work_id,
+        edition_id=source.edition_id,
+        source_label=source.source_label,
+        language_stage=source.language_stage,
+        date_start=source.date_start,
+        date_end=source.date_end,
+        id_scheme=source.id_scheme,
+    )
+
+
+def _havamal_settings(source: CorpusSource) -> dict[str, Any]:
+    """``havamal_adapter`` overrides: per-source IDs, so JSON files never share an Edition."""
+    settings: dict[str, Any] = {
+        "work_id": source.work_id,
+        "edition_id": source.edition_id,
+        "source_label": source.source_label,
+        "id_scheme": source.id_scheme,
+    }
+    if source.date_start is not None or source.date_end is not None:
+        settings["date_start"] = source.date_start
+        settings["date_end"] = source.date_end
+    return settings
+
+
+def source_config_hash(source: CorpusSource) -> str:
+    if source.kind == "plaintext":
+        from nta.ingest.plaintext import adapter_config_hash
+
+        return adapter_config_hash(_plaintext_options(source))
+    if source.kind == "tei":
+        from nta.ingest.tei import adapter_config_hash
+
+        return adapter_config_hash(_tei_options(source))
+    from nta.ingest.havamal import adapter_config_hash
+
+    return adapter_config_hash(Path(source.path), **_havamal_settings(source))
+
+
+def plan_source(
+    source: CorpusSource,
+    batch_segments: int,
+    start_after: int = 0,
+    cache: SourceCache | None = None,
+) -> Iterator[PlannedBatch]:
+    """Dispatch to the planner for ``source.kind``; plaintext does not use ``cache``."""
+    if source.kind == "plaintext":
+        from nta.ingest.plaintext import plan_plaintext
+
+        return plan_plaintext(_plaintext_options(source), batch_segments, start_after)
+    if source.kind == "tei":
+        from nta.ingest.tei import plan_tei
+
+        return plan_tei(_tei_options(source), batch_segments, start_after, cache)
+    from nta.ingest.havamal import plan_havamal
+
+    return plan_havamal(
+        Path(source.path), batch_segments, start_after, cache, **_havamal_settings(source)
+    )
+
+
+def _plan_worker(
+    index: int,
+    source: CorpusSource,
+    batch_segments: int,
+    start_after: int,
+    cache: SourceCache | None,
+    out: Any,
+) -> None:
+    # Runs in a pool process. `out.put` blocks when the writer falls behind,
+    # which is the backpressure that keeps planned rows bounded in memory.
+    from nta.ingest.pipeline import with_sketches
+
+    try:
+        for batch in with_sketches(plan_source(source, batch_segments, start_after, cache)):
+            out.put(("batch", index, batch))
+    except Exception as exc:
+        out.put(("failed", index, f"{type(exc).__name__}: {exc}"))
+        return
+    out.put(("done", index, None))
+
+
+def _write_with_retry(repo: Neo4jRepository, batch: PlannedBatch) -> None:
+    from neo4j.exceptions import TransientError
+
+    from nta.ingest.pipeline import write_batch
+
+    for attempt in range(WRITE_RETRIES):
+        try:
+            write_batch(repo, batch)
+            return
+        except TransientError:
+            if attempt == WRITE_RETRIES - 1:
+                raise
+            time.sleep(0.5 * 2**attempt)
+
+
+def _writer_loop(
+    inbox: Any,
+    repo: Neo4jRepository,
+    statuses: dict[int, SourceStatus],
+    checkpointers: dict[int, SegmentCheckpointer],
+    expected: int,
+    report: Any,
+) -> None:
+    finished = 0
+    while finished < expected:
+        kind, index, payload = inbox.get()
+        status = statuses[index]
+        if kind == "batch":
+            # Keep draining after a failure so the planner never blocks forever.
+            if status.status == "failed":
+                continue
+            status.status = "running"
+            try:
+                _write_with_retry(repo, payload)
+            except Exception as exc:
+                status.status = "failed"
+                status.error = f"{type(exc).__name__}: {exc}"
+                continue
+            status.segments += payload.segments
+            status.tokens += payload.tokens
+            checkpointer = checkpointers.get(index)
+            if checkpointer is not None and payload.segments:
+                checkpointer.batch_done(payload.last_ordinal, payload.segments, payload.tokens)
+            continue
+
+        finished += 1
+        if kind == "failed":
+            status.status = "failed"
+            status.error = payload
+        elif status.status != "failed":
+            status.status = "ok"
+            checkpointer = checkpointers.get(index)
+            if checkpointer is not None:
+                checkpointer.finish()
+        status.seconds = time.monotonic() - status.started
+        report(status)
+
+
+def ingest_corpus(
+    sources: Sequence[CorpusSource],
+    repo: Neo4jRepository,
+    workers: int | None = None,
+    writers: int = 1,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    batch_segments: int = DEFAULT_CHECKPOINT_EVERY,
+    journal: CheckpointJournal | None = None,
+    resume: bool = False,
+    report: Any = None,
+    cache: SourceCache | None = None,
+) -> list[SourceStatus]:
+    """
+    Plan sources in a process pool and write them through bounded queues.
+
+    Source ``i`` is always written by writer ``i % writers``, so one source's
+    batches are committed in order and its checkpoints stay valid. Each writer
+    inbox holds at most ``queue_size`` planned batches. Returns one status per
+    source, in input order.
+    """
+    if writers < 1:
+        raise ValueError("writers must be >= 1")
+    workers = workers or os.cpu_count() or 1
+    report = report or (lambda status: None)
+
+    statuses: dict[int, SourceStatus] = {}
+    checkpointers: dict[int, SegmentCheckpointer] = {}
+    for index, source in enumerate(sources):
+        status = SourceStatus(source=source, edition_id=source.edition_id)
+        statuses[index] = status
+        if journal is not None:
+            checkpointers[index] = SegmentCheckpointer(
+                journal=journal,
+                edition_id=status.edition_id,
+                config_hash=source_config_hash(source),
+                every=batch_segments,
+                resume=resume,
+            )
+
+    with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as pool:
+        inboxes = [manager.Queue(maxsize=queue_size) for _ in range(writers)]
+        threads = []
+        for writer_index, inbox in enumerate(inboxes):
+            assigned = sum(1 for index in statuses if index % writers == writer_index)
+            thread = threading.Thread(
+                target=_writer_loop,
+                args=(inbox, repo, statuses, checkpointers, assigned, report),
+                name=f"nta-corpus-writer-{writer_index}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+
+        futures = []
+        for index, source in enumerate(sources):
+            checkpointer = checkpointers.get(index)
+            start_after = checkpointer.start_after if checkpointer is not None else 0
+            statuses[index].started = time.monotonic()
+            futures.append(
+                pool.submit(
+                    _plan_worker,
+                    index,
+                    source,
+                    batch_segments,
+                    start_after,
+                    cache,
+                    inboxes[index % writers],
+                )
+            )
+
+        for index, future in enumerate(futures):
+            exc = future.exception()
+            if exc is not None:
+                # The worker died before it could report; unblock its writer.
+                inboxes[index % writers].put(("failed", index, f"{type(exc).__name__}: {exc}"))
+        for thread in threads:
+            thread.join()
+
+    return [statuses[index] for index in range(len(sources))]
+
+
+def format_status_table(statuses: Sequence[SourceStatus]) -> str:
+    header = ("file", "edition", "segments", "tokens", "status", "seconds")
+    rows = [
+        (
+            Path(status.source.path).name,
+            status.edition_id,
+            str(status.segments),
+            str(status.tokens),
+            status.status,
+            f"{status.seconds:.1f}",
+        )
+        for status in statuses
+    ]
+    failed = sum(1 for status in statuses if status.status != "ok")
+    rows.append(
+        (
+            f"TOTAL ({len(statuses)} files, {failed} failed)",
+            "",
+            str(sum(status.segments for status in statuses)),
+            str(sum(status.tokens for status in statuses)),
+            "",
+            "",
+        )
+    )
+    widths = [max(len(row[col]) for row in [header, *rows]) for col in range(len(header))]
+    lines = [
+        "  ".join(value.ljust(width) for value, width in zip(row, widths))
+        for row in [header, *rows]
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(line.rstrip() for line in lines)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--dir", help="Directory to scan for *.txt, *.json and *.xml sources.")
+    target.add_argument("--manifest", help="JSON array or JSONL manifest of sources.")
+    parser.add_argument(
+        "--language-stage",
+        default=None,
+        help="Default language/stage code for plaintext sources.",
+    )
+    parser.add_argument(
+        "--segment",
+        choices=SEGMENT_MODES,
+        default="line",
+        help="Default plaintext segmentation mode.",
+    )
+    parser.add_argument(
+        "--id-scheme",
+        choices=ids.ID_SCHEMES,
+        default=None,
+        help="Default ID scheme for all sources (v1 keeps the Hávamál JSON verse IDs).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Planner processes (default: CPU count).",
+    )
+    parser.add_argument("--writers", type=int, default=1, help="Concurrent writer threads.")
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=f"Planned batches buffered per writer (default: {DEFAULT_QUEUE_SIZE}).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue each source after its last committed checkpoint.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=DEFAULT_CHECKPOINT_EVERY,
+        help=f"Segments per write batch and checkpoint (default: {DEFAULT_CHECKPOINT_EVERY}).",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=str(DEFAULT_CHECKPOINT_DIR),
+        help=f"Progress journal directory (default: {DEFAULT_CHECKPOINT_DIR}).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Adapter output cache directory (default: {DEFAULT_CACHE_DIR}).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse sources even if cached adapter output exists.",
+    )
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+    from nta.graph.repo import Neo4jRepository
+    from nta.ingest.pipeline import resolve_id_scheme
+
+    defaults: dict[str, Any] = {"segment": args.segment}
+    if args.id_scheme:
+        defaults["id_scheme"] = args.id_scheme
+    if args.language_stage:
+        defaults["language_stage"] = args.language_stage
+    if args.manifest:
+        sources = load_manifest(args.manifest, defaults)
+    else:
+        sources = discover_sources(args.dir, defaults)
+    if not sources:
+        print("No sources found.")
+        return
+
+    def report(status: SourceStatus) -> None:
+        detail = f" ({status.error})" if status.status == "failed" else ""
+        print(
+            f"[{status.status}] {status.source.path}: {status.segments} segments, "
+            f"{status.tokens} tokens in {status.seconds:.1f}s{detail}",
+            flush=True,
+        )
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        sources = [
+            replace(
+                source,
+                id_scheme=resolve_id_scheme(driver, source.edition_id, source.id_scheme),
+            )
+            for source in sources
+        ]
+        statuses = ingest_corpus(
+            sources,
+            Neo4jRepository(driver),
+            workers=args.workers,
+            writers=args.writers,
+            queue_size=args.queue_size,
+            batch_segments=args.checkpoint_every,
+            journal=CheckpointJournal(args.checkpoint_dir),
+            resume=args.resume,
+            report=report,
+            cache=None if args.no_cache else SourceCache(args.cache_dir),
+        )
+    finally:
+        if owns_driver:
+            driver.close()
+
+    print(format_status_table(statuses))
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterator
+
+from nta.ingest.checkpoint import DEFAULT_CHECKPOINT_DIR
+from nta.ingest.checkpoint import DEFAULT_CHECKPOINT_EVERY
+from nta.ingest.checkpoint import CheckpointJournal
+from nta.ingest.checkpoint import SegmentCheckpointer
+from nta.ingest.checkpoint import config_hash
+from nta.ingest.adapters.base import RawSource
+from nta.ingest.adapters.verse_json import ADAPTER_VERSION
+from nta.ingest.adapters.verse_json import VerseJsonAdapter
+from nta.ingest.cache import DEFAULT_CACHE_DIR
+from nta.ingest.cache import SourceCache
+from nta.ingest.cache import cached_adapt
+from nta.ingest.checkpoint import source_fingerprint
+from nta.graph.rows import RowSet
+from nta.ingest.text import NORMALIZATION_POLICY_V0
+from nta.model import ids
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+    from nta.ingest.pipeline import PlannedBatch
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_INPUT_PATH = REPO_ROOT / "data" / "Hávamál1.json"
+
+WORK_ID = "havamal"
+EDITION_ID = "havamal_gudni_jonsson_print"
+LANGUAGE = "Old Norse"
+FORM_PREFIX = "non"
+SOURCE_LABEL = "Sæmundar-Edda: Hávamál"
+DATE_START = 900
+DATE_END = 1100
+DATE_APPROX = True
+DATE_NOTE = "placeholder; revise later"
+PROVENANCE = "Guðni Jónsson print"
+NORMALIZATION_POLICY = NORMALIZATION_POLICY_V0
+MORPH_ANALYZER = "placeholder"
+MORPH_ANALYZER_VERSION = "0.1"
+MORPH_POS = "UNKNOWN"
+MORPH_CONFIDENCE = 0.0
+MORPH_IS_AMBIGUOUS = False
+MORPH_IS_ACTIVE = True
+ANALYZER_ID = f"{MORPH_ANALYZER}:{MORPH_ANALYZER_VERSION}"
+ANALYZER_NAME = "Placeholder Analyzer"
+ANALYZER_DESCRIPTION = "Bootstrap analyzer for morphology scaffolding."
+ANALYZER_AUTHOR = "norse_text_analytics"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--input",
+        type=str,
+        default=None,
+        help="Optional path to input JSON file. Defaults to data/Hávamál1.json.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue after the last committed checkpoint for this edition/config.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=DEFAULT_CHECKPOINT_EVERY,
+        help=f"Segments per checkpoint batch (default: {DEFAULT_CHECKPOINT_EVERY}).",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=str(DEFAULT_CHECKPOINT_DIR),
+        help=f"Progress journal directory (default: {DEFAULT_CHECKPOINT_DIR}).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Adapter output cache directory (default: {DEFAULT_CACHE_DIR}).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse the source even if a cached adapter output exists.",
+    )
+
+
+def resolve_input_path(explicit_path: str | None) -> Path:
+    if explicit_path:
+        path = Path(explicit_path)
+        if not path.exists():
+            raise FileNotFoundError(f"Input file not found: {path}")
+        return path
+
+    if DEFAULT_INPUT_PATH.exists():
+        return DEFAULT_INPUT_PATH
+    raise FileNotFoundError(f"Input file not found: {DEFAULT_INPUT_PATH}")
+
+
+def adapter_config_hash(input_path: Path, **settings: Any) -> str:
+    """Checkpoint config hash; ``settings`` are the ``havamal_adapter`` overrides."""
+    adapter = havamal_adapter(**settings)
+    return config_hash(
+        adapter=ADAPTER_VERSION,
+        source=source_fingerprint(input_path),
+        work_id=adapter.work_id,
+        edition_id=adapter.edition_id,
+        id_scheme=ids.id_scheme(adapter.id_scheme).name,
+        language=LANGUAGE,
+        normalization_policy=NORMALIZATION_POLICY,
+        analyzer_id=ANALYZER_ID,
+    )
+
+
+def havamal_adapter(
+    work_id: str = WORK_ID,
+    edition_id: str = EDITION_ID,
+    source_label: str = SOURCE_LABEL,
+    date_start: int | None = DATE_START,
+    date_end: int | None = DATE_END,
+    id_scheme: str | None = None,
+) -> VerseJsonAdapter:
+    """
+    The verse JSON adapter with Hávamál's settings.
+
+    The defaults are the print edition ``nta ingest havamal`` writes; corpus
+    ingest passes per-source IDs so several JSON files never share an
+    Edition.
+    """
+    return VerseJsonAdapter(
+        work_id=work_id,
+        edition_id=edition_id,
+        language=LANGUAGE,
+        source_label=source_label,
+        date_start=date_start,
+        date_end=date_end,
+        form_prefix=FORM_PREFIX,
+        edition_properties={
+            "date_approx": DATE_APPROX,
+            "date_note": DATE_NOTE,
+            "provenance": PROVENANCE,
+        },
+        id_scheme=id_scheme,
+    )
+
+
+def plan_havamal(
+    input_path: Path,
+    batch_segments: int = DEFAULT_CHECKPOINT_EVERY,
+    start_after: int = 0,
+    cache: SourceCache | None = None,
+    **settings: Any,
+) -> Iterator[PlannedBatch]:
+    """
+    Plan Hávamál JSON writes through the shared adapter pipeline (no DB access).
+
+    Adds the placeholder MorphAnalysis (and its Analyzer) for every planned
+    token, as the original script did. With a cache, unchanged input skips
+    JSON parsing and tokenization. ``settings`` override the Work/Edition
+    (see ``havamal_adapter``).
+    """
+    from nta.ingest.pipeline import plan_adapter_output
+
+    adapter = havamal_adapter(**settings)
+    raw_source = RawSource(source_id=adapter.edition_id, kind="json", origin=str(input_path))
+    adapter_output = cached_adapt(
+        adapter,
+        raw_source,
+        cache,
+        "verse_json",
+        ADAPTER_VERSION,
+        NORMALIZATION_POLICY,
+        adapter.cache_settings(),
+    )
+    created_at = datetime.now(timezone.utc)
+
+    for index, batch in enumerate(plan_adapter_output(adapter_output, batch_segments, start_after)):
+        if index == 0:
+            batch.rows.merge_node(
+                "Analyzer",
+                "analyzer_id",
+                ANALYZER_ID,
+                on_create={
+                    "name": ANALYZER_NAME,
+                    "version": MORPH_ANALYZER_VERSION,
+                    "description": ANALYZER_DESCRIPTION,
+                    "author": ANALYZER_AUTHOR,
+                    "created_at": created_at,
+                },
+            )
+        _plan_placeholder_analyses(batch.rows, created_at)
+        yield batch
+
+
+def _plan_placeholder_analyses(rows: RowSet, created_at: datetime) -> None:
+    token_ids = list(rows.nodes.get(("Token", "token_id"), ()))
+    for token_id in token_ids:
+        analysis_id = f"{token_id}:{MORPH_ANALYZER}"
+        analysis = ("MorphAnalysis", "analysis_id", analysis_id)
+        rows.merge_node(
+            "MorphAnalysis",
+            "analysis_id",
+            analysis_id,
+            on_create={
+                "analyzer": MORPH_ANALYZER,
+                "analyzer_version": MORPH_ANALYZER_VERSION,
+                "confidence": MORPH_CONFIDENCE,
+                "pos": MORPH_POS,
+                "is_ambiguous": MORPH_IS_AMBIGUOUS,
+                "created_at": created_at,
+                "supersedes": None,
+                "is_active": MORPH_IS_ACTIVE,
+            },
+        )
+        rows.merge_relationship("HAS_ANALYSIS", ("Token", "token_id", token_id), analysis)
+        rows.merge_relationship("PRODUCED_BY", analysis, ("Analyzer", "analyzer_id", ANALYZER_ID))
+
+
+def ingest(
+    input_path: Path,
+    resume: bool = False,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    checkpoint_dir: str | Path = DEFAULT_CHECKPOINT_DIR,
+    driver: Driver | None = None,
+    cache: SourceCache | None = None,
+) -> tuple[int, int]:
+    """Ingest Hávamál JSON; opens (and closes) a driver unless one is given."""
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+    from nta.graph.repo import Neo4jRepository
+    from nta.ingest.pipeline import resolve_id_scheme
+    from nta.ingest.pipeline import write_batches
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        id_scheme = resolve_id_scheme(driver, EDITION_ID)
+        checkpointer = SegmentCheckpointer(
+            journal=CheckpointJournal(checkpoint_dir),
+            edition_id=EDITION_ID,
+            config_hash=adapter_config_hash(input_path, id_scheme=id_scheme),
+            every=checkpoint_every,
+            resume=resume,
+        )
+        if checkpointer.resumed_from is not None:
+            print(f"Resuming after segment {checkpointer.start_after}")
+
+        batches = plan_havamal(
+            input_path, checkpointer.every, checkpointer.start_after, cache, id_scheme=id_scheme
+        )
+        counts = write_batches(Neo4jRepository(driver), batches, checkpointer)
+    finally:
+        if owns_driver:
+            driver.close()
+
+    return counts["segments"], counts["tokens"]
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    segment_count, token_count = ingest(
+        resolve_input_path(args.input),
+        resume=args.resume,
+        checkpoint_every=args.checkpoint_every,
+        checkpoint_dir=args.checkpoint_dir,
+        driver=driver,
+        cache=None if args.no_cache else SourceCache(args.cache_dir),
+    )
+    print(f"Segments ingested: {segment_count}")
+    print(f"Tokens ingested: {token_count}")
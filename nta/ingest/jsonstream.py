@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import IO
+from typing import Any
+from typing import Iterator
+from typing import Sequence
+
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_CHARS = re.compile(r"[-+.0-9eE]*")
+_DECODER = json.JSONDecoder()
+
+
+class _Scanner:
+    """Chunked JSON reader that decodes one value at a time with ``raw_decode``."""
+
+    def __init__(self, fh: IO[str], chunk_size: int) -> None:
+        self._fh = fh
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._fh.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        if self._pos:
+            self._buf = self._buf[self._pos :]
+            self._pos = 0
+        self._buf += chunk
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON input, found {found!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        if self.peek() in "-0123456789":
+            # A number ends only at a delimiter: buffer until one follows it,
+            # or "2.5" split after "2." would decode as 2.
+            while (
+                _NUMBER_CHARS.match(self._buf, self._pos).end() == len(self._buf) and self._fill()
+            ):
+                pass
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Most likely the value runs past the buffered chunk.
+                if self._fill():
+                    continue
+                raise
+            self._pos = end
+            return value
+
+
+def iter_json_path(
+    fh: IO[str],
+    target: Sequence[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[str, tuple[str, ...], Any]]:
+    """
+    Stream one array nested in a JSON document without loading the document.
+
+    ``target`` is the key path of the array (for example ``("poem", "verses")``).
+    Yields ``("item", path, value)`` for each array element, decoded one at a
+    time, and ``("field", path, value)`` for every sibling value met on the way
+    in or out (in document order). Memory is bounded by the largest single
+    element or sibling, not by the file.
+    """
+    yield from _walk(_Scanner(fh, chunk_size), tuple(target), ())
+
+
+def _walk(
+    scanner: _Scanner, target: tuple[str, ...], path: tuple[str, ...]
+) -> Iterator[tuple[str, tuple[str, ...], Any]]:
+    if not target:
+        scanner.expect("[")
+        if scanner.peek() == "]":
+            scanner.expect("]")
+            return
+        while True:
+            yield "item", path, scanner.value()
+            if scanner.peek() != ",":
+                scanner.expect("]")
+                return
+            scanner.expect(",")
+
+    scanner.expect("{")
+    if scanner.peek() == "}":
+        scanner.expect("}")
+        return
+    while True:
+        key = scanner.value()
+        scanner.expect(":")
+        if key == target[0]:
+            yield from _walk(scanner, target[1:], (*path, key))
+        else:
+            yield "field", (*path, key), scanner.value()
+        if scanner.peek() != ",":
+            scanner.expect("}")
+            return
+        scanner.expect(",")
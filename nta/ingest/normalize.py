@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Callable
+from typing import Iterable
+from typing import Mapping
+
+from nta.ingest.text import NORMALIZATION_POLICY_V0
+from nta.ingest.text import SURROUNDING_PUNCT
+
+
+STEP_KINDS = ("strip", "collapse_whitespace", "unicode", "map", "fold_accents", "lower", "expand")
+
+# Latin blocks whose precomposed letters ``fold_accents`` tabulates.
+_FOLD_RANGES = ((0x00C0, 0x0250), (0x1E00, 0x1F00))
+_COMBINING_RANGE = (0x0300, 0x0370)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass(slots=True, frozen=True)
+class NormalizationStep:
+    """
+    One stage of a normalization pipeline.
+
+    - ``strip``: strip ``chars`` from both ends
+    - ``collapse_whitespace``: runs of whitespace become one space
+    - ``unicode``: ``unicodedata.normalize(form)`` (NFC by default)
+    - ``map``: per-character replacements (``mapping`` keys are single
+      characters; values may be longer or empty)
+    - ``fold_accents``: drop combining marks from precomposed Latin letters,
+      except those in ``chars``
+    - ``lower``: ``str.lower``
+    - ``expand``: literal substring replacements (abbreviations), longest
+      key first
+    """
+
+    kind: str
+    chars: str = ""
+    form: str = "NFC"
+    mapping: Mapping[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True, frozen=True)
+class NormalizationPolicy:
+    """
+    A named, versioned pipeline of steps.
+
+    ``policy_id`` (``<name>_v<version>``) is what Editions and
+    ``NORMALIZED_TO`` edges record, so a published policy never changes:
+    behaviour changes ship as a new version.
+    """
+
+    name: str
+    version: int
+    steps: tuple[NormalizationStep, ...]
+    description: str = ""
+
+    @property
+    def policy_id(self) -> str:
+        return f"{self.name}_v{self.version}"
+
+    def compile(self) -> CompiledPolicy:
+        return CompiledPolicy(self)
+
+
+def _fold_table(keep: str) -> dict[int, str]:
+    table: dict[int, str] = {}
+    for start, stop in _FOLD_RANGES:
+        for code in range(start, stop):
+            char = chr(code)
+            if char in keep:
+                continue
+            decomposed = unicodedata.normalize("NFD", char)
+            base = "".join(c for c in decomposed if not unicodedata.combining(c))
+            if base != char and base:
+                table[code] = unicodedata.normalize("NFC", base)
+    for code in range(*_COMBINING_RANGE):
+        table.setdefault(code, "")
+    return table
+
+
+def _char_table(step: NormalizationStep) -> dict[int, str]:
+    if step.kind == "fold_accents":
+        return _fold_table(step.chars)
+    for key in step.mapping:
+        if len(key) != 1:
+            raise ValueError(f"map keys must be single characters, got {key!r}")
+    return {ord(key): value for key, value in step.mapping.items()}
+
+
+def _compose(first: dict[int, str], second: dict[int, str]) -> dict[int, str]:
+    """One table equivalent to translating by ``first`` then ``second``."""
+    table = {code: value.translate(second) for code, value in first.items()}
+    for code, value in second.items():
+        table.setdefault(code, value)
+    return table
+
+
+def _expander(mapping: Mapping[str, str]) -> Callable[[str], str]:
+    if not mapping:
+        return lambda text: text
+    keys = sorted(mapping, key=len, reverse=True)
+    pattern = re.compile("|".join(re.escape(key) for key in keys))
+    lookup = dict(mapping)
+    return lambda text: pattern.sub(lambda m: lookup[m.group()], text)
+
+
+class CompiledPolicy:
+    """
+    A policy compiled into plain string operations.
+
+    Adjacent ``map``/``fold_accents`` steps fuse into one ``str.translate``
+    table, expansions into one alternation, and ``strip`` uses the C-level
+    ``str.strip``, so each surface costs a handful of C calls. The batch
+    API memoizes per call: corpus surfaces repeat heavily.
+    """
+
+    __slots__ = ("policy_id", "_stages")
+
+    def __init__(self, policy: NormalizationPolicy) -> None:
+        stages: list[Callable[[str], str]] = []
+        table: dict[int, str] | None = None
+
+        def flush_table() -> None:
+            nonlocal table
+            if table:
+                stages.append(_translator(table))
+            table = None
+
+        for step in policy.steps:
+            if step.kind not in STEP_KINDS:
+                raise ValueError(f"Unknown normalization step: {step.kind!r}")
+            if step.kind in ("map", "fold_accents"):
+                step_table = _char_table(step)
+                table = step_table if table is None else _compose(table, step_table)
+                continue
+            flush_table()
+            if step.kind == "strip":
+                stages.append(_stripper(step.chars))
+            elif step.kind == "collapse_whitespace":
+                stages.append(_collapse_whitespace)
+            elif step.kind == "unicode":
+                stages.append(_unicode_normalizer(step.form))
+            elif step.kind == "lower":
+                stages.append(str.lower)
+            else:
+                stages.append(_expander(step.mapping))
+        flush_table()
+        self.policy_id = policy.policy_id
+        self._stages = tuple(stages)
+
+    def __call__(self, surface: str) -> str:
+        for stage in self._stages:
+            surface = stage(surface)
+        return surface
+
+    def normalize_many(self, surfaces: Iterable[str]) -> list[str]:
+        """Normalize a batch; each distinct surface is computed once."""
+        seen: dict[str, str] = {}
+        out = []
+        for surface in surfaces:
+            normalized = seen.get(surface)
+            if normalized is None:
+                normalized = seen[surface] = self(surface)
+            out.append(normalized)
+        return out
+
+
+def _translator(table: dict[int, str]) -> Callable[[str], str]:
+    return lambda text: text.translate(table)
+
+
+def _stripper(chars: str) -> Callable[[str], str]:
+    return lambda text: text.strip(chars or None)
+
+
+def _unicode_normalizer(form: str) -> Callable[[str], str]:
+    if form not in ("NFC", "NFD", "NFKC", "NFKD"):
+        raise ValueError(f"Unknown Unicode normalization form: {form!r}")
+    return lambda text: unicodedata.normalize(form, text)
+
+
+def _collapse_whitespace(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+_V0_STEPS = (
+    NormalizationStep("strip", chars=SURROUNDING_PUNCT),
+    NormalizationStep("collapse_whitespace"),
+)
+
+# Manuscript letters with a standard normalized-Old-Norse equivalent.
+OLD_NORSE_LETTERS = {
+    "ǫ": "ö",
+    "Ǫ": "Ö",
+    "ø": "ö",
+    "Ø": "Ö",
+    "ę": "æ",
+    "Ę": "Æ",
+    "œ": "æ",
+    "Œ": "Æ",
+    "ſ": "s",
+    "ꝼ": "f",
+    "ꝛ": "r",
+}
+
+# Common scribal abbreviations (Tironian et, þat-thorn, the -us and -ur marks).
+OLD_NORSE_ABBREVIATIONS = {
+    "⁊": "ok",
+    "ꝥ": "þat",
+    "Ꝥ": "Þat",
+    "ꝰ": "us",
+    "ᷣ": "ur",
+}
+
+# Search-key folding: drop everything but base letters.
+OLD_NORSE_FOLDS = {
+    "þ": "th",
+    "Þ": "th",
+    "ð": "d",
+    "Ð": "d",
+    "æ": "ae",
+    "Æ": "ae",
+    "ö": "o",
+    "Ö": "o",
+}
+
+POLICY_V0 = NormalizationPolicy(
+    "punct_strip_whitespace_collapse",
+    0,
+    _V0_STEPS,
+    "Strip surrounding punctuation and collapse whitespace (normalize_v0).",
+)
+POLICY_ON_STANDARD_V1 = NormalizationPolicy(
+    "on_standard",
+    1,
+    _V0_STEPS
+    + (
+        NormalizationStep("unicode", form="NFC"),
+        NormalizationStep("expand", mapping=OLD_NORSE_ABBREVIATIONS),
+        NormalizationStep("map", mapping=OLD_NORSE_LETTERS),
+    ),
+    "v0 plus NFC, abbreviation expansion and standard letters (ǫ→ö, ę→æ, ſ→s).",
+)
+POLICY_ON_FOLDED_V1 = NormalizationPolicy(
+    "on_folded",
+    1,
+    POLICY_ON_STANDARD_V1.steps
+    + (
+        NormalizationStep("lower"),
+        NormalizationStep("fold_accents"),
+        NormalizationStep("map", mapping=OLD_NORSE_FOLDS),
+    ),
+    "on_standard plus lower case, accent folding and þ→th, ð→d, æ→ae, ö→o.",
+)
+
+NORMALIZATION_POLICIES: dict[str, NormalizationPolicy] = {
+    policy.policy_id: policy for policy in (POLICY_V0, POLICY_ON_STANDARD_V1, POLICY_ON_FOLDED_V1)
+}
+DEFAULT_NORMALIZATION_POLICY = NORMALIZATION_POLICY_V0
+_COMPILED: dict[str, CompiledPolicy] = {}
+
+
+def register_policy(policy: NormalizationPolicy) -> None:
+    """Add a policy; a published ``policy_id`` cannot be redefined."""
+    existing = NORMALIZATION_POLICIES.get(policy.policy_id)
+    if existing is not None and existing != policy:
+        raise ValueError(
+            f"Normalization policy {policy.policy_id!r} already exists; bump its version"
+        )
+    NORMALIZATION_POLICIES[policy.policy_id] = policy
+
+
+def normalization_policy(policy_id: str | None = None) -> CompiledPolicy:
+    """Compiled policy by ID (``None`` means the default), compiled once and reused."""
+    policy_id = policy_id or DEFAULT_NORMALIZATION_POLICY
+    compiled = _COMPILED.get(policy_id)
+    if compiled is None:
+        try:
+            policy = NORMALIZATION_POLICIES[policy_id]
+        except KeyError:
+            raise ValueError(
+                f"Unknown normalization policy: {policy_id!r} "
+                f"(expected one of {tuple(NORMALIZATION_POLICIES)})"
+            ) from None
+        compiled = _COMPILED[policy_id] = policy.compile()
+    return compiled
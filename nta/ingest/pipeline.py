@@ -1,117 +1,415 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+
+from nta.graph.buffer import DEFAULT_MAX_PENDING
+from nta.graph.buffer import WriteBehindBuffer
 from nta.graph.repo import Neo4jRepository
+from nta.graph.rows import RowSet
 from nta.ingest.adapters.base import AdapterOutput
+from nta.ingest.adapters.base import AdapterSegmentRecord
 from nta.ingest.adapters.base import AdapterTokenRecord
+from nta.ingest.checkpoint import DEFAULT_CHECKPOINT_EVERY
+from nta.ingest.checkpoint import SegmentCheckpointer
 from nta.model import ids
-from nta.model.types import Edition
-from nta.model.types import Form
-from nta.model.types import Segment
-from nta.model.types import Token
-from nta.model.types import Work
+from nta.model.hll import HLL_PRECISION
+from nta.model.hll import HyperLogLog
+from nta.model.periods import edition_period
+
+
+DEFAULT_BATCH_SEGMENTS = DEFAULT_CHECKPOINT_EVERY
+_INSTANCE_OF_FORM = ("INSTANCE_OF_FORM", "Token", "token_id", "Form", "form_id", ())
+_REALIZES = ("REALIZES", "Form", "form_id", "Lemma", "lemma_id", ())
+
+EDITION_ID_SCHEME_QUERY = """
+MATCH (e:Edition {edition_id: $edition_id})
+RETURN e.id_scheme AS id_scheme, e.id_base AS id_base
+"""
+VOCABULARY_SAMPLE_QUERY = """
+MATCH (f:Form)
+RETURN f.form_id AS form_id
+LIMIT 1
+"""
+
+
+@dataclass(slots=True)
+class PlannedBatch:
+    """Coalesced graph writes for a run of consecutive segments of one edition."""
+
+    edition_id: str
+    rows: RowSet
+    last_ordinal: int
+    segments: int = 0
+    tokens: int = 0
+    sketches: dict[str, HyperLogLog] | None = None
+
+
+def batch_sketches(rows: RowSet, precision: int = HLL_PRECISION) -> dict[str, HyperLogLog]:
+    """
+    Distinct-count sketches of one batch, keyed like ``EDITION_SKETCHES``.
+
+    - ``surfaces``: ``Token.surface`` values
+    - ``forms``: Forms reached by ``INSTANCE_OF_FORM``
+    - ``lemmas``: Lemmas those forms ``REALIZES`` in the same batch
+    """
+    surfaces = HyperLogLog(precision)
+    forms = HyperLogLog(precision)
+    lemmas = HyperLogLog(precision)
+    for row in rows.nodes.get(("Token", "token_id"), {}).values():
+        surfaces.add(row["props"]["surface"])
+    form_ids = {form_id for _, form_id in rows.relationships.get(_INSTANCE_OF_FORM, {})}
+    forms.update(form_ids)
+    lemmas.update(
+        lemma_id
+        for form_id, lemma_id in rows.relationships.get(_REALIZES, {})
+        if form_id in form_ids
+    )
+    return {"forms": forms, "lemmas": lemmas, "surfaces": surfaces}
+
+
+def with_sketches(batches: Iterable[PlannedBatch]) -> Iterator[PlannedBatch]:
+    """Attach ``batch_sketches`` while planning (e.g. in corpus worker processes)."""
+    for batch in batches:
+        if batch.sketches is None:
+            batch.sketches = batch_sketches(batch.rows)
+        yield batch
+
+
+def write_batch(repo: Any, batch: PlannedBatch) -> None:
+    """
+    Write one batch's rows, then fold its sketches into the Edition.
+
+    Sketch merges are register-wise max, so re-writing a batch (retry or
+    resume) never changes the result.
+    """
+    repo.write_rows(batch.rows)
+    _merge_sketches(repo, batch)
+    repo.flush()
+
+
+def _merge_sketches(repo: Any, batch: PlannedBatch) -> None:
+    if batch.segments:
+        sketches = batch.sketches if batch.sketches is not None else batch_sketches(batch.rows)
+        repo.merge_edition_sketches(batch.edition_id, sketches)
+
+
+def resolve_id_scheme(
+    driver: Any, edition_id: str, requested: str | None = None, rebuild: bool = False
+) -> str:
+    """
+    The ID scheme to ingest ``edition_id`` with, checked against the graph.
+
+    - an existing edition keeps its stored ``Edition.id_scheme`` (v1 if unset)
+    - Forms and Lemmas are shared by every edition, so the graph's vocabulary
+      scheme (read off one Form ID) must match too
+    - otherwise ``requested``, or the default
+
+    Raises ValueError when ``requested``, the stored scheme and the
+    vocabulary disagree, instead of writing IDs of two schemes side by side.
+    Unless ``rebuild`` is set, also refuses an edition swapped in by ``nta
+    edition rebuild``: its Segment/Token keys are based on ``Edition.id_base``,
+    so ingest would plan a second copy of every segment next to them.
+    """
+    with driver.session() as session:
+        edition = session.run(EDITION_ID_SCHEME_QUERY, edition_id=edition_id).single()
+        form = session.run(VOCABULARY_SAMPLE_QUERY).single()
+    id_base = edition.get("id_base") if edition else None
+    if not rebuild and id_base and id_base != edition_id:
+        raise ValueError(
+            f"Edition {edition_id} was rebuilt and its IDs are based on {id_base}; "
+            f"update it with 'nta edition rebuild' instead of re-ingesting"
+        )
+    stored = (edition["id_scheme"] or ids.DEFAULT_ID_SCHEME) if edition else None
+    vocabulary = ids.form_id_scheme(form["form_id"]) if form else None
+    scheme = ids.id_scheme(requested or stored or vocabulary).name
+    for found, where in (
+        (stored, f"Edition {edition_id}"),
+        (vocabulary, "the graph's Form vocabulary"),
+    ):
+        if found is not None and found != scheme:
+            raise ValueError(
+                f"{where} uses ID scheme {found}, not {scheme}: ingest with "
+                f"--id-scheme {found} or migrate first with 'nta ids migrate'"
+            )
+    return scheme
 
 
 def ingest_adapter_output(
-    repo: Neo4jRepository, adapter_output: AdapterOutput
+    repo: Neo4jRepository,
+    adapter_output: AdapterOutput,
+    checkpointer: SegmentCheckpointer | None = None,
+    batch_segments: int | None = None,
 ) -> dict[str, int]:
     """
     Persist adapter output using MERGE-based repository writes.
 
-    IDs are deterministic. If adapter records omit IDs, fallback IDs are used:
+    IDs are deterministic. If adapter records omit IDs, fallback IDs come
+    from the edition's ID scheme (``edition.id_scheme``, default v1):
     - segment_id: <edition_id>:segment:<ordinal>
     - token_id: <segment_id>:token:<position>
+    - form_id: ids.form_id(language, orthography)
+
+    Writes are planned per batch of segments and sent as bulk UNWIND
+    statements (see ``write_batches``). With a checkpointer, segments at or
+    below its resume ordinal are skipped and each batch is recorded once its
+    rows have been flushed.
     """
+    if batch_segments is None:
+        batch_segments = (
+            checkpointer.every if checkpointer is not None else DEFAULT_BATCH_SEGMENTS
+        )
+    start_after = checkpointer.start_after if checkpointer is not None else 0
+    batches = plan_adapter_output(adapter_output, batch_segments, start_after)
+    return write_batches(repo, batches, checkpointer)
 
-    work_meta = adapter_output.work
-    edition_meta = adapter_output.edition
 
-    work = Work(work_id=work_meta.work_id, title=work_meta.title)
-    edition = Edition(
-        edition_id=edition_meta.edition_id,
-        work_id=work_meta.work_id,
-        label=edition_meta.source_label or edition_meta.title,
-        version=edition_meta.version,
-    )
+def write_batches(
+    repo: Neo4jRepository,
+    batches: Iterable[PlannedBatch],
+    checkpointer: SegmentCheckpointer | None = None,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> dict[str, int]:
+    """
+    Write planned batches in order through a ``WriteBehindBuffer``.
+
+    Consecutive batches coalesce in the buffer, so a Form, Lemma or link that
+    recurs across batches is written once per flush, not once per batch. A
+    batch's sketches and checkpoint follow only after the flush carrying its
+    rows has returned; rows flushed when an error leaves the buffer are
+    simply re-merged on resume.
+    """
+    segments = 0
+    tokens = 0
+    unsettled: list[PlannedBatch] = []
+    with WriteBehindBuffer(repo, max_pending=max_pending) as buffer:
+        for batch in batches:
+            flushes = buffer.stats["flushes"]
+            buffer.merge_rows(batch.rows)
+            unsettled.append(batch)
+            segments += batch.segments
+            tokens += batch.tokens
+            if buffer.stats["flushes"] != flushes:
+                _settle(repo, unsettled, checkpointer)
+    _settle(repo, unsettled, checkpointer)
+
+    if checkpointer is not None:
+        checkpointer.finish()
+    return {"segments": segments, "tokens": tokens}
+
+
+def _settle(
+    repo: Any, batches: list[PlannedBatch], checkpointer: SegmentCheckpointer | None
+) -> None:
+    """Fold in sketches and checkpoint batches whose rows have been flushed."""
+    for batch in batches:
+        _merge_sketches(repo, batch)
+        if checkpointer is not None and batch.segments:
+            checkpointer.batch_done(batch.last_ordinal, batch.segments, batch.tokens)
+    batches.clear()
 
-    repo.upsert_work(work)
-    repo.upsert_edition(edition)
-    repo.link_work_edition(work.work_id, edition.edition_id)
 
+def plan_adapter_output(
+    adapter_output: AdapterOutput,
+    batch_segments: int = DEFAULT_BATCH_SEGMENTS,
+    start_after: int = 0,
+) -> Iterator[PlannedBatch]:
+    """
+    Turn adapter output into batches of coalesced rows without touching the DB.
+
+    Pure and picklable, so planning (tokens, IDs, forms) can run in worker
+    processes. The first batch also carries the Work/Edition rows. Segment
+    ordinals are 1-based; those with ``ordinal <= start_after`` are skipped.
+    """
+    if batch_segments < 1:
+        raise ValueError("batch_segments must be >= 1")
+
+    edition_meta = adapter_output.edition
+    edition_id = edition_meta.edition_id
     language = edition_meta.language or "UNKNOWN"
     normalization_policy = edition_meta.normalization_policy or "adapter"
+    scheme = ids.id_scheme(edition_meta.id_scheme)
 
-    segments_ingested = 0
-    tokens_ingested = 0
+    batch = PlannedBatch(edition_id=edition_id, rows=RowSet(), last_ordinal=start_after)
+    _plan_header(batch.rows, adapter_output, scheme)
 
     for segment_record in adapter_output.segments:
-        segment_id = segment_record.segment_id or ids.segment_id(
-            edition.edition_id, segment_record.ordinal
-        )
-        segment = Segment(
-            segment_id=segment_id,
-            edition_id=edition.edition_id,
-            text=segment_record.text,
-            position=segment_record.ordinal,
-            ref=segment_record.ref or str(segment_record.ordinal),
+        if segment_record.ordinal < 1:
+            # start_after == 0 means "no checkpoint", so an ordinal-0 segment
+            # would be skipped silently.
+            raise ValueError(
+                f"{edition_id}: segment ordinals are 1-based, got {segment_record.ordinal}"
+            )
+        if segment_record.ordinal <= start_after:
+            continue
+        batch.tokens += _plan_segment(
+            batch.rows, edition_id, segment_record, language, normalization_policy, scheme
         )
-        repo.upsert_segment(segment)
-        repo.link_edition_segment(edition.edition_id, segment_id)
-        segments_ingested += 1
-
-        for token_record in segment_record.tokens:
-            _ingest_token(
-                repo=repo,
-                token_record=token_record,
-                segment_id=segment_id,
-                language=language,
-                normalization_policy=normalization_policy,
+        batch.segments += 1
+        batch.last_ordinal = segment_record.ordinal
+        if batch.segments >= batch_segments:
+            yield batch
+            batch = PlannedBatch(
+                edition_id=edition_id, rows=RowSet(), last_ordinal=batch.last_ordinal
             )
-            tokens_ingested += 1
 
-    return {"segments": segments_ingested, "tokens": tokens_ingested}
+    if batch.segments or batch.rows:
+        yield batch
 
 
-def _ingest_token(
-    repo: Neo4jRepository,
+def _plan_header(rows: RowSet, adapter_output: AdapterOutput, scheme: ids.IdScheme) -> None:
+    work_meta = adapter_output.work
+    edition_meta = adapter_output.edition
+
+    edition_props = {
+        "label": edition_meta.source_label or edition_meta.title,
+        "version": edition_meta.version,
+        "id_scheme": scheme.name,
+    }
+    optional = {
+        "title": edition_meta.title,
+        "source_label": edition_meta.source_label,
+        "language": edition_meta.language,
+        "language_stage": edition_meta.language_stage,
+        "date_start": edition_meta.date_start,
+        "date_end": edition_meta.date_end,
+        "normalization_policy": edition_meta.normalization_policy,
+    }
+    edition_props.update({k: v for k, v in optional.items() if v is not None})
+    edition_props.update(edition_meta.properties)
+
+    rows.merge_node("Work", "work_id", work_meta.work_id, {"title": work_meta.title})
+    rows.merge_node("Edition", "edition_id", edition_meta.edition_id, edition_props)
+    rows.merge_relationship(
+        "HAS_EDITION",
+        ("Work", "work_id", work_meta.work_id),
+        ("Edition", "edition_id", edition_meta.edition_id),
+    )
+    plan_edition_period(
+        rows, edition_meta.edition_id, edition_meta.date_start, edition_meta.date_end
+    )
+
+
+def plan_edition_period(
+    rows: RowSet, edition_id: str, date_start: int | None, date_end: int | None
+) -> None:
+    """Add normalized date bounds, the undated flag and century buckets."""
+    period = edition_period(date_start, date_end)
+    rows.merge_node("Edition", "edition_id", edition_id, period.properties())
+    for bucket in period.centuries:
+        rows.merge_node(
+            "Century", "century", bucket, {"start": bucket * 100, "end": bucket * 100 + 99}
+        )
+        rows.merge_relationship(
+            "IN_CENTURY",
+            ("Edition", "edition_id", edition_id),
+            ("Century", "century", bucket),
+        )
+
+
+def _plan_segment(
+    rows: RowSet,
+    edition_id: str,
+    segment_record: AdapterSegmentRecord,
+    language: str,
+    normalization_policy: str,
+    scheme: ids.IdScheme,
+) -> int:
+    segment_id = segment_record.segment_id or scheme.segment_id(edition_id, segment_record.ordinal)
+    segment_props = {
+        "text": segment_record.text,
+        "position": segment_record.ordinal,
+        "ref": segment_record.ref or str(segment_record.ordinal),
+    }
+    structure = {
+        "verse": segment_record.verse,
+        "strophe": segment_record.strophe,
+        "line_index": _line_index(segment_record.line),
+    }
+    segment_props.update({k: v for k, v in structure.items() if v is not None})
+
+    rows.merge_node("Segment", "segment_id", segment_id, segment_props)
+    rows.merge_relationship(
+        "HAS_SEGMENT",
+        ("Edition", "edition_id", edition_id),
+        ("Segment", "segment_id", segment_id),
+    )
+
+    token_count = 0
+    for token_record in segment_record.tokens:
+        _plan_token(rows, token_record, segment_id, language, normalization_policy, scheme)
+        token_count += 1
+    return token_count
+
+
+def _line_index(line: str | None) -> int | str | None:
+    # Segment.line_index is stored as an integer when the adapter's line ref is numeric.
+    if line is not None and line.isdigit():
+        return int(line)
+    return line
+
+
+def _plan_token(
+    rows: RowSet,
     token_record: AdapterTokenRecord,
     segment_id: str,
     language: str,
     normalization_policy: str,
+    scheme: ids.IdScheme,
 ) -> None:
-    token_id = token_record.token_id or ids.token_id(segment_id, token_record.position)
+    token_id = token_record.token_id or scheme.token_id(segment_id, token_record.position)
     normalized = token_record.normalized or token_record.surface
+    surface_form_id = token_record.form_id or scheme.form_id(language, token_record.surface)
 
-    token = Token(
-        token_id=token_id,
-        segment_id=segment_id,
-        surface=token_record.surface,
-        position=token_record.position,
-        normalized=normalized,
+    rows.merge_node(
+        "Token",
+        "token_id",
+        token_id,
+        {
+            "surface": token_record.surface,
+            "position": token_record.position,
+            "normalized": normalized,
+        },
     )
-    surface_form = Form(
-        form_id=ids.form_id(language, token_record.surface),
-        orthography=token_record.surface,
-        language=language,
+    rows.merge_node(
+        "Form",
+        "form_id",
+        surface_form_id,
+        {"orthography": token_record.surface, "language": language},
+    )
+    rows.merge_relationship(
+        "INSTANCE_OF_FORM",
+        ("Token", "token_id", token_id),
+        ("Form", "form_id", surface_form_id),
+    )
+    rows.merge_relationship(
+        "HAS_TOKEN",
+        ("Segment", "segment_id", segment_id),
+        ("Token", "token_id", token_id),
     )
-
-    repo.upsert_token_and_form(token=token, form=surface_form)
-    repo.link_segment_token(segment_id=segment_id, token_id=token_id)
 
     if normalized != token_record.surface:
-        normalized_form = Form(
-            form_id=ids.form_id(language, normalized),
-            orthography=normalized,
-            language=language,
+        normalized_form_id = token_record.normalized_form_id or scheme.form_id(
+            language, normalized
         )
-        repo.upsert_form(normalized_form)
-        repo.link_form_orthographic_variant(
-            form_id=surface_form.form_id,
-            normalized_form_id=normalized_form.form_id,
-            variant_type="adapter_normalization",
+        rows.merge_node(
+            "Form",
+            "form_id",
+            normalized_form_id,
+            {"orthography": normalized, "language": language},
         )
-        repo.link_token_normalized_to(
-            token_id=token_id,
-            form_id=normalized_form.form_id,
-            policy=normalization_policy,
+        rows.merge_relationship(
+            "ORTHOGRAPHIC_VARIANT_OF",
+            ("Form", "form_id", surface_form_id),
+            ("Form", "form_id", normalized_form_id),
+            {"type": "adapter_normalization"},
+        )
+        rows.merge_relationship(
+            "NORMALIZED_TO",
+            ("Token", "token_id", token_id),
+            ("Form", "form_id", normalized_form_id),
+            {"policy": normalization_policy},
+            keys=("policy",),
         )
-
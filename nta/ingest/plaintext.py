@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Iterator
+
+from nta.graph.rows import RowSet
+from nta.ingest.checkpoint import DEFAULT_CHECKPOINT_DIR
+from nta.ingest.checkpoint import DEFAULT_CHECKPOINT_EVERY
+from nta.ingest.checkpoint import CheckpointJournal
+from nta.ingest.checkpoint import SegmentCheckpointer
+from nta.ingest.checkpoint import config_hash
+from nta.ingest.checkpoint import source_fingerprint
+from nta.ingest.segment import SEGMENT_MODES
+from nta.ingest.segment import iter_file_segments
+from nta.ingest.structure import STRUCTURE_RULESETS
+from nta.ingest.structure import structure_rules
+from nta.ingest.text import NORMALIZATION_POLICY_V0
+from nta.ingest.text import normalize_v0
+from nta.ingest.text import tokenize_v0
+from nta.model import ids
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+    from nta.ingest.pipeline import PlannedBatch
+
+
+NORMALIZATION_POLICY = NORMALIZATION_POLICY_V0
+ADAPTER_VERSION = "plaintext_v1"
+
+
+def _segment_id_v1(edition_id: str, ordinal: int) -> str:
+    return f"{edition_id}:seg{ordinal}"
+
+
+def _token_id_v1(segment_id: str, index: int) -> str:
+    return f"{segment_id}:t{index}"
+
+
+def _form_id_v1(language: str, surface: str) -> str:
+    return f"{language}:{surface}"
+
+
+# The original plaintext layout; Form and Lemma share the same key.
+PLAINTEXT_IDS_V1 = ids.IdScheme("v1", _segment_id_v1, _token_id_v1, _form_id_v1, _form_id_v1)
+
+
+def plaintext_ids(id_scheme: str | None) -> ids.IdScheme:
+    scheme = ids.id_scheme(id_scheme)
+    return PLAINTEXT_IDS_V1 if scheme.name == "v1" else scheme
+
+
+@dataclass(slots=True, frozen=True)
+class PlaintextOptions:
+    path: str
+    work_id: str
+    edition_id: str
+    source_label: str
+    language_stage: str
+    segment: str = "line"
+    date_start: int | None = None
+    date_end: int | None = None
+    id_scheme: str | None = None
+    structure: str | None = None
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "PlaintextOptions":
+        return cls(
+            path=str(args.path),
+            work_id=args.work_id,
+            edition_id=args.edition_id,
+            source_label=args.source_label,
+            language_stage=args.language_stage,
+            segment=args.segment,
+            date_start=args.date_start,
+            date_end=args.date_end,
+            id_scheme=args.id_scheme,
+            structure=args.structure,
+        )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--path", required=True, help="Path to UTF-8 text file.")
+    parser.add_argument("--work-id", required=True, help="Work.work_id")
+    parser.add_argument("--edition-id", required=True, help="Edition.edition_id")
+    parser.add_argument("--source-label", required=True, help="Edition.source_label")
+    parser.add_argument(
+        "--language-stage",
+        required=True,
+        help="Language/stage code (for example: on, own, nb, nn).",
+    )
+    parser.add_argument(
+        "--date-start",
+        type=int,
+        default=None,
+        help="Optional Edition.date_start year.",
+    )
+    parser.add_argument(
+        "--date-end",
+        type=int,
+        default=None,
+        help="Optional Edition.date_end year.",
+    )
+    parser.add_argument(
+        "--segment",
+        choices=SEGMENT_MODES,
+        default="line",
+        help="Segmentation mode: line (default) or paragraph.",
+    )
+    parser.add_argument(
+        "--id-scheme",
+        choices=ids.ID_SCHEMES,
+        default=None,
+        help=f"Segment/token/form ID scheme (default: {ids.DEFAULT_ID_SCHEME}).",
+    )
+    parser.add_argument(
+        "--structure",
+        choices=tuple(STRUCTURE_RULESETS),
+        default=None,
+        help="Detect L1 verse/strophe/chapter markers with this rule set (default: off).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue after the last committed checkpoint for this edition/config.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=DEFAULT_CHECKPOINT_EVERY,
+        help=f"Segments per checkpoint batch (default: {DEFAULT_CHECKPOINT_EVERY}).",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=str(DEFAULT_CHECKPOINT_DIR),
+        help=f"Progress journal directory (default: {DEFAULT_CHECKPOINT_DIR}).",
+    )
+
+
+def adapter_config_hash(options: PlaintextOptions) -> str:
+    settings = {}
+    scheme = plaintext_ids(options.id_scheme).name
+    if scheme != "v1":
+        # Only non-default schemes join the hash, so v1 checkpoints stay valid.
+        settings["id_scheme"] = scheme
+    if options.structure is not None:
+        settings["structure"] = options.structure
+    return config_hash(
+        adapter=ADAPTER_VERSION,
+        source=source_fingerprint(options.path),
+        work_id=options.work_id,
+        language_stage=options.language_stage,
+        segment_mode=options.segment,
+        normalization_policy=NORMALIZATION_POLICY,
+        **settings,
+    )
+
+
+def plan_plaintext(
+    options: PlaintextOptions,
+    batch_segments: int = DEFAULT_CHECKPOINT_EVERY,
+    start_after: int = 0,
+) -> Iterator[PlannedBatch]:
+    """
+    Stream a plaintext file into planned write batches (no DB access).
+
+    Segments are read incrementally from disk, so memory is bounded by one
+    batch of coalesced rows regardless of file size.
+    """
+    from nta.ingest.pipeline import PlannedBatch
+    from nta.ingest.pipeline import plan_edition_period
+
+    edition_id = options.edition_id
+    language = options.language_stage
+    scheme = plaintext_ids(options.id_scheme)
+
+    batch = PlannedBatch(edition_id=edition_id, rows=RowSet(), last_ordinal=start_after)
+    rows = batch.rows
+    rows.merge_node("Work", "work_id", options.work_id, {"title": options.work_id})
+    rows.merge_node(
+        "Edition",
+        "edition_id",
+        edition_id,
+        {
+            "label": options.source_label,
+            "version": ADAPTER_VERSION,
+            "source_label": options.source_label,
+            "language_stage": options.language_stage,
+            "date_start": options.date_start,
+            "date_end": options.date_end,
+            "normalization_policy": NORMALIZATION_POLICY,
+            "segment_mode": options.segment,
+            "id_scheme": scheme.name,
+            "structure": options.structure,
+        },
+    )
+    rows.merge_relationship(
+        "HAS_EDITION",
+        ("Work", "work_id", options.work_id),
+        ("Edition", "edition_id", edition_id),
+    )
+    plan_edition_period(rows, edition_id, options.date_start, options.date_end)
+
+    # Ordinals start at 1, so start_after == 0 (no checkpoint) skips nothing.
+    for ordinal, segment_text, segment_props in _iter_plaintext_segments(options):
+        if ordinal <= start_after:
+            continue
+
+        segment_id = scheme.segment_id(edition_id, ordinal)
+        rows.merge_node(
+            "Segment",
+            "segment_id",
+            segment_id,
+            {"text": segment_text, "position": ordinal, **segment_props},
+        )
+        rows.merge_relationship(
+            "HAS_SEGMENT",
+            ("Edition", "edition_id", edition_id),
+            ("Segment", "segment_id", segment_id),
+        )
+
+        for token_index, surface in enumerate(tokenize_v0(segment_text)):
+            token_id = scheme.token_id(segment_id, token_index)
+            form_id = scheme.form_id(language, surface)
+            lemma_id = scheme.lemma_id(language, surface)
+            rows.merge_node(
+                "Token",
+                "token_id",
+                token_id,
+                {
+                    "surface": surface,
+                    "position": token_index,
+                    "normalized": normalize_v0(surface),
+                },
+            )
+            rows.merge_node("Form", "form_id", form_id, {"orthography": surface, "language": language})
+            rows.merge_relationship(
+                "INSTANCE_OF_FORM",
+                ("Token", "token_id", token_id),
+                ("Form", "form_id", form_id),
+            )
+            rows.merge_relationship(
+                "HAS_TOKEN",
+                ("Segment", "segment_id", segment_id),
+                ("Token", "token_id", token_id),
+            )
+
+            # Temporary 1:1 mapping: one Lemma per Form, headword = surface.
+            rows.merge_node(
+                "Lemma",
+                "lemma_id",
+                lemma_id,
+                {"headword": surface, "language": language, "pos": "UNKNOWN"},
+            )
+            rows.merge_relationship(
+                "REALIZES",
+                ("Form", "form_id", form_id),
+                ("Lemma", "lemma_id", lemma_id),
+            )
+            batch.tokens += 1
+
+        batch.segments += 1
+        batch.last_ordinal = ordinal
+        if batch.segments >= batch_segments:
+            yield batch
+            batch = PlannedBatch(
+                edition_id=edition_id, rows=RowSet(), last_ordinal=batch.last_ordinal
+            )
+            rows = batch.rows
+
+    if batch.segments or batch.rows:
+        yield batch
+
+
+def _iter_plaintext_segments(options: PlaintextOptions) -> Iterator[tuple[int, str, dict]]:
+    segments = iter_file_segments(options.path, options.segment)
+    if options.structure is None:
+        for ordinal, text in segments:
+            yield ordinal, text, {"ref": str(ordinal)}
+        return
+
+    from nta.ingest.pipeline import _line_index
+
+    # Marker-only lines are dropped, so ordinals count content segments.
+    rules = structure_rules(options.structure)
+    for segment in rules.iter_structured(text for _, text in segments):
+        props = {
+            "ref": segment.ref,
+            "verse": segment.verse,
+            "strophe": segment.strophe,
+            "line_index": _line_index(segment.line),
+        }
+        if segment.chapter is not None:
+            props["chapter"] = segment.chapter
+        yield segment.ordinal, segment.text, props
+
+
+def ingest(args: argparse.Namespace, driver: Driver | None = None) -> tuple[int, int]:
+    """Ingest a plaintext file; opens (and closes) a driver unless one is given."""
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+    from nta.graph.repo import Neo4jRepository
+    from nta.ingest.pipeline import resolve_id_scheme
+    from nta.ingest.pipeline import write_batches
+
+    options = PlaintextOptions.from_args(args)
+    if not Path(options.path).exists():
+        raise FileNotFoundError(f"Input file not found: {options.path}")
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        options = replace(
+            options, id_scheme=resolve_id_scheme(driver, options.edition_id, options.id_scheme)
+        )
+        checkpointer = SegmentCheckpointer(
+            journal=CheckpointJournal(args.checkpoint_dir),
+            edition_id=options.edition_id,
+            config_hash=adapter_config_hash(options),
+            every=args.checkpoint_every,
+            resume=args.resume,
+        )
+        if checkpointer.resumed_from is not None:
+            print(f"Resuming after segment {checkpointer.start_after}")
+
+        batches = plan_plaintext(options, checkpointer.every, checkpointer.start_after)
+        counts = write_batches(Neo4jRepository(driver), batches, checkpointer)
+    finally:
+        if owns_driver:
+            driver.close()
+
+    return counts["segments"], counts["tokens"]
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    segments, tokens = ingest(args, driver=driver)
+    print(f"Segments ingested: {segments}")
+    print(f"Tokens ingested: {tokens}")
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable
+from typing import Iterator
+
+
+STRUCTURE_KINDS = ("chapter", "verse", "strophe")
+
+
+@dataclass(slots=True, frozen=True)
+class StructureRule:
+    """
+    One L1 marker rule.
+
+    ``pattern`` is matched at the start of a segment and must contain one
+    ``(?P<value>...)`` group holding the marker value. Text after the match is
+    content: a marker alone on its line emits no segment, ``"1. Gáttir"``
+    starts strophe 1 with the segment ``"Gáttir"``.
+    """
+
+    kind: str
+    pattern: str
+    flags: int = 0
+
+
+@dataclass(slots=True, frozen=True)
+class StructureRuleSet:
+    name: str
+    rules: tuple[StructureRule, ...]
+
+    def compile(self) -> CompiledRuleSet:
+        return CompiledRuleSet(self)
+
+
+# Not frozen: frozen __init__ goes through object.__setattr__ per field, which
+# made record construction dominate the detection loop.
+@dataclass(slots=True)
+class StructuredSegment:
+    ordinal: int
+    text: str
+    ref: str
+    chapter: str | None = None
+    verse: str | None = None
+    strophe: str | None = None
+    line: str | None = None
+
+
+class CompiledRuleSet:
+    """
+    A rule set compiled once into a single alternation.
+
+    Each segment costs one ``re.match`` call however many rules there are;
+    ``lastgroup`` names the rule that fired. Rules are tried in order, so put
+    the more specific ones (roman verse numbers) before the general ones.
+    """
+
+    __slots__ = ("name", "pattern", "_rules")
+
+    def __init__(self, rule_set: StructureRuleSet) -> None:
+        alternatives = []
+        for index, rule in enumerate(rule_set.rules):
+            if rule.kind not in STRUCTURE_KINDS:
+                raise ValueError(f"Unknown structure kind: {rule.kind!r}")
+            if rule.pattern.count("(?P<value>") != 1:
+                raise ValueError(f"Rule {index} needs exactly one (?P<value>...) group")
+            body = rule.pattern.replace("(?P<value>", f"(?P<v{index}>")
+            if rule.flags:
+                body = f"(?{_inline_flags(rule.flags)}:{body})"
+            alternatives.append(f"(?P<r{index}>{body})")
+        self.name = rule_set.name
+        self.pattern = re.compile("|".join(alternatives))
+        self._rules = {
+            f"r{index}": (rule.kind, f"v{index}") for index, rule in enumerate(rule_set.rules)
+        }
+
+    def match(self, text: str) -> tuple[str, str, str] | None:
+        """Return ``(kind, value, rest)`` for a marker at the start of ``text``."""
+        found = self.pattern.match(text)
+        if found is None:
+            return None
+        kind, value_group = self._rules[found.lastgroup]
+        return kind, found.group(value_group), text[found.end() :].strip()
+
+    def iter_structured(
+        self, segments: Iterable[str], start: int = 1
+    ) -> Iterator[StructuredSegment]:
+        """
+        Single pass over segment texts, tracking the enclosing markers.
+
+        A new chapter resets verse/strophe, a new verse resets strophe, and
+        any marker restarts the 0-based line counter. ``ref`` joins the known
+        chapter/verse/strophe values and the line index with ``.``
+        (``I.1.0``); ordinals count emitted segments only.
+        """
+        match = self.pattern.match
+        rules = self._rules
+        chapter = verse = strophe = None
+        prefix = ""
+        line = 0
+        ordinal = start
+        for text in segments:
+            found = match(text)
+            if found is not None:
+                kind, value_group = rules[found.lastgroup]
+                value = found.group(value_group)
+                if kind == "chapter":
+                    chapter, verse, strophe = value, None, None
+                elif kind == "verse":
+                    verse, strophe = value, None
+                else:
+                    strophe = value
+                prefix = "".join(
+                    f"{part}." for part in (chapter, verse, strophe) if part is not None
+                )
+                line = 0
+                text = text[found.end() :].strip()
+                if not text:
+                    continue
+            line_ref = str(line)
+            yield StructuredSegment(
+                ordinal, text, prefix + line_ref, chapter, verse, strophe, line_ref
+            )
+            ordinal += 1
+            line += 1
+
+
+def _inline_flags(flags: int) -> str:
+    letters = ""
+    for flag, letter in ((re.IGNORECASE, "i"), (re.UNICODE, "u")):
+        if flags & flag:
+            letters += letter
+    if flags & ~(re.IGNORECASE | re.UNICODE):
+        raise ValueError("Only re.IGNORECASE/re.UNICODE are supported per rule")
+    return letters
+
+
+# Versioned: changing a rule changes refs, so add a new name instead of editing.
+L1_RULES_V1 = StructureRuleSet(
+    name="l1_v1",
+    rules=(
+        StructureRule(
+            "chapter",
+            r"(?:chapter|kapittel|kapitel|kap\.)\s+(?P<value>[0-9IVXLCDM]+)\b\.?",
+            re.IGNORECASE,
+        ),
+        StructureRule("verse", r"(?P<value>[IVXLCDM]+)\.(?=\s*$)"),
+        StructureRule("strophe", r"(?P<value>\d+)\.(?:\s|$)"),
+    ),
+)
+
+STRUCTURE_RULESETS: dict[str, StructureRuleSet] = {L1_RULES_V1.name: L1_RULES_V1}
+_COMPILED: dict[str, CompiledRuleSet] = {}
+
+
+def structure_rules(name: str) -> CompiledRuleSet:
+    """Compiled rule set by name, compiled on first use and then reused."""
+    compiled = _COMPILED.get(name)
+    if compiled is None:
+        try:
+            rule_set = STRUCTURE_RULESETS[name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown structure rule set: {name!r} (expected one of {tuple(STRUCTURE_RULESETS)})"
+            ) from None
+        compiled = _COMPILED[name] = rule_set.compile()
+    return compiled
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Iterator
+
+from nta.ingest.adapters.base import RawSource
+from nta.ingest.adapters.tei import ADAPTER_VERSION
+from nta.ingest.adapters.tei import SEGMENT_TAGS
+from nta.ingest.adapters.tei import TeiAdapter
+from nta.ingest.cache import DEFAULT_CACHE_DIR
+from nta.ingest.cache import SourceCache
+from nta.ingest.cache import cached_adapt
+from nta.ingest.checkpoint import DEFAULT_CHECKPOINT_DIR
+from nta.ingest.checkpoint import DEFAULT_CHECKPOINT_EVERY
+from nta.ingest.checkpoint import CheckpointJournal
+from nta.ingest.checkpoint import SegmentCheckpointer
+from nta.ingest.checkpoint import config_hash
+from nta.ingest.checkpoint import source_fingerprint
+from nta.ingest.text import NORMALIZATION_POLICY_V0
+from nta.model import ids
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+    from nta.ingest.pipeline import PlannedBatch
+
+
+@dataclass(slots=True, frozen=True)
+class TeiOptions:
+    path: str
+    work_id: str
+    edition_id: str
+    source_label: str | None = None
+    language_stage: str | None = None
+    segment_tags: tuple[str, ...] = SEGMENT_TAGS
+    date_start: int | None = None
+    date_end: int | None = None
+    id_scheme: str | None = None
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "TeiOptions":
+        return cls(
+            path=str(args.path),
+            work_id=args.work_id,
+            edition_id=args.edition_id,
+            source_label=args.source_label,
+            language_stage=args.language_stage,
+            segment_tags=tuple(args.segment_tags.split(",")),
+            date_start=args.date_start,
+            date_end=args.date_end,
+            id_scheme=args.id_scheme,
+        )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--path", required=True, help="Path to a TEI XML file.")
+    parser.add_argument("--work-id", required=True, help="Work.work_id")
+    parser.add_argument("--edition-id", required=True, help="Edition.edition_id")
+    parser.add_argument("--source-label", default=None, help="Edition.source_label")
+    parser.add_argument(
+        "--language-stage",
+        default=None,
+        help="Language/stage code (default: xml:lang of <text>).",
+    )
+    parser.add_argument(
+        "--date-start",
+        type=int,
+        default=None,
+        help="Optional Edition.date_start year.",
+    )
+    parser.add_argument(
+        "--date-end",
+        type=int,
+        default=None,
+        help="Optional Edition.date_end year.",
+    )
+    parser.add_argument(
+        "--segment-tags",
+        default=",".join(SEGMENT_TAGS),
+        help="Comma-separated TEI elements emitted as segments (default: l,p).",
+    )
+    parser.add_argument(
+        "--id-scheme",
+        choices=ids.ID_SCHEMES,
+        default=None,
+        help=f"Segment/token/form ID scheme (default: {ids.DEFAULT_ID_SCHEME}).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue after the last committed checkpoint for this edition/config.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=DEFAULT_CHECKPOINT_EVERY,
+        help=f"Segments per checkpoint batch (default: {DEFAULT_CHECKPOINT_EVERY}).",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=str(DEFAULT_CHECKPOINT_DIR),
+        help=f"Progress journal directory (default: {DEFAULT_CHECKPOINT_DIR}).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Adapter output cache directory (default: {DEFAULT_CACHE_DIR}).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse the source even if a cached adapter output exists.",
+    )
+
+
+def adapter_config_hash(options: TeiOptions) -> str:
+    return config_hash(
+        adapter=ADAPTER_VERSION,
+        source=source_fingerprint(options.path),
+        work_id=options.work_id,
+        language_stage=options.language_stage,
+        segment_tags=list(options.segment_tags),
+        normalization_policy=NORMALIZATION_POLICY_V0,
+        id_scheme=ids.id_scheme(options.id_scheme).name,
+    )
+
+
+def plan_tei(
+    options: TeiOptions,
+    batch_segments: int = DEFAULT_CHECKPOINT_EVERY,
+    start_after: int = 0,
+    cache: SourceCache | None = None,
+) -> Iterator[PlannedBatch]:
+    """Stream a TEI file into planned write batches (no DB access)."""
+    from nta.ingest.pipeline import plan_adapter_output
+
+    adapter = TeiAdapter(
+        work_id=options.work_id,
+        edition_id=options.edition_id,
+        language=options.language_stage,
+        source_label=options.source_label,
+        date_start=options.date_start,
+        date_end=options.date_end,
+        segment_tags=options.segment_tags,
+        id_scheme=options.id_scheme,
+    )
+    raw_source = RawSource(source_id=options.edition_id, kind="tei_xml", origin=options.path)
+    adapter_output = cached_adapt(
+        adapter,
+        raw_source,
+        cache,
+        "tei",
+        ADAPTER_VERSION,
+        NORMALIZATION_POLICY_V0,
+        adapter.cache_settings(),
+    )
+    return plan_adapter_output(adapter_output, batch_segments, start_after)
+
+
+def ingest(args: argparse.Namespace, driver: Driver | None = None) -> tuple[int, int]:
+    """Ingest a TEI file; opens (and closes) a driver unless one is given."""
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+    from nta.graph.repo import Neo4jRepository
+    from nta.ingest.pipeline import resolve_id_scheme
+    from nta.ingest.pipeline import write_batches
+
+    options = TeiOptions.from_args(args)
+    if not Path(options.path).exists():
+        raise FileNotFoundError(f"Input file not found: {options.path}")
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        options = replace(
+            options, id_scheme=resolve_id_scheme(driver, options.edition_id, options.id_scheme)
+        )
+        checkpointer = SegmentCheckpointer(
+            journal=CheckpointJournal(args.checkpoint_dir),
+            edition_id=options.edition_id,
+            config_hash=adapter_config_hash(options),
+            every=args.checkpoint_every,
+            resume=args.resume,
+        )
+        if checkpointer.resumed_from is not None:
+            print(f"Resuming after segment {checkpointer.start_after}")
+
+        cache = None if args.no_cache else SourceCache(args.cache_dir)
+        batches = plan_tei(options, checkpointer.every, checkpointer.start_after, cache)
+        counts = write_batches(Neo4jRepository(driver), batches, checkpointer)
+    finally:
+        if owns_driver:
+            driver.close()
+
+    return counts["segments"], counts["tokens"]
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    segments, tokens = ingest(args, driver=driver)
+    print(f"Segments ingested: {segments}")
+    print(f"Tokens ingested: {tokens}")
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import base64
 import hashlib
 import re
 import unicodedata
+from dataclasses import dataclass
+from typing import Callable
 
 
 def _normalize(value: str) -> str:
@@ -69,3 +72,90 @@ def claim_id(
     claim_type: str, asserts_target_id: str, statement: str, source_id: str
 ) -> str:
     return f"claim:{_digest(claim_type, asserts_target_id, statement, source_id)}"
+
+
+# Compact scheme (v2) ---------------------------------------------------------
+#
+# Opt-in per edition (recorded as Edition.id_scheme). Keys are short enough
+# that unique-constraint indexes and relationship endpoints stay small:
+# - segment_id: <edition_key>.<position base36>          e.g. "k3x9q2ab.1a"
+# - token_id:   <segment_id>.<position base36>           e.g. "k3x9q2ab.1a.3"
+# - form_id:    "f" + 16 base32 chars (80-bit blake2b)   e.g. "fq2x...k7"
+# - lemma_id:   "l" + 16 base32 chars
+# Orthography and headwords are only NFC-normalized, so forms differing in
+# case stay distinct.
+
+ID_SCHEMES = ("v1", "v2")
+DEFAULT_ID_SCHEME = "v1"
+
+_BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+_FORM_ID_V2 = re.compile(r"f[a-z2-7]{16}")
+
+
+def _compact_digest(text: str, size: int) -> str:
+    raw = hashlib.blake2b(text.encode("utf-8"), digest_size=size).digest()
+    return base64.b32encode(raw).decode("ascii").rstrip("=").lower()
+
+
+def _base36(value: int) -> str:
+    if value < 0:
+        raise ValueError("position must be >= 0")
+    digits = ""
+    while True:
+        value, rem = divmod(value, 36)
+        digits = _BASE36[rem] + digits
+        if not value:
+            return digits
+
+
+def edition_key_v2(edition: str) -> str:
+    """8-char key for an exact edition_id (40-bit digest)."""
+    return _compact_digest(edition, 5)
+
+
+def segment_id_v2(edition: str, position: int) -> str:
+    return f"{edition_key_v2(edition)}.{_base36(position)}"
+
+
+def token_id_v2(segment: str, position: int) -> str:
+    return f"{segment}.{_base36(position)}"
+
+
+def form_id_v2(language: str, orthography: str) -> str:
+    text = f"{_normalize(language)}\t{unicodedata.normalize('NFC', orthography)}"
+    return "f" + _compact_digest(text, 10)
+
+
+def lemma_id_v2(language: str, headword: str) -> str:
+    text = f"{_normalize(language)}\t{unicodedata.normalize('NFC', headword)}"
+    return "l" + _compact_digest(text, 10)
+
+
+@dataclass(slots=True, frozen=True)
+class IdScheme:
+    """The ID constructors of one versioned scheme."""
+
+    name: str
+    segment_id: Callable[[str, int], str]
+    token_id: Callable[[str, int], str]
+    form_id: Callable[[str, str], str]
+    lemma_id: Callable[[str, str], str]
+
+
+_SCHEMES = {
+    "v1": IdScheme("v1", segment_id, token_id, form_id, lemma_id),
+    "v2": IdScheme("v2", segment_id_v2, token_id_v2, form_id_v2, lemma_id_v2),
+}
+
+
+def id_scheme(name: str | None = None) -> IdScheme:
+    """Look up a scheme by name; ``None`` means ``DEFAULT_ID_SCHEME``."""
+    try:
+        return _SCHEMES[name or DEFAULT_ID_SCHEME]
+    except KeyError:
+        raise ValueError(f"Unknown ID scheme: {name!r} (expected one of {ID_SCHEMES})") from None
+
+
+def form_id_scheme(form: str) -> str:
+    """The scheme a form_id was built with (adapter-specific keys count as v1)."""
+    return "v2" if _FORM_ID_V2.fullmatch(form) else "v1"
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass
+from typing import Any
+
+# Sentinels match the COALESCE defaults the date filters used before bounds
+# were stored, so undated editions still pass every year filter.
+DATE_MIN = -999999
+DATE_MAX = 999999
+
+
+@dataclass(slots=True, frozen=True)
+class EditionPeriod:
+    """
+    Normalized, never-null interval bounds for an Edition.
+
+    - ``date_lo``/``date_hi``: the known year range; a single known year is
+      used for both ends; undated editions get ``DATE_MIN``/``DATE_MAX``
+    - ``undated``: neither year was known (so the bounds are sentinels)
+    - ``centuries``: ``year // 100`` buckets the interval overlaps (empty when
+      undated); 1150 is century 11, -50 is century -1
+    """
+
+    date_lo: int
+    date_hi: int
+    undated: bool
+    centuries: tuple[int, ...] = ()
+
+    def properties(self) -> dict[str, Any]:
+        return {"date_lo": self.date_lo, "date_hi": self.date_hi, "undated": self.undated}
+
+
+def century(year: int) -> int:
+    return year // 100
+
+
+def edition_period(date_start: int | None, date_end: int | None) -> EditionPeriod:
+    """Bounds for an Edition; a reversed range is swapped with a warning, not rejected."""
+    if date_start is None and date_end is None:
+        return EditionPeriod(DATE_MIN, DATE_MAX, True)
+    lo = date_start if date_start is not None else date_end
+    hi = date_end if date_end is not None else date_start
+    if lo > hi:
+        warnings.warn(
+            f"date_start {lo} is after date_end {hi}; using {hi}-{lo}", stacklevel=2
+        )
+        lo, hi = hi, lo
+    return EditionPeriod(lo, hi, False, tuple(range(century(lo), century(hi) + 1)))
@@ -0,0 +1 @@
+"""Read-only report helpers over the graph."""
@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import math
+import shutil
+import sys
+import tempfile
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterable
+from typing import Iterator
+from typing import Sequence
+from typing import TextIO
+
+Gram = tuple[str, ...]
+
+MEASURES = ("llr", "pmi", "count")
+DEFAULT_MAX_ENTRIES = 1_000_000
+DEFAULT_SKETCH_WIDTH = 1 << 21
+DEFAULT_SKETCH_DEPTH = 4
+DEFAULT_CANDIDATES = 200_000
+# Spilled keys join terms with a unit separator; it sorts below every
+# printable character, so string order equals tuple order.
+_KEY_SEP = "\x1f"
+_MASK32 = 0xFFFFFFFF
+
+
+class SpillingCounter:
+    """
+    Exact gram counts with bounded memory.
+
+    Counts accumulate in a ``Counter``; once it holds more than
+    ``max_entries`` keys it is written as a sorted run to a temporary
+    directory and cleared. ``items()`` merges the runs (and what is still in
+    memory) into one sorted stream, so memory stays at ``max_entries`` keys
+    plus one line per run regardless of corpus size.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, spill_dir: str | None = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.spill_dir = spill_dir
+        self.runs: list[Path] = []
+        self._counts: Counter[Gram] = Counter()
+        self._tmp: str | None = None
+
+    def update(self, grams: Iterable[Gram]) -> None:
+        self._counts.update(grams)
+        if len(self._counts) > self.max_entries:
+            self._spill()
+
+    def _spill(self) -> None:
+        if self._tmp is None:
+            self._tmp = tempfile.mkdtemp(prefix="nta-colloc-", dir=self.spill_dir)
+        path = Path(self._tmp) / f"run{len(self.runs):05d}.tsv"
+        rows = sorted((_KEY_SEP.join(gram), count) for gram, count in self._counts.items())
+        with path.open("w", encoding="utf-8") as fh:
+            fh.writelines(f"{key}\t{count}\n" for key, count in rows)
+        self.runs.append(path)
+        self._counts.clear()
+
+    def items(self) -> Iterator[tuple[Gram, int]]:
+        """Every gram with its exact count, in sorted order."""
+        memory = sorted((_KEY_SEP.join(gram), count) for gram, count in self._counts.items())
+        streams = [_read_run(path) for path in self.runs]
+        merged = heapq.merge(iter(memory), *streams, key=itemgetter(0))
+        for key, group in groupby(merged, key=itemgetter(0)):
+            yield tuple(key.split(_KEY_SEP)), sum(count for _, count in group)
+
+    def close(self) -> None:
+        if self._tmp is not None:
+            shutil.rmtree(self._tmp, ignore_errors=True)
+            self._tmp = None
+        self.runs = []
+
+
+def _read_run(path: Path) -> Iterator[tuple[str, int]]:
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            key, _, count = line.rstrip("\n").rpartition("\t")
+            yield key, int(count)
+
+
+class CountMinSketch:
+    """
+    Count-min sketch with conservative update.
+
+    Estimates never undercount; with ``width = e / epsilon`` and
+    ``depth = ln(1 / delta)`` they overcount by more than ``epsilon * total``
+    with probability at most ``delta``. Cells use Python's ``hash``, so a
+    sketch is only meaningful within one process.
+    """
+
+    def __init__(self, width: int = DEFAULT_SKETCH_WIDTH, depth: int = DEFAULT_SKETCH_DEPTH):
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be positive")
+        self.width = width
+        self.depth = depth
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    @classmethod
+    def for_error(cls, epsilon: float, delta: float) -> CountMinSketch:
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)))
+
+    def _cells(self, key: object) -> list[int]:
+        # Double hashing: depth cells from one 64-bit hash.
+        h = hash(key)
+        h1 = h & _MASK32
+        h2 = ((h >> 32) & _MASK32) | 1
+        width = self.width
+        return [(h1 + i * h2) % width for i in range(self.depth)]
+
+    def add(self, key: object, count: int = 1) -> int:
+        """Add ``count`` and return the new estimate."""
+        cells = self._cells(key)
+        rows = self.rows
+        estimate = min(row[cell] for row, cell in zip(rows, cells)) + count
+        for row, cell in zip(rows, cells):
+            if row[cell] < estimate:
+                row[cell] = estimate
+        return estimate
+
+    def estimate(self, key: object) -> int:
+        return min(row[cell] for row, cell in zip(self.rows, self._cells(key)))
+
+
+class SketchCounter:
+    """
+    Approximate gram counts in fixed memory: a count-min sketch plus the
+    ``capacity`` heaviest grams seen so far.
+
+    Reported counts are sketch estimates (never below the true count). Grams
+    that drop out of the candidate set keep their history in the sketch, so
+    a late-rising gram comes back with its full estimate.
+    """
+
+    def __init__(
+        self,
+        sketch: CountMinSketch | None = None,
+        capacity: int = DEFAULT_CANDIDATES,
+        min_count: int = 1,
+    ):
+        self.sketch = sketch or CountMinSketch()
+        self.capacity = capacity
+        self.floor = min_count
+        self.candidates: dict[Gram, int] = {}
+        self._pending: Counter[Gram] = Counter()
+
+    def update(self, grams: Iterable[Gram]) -> None:
+        # Pre-aggregating keeps the per-key sketch work to distinct grams.
+        self._pending.update(grams)
+        if len(self._pending) >= self.capacity:
+            self._flush()
+
+    def _flush(self) -> None:
+        add = self.sketch.add
+        candidates = self.candidates
+        floor = self.floor
+        for gram, count in self._pending.items():
+            estimate = add(gram, count)
+            if estimate >= floor:
+                candidates[gram] = estimate
+        self._pending.clear()
+        if len(candidates) > 2 * self.capacity:
+            kept = heapq.nlargest(self.capacity, candidates.items(), key=itemgetter(1))
+            self.candidates = dict(kept)
+            self.floor = max(floor, kept[-1][1])
+
+    def items(self) -> Iterator[tuple[Gram, int]]:
+        self._flush()
+        yield from sorted(self.candidates.items())
+
+    def close(self) -> None:
+        self.candidates = {}
+        self._pending.clear()
+
+
+@dataclass(slots=True, frozen=True)
+class Collocation:
+    terms: Gram
+    count: int
+    pmi: float
+    llr: float | None
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "terms": list(self.terms),
+            "count": self.count,
+            "pmi": round(self.pmi, 4),
+            "llr": None if self.llr is None else round(self.llr, 4),
+        }
+
+
+def log_likelihood(k11: int, k12: int, k21: int, k22: int) -> float:
+    """Dunning's G² for a 2x2 contingency table (``k11`` = pair count)."""
+    total = k11 + k12 + k21 + k22
+    rows = (k11 + k12, k21 + k22)
+    cols = (k11 + k21, k12 + k22)
+    g2 = 0.0
+    for observed, row, col in ((k11, 0, 0), (k12, 0, 1), (k21, 1, 0), (k22, 1, 1)):
+        if observed > 0:
+            g2 += observed * math.log(observed * total / (rows[row] * cols[col]))
+    return 2.0 * g2
+
+
+class CollocationCounter:
+    """
+    Streaming n-gram and co-occurrence counts over term sequences.
+
+    - ``window == 0``: contiguous ``n``-grams (``n == 2`` is adjacent pairs)
+    - ``window > 0``: ordered pairs ``(a, b)`` with ``b`` 1..``window``
+      tokens after ``a`` (``n`` must be 2)
+
+    Grams never cross sequence (segment) boundaries. Unigram counts and pair
+    marginals are exact and vocabulary-sized; gram counts go to ``grams``,
+    a ``SpillingCounter`` (exact) or ``SketchCounter`` (approximate).
+    """
+
+    def __init__(
+        self,
+        n: int = 2,
+        window: int = 0,
+        grams: SpillingCounter | SketchCounter | None = None,
+    ):
+        if n < 2:
+            raise ValueError("n must be at least 2")
+        if window < 0:
+            raise ValueError("window must be non-negative")
+        if window and n != 2:
+            raise ValueError("Windowed co-occurrence counts pairs; use n=2")
+        self.n = n
+        self.window = window or (1 if n == 2 else 0)
+        self.grams = grams if grams is not None else SpillingCounter()
+        self.unigrams: Counter[str] = Counter()
+        self.left: Counter[str] = Counter()
+        self.right: Counter[str] = Counter()
+        self.tokens = 0
+        self.total = 0
+
+    def __enter__(self) -> CollocationCounter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.grams.close()
+
+    def add(self, terms: Sequence[str]) -> None:
+        """Count one sequence (typically a segment's normalized terms)."""
+        size = len(terms)
+        self.tokens += size
+        self.unigrams.update(terms)
+        if self.window:
+            # Counter.update over zips and slices runs in C; the marginals
+            # count each token once per pair it opens or closes.
+            for distance in range(1, min(self.window, size - 1) + 1):
+                self.grams.update(zip(terms, terms[distance:]))
+                self.left.update(terms[: size - distance])
+                self.right.update(terms[distance:])
+                self.total += size - distance
+        elif size >= self.n:
+            self.grams.update(zip(*(terms[i:] for i in range(self.n))))
+            self.total += size - self.n + 1
+
+    def add_all(self, sequences: Iterable[Sequence[str]]) -> None:
+        for terms in sequences:
+            self.add(terms)
+
+    def score(self, gram: Gram, count: int) -> Collocation:
+        """
+        PMI (bits) for any gram; G² for pairs.
+
+        G² is signed: negative when the pair occurs less often than its
+        marginals predict (PMI < 0), so ranking by ``llr`` puts attraction
+        first and strongly avoided pairs last.
+        """
+        if self.window:
+            first, second = gram
+            left = self.left[first]
+            right = self.right[second]
+            total = self.total
+            pmi = math.log2(count * total / (left * right))
+            llr = log_likelihood(
+                count, left - count, right - count, total - left - right + count
+            )
+            return Collocation(gram, count, pmi, -llr if pmi < 0 else llr)
+        log_expected = sum(math.log2(self.unigrams[term] / self.tokens) for term in gram)
+        return Collocation(gram, count, math.log2(count / self.total) - log_expected, None)
+
+    def top(
+        self,
+        measure: str = "llr",
+        limit: int = 50,
+        min_count: int = 5,
+    ) -> list[Collocation]:
+        """
+        The ``limit`` best grams with at least ``min_count`` occurrences.
+
+        Grams stream out of the counter in sorted order and only the current
+        best ``limit`` are held, so ranking is as memory-bounded as counting.
+        Ties keep the gram order.
+        """
+        if measure not in MEASURES:
+            raise ValueError(f"Unsupported measure: {measure}")
+        if measure == "llr" and not self.window:
+            raise ValueError("Log-likelihood is defined for pairs; use n=2 or --window")
+        rows = (
+            self.score(gram, count)
+            for gram, count in self.grams.items()
+            if count >= min_count
+        )
+        if measure == "count":
+            return heapq.nlargest(limit, rows, key=lambda row: row.count)
+        return heapq.nlargest(limit, rows, key=lambda row: (getattr(row, measure), row.count))
+
+
+def write_tsv(rows: Iterable[Collocation], out: TextIO) -> int:
+    out.write("terms\tcount\tpmi\tllr\n")
+    count = 0
+    for row in rows:
+        llr = "" if row.llr is None else f"{row.llr:.4f}"
+        out.write(f"{' '.join(row.terms)}\t{row.count}\t{row.pmi:.4f}\t{llr}\n")
+        count += 1
+    return count
+
+
+def write_jsonl(rows: Iterable[Collocation], out: TextIO) -> int:
+    count = 0
+    for row in rows:
+        out.write(json.dumps(row.as_dict(), ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    from nta.search.build import add_source_arguments
+
+    add_source_arguments(parser)
+    parser.add_argument(
+        "--only-edition",
+        action="append",
+        default=[],
+        help="Count only segments of this edition_id; repeatable (default: whole corpus).",
+    )
+    parser.add_argument("--n", type=int, default=2, help="Gram length (default: 2).")
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=0,
+        help="Count ordered pairs up to this many tokens apart instead of contiguous n-grams.",
+    )
+    parser.add_argument("--measure", choices=MEASURES, default=None, help="Ranking measure.")
+    parser.add_argument("--min-count", type=int, default=5, help="Minimum gram count (default: 5).")
+    parser.add_argument("--limit", type=int, default=50, help="Rows to report (default: 50).")
+    parser.add_argument(
+        "--max-entries",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help=f"Exact mode: distinct grams held before spilling (default: {DEFAULT_MAX_ENTRIES}).",
+    )
+    parser.add_argument("--spill-dir", default=None, help="Directory for spilled runs.")
+    parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help="Count grams with a count-min sketch in fixed memory (counts may be high).",
+    )
+    parser.add_argument("--sketch-width", type=int, default=DEFAULT_SKETCH_WIDTH)
+    parser.add_argument("--sketch-depth", type=int, default=DEFAULT_SKETCH_DEPTH)
+    parser.add_argument("--format", choices=["tsv", "jsonl"], default="tsv")
+    parser.add_argument("--output", default="-", help="Output path (default: stdout).")
+
+
+def run(args: argparse.Namespace) -> int:
+    from nta.search.build import source_docs
+
+    if not (args.dir or args.manifest or args.jsonl):
+        print("Nothing to count: pass --dir, --manifest and/or --jsonl.")
+        return 2
+    measure = args.measure or ("llr" if args.n == 2 else "pmi")
+    if args.approximate:
+        sketch = CountMinSketch(args.sketch_width, args.sketch_depth)
+        grams: SpillingCounter | SketchCounter = SketchCounter(
+            sketch, capacity=max(args.limit * 100, DEFAULT_CANDIDATES), min_count=args.min_count
+        )
+    else:
+        grams = SpillingCounter(args.max_entries, args.spill_dir)
+    only = set(args.only_edition)
+    docs = source_docs(args)
+    with CollocationCounter(args.n, args.window, grams) as counter:
+        counter.add_all(doc.terms for doc in docs if not only or doc.edition_id in only)
+        rows = counter.top(measure, args.limit, args.min_count)
+        spills = len(grams.runs) if isinstance(grams, SpillingCounter) else 0
+    write = write_jsonl if args.format == "jsonl" else write_tsv
+    if args.output == "-":
+        write(rows, sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            write(rows, out)
+    print(
+        f"{counter.tokens} tokens, {counter.total} grams, {len(counter.unigrams)} types, "
+        f"{spills} spilled runs",
+        file=sys.stderr,
+    )
+    return 0
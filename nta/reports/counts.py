@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_JSON_PATH = REPO_ROOT / "data" / "Hávamál1.json"
+
+TOP_TOKENS_QUERY = """
+MATCH (t:Token)
+WHERE t.surface IS NOT NULL AND t.surface <> ""
+RETURN t.surface AS surface, count(*) AS freq
+ORDER BY freq DESC, surface ASC
+LIMIT $limit
+"""
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--source",
+        choices=["graph", "json"],
+        default="graph",
+        help="Use 'graph' (default) for Neo4j counts or 'json' for old local logic.",
+    )
+    parser.add_argument(
+        "--input",
+        default=str(DEFAULT_JSON_PATH),
+        help="Hávamál JSON path for --source json (default: data/Hávamál1.json).",
+    )
+    parser.add_argument("--limit", type=int, default=20, help="Rows for --source graph.")
+
+
+def strip_line(line: str) -> list[str]:
+    """Old JSON tokenization logic kept for compatibility."""
+    strip = [".", ",", ";", ":", "!", "?", '"']
+    words = line.split(" ")
+    for char in strip:
+        words = [word.replace(char, "").lower() for word in words]
+    return words
+
+
+def count_from_json(file_path: str | Path = DEFAULT_JSON_PATH) -> dict[str, int]:
+    """Original logic: count words from local Havamal JSON (sorted by word)."""
+    with Path(file_path).open("rb") as fh:
+        data = json.load(fh)
+
+    counts: dict[str, int] = {}
+    for verse in data["poem"]["verses"]:
+        for strophe in verse["strophes"]:
+            for line in strophe["lines"]:
+                for word in strip_line(line):
+                    counts[word] = counts.get(word, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+@lru_cache(maxsize=8)
+def _cached_counts(path: str, mtime_ns: int) -> dict[str, int]:
+    # Keyed by mtime so a warm daemon re-parses only files that changed.
+    return count_from_json(path)
+
+
+def print_top_tokens_from_graph(driver: Driver | None = None, limit: int = 20) -> None:
+    """Graph logic: count Token nodes grouped by surface in Neo4j."""
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        with driver.session() as session:
+            for record in session.run(TOP_TOKENS_QUERY, limit=limit):
+                print(f"{record['surface']}: {record['freq']}")
+    finally:
+        if owns_driver:
+            driver.close()
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    if args.source == "graph":
+        print_top_tokens_from_graph(driver=driver, limit=args.limit)
+        return
+
+    # Keep old behavior available until fully retired.
+    path = Path(args.input).resolve()
+    counts = _cached_counts(str(path), path.stat().st_mtime_ns)
+    for word, count in counts.items():
+        if count > 1:
+            print(f"{word}: {count}")
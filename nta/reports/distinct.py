@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterable
+
+from nta.model.hll import EDITION_SKETCHES
+from nta.model.hll import HLL_PRECISION
+from nta.model.hll import HyperLogLog
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+GROUPINGS = ("edition", "language_stage", "century")
+
+# Reads only Edition properties (plus IN_CENTURY), never Tokens.
+SKETCHES_QUERY = """
+MATCH (e:Edition)
+WHERE ($edition_ids IS NULL OR e.edition_id IN $edition_ids)
+  AND ($language_stage IS NULL OR e.language_stage = $language_stage)
+  AND ($century IS NULL OR EXISTS { MATCH (e)-[:IN_CENTURY]->(:Century {century: $century}) })
+RETURN e.edition_id AS edition_id,
+       e.language_stage AS language_stage,
+       [(e)-[:IN_CENTURY]->(c:Century) | c.century] AS centuries,
+       e.hll_forms AS forms,
+       e.hll_lemmas AS lemmas,
+       e.hll_surfaces AS surfaces
+ORDER BY edition_id
+"""
+
+BACKFILL_EDITIONS_QUERY = """
+MATCH (e:Edition)
+WHERE $all OR e.hll_forms IS NULL
+RETURN e.edition_id AS edition_id
+ORDER BY edition_id
+"""
+
+EDITION_TERMS_QUERY = """
+MATCH (:Edition {edition_id: $edition_id})-[:HAS_SEGMENT]->(:Segment)-[:HAS_TOKEN]->(t:Token)
+OPTIONAL MATCH (t)-[:INSTANCE_OF_FORM]->(f:Form)
+OPTIONAL MATCH (f)-[r:REALIZES]->(l:Lemma)
+WHERE coalesce(r.is_active, true)
+RETURN t.surface AS surface, f.form_id AS form_id, l.lemma_id AS lemma_id
+"""
+
+STORE_SKETCHES_QUERY = """
+MATCH (e:Edition {edition_id: $edition_id})
+SET e.hll_forms = $forms, e.hll_lemmas = $lemmas, e.hll_surfaces = $surfaces
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class DistinctCounts:
+    """
+    Estimated distinct forms, lemmas and surfaces over a set of editions.
+
+    ``unsketched`` counts matching editions without stored sketches (ingested
+    before sketches existed; see ``--backfill``); they add nothing to the
+    estimates. Estimates are within ``standard_error`` (relative) about 68%
+    of the time and within three times that almost always.
+    """
+
+    group: str | int | None
+    editions: int
+    forms: int
+    lemmas: int
+    surfaces: int
+    unsketched: int
+    standard_error: float
+
+
+def merge_sketch_rows(
+    rows: Iterable[dict[str, Any]], by: str | None = None
+) -> list[DistinctCounts]:
+    """Union the stored sketches of ``rows``, overall or per ``by`` group."""
+    if by is not None and by not in GROUPINGS:
+        raise ValueError(f"Unsupported grouping: {by}")
+    groups: dict[Any, dict[str, Any]] = {}
+    for row in rows:
+        if by is None:
+            keys: list[Any] = [None]
+        elif by == "edition":
+            keys = [row["edition_id"]]
+        elif by == "century":
+            keys = list(row.get("centuries") or [None])
+        else:
+            keys = [row.get("language_stage")]
+        for key in keys:
+            group = groups.setdefault(key, {"editions": 0, "unsketched": 0, "sketches": {}})
+            group["editions"] += 1
+            if row.get("forms") is None:
+                group["unsketched"] += 1
+                continue
+            for name in EDITION_SKETCHES:
+                registers = row.get(name)
+                if registers is None:
+                    continue
+                sketch = HyperLogLog.from_list(registers)
+                if name in group["sketches"]:
+                    group["sketches"][name].merge(sketch)
+                else:
+                    group["sketches"][name] = sketch
+
+    results = []
+    # Centuries sort numerically (9 before 10), labels alphabetically, None last.
+    for key in sorted(groups, key=_group_order):
+        group = groups[key]
+        sketches = group["sketches"]
+        counts = {
+            name: sketches[name].count() if name in sketches else 0 for name in EDITION_SKETCHES
+        }
+        error = next(iter(sketches.values())).standard_error if sketches else 0.0
+        results.append(
+            DistinctCounts(
+                group=key,
+                editions=group["editions"],
+                unsketched=group["unsketched"],
+                standard_error=round(error, 4),
+                **counts,
+            )
+        )
+    return results
+
+
+def distinct_counts(
+    session: Any,
+    edition_ids: list[str] | None = None,
+    language_stage: str | None = None,
+    century: int | None = None,
+    by: str | None = None,
+) -> list[DistinctCounts]:
+    result = session.run(
+        SKETCHES_QUERY,
+        edition_ids=edition_ids or None,
+        language_stage=language_stage,
+        century=century,
+    )
+    return merge_sketch_rows((record.data() for record in result), by)
+
+
+def edition_sketches_from_rows(
+    rows: Iterable[dict[str, Any]], precision: int = HLL_PRECISION
+) -> dict[str, HyperLogLog]:
+    """Sketches of one edition from ``EDITION_TERMS_QUERY`` rows."""
+    sketches = {name: HyperLogLog(precision) for name in EDITION_SKETCHES}
+    for row in rows:
+        if row.get("surface") is not None:
+            sketches["surfaces"].add(row["surface"])
+        if row.get("form_id") is not None:
+            sketches["forms"].add(row["form_id"])
+        if row.get("lemma_id") is not None:
+            sketches["lemmas"].add(row["lemma_id"])
+    return sketches
+
+
+def backfill_sketches(driver: Driver, rebuild: bool = False) -> int:
+    """
+    Recompute sketches from the graph for editions that lack them (or all).
+
+    Use ``rebuild`` after changes that ingest cannot see, such as re-mapped
+    ``REALIZES`` edges or a re-ingested, shortened source. Returns editions
+    written.
+    """
+    with driver.session() as session:
+        edition_ids = [
+            record["edition_id"] for record in session.run(BACKFILL_EDITIONS_QUERY, all=rebuild)
+        ]
+        for edition_id in edition_ids:
+            result = session.run(EDITION_TERMS_QUERY, edition_id=edition_id)
+            sketches = edition_sketches_from_rows(record.data() for record in result)
+            session.run(
+                STORE_SKETCHES_QUERY,
+                edition_id=edition_id,
+                **{name: sketch.to_list() for name, sketch in sketches.items()},
+            ).consume()
+    return len(edition_ids)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--edition-id", action="append", default=[], help="Restrict to this edition; repeatable."
+    )
+    parser.add_argument("--language-stage", default=None, help="Restrict to a language stage.")
+    parser.add_argument("--century", type=int, default=None, help="Restrict to a century bucket.")
+    parser.add_argument("--by", choices=GROUPINGS, default=None, help="Report one row per group.")
+    parser.add_argument("--jsonl", action="store_true", help="Print rows as JSON lines.")
+    parser.add_argument(
+        "--backfill",
+        choices=["missing", "all"],
+        default=None,
+        help="First recompute sketches from Tokens for editions missing them (or all).",
+    )
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        if args.backfill:
+            written = backfill_sketches(driver, rebuild=args.backfill == "all")
+            print(f"Backfilled sketches for {written} editions.")
+        with driver.session() as session:
+            rows = distinct_counts(
+                session, args.edition_id, args.language_stage, args.century, args.by
+            )
+    finally:
+        if owns_driver:
+            driver.close()
+
+    if args.jsonl:
+        for row in rows:
+            print(json.dumps(asdict(row), ensure_ascii=False))
+        return
+    print(f"{'group':<24} {'editions':>8} {'forms':>10} {'lemmas':>10} {'surfaces':>10}")
+    for row in rows:
+        group = "all" if row.group is None and args.by is None else str(row.group)
+        print(
+            f"{group:<24} {row.editions:>8} {row.forms:>10} {row.lemmas:>10} {row.surfaces:>10}"
+        )
+    if rows:
+        print(f"(estimates, ±{rows[0].standard_error:.1%} standard error)")
+        unsketched = sum(row.unsketched for row in rows)
+        if unsketched:
+            print(f"({unsketched} editions have no sketches; run with --backfill missing)")
+
+
+def _group_order(value: Any) -> tuple[bool, bool, Any]:
+    numeric = isinstance(value, int)
+    return value is None, not numeric, value if numeric else str(value)
@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import TextIO
+
+from nta.graph.fulltext import FULLTEXT_MODES
+from nta.graph.fulltext import matching_edition_ids
+from nta.model.periods import century
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+# Filters are resolved once, before the report queries, into $edition_ids
+# (null = no filter), so every query expands from a fixed set of editions:
+# - --from-year/--to-year through the Century buckets (EDITIONS_IN_YEARS_QUERY)
+# - --source-like through the Edition.source_label full-text index
+# Both given: editions matching both.
+# REALIZES links retired by "nta lemmas remap" carry is_active = false; links
+# written by ingest have no is_active and count as active.
+
+# Editions overlapping a year range: only the Century buckets in range are
+# scanned (a seek on the century key), then the stored date_lo/date_hi bounds
+# trim partial overlaps. Undated editions have sentinel bounds and pass every
+# year filter, as before the buckets; editions without bounds never match one.
+EDITIONS_IN_YEARS_QUERY = """
+MATCH (c:Century)
+WHERE ($from_century IS NULL OR c.century >= $from_century)
+  AND ($to_century IS NULL OR c.century <= $to_century)
+MATCH (c)<-[:IN_CENTURY]-(e:Edition)
+WHERE ($from_year IS NULL OR e.date_hi >= $from_year)
+  AND ($to_year IS NULL OR e.date_lo <= $to_year)
+RETURN DISTINCT e.edition_id AS edition_id
+UNION
+MATCH (e:Edition {undated: true})
+RETURN e.edition_id AS edition_id
+"""
+
+TOP_FORMS_QUERY = """
+MATCH (l:Lemma {lemma_id: $lemma_id})<-[r:REALIZES]-(f:Form)<-[:INSTANCE_OF_FORM]-(t:Token)
+WHERE coalesce(r.is_active, true)
+MATCH (s:Segment)-[:HAS_TOKEN]->(t)
+MATCH (e:Edition)-[:HAS_SEGMENT]->(s)
+WHERE ($edition_ids IS NULL OR e.edition_id IN $edition_ids)
+RETURN t.surface AS surface,
+       count(*) AS freq
+ORDER BY freq DESC, surface ASC
+LIMIT $limit
+"""
+
+TOP_FORMS_BY_SOURCE_FALLBACK_QUERY = """
+MATCH (l:Lemma {lemma_id: $lemma_id})<-[r:REALIZES]-(f:Form)<-[:INSTANCE_OF_FORM]-(t:Token)
+WHERE coalesce(r.is_active, true)
+MATCH (s:Segment)-[:HAS_TOKEN]->(t)
+MATCH (e:Edition)-[:HAS_SEGMENT]->(s)
+WHERE ($edition_ids IS NULL OR e.edition_id IN $edition_ids)
+RETURN COALESCE(e.source_label, "(unknown source)") AS source_label,
+       e.date_start AS date_start,
+       e.date_end AS date_end,
+       t.surface AS surface,
+       count(*) AS freq
+ORDER BY source_label ASC, freq DESC, surface ASC
+LIMIT $limit
+"""
+
+FEATURE_COUNTS_QUERY = """
+MATCH (l:Lemma {lemma_id: $lemma_id})<-[:ANALYZES_AS]-(m:MorphAnalysis)<-[:HAS_ANALYSIS]-(t:Token)
+MATCH (s:Segment)-[:HAS_TOKEN]->(t)
+MATCH (e:Edition)-[:HAS_SEGMENT]->(s)
+WHERE ($edition_ids IS NULL OR e.edition_id IN $edition_ids)
+OPTIONAL MATCH (m)-[:HAS_FEATURE]->(f_case:Feature {key: "case"})
+OPTIONAL MATCH (m)-[:HAS_FEATURE]->(f_number:Feature {key: "number"})
+OPTIONAL MATCH (m)-[:HAS_FEATURE]->(f_gender:Feature {key: "gender"})
+RETURN COALESCE(f_case.value, "NA") AS case,
+       COALESCE(f_number.value, "NA") AS number,
+       COALESCE(f_gender.value, "NA") AS gender,
+       count(*) AS freq
+ORDER BY freq DESC, case, number, gender
+LIMIT $limit
+"""
+
+EXAMPLES_QUERY = """
+MATCH (l:Lemma {lemma_id: $lemma_id})<-[r:REALIZES]-(f:Form)<-[:INSTANCE_OF_FORM]-(t:Token)
+WHERE coalesce(r.is_active, true)
+MATCH (s:Segment)-[:HAS_TOKEN]->(t)
+MATCH (e:Edition)-[:HAS_SEGMENT]->(s)
+WHERE ($edition_ids IS NULL OR e.edition_id IN $edition_ids)
+RETURN COALESCE(e.source_label, "(unknown source)") AS source_label,
+       e.date_start AS date_start,
+       e.date_end AS date_end,
+       s.ref AS segment_ref,
+       t.surface AS surface,
+       s.text AS segment_text
+ORDER BY COALESCE(e.date_start, 999999), source_label, segment_ref, t.position
+LIMIT $limit
+"""
+
+# Batch variants: one round trip per query per chunk of lemmas. Rows are
+# ordered as in the single-lemma queries, then collected and cut to $limit
+# per lemma.
+_BATCH_MATCH = """
+UNWIND $lemma_ids AS lemma_id
+MATCH (:Lemma {lemma_id: lemma_id})<-[r:REALIZES]-(f:Form)<-[:INSTANCE_OF_FORM]-(t:Token)
+WHERE coalesce(r.is_active, true)
+MATCH (s:Segment)-[:HAS_TOKEN]->(t)
+MATCH (e:Edition)-[:HAS_SEGMENT]->(s)
+"""
+
+_BATCH_FILTERS = """
+WHERE ($edition_ids IS NULL OR e.edition_id IN $edition_ids)
+"""
+
+BATCH_TOP_FORMS_QUERY = (
+    _BATCH_MATCH
+    + _BATCH_FILTERS
+    + """
+WITH lemma_id, t.surface AS surface, count(*) AS freq
+ORDER BY freq DESC, surface ASC
+WITH lemma_id, collect({surface: surface, freq: freq})[..$limit] AS rows
+RETURN lemma_id, rows
+"""
+)
+
+BATCH_TOP_FORMS_BY_SOURCE_FALLBACK_QUERY = (
+    _BATCH_MATCH
+    + """
+WHERE ($edition_ids IS NULL OR e.edition_id IN $edition_ids)
+WITH lemma_id,
+     COALESCE(e.source_label, "(unknown source)") AS source_label,
+     e.date_start AS date_start,
+     e.date_end AS date_end,
+     t.surface AS surface,
+     count(*) AS freq
+ORDER BY source_label ASC, freq DESC, surface ASC
+WITH lemma_id, collect({
+  source_label: source_label, date_start: date_start, date_end: date_end,
+  surface: surface, freq: freq
+})[..$limit] AS rows
+RETURN lemma_id, rows
+"""
+)
+
+BATCH_FEATURE_COUNTS_QUERY = (
+    """
+UNWIND $lemma_ids AS lemma_id
+MATCH (:Lemma {lemma_id: lemma_id})<-[:ANALYZES_AS]-(m:MorphAnalysis)<-[:HAS_ANALYSIS]-(t:Token)
+MATCH (s:Segment)-[:HAS_TOKEN]->(t)
+MATCH (e:Edition)-[:HAS_SEGMENT]->(s)
+"""
+    + _BATCH_FILTERS
+    + """
+OPTIONAL MATCH (m)-[:HAS_FEATURE]->(f_case:Feature {key: "case"})
+OPTIONAL MATCH (m)-[:HAS_FEATURE]->(f_number:Feature {key: "number"})
+OPTIONAL MATCH (m)-[:HAS_FEATURE]->(f_gender:Feature {key: "gender"})
+WITH lemma_id,
+     COALESCE(f_case.value, "NA") AS case,
+     COALESCE(f_number.value, "NA") AS number,
+     COALESCE(f_gender.value, "NA") AS gender,
+     count(*) AS freq
+ORDER BY freq DESC, case, number, gender
+WITH lemma_id, collect({case: case, number: number, gender: gender, freq: freq})[..$limit] AS rows
+RETURN lemma_id, rows
+"""
+)
+
+BATCH_EXAMPLES_QUERY = (
+    _BATCH_MATCH
+    + _BATCH_FILTERS
+    + """
+WITH lemma_id, e, s, t
+ORDER BY COALESCE(e.date_start, 999999), COALESCE(e.source_label, "(unknown source)"), s.ref, t.position
+WITH lemma_id, collect({
+  source_label: COALESCE(e.source_label, "(unknown source)"),
+  date_start: e.date_start, date_end: e.date_end,
+  segment_ref: s.ref, surface: t.surface, segment_text: s.text
+})[..$limit] AS rows
+RETURN lemma_id, rows
+"""
+)
+
+BATCH_SECTIONS = ("top_forms", "features", "examples")
+CSV_COLUMNS = (
+    "lemma_id",
+    "section",
+    "source_label",
+    "date_start",
+    "date_end",
+    "surface",
+    "case",
+    "number",
+    "gender",
+    "segment_ref",
+    "segment_text",
+    "freq",
+)
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_WORKERS = 4
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--lemma-id",
+        action="append",
+        default=[],
+        help="Lemma identifier (repeatable; more than one switches to batch output).",
+    )
+    parser.add_argument(
+        "--lemma-ids",
+        default=None,
+        help="File with one lemma_id per line ('-' for stdin); runs the batch report.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("jsonl", "csv"),
+        default=None,
+        help="Batch output format (default: jsonl).",
+    )
+    parser.add_argument("--output", default="-", help="Batch output path (default: stdout).")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Lemmas per UNWIND query (default: {DEFAULT_CHUNK_SIZE}).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent sessions for batch reports (default: {DEFAULT_WORKERS}).",
+    )
+    parser.add_argument("--from-year", type=int, default=None, help="Optional inclusive lower bound year.")
+    parser.add_argument("--to-year", type=int, default=None, help="Optional inclusive upper bound year.")
+    parser.add_argument(
+        "--source-like",
+        default=None,
+        help="Optional Edition.source_label full-text filter (words, last one as prefix).",
+    )
+    parser.add_argument(
+        "--source-match",
+        choices=FULLTEXT_MODES,
+        default="prefix",
+        help="How --source-like matches: prefix (default), all words, or phrase.",
+    )
+    parser.add_argument("--limit", type=int, default=20, help="Max rows per section (default: 20).")
+
+
+def print_rows(title: str, rows: Iterable[dict[str, Any]]) -> None:
+    print(f"\n== {title} ==")
+    empty = True
+    for row in rows:
+        empty = False
+        parts = [f"{k}={row[k]}" for k in row]
+        print(" | ".join(parts))
+    if empty:
+        print("(no rows)")
+
+
+def iter_lemma_ids(path: str) -> Iterator[str]:
+    """Lemma IDs from a file, one per line; blank lines and ``#`` comments skipped."""
+    fh = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line in fh:
+            lemma_id = line.strip()
+            if lemma_id and not lemma_id.startswith("#"):
+                yield lemma_id
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
+def _chunks(values: Iterable[str], size: int) -> Iterator[list[str]]:
+    chunk: list[str] = []
+    for value in values:
+        chunk.append(value)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def report_chunk(
+    session: Any, lemma_ids: list[str], params: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Run the three batch queries for one chunk; one report per lemma, in input order."""
+    reports = {
+        lemma_id: {"lemma_id": lemma_id, **{section: [] for section in BATCH_SECTIONS}}
+        for lemma_id in lemma_ids
+    }
+    if params["from_year"] is None and params["to_year"] is None:
+        top_forms_query = BATCH_TOP_FORMS_BY_SOURCE_FALLBACK_QUERY
+    else:
+        top_forms_query = BATCH_TOP_FORMS_QUERY
+    queries = (top_forms_query, BATCH_FEATURE_COUNTS_QUERY, BATCH_EXAMPLES_QUERY)
+    for section, query in zip(BATCH_SECTIONS, queries):
+        for record in session.run(query, lemma_ids=lemma_ids, **params):
+            reports[record["lemma_id"]][section] = record["rows"]
+    return list(reports.values())
+
+
+def batch_report(
+    driver: Driver,
+    lemma_ids: Iterable[str],
+    params: dict[str, Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = DEFAULT_WORKERS,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield one report per lemma, chunked over ``workers`` concurrent sessions.
+
+    Results come back in input order; at most ``2 * workers`` chunks are in
+    flight, so memory is bounded by chunk size rather than lexicon size.
+    Duplicate IDs within a chunk are reported once.
+    """
+
+    def work(chunk: list[str]) -> list[dict[str, Any]]:
+        with driver.session() as session:
+            return report_chunk(session, list(dict.fromkeys(chunk)), params)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending: deque = deque()
+        for chunk in _chunks(lemma_ids, max(1, chunk_size)):
+            pending.append(pool.submit(work, chunk))
+            if len(pending) >= 2 * max(1, workers):
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_jsonl(reports: Iterable[dict[str, Any]], out: TextIO) -> int:
+    count = 0
+    for report in reports:
+        out.write(json.dumps(report, ensure_ascii=False, default=str) + "\n")
+        count += 1
+    return count
+
+
+def write_csv(reports: Iterable[dict[str, Any]], out: TextIO) -> int:
+    """Long format: one row per section row, unused columns left empty."""
+    writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for report in reports:
+        for section in BATCH_SECTIONS:
+            for row in report[section]:
+                writer.writerow({**row, "lemma_id": report["lemma_id"], "section": section})
+        count += 1
+    return count
+
+
+def editions_in_years(session: Any, from_year: int | None, to_year: int | None) -> list[str]:
+    """Edition IDs overlapping ``from_year``..``to_year``, via the Century buckets."""
+    result = session.run(
+        EDITIONS_IN_YEARS_QUERY,
+        from_year=from_year,
+        to_year=to_year,
+        from_century=None if from_year is None else century(from_year),
+        to_century=None if to_year is None else century(to_year),
+    )
+    return [record["edition_id"] for record in result]
+
+
+def edition_filter(session: Any, args: argparse.Namespace) -> list[str] | None:
+    """``$edition_ids`` for the year and source filters of ``args`` (None: no filter)."""
+    edition_ids = None
+    if args.from_year is not None or args.to_year is not None:
+        edition_ids = editions_in_years(session, args.from_year, args.to_year)
+    if args.source_like:
+        matching = matching_edition_ids(session, args.source_like, args.source_match)
+        if edition_ids is None:
+            edition_ids = matching
+        else:
+            wanted = set(matching)
+            edition_ids = [edition_id for edition_id in edition_ids if edition_id in wanted]
+    return edition_ids
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    """Print the report; opens (and closes) a driver unless one is given."""
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+
+    if not args.lemma_id and not args.lemma_ids:
+        raise SystemExit("Provide --lemma-id or --lemma-ids.")
+    if args.lemma_ids or len(args.lemma_id) > 1 or args.format:
+        owns_driver = driver is None
+        if driver is None:
+            driver = get_driver(Neo4jConfig.from_env())
+        try:
+            _run_batch(args, driver)
+        finally:
+            if owns_driver:
+                driver.close()
+        return
+
+    lemma_id = args.lemma_id[0]
+    params = {
+        "lemma_id": lemma_id,
+        "from_year": args.from_year,
+        "to_year": args.to_year,
+        "edition_ids": None,
+        "limit": args.limit,
+    }
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        with driver.session() as session:
+            params["edition_ids"] = edition_filter(session, args)
+            if args.from_year is None and args.to_year is None:
+                top_forms_result = session.run(TOP_FORMS_BY_SOURCE_FALLBACK_QUERY, **params)
+            else:
+                top_forms_result = session.run(TOP_FORMS_QUERY, **params)
+
+            # Rows are printed as they arrive; each result is consumed before
+            # the next query runs on the session.
+            top_forms = (record.data() for record in top_forms_result)
+
+            print(f"lemma_id={lemma_id}")
+            print(
+                "filters="
+                f"from_year={args.from_year},to_year={args.to_year},"
+                f"source_like={args.source_like},limit={args.limit}"
+            )
+
+            if args.from_year is None and args.to_year is None:
+                print_rows("Top surfaces by source/date fallback", top_forms)
+            else:
+                print_rows("Top observed surfaces", top_forms)
+
+            feature_result = session.run(FEATURE_COUNTS_QUERY, **params)
+            print_rows(
+                "Morph feature counts (case/number/gender)",
+                (record.data() for record in feature_result),
+            )
+            examples_result = session.run(EXAMPLES_QUERY, **params)
+            print_rows("Example attestations", (record.data() for record in examples_result))
+    finally:
+        if owns_driver:
+            driver.close()
+
+
+def _run_batch(args: argparse.Namespace, driver: Driver) -> None:
+    lemma_ids: Iterable[str] = args.lemma_id
+    if args.lemma_ids:
+        lemma_ids = chain(args.lemma_id, iter_lemma_ids(args.lemma_ids))
+    params = {
+        "from_year": args.from_year,
+        "to_year": args.to_year,
+        "edition_ids": None,
+        "limit": args.limit,
+    }
+    with driver.session() as session:
+        params["edition_ids"] = edition_filter(session, args)
+    reports = batch_report(driver, lemma_ids, params, args.chunk_size, args.workers)
+    write = write_csv if args.format == "csv" else write_jsonl
+    if args.output == "-":
+        count = write(reports, sys.stdout)
+    else:
+        with open(Path(args.output), "w", encoding="utf-8", newline="") as out:
+            count = write(reports, out)
+    print(f"Lemmas reported: {count}", file=sys.stderr)
@@ -0,0 +1 @@
+"""Local (database-free) search over segment text."""
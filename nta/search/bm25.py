@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+from typing import Iterator
+
+from nta.ingest.text import normalize_v0
+from nta.ingest.text import tokenize_v0
+
+
+MAGIC = b"NTAS"
+FORMAT_VERSION = 1
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+_ALIGN = 8
+_FIELD_SEP = "\x1f"
+_PREAMBLE = struct.Struct("<4sII")
+_PHRASE = re.compile(r'"([^"]*)"')
+
+
+@dataclass(slots=True, frozen=True)
+class SearchDoc:
+    """One searchable segment; ``terms`` are ``search_term`` values in token order."""
+
+    segment_id: str
+    edition_id: str
+    text: str
+    terms: tuple[str, ...]
+    ref: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class SearchHit:
+    score: float
+    segment_id: str
+    edition_id: str
+    ref: str | None
+    text: str
+
+
+def search_term(normalized: str) -> str:
+    """Index term for a ``Token.normalized`` value (case-folded for search)."""
+    return normalized.casefold()
+
+
+def analyze(text: str) -> list[str]:
+    """The graph's term analysis (``tokenize_v0`` + ``normalize_v0``), case-folded."""
+    return [search_term(normalize_v0(surface)) for surface in tokenize_v0(text)]
+
+
+def build_index(
+    docs: Iterable[SearchDoc],
+    path: str | Path,
+    k1: float = DEFAULT_K1,
+    b: float = DEFAULT_B,
+) -> dict[str, int]:
+    """
+    Write a BM25 index file for ``docs``.
+
+    Postings are accumulated in memory as flat arrays, so peak memory is
+    roughly the final file size. Layout (all arrays native-endian, 8-byte
+    aligned, described by a JSON header):
+
+    - ``term_offsets``/``term_blob``: sorted UTF-8 terms for binary search
+    - ``term_starts``: first posting of each term (``df`` = next - this)
+    - ``post_docs``/``post_tfs``/``post_pos``: doc id, term frequency and first
+      position index of each posting; ``positions`` holds token positions
+    - ``doc_norms``: ``k1 * (1 - b + b * len / avgdl)`` per doc, precomputed
+    - ``doc_offsets``/``doc_blob``: segment_id, edition_id, ref and text
+
+    Fixed-width arrays rather than delta/varint bytes: they are read through
+    zero-copy ``memoryview.cast`` and decoding varints in Python would
+    dominate query time.
+    """
+    postings: dict[str, tuple[array, array, array]] = {}
+    doc_lengths = array("I")
+    doc_offsets = array("Q", [0])
+    doc_blob = bytearray()
+
+    for doc_id, doc in enumerate(docs):
+        seen: dict[str, list[int]] = {}
+        for position, term in enumerate(doc.terms):
+            if term:
+                seen.setdefault(term, []).append(position)
+        for term, term_positions in seen.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = (array("I"), array("I"), array("I"))
+            entry[0].append(doc_id)
+            entry[1].append(len(term_positions))
+            entry[2].extend(term_positions)
+        doc_lengths.append(len(doc.terms))
+        record = _FIELD_SEP.join((doc.segment_id, doc.edition_id, doc.ref or "", doc.text))
+        doc_blob += record.encode("utf-8")
+        doc_offsets.append(len(doc_blob))
+
+    n_docs = len(doc_lengths)
+    avgdl = (sum(doc_lengths) / n_docs) if n_docs else 0.0
+    doc_norms = array("f", (k1 * (1 - b + b * length / (avgdl or 1)) for length in doc_lengths))
+
+    terms = sorted(postings)
+    term_offsets = array("Q", [0])
+    term_blob = bytearray()
+    term_starts = array("I", [0])
+    post_docs = array("I")
+    post_tfs = array("I")
+    post_pos = array("Q")
+    max_position = 0
+    positions_list: list[array] = []
+    n_positions = 0
+    for term in terms:
+        docs_arr, tfs_arr, term_positions = postings.pop(term)
+        term_blob += term.encode("utf-8")
+        term_offsets.append(len(term_blob))
+        start = n_positions
+        for tf in tfs_arr:
+            post_pos.append(start)
+            start += tf
+        n_positions = start
+        post_docs.extend(docs_arr)
+        post_tfs.extend(tfs_arr)
+        positions_list.append(term_positions)
+        if term_positions:
+            max_position = max(max_position, max(term_positions))
+        term_starts.append(len(post_docs))
+
+    position_code = "H" if max_position < 1 << 16 else "I"
+    positions = array(position_code)
+    for term_positions in positions_list:
+        positions.frombytes(array(position_code, term_positions).tobytes())
+
+    sections = {
+        "term_offsets": term_offsets,
+        "term_blob": bytes(term_blob),
+        "term_starts": term_starts,
+        "post_docs": post_docs,
+        "post_tfs": post_tfs,
+        "post_pos": post_pos,
+        "positions": positions,
+        "doc_norms": doc_norms,
+        "doc_lengths": doc_lengths,
+        "doc_offsets": doc_offsets,
+        "doc_blob": bytes(doc_blob),
+    }
+    header = {
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "n_docs": n_docs,
+        "n_terms": len(terms),
+        "avgdl": avgdl,
+        "k1": k1,
+        "b": b,
+        "sections": {},
+    }
+    _write_sections(Path(path), header, sections)
+    return {"docs": n_docs, "terms": len(terms), "postings": len(post_docs)}
+
+
+def _write_sections(
+    path: Path,
+    header: dict,
+    sections: dict[str, array | bytes],
+    magic: bytes = MAGIC,
+    version: int = FORMAT_VERSION,
+) -> None:
+    # Offsets depend on the header length, so lay out with a fixed-size guess
+    # and grow it until the encoded header fits.
+    reserved = 1024
+    while True:
+        offset = _align(_PREAMBLE.size + reserved)
+        layout = {}
+        for name, data in sections.items():
+            size = len(data) * data.itemsize if isinstance(data, array) else len(data)
+            code = data.typecode if isinstance(data, array) else "B"
+            layout[name] = [offset, size, code]
+            offset = _align(offset + size)
+        header["sections"] = layout
+        encoded = json.dumps(header).encode("utf-8")
+        if len(encoded) <= reserved:
+            break
+        reserved = len(encoded) * 2
+
+    tmp = path.with_name(path.name + ".tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(tmp, "wb") as fh:
+        fh.write(_PREAMBLE.pack(magic, version, reserved))
+        fh.write(encoded.ljust(reserved, b" "))
+        for name, data in sections.items():
+            start = layout[name][0]
+            fh.write(b"\0" * (start - fh.tell()))
+            fh.write(data.tobytes() if isinstance(data, array) else data)
+    os.replace(tmp, path)
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class SearchIndex:
+    """
+    A memory-mapped BM25 index; opening it reads only the header.
+
+    Pages are faulted in on demand, so several processes searching the same
+    file share one copy in the OS page cache.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._fh = open(self.path, "rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, reserved = _PREAMBLE.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path}: not an nta search index (version {FORMAT_VERSION})")
+        header = json.loads(bytes(self._mm[_PREAMBLE.size : _PREAMBLE.size + reserved]))
+        if header["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError(f"{path}: built on a {header['byteorder']}-endian machine")
+        self.n_docs = header["n_docs"]
+        self.n_terms = header["n_terms"]
+        self.avgdl = header["avgdl"]
+        self.k1 = header["k1"]
+        self._base = view = memoryview(self._mm)
+        self._views = {
+            name: view[offset : offset + size].cast(code)
+            for name, (offset, size, code) in header["sections"].items()
+        }
+
+    def __enter__(self) -> SearchIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        views = getattr(self, "_views", {})
+        for view in views.values():
+            view.release()
+        self._views = {}
+        base = getattr(self, "_base", None)
+        if base is not None:
+            base.release()
+            self._base = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._fh.close()
+
+    def _term_id(self, term: str) -> int | None:
+        offsets = self._views["term_offsets"]
+        blob = self._views["term_blob"]
+        key = term.encode("utf-8")
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = blob[offsets[mid] : offsets[mid + 1]].tobytes()
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def _postings(self, term: str) -> tuple[int, int]:
+        term_id = self._term_id(term)
+        if term_id is None:
+            return 0, 0
+        starts = self._views["term_starts"]
+        return starts[term_id], starts[term_id + 1]
+
+    def doc_freq(self, term: str) -> int:
+        start, end = self._postings(term)
+        return end - start
+
+    def document(self, doc_id: int) -> tuple[str, str, str | None, str]:
+        offsets = self._views["doc_offsets"]
+        raw = self._views["doc_blob"][offsets[doc_id] : offsets[doc_id + 1]].tobytes()
+        segment_id, edition_id, ref, text = raw.decode("utf-8").split(_FIELD_SEP, 3)
+        return segment_id, edition_id, ref or None, text
+
+    def search(self, query: str, limit: int = 10) -> list[SearchHit]:
+        """
+        BM25 over the query's terms; quoted parts must match as phrases.
+
+        ``gáttir "skoðask skyli"`` ranks segments containing ``gáttir``,
+        ``skoðask`` or ``skyli`` and keeps only those with the phrase. Terms
+        are analyzed like graph tokens (``tokenize_v0`` + ``normalize_v0``).
+        """
+        phrases = [terms for terms in (analyze(p) for p in _PHRASE.findall(query)) if terms]
+        loose = analyze(_PHRASE.sub(" ", query))
+        terms = list(dict.fromkeys([*loose, *(t for phrase in phrases for t in phrase)]))
+        if not terms:
+            return []
+
+        allowed = None
+        for phrase in phrases:
+            matches = self._phrase_docs(phrase)
+            allowed = matches if allowed is None else allowed & matches
+            if not allowed:
+                return []
+
+        scores = self._score(terms, allowed)
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [SearchHit(score, *self.document(doc_id)) for doc_id, score in best]
+
+    def _score(self, terms: list[str], allowed: set[int] | None) -> dict[int, float]:
+        docs = self._views["post_docs"]
+        tfs = self._views["post_tfs"]
+        norms = self._views["doc_norms"]
+        k1_plus = self.k1 + 1
+        scores: dict[int, float] = {}
+        get = scores.get
+        for term in terms:
+            start, end = self._postings(term)
+            if start == end:
+                continue
+            df = end - start
+            idf = math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in zip(docs[start:end], tfs[start:end]):
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                scores[doc_id] = get(doc_id, 0.0) + idf * tf * k1_plus / (tf + norms[doc_id])
+        return scores
+
+    def _phrase_docs(self, phrase: list[str]) -> set[int]:
+        ranges = [self._postings(term) for term in phrase]
+        if any(start == end for start, end in ranges):
+            return set()
+        docs = self._views["post_docs"]
+        tfs = self._views["post_tfs"]
+        first = self._views["post_pos"]
+        positions = self._views["positions"]
+
+        # Walk the rarest term's postings and probe the others by bisection.
+        order = sorted(range(len(phrase)), key=lambda i: ranges[i][1] - ranges[i][0])
+        rare = order[0]
+        found: set[int] = set()
+        start, end = ranges[rare]
+        for posting in range(start, end):
+            doc_id = docs[posting]
+            candidates = None
+            for offset in order:
+                lo, hi = ranges[offset]
+                index = bisect_left(docs, doc_id, lo, hi)
+                if index == hi or docs[index] != doc_id:
+                    candidates = set()
+                    break
+                begin = first[index]
+                shifted = {p - offset for p in positions[begin : begin + tfs[index]]}
+                candidates = shifted if candidates is None else candidates & shifted
+                if not candidates:
+                    break
+            if candidates:
+                found.add(doc_id)
+        return found
+
+
+def iter_hits_jsonl(hits: Iterable[SearchHit]) -> Iterator[str]:
+    for hit in hits:
+        yield json.dumps(
+            {
+                "score": round(hit.score, 4),
+                "segment_id": hit.segment_id,
+                "edition_id": hit.edition_id,
+                "ref": hit.ref,
+                "text": hit.text,
+            },
+            ensure_ascii=False,
+        )
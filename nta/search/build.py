@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+from itertools import chain
+from pathlib import Path
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+
+from nta.ingest.cache import DEFAULT_CACHE_DIR
+from nta.ingest.checkpoint import DEFAULT_CHECKPOINT_EVERY
+from nta.search.bm25 import DEFAULT_B
+from nta.search.bm25 import DEFAULT_K1
+from nta.search.bm25 import SearchDoc
+from nta.search.bm25 import analyze
+from nta.search.bm25 import build_index
+from nta.search.bm25 import search_term
+
+_HAS_TOKEN = ("HAS_TOKEN", "Segment", "segment_id", "Token", "token_id", ())
+
+
+def docs_from_batches(batches: Iterable[Any]) -> Iterator[SearchDoc]:
+    """
+    Search documents from planned ingest batches (``PlannedBatch``).
+
+    Segment IDs, refs and token terms come from exactly what the graph ingest
+    would write (``Token.normalized``, case-folded), whichever adapter
+    planned them.
+    """
+    for batch in batches:
+        rows = batch.rows
+        tokens = rows.nodes.get(("Token", "token_id"), {})
+        by_segment: dict[str, list[tuple[int, str]]] = {}
+        for (segment_id, token_id), _ in rows.relationships.get(_HAS_TOKEN, {}).items():
+            props = tokens[token_id]["props"]
+            by_segment.setdefault(segment_id, []).append(
+                (props["position"], search_term(props.get("normalized") or ""))
+            )
+        for segment_id, row in rows.nodes.get(("Segment", "segment_id"), {}).items():
+            props = row["props"]
+            terms = tuple(term for _, term in sorted(by_segment.get(segment_id, ())))
+            yield SearchDoc(
+                segment_id=segment_id,
+                edition_id=batch.edition_id,
+                text=props["text"],
+                terms=terms,
+                ref=props.get("ref"),
+            )
+
+
+def docs_from_jsonl(path: str | Path, edition_id: str | None = None) -> Iterator[SearchDoc]:
+    """
+    Search documents from exported segment rows (``.jsonl`` or ``.jsonl.gz``).
+
+    Rows need ``segment_id`` and ``text`` (as written by
+    ``nta query edition_segments``); ``edition_id``/``ref`` are optional.
+    Terms are re-analyzed with the graph's tokenizer and normalizer.
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            text = row.get("text") or row.get("segment_text") or ""
+            yield SearchDoc(
+                segment_id=row["segment_id"],
+                edition_id=row.get("edition_id") or edition_id or "",
+                text=text,
+                terms=tuple(analyze(text)),
+                ref=row.get("ref") or row.get("segment_ref"),
+            )
+
+
+def add_source_arguments(parser: argparse.ArgumentParser) -> None:
+    """Segment source flags shared by offline commands (search, collocations)."""
+    parser.add_argument("--dir", help="Directory of sources, as for 'nta ingest corpus'.")
+    parser.add_argument("--manifest", help="Corpus manifest, as for 'nta ingest corpus'.")
+    parser.add_argument(
+        "--jsonl",
+        action="append",
+        default=[],
+        help="Exported segment rows (.jsonl/.jsonl.gz); repeatable.",
+    )
+    parser.add_argument(
+        "--edition-id",
+        default=None,
+        help="edition_id for --jsonl rows that do not carry one.",
+    )
+    parser.add_argument(
+        "--language-stage",
+        default=None,
+        help="Default language/stage code for plaintext sources.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Adapter output cache directory (default: {DEFAULT_CACHE_DIR}).",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the adapter cache.")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--output", required=True, help="Index file to write.")
+    add_source_arguments(parser)
+    parser.add_argument("--k1", type=float, default=DEFAULT_K1, help="BM25 k1.")
+    parser.add_argument("--b", type=float, default=DEFAULT_B, help="BM25 b.")
+
+
+def _corpus_docs(args: argparse.Namespace) -> Iterator[SearchDoc]:
+    from nta.ingest.cache import SourceCache
+    from nta.ingest.corpus import discover_sources
+    from nta.ingest.corpus import load_manifest
+    from nta.ingest.corpus import plan_source
+
+    defaults: dict[str, Any] = {}
+    if args.language_stage:
+        defaults["language_stage"] = args.language_stage
+    sources = []
+    if args.dir:
+        sources.extend(discover_sources(args.dir, defaults))
+    if args.manifest:
+        sources.extend(load_manifest(args.manifest, defaults))
+    cache = None if args.no_cache else SourceCache(args.cache_dir)
+    for source in sources:
+        yield from docs_from_batches(plan_source(source, DEFAULT_CHECKPOINT_EVERY, 0, cache))
+
+
+def source_docs(args: argparse.Namespace) -> Iterator[SearchDoc]:
+    """Documents for the flags added by ``add_source_arguments``, streamed."""
+    return chain(
+        _corpus_docs(args),
+        *(docs_from_jsonl(path, args.edition_id) for path in args.jsonl),
+    )
+
+
+def run(args: argparse.Namespace) -> int:
+    if not (args.dir or args.manifest or args.jsonl):
+        print("Nothing to index: pass --dir, --manifest and/or --jsonl.")
+        return 2
+    docs = source_docs(args)
+    stats = build_index(docs, args.output, k1=args.k1, b=args.b)
+    size = Path(args.output).stat().st_size
+    print(
+        f"Indexed {stats['docs']} segments, {stats['terms']} terms, "
+        f"{stats['postings']} postings -> {args.output} ({size / 1024:.0f} KiB)"
+    )
+    return 0
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+import time
+from itertools import chain
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Iterator
+
+from nta.search.suffix import FormEntry
+from nta.search.suffix import build_form_index
+from nta.search.suffix import entries_from_jsonl
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+
+def entries_from_graph(driver: Driver, page_size: int) -> Iterator[FormEntry]:
+    """Every ``Form`` through the keyset-paged ``forms`` named query."""
+    from nta.graph.query import QueryService
+
+    for row in QueryService(driver).paginate("forms", page_size=page_size):
+        yield FormEntry(row["form_id"], row["orthography"] or "", row["language"] or "")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--output", required=True, help="Index file to write.")
+    parser.add_argument(
+        "--jsonl",
+        action="append",
+        default=[],
+        help="Exported 'nta query forms' rows (.jsonl/.jsonl.gz); repeatable. "
+        "Default: read every Form from the graph.",
+    )
+    parser.add_argument(
+        "--page-size", type=int, default=20_000, help="Forms per graph page (default: 20000)."
+    )
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    start = time.perf_counter()
+    if args.jsonl:
+        stats = build_form_index(
+            chain.from_iterable(entries_from_jsonl(path) for path in args.jsonl), args.output
+        )
+    else:
+        from nta.graph.db import Neo4jConfig
+        from nta.graph.db import get_driver
+
+        owns_driver = driver is None
+        if driver is None:
+            driver = get_driver(Neo4jConfig.from_env())
+        try:
+            stats = build_form_index(entries_from_graph(driver, args.page_size), args.output)
+        finally:
+            if owns_driver:
+                driver.close()
+    size = Path(args.output).stat().st_size
+    print(
+        f"Indexed {stats['forms']} forms, {stats['suffixes']} suffixes -> {args.output} "
+        f"({size / 1024:.0f} KiB) in {time.perf_counter() - start:.1f}s"
+    )
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import TYPE_CHECKING
+
+from nta.search.suffix import FormIndex
+
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "pattern",
+        help="Affix pattern: '-inn' (ends with), 'sk-' (starts with), '-sk-' (contains), "
+        "'hestr' (whole form).",
+    )
+    parser.add_argument("--index", required=True, help="Index file from 'nta forms build'.")
+    parser.add_argument("--language", default=None, help="Only forms of this language.")
+    parser.add_argument("--limit", type=int, default=None, help="Max forms (default: all).")
+    parser.add_argument("--jsonl", action="store_true", help="Print forms as JSON lines.")
+    parser.add_argument(
+        "--attestations",
+        action="store_true",
+        help="Stream every token of the matching forms from the graph as JSON lines.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Form IDs per attestation query (default: {DEFAULT_CHUNK_SIZE}).",
+    )
+
+
+def run(args: argparse.Namespace, driver: Driver | None = None) -> None:
+    with FormIndex(args.index) as index:
+        start = time.perf_counter()
+        matches = index.search(args.pattern, language=args.language, limit=args.limit)
+        elapsed = time.perf_counter() - start
+    if args.attestations:
+        _write_attestations([match.form_id for match in matches], args.chunk_size, driver)
+        return
+    for match in matches:
+        if args.jsonl:
+            row = {
+                "form_id": match.form_id,
+                "orthography": match.orthography,
+                "language": match.language,
+            }
+            print(json.dumps(row, ensure_ascii=False))
+        else:
+            print(f"{match.orthography}\t{match.language}\t{match.form_id}")
+    if not args.jsonl:
+        print(f"({len(matches)} forms in {elapsed * 1000:.1f} ms)")
+
+
+def _write_attestations(form_ids: list[str], chunk_size: int, driver: Driver | None) -> None:
+    """``forms_attestations`` rows, one keyset-paged query per chunk of form IDs."""
+    from nta.graph.db import Neo4jConfig
+    from nta.graph.db import get_driver
+    from nta.graph.query import QueryService
+
+    owns_driver = driver is None
+    if driver is None:
+        driver = get_driver(Neo4jConfig.from_env())
+    try:
+        service = QueryService(driver)
+        write = sys.stdout.write
+        for start in range(0, len(form_ids), chunk_size):
+            chunk = form_ids[start : start + chunk_size]
+            for row in service.paginate("forms_attestations", form_ids=chunk):
+                write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+    finally:
+        if owns_driver:
+            driver.close()
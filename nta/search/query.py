@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from nta.search.bm25 import SearchIndex
+from nta.search.bm25 import iter_hits_jsonl
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("query", help='Search text; quote phrases, e.g. \'gáttir "skoðask skyli"\'.')
+    parser.add_argument("--index", required=True, help="Index file from 'nta search build'.")
+    parser.add_argument("--limit", type=int, default=10, help="Max hits (default: 10).")
+    parser.add_argument("--jsonl", action="store_true", help="Print hits as JSON lines.")
+
+
+def run(args: argparse.Namespace) -> int:
+    with SearchIndex(args.index) as index:
+        start = time.perf_counter()
+        hits = index.search(args.query, limit=args.limit)
+        elapsed = time.perf_counter() - start
+        if args.jsonl:
+            for line in iter_hits_jsonl(hits):
+                print(line)
+            return 0
+        for hit in hits:
+            ref = f" [{hit.ref}]" if hit.ref else ""
+            print(f"{hit.score:7.3f}  {hit.segment_id}{ref}  {hit.text}")
+        print(f"({len(hits)} hits of {index.n_docs} segments in {elapsed * 1000:.1f} ms)")
+    return 0
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import gzip
+import json
+import mmap
+import sys
+import unicodedata
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+from typing import Iterator
+
+from nta.search.bm25 import _PREAMBLE
+from nta.search.bm25 import _write_sections
+
+
+MAGIC = b"NTAF"
+FORMAT_VERSION = 1
+_SEP = 0
+AFFIX_KINDS = ("exact", "prefix", "suffix", "infix")
+
+
+@dataclass(slots=True, frozen=True)
+class FormEntry:
+    """One ``Form`` of the indexed vocabulary."""
+
+    form_id: str
+    orthography: str
+    language: str = ""
+
+
+@dataclass(slots=True, frozen=True)
+class FormMatch:
+    form_id: str
+    orthography: str
+    language: str
+
+
+def form_key(text: str) -> str:
+    """Index/search key of an orthography: NFC, case-folded."""
+    return unicodedata.normalize("NFC", text).casefold()
+
+
+def parse_affix(pattern: str) -> tuple[str, str]:
+    """
+    ``(kind, text)`` for a pattern in affix notation.
+
+    ``-inn`` ends a form, ``sk-`` starts one, ``-sk-`` occurs anywhere and a
+    bare ``hestr`` must be the whole form.
+    """
+    head = pattern.startswith("-")
+    tail = pattern.endswith("-") and len(pattern) > 1
+    text = pattern[1 if head else 0 : len(pattern) - 1 if tail else len(pattern)]
+    if not text or "\x00" in text:
+        raise ValueError(f"Empty or invalid affix pattern: {pattern!r}")
+    kind = "infix" if head and tail else "suffix" if head else "prefix" if tail else "exact"
+    return kind, text
+
+
+def _probe(kind: str, text: str) -> bytes:
+    key = form_key(text).encode("utf-8")
+    sep = bytes([_SEP])
+    if kind == "exact":
+        return sep + key + sep
+    if kind == "prefix":
+        return sep + key
+    if kind == "suffix":
+        return key + sep
+    if kind == "infix":
+        return key
+    raise ValueError(f"Unknown affix kind: {kind!r} (expected one of {AFFIX_KINDS})")
+
+
+def build_form_index(entries: Iterable[FormEntry], path: str | Path) -> dict[str, int]:
+    """
+    Write a suffix-array index over the orthography of ``entries``.
+
+    Keys (``form_key``) are laid out as ``\\0key\\0key\\0...`` in one UTF-8
+    blob, and every character start, plus the separator before each key, is
+    a suffix. With the separators, prefix, suffix and whole-form searches
+    are plain substring searches. Layout (8-byte aligned, described by a
+    JSON header, as for the BM25 index):
+
+    - ``text``: the key blob
+    - ``sa``: suffix start offsets in byte order of the suffixes
+    - ``sa_entries``: the entry each suffix belongs to, so hits need no
+      position-to-entry lookup
+    - ``entry_languages``: index into the header's ``languages``
+    - ``id_offsets``/``id_blob`` and ``orthography_offsets``/
+      ``orthography_blob``: form_id and original orthography per entry
+
+    Entries are sorted by key (then form_id), so entry numbers of a hit set
+    sort alphabetically.
+    """
+    rows = sorted(
+        (key, entry.form_id, entry.orthography, entry.language or "")
+        for entry in entries
+        if (key := form_key(entry.orthography or ""))
+    )
+    languages = sorted({language for _, _, _, language in rows})
+    language_ids = {language: index for index, language in enumerate(languages)}
+
+    text = bytearray([_SEP])
+    key_starts = array("I")
+    entry_languages = array("H")
+    id_offsets = array("Q", [0])
+    id_blob = bytearray()
+    orthography_offsets = array("Q", [0])
+    orthography_blob = bytearray()
+    for key, form_id, orthography, language in rows:
+        key_starts.append(len(text))
+        text += key.encode("utf-8")
+        text.append(_SEP)
+        entry_languages.append(language_ids[language])
+        id_blob += form_id.encode("utf-8")
+        id_offsets.append(len(id_blob))
+        orthography_blob += orthography.encode("utf-8")
+        orthography_offsets.append(len(orthography_blob))
+    blob = bytes(text)
+    if len(blob) >= 1 << 32:
+        raise ValueError("Form vocabulary too large for 32-bit suffix offsets")
+
+    # Bucket suffixes by first byte and sort each bucket separately: only one
+    # bucket's sort keys are alive at a time.
+    buckets: dict[int, tuple[array, array]] = {}
+    for entry, start in enumerate(key_starts):
+        end = blob.index(_SEP, start)
+        for position in range(start - 1, end):
+            # Skip UTF-8 continuation bytes: only character starts are suffixes.
+            if position >= start and 0x80 <= blob[position] < 0xC0:
+                continue
+            bucket = buckets.get(blob[position])
+            if bucket is None:
+                bucket = buckets[blob[position]] = (array("I"), array("I"))
+            bucket[0].append(position)
+            bucket[1].append(entry)
+    sa = array("I")
+    sa_entries = array("I")
+    for first in sorted(buckets):
+        positions, owners = buckets.pop(first)
+        ends = [blob.index(_SEP, key_starts[owner]) + 1 for owner in owners]
+        order = sorted(range(len(positions)), key=lambda i: blob[positions[i] : ends[i]])
+        sa.extend(positions[i] for i in order)
+        sa_entries.extend(owners[i] for i in order)
+
+    sections = {
+        "text": blob,
+        "sa": sa,
+        "sa_entries": sa_entries,
+        "entry_languages": entry_languages,
+        "id_offsets": id_offsets,
+        "id_blob": bytes(id_blob),
+        "orthography_offsets": orthography_offsets,
+        "orthography_blob": bytes(orthography_blob),
+    }
+    header = {
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "n_entries": len(rows),
+        "n_suffixes": len(sa),
+        "languages": languages,
+        "sections": {},
+    }
+    _write_sections(Path(path), header, sections, MAGIC, FORMAT_VERSION)
+    return {"forms": len(rows), "suffixes": len(sa), "bytes": len(blob)}
+
+
+class FormIndex:
+    """
+    A memory-mapped suffix array over form orthographies.
+
+    An affix search is two binary searches over ``sa`` (O(log n) probes
+    of the mapped text), then one slice of ``sa_entries``.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._fh = open(self.path, "rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, reserved = _PREAMBLE.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path}: not an nta form index (version {FORMAT_VERSION})")
+        header = json.loads(bytes(self._mm[_PREAMBLE.size : _PREAMBLE.size + reserved]))
+        if header["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError(f"{path}: built on a {header['byteorder']}-endian machine")
+        self.n_entries = header["n_entries"]
+        self.n_suffixes = header["n_suffixes"]
+        self.languages = header["languages"]
+        self._text_offset = header["sections"]["text"][0]
+        self._id_offset = header["sections"]["id_blob"][0]
+        self._base = view = memoryview(self._mm)
+        self._views = {
+            name: view[offset : offset + size].cast(code)
+            for name, (offset, size, code) in header["sections"].items()
+        }
+
+    def __enter__(self) -> FormIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        views = getattr(self, "_views", {})
+        for view in views.values():
+            view.release()
+        self._views = {}
+        base = getattr(self, "_base", None)
+        if base is not None:
+            base.release()
+            self._base = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._fh.close()
+
+    def _range(self, probe: bytes) -> tuple[int, int]:
+        """Half-open ``sa`` range of suffixes starting with ``probe``."""
+        sa = self._views["sa"]
+        mm = self._mm
+        base = self._text_offset
+        width = len(probe)
+        lo, hi = 0, self.n_suffixes
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = base + sa[mid]
+            if mm[start : start + width] < probe:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = lo
+        hi = self.n_suffixes
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = base + sa[mid]
+            if mm[start : start + width] <= probe:
+                lo = mid + 1
+            else:
+                hi = mid
+        return first, lo
+
+    def entry_ids(self, pattern: str, language: str | None = None) -> list[int]:
+        """Sorted entry numbers matching ``pattern`` (affix notation, see ``parse_affix``)."""
+        start, end = self._range(_probe(*parse_affix(pattern)))
+        entries = sorted(set(self._views["sa_entries"][start:end]))
+        if language is None:
+            return entries
+        try:
+            code = self.languages.index(language)
+        except ValueError:
+            return []
+        languages = self._views["entry_languages"]
+        return [entry for entry in entries if languages[entry] == code]
+
+    def count(self, pattern: str) -> int:
+        """Occurrences of the pattern (a form matching ``-a-`` twice counts twice)."""
+        start, end = self._range(_probe(*parse_affix(pattern)))
+        return end - start
+
+    def entry(self, entry: int) -> FormMatch:
+        offsets = self._views["orthography_offsets"]
+        raw = self._views["orthography_blob"][offsets[entry] : offsets[entry + 1]]
+        language = self.languages[self._views["entry_languages"][entry]]
+        return FormMatch(self._form_id(entry), raw.tobytes().decode("utf-8"), language)
+
+    def _form_id(self, entry: int) -> str:
+        offsets = self._views["id_offsets"]
+        base = self._id_offset
+        return self._mm[base + offsets[entry] : base + offsets[entry + 1]].decode("utf-8")
+
+    def search(
+        self, pattern: str, language: str | None = None, limit: int | None = None
+    ) -> list[FormMatch]:
+        """Matching forms in key order, optionally one ``language`` only."""
+        entries = self.entry_ids(pattern, language)
+        return [self.entry(entry) for entry in entries[:limit]]
+
+    def form_ids(
+        self, pattern: str, language: str | None = None, limit: int | None = None
+    ) -> list[str]:
+        """Form IDs for ``pattern``, ready for the ``forms_attestations`` query."""
+        return [self._form_id(entry) for entry in self.entry_ids(pattern, language)[:limit]]
+
+
+def entries_from_jsonl(path: str | Path) -> Iterator[FormEntry]:
+    """
+    Form entries from exported rows (``.jsonl`` or ``.jsonl.gz``).
+
+    Rows need ``form_id`` and ``orthography`` (as written by ``nta query
+    forms``); ``language`` is optional.
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            yield FormEntry(row["form_id"], row.get("orthography") or "", row.get("language") or "")
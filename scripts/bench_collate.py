@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Allow direct script execution from repo root without package installation.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from nta.align.collate import collation_ops
+from nta.align.collate import intern_keys
+from nta.align.collate import match_pairs
+from nta.align.collate import summarize
+from nta.ingest.havamal import DEFAULT_INPUT_PATH
+from nta.ingest.havamal import plan_havamal
+from nta.ingest.normalize import normalization_policy
+
+
+def base_surfaces(copies: int) -> list[str]:
+    """Hávamál token surfaces repeated to saga length."""
+    surfaces = [
+        row["props"]["surface"]
+        for batch in plan_havamal(Path(DEFAULT_INPUT_PATH))
+        for row in batch.rows.nodes.get(("Token", "token_id"), {}).values()
+    ]
+    return surfaces * copies
+
+
+def witness_of(base: list[str], edits: int, rng: random.Random) -> list[str]:
+    """A copy of ``base`` with ``edits`` random substitutions, omissions and additions."""
+    witness = list(base)
+    for _ in range(edits):
+        i = rng.randrange(len(witness))
+        kind = rng.randrange(3)
+        if kind == 0:
+            witness[i] = witness[i] + "x"
+        elif kind == 1:
+            del witness[i]
+        else:
+            witness.insert(i, f"add{rng.randrange(1000)}")
+    return witness
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark witness collation.")
+    parser.add_argument(
+        "--copies", type=int, default=30, help="Hávamál copies (~5k tokens each)."
+    )
+    parser.add_argument("--edits", type=int, default=3000, help="Random edits in the witness.")
+    parser.add_argument("--max-edits", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    base = base_surfaces(args.copies)
+    witness = witness_of(base, args.edits, rng)
+    policy = normalization_policy("on_folded_v1")
+
+    start = time.perf_counter()
+    vocab: dict[str, int] = {}
+    base_keys = intern_keys(base, policy, vocab)
+    witness_keys = intern_keys(witness, policy, vocab)
+    keyed = time.perf_counter()
+    pairs = match_pairs(base_keys, witness_keys, args.max_edits)
+    ops = collation_ops(pairs, len(base_keys), len(witness_keys))
+    done = time.perf_counter()
+
+    summary = summarize("base", "witness", ops, len(base), len(witness), done - keyed)
+    print(f"tokens: {len(base):,} base, {len(witness):,} witness; {args.edits} edits")
+    print(f"keys:   {keyed - start:.3f}s ({len(vocab):,} distinct)")
+    print(f"align:  {done - keyed:.3f}s, {summary.agreement:.2%} agreement, {summary.units}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Allow direct script execution from repo root without package installation.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from nta.ingest.havamal import DEFAULT_INPUT_PATH
+from nta.ingest.havamal import plan_havamal
+from nta.reports.collocations import CollocationCounter
+from nta.reports.collocations import CountMinSketch
+from nta.reports.collocations import SketchCounter
+from nta.reports.collocations import SpillingCounter
+from nta.search.build import docs_from_batches
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark collocation counting.")
+    parser.add_argument(
+        "--copies", type=int, default=200, help="Hávamál copies (~4k tokens each)."
+    )
+    parser.add_argument("--window", type=int, default=5)
+    parser.add_argument("--max-entries", type=int, default=20_000, help="Spill threshold.")
+    parser.add_argument(
+        "--distinct",
+        type=int,
+        default=20,
+        help="Suffix terms with copy %% N so the vocabulary grows (default: 20).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    base = [doc.terms for doc in docs_from_batches(plan_havamal(Path(DEFAULT_INPUT_PATH)))]
+    variants = [
+        [tuple(f"{term}{suffix}" for term in terms) for terms in base]
+        for suffix in range(max(args.distinct, 1))
+    ]
+    modes = {
+        "exact": lambda: SpillingCounter(),
+        "spilling": lambda: SpillingCounter(args.max_entries),
+        "sketch": lambda: SketchCounter(CountMinSketch()),
+    }
+    for window in (0, args.window):
+        for mode, grams in modes.items():
+            counter = CollocationCounter(2, window, grams())
+            start = time.perf_counter()
+            for copy in range(args.copies):
+                counter.add_all(variants[copy % len(variants)])
+            counted = time.perf_counter() - start
+            top = counter.top("llr", limit=50)
+            ranked = time.perf_counter() - start - counted
+            runs = len(counter.grams.runs) if isinstance(counter.grams, SpillingCounter) else 0
+            counter.close()
+            print(
+                f"window={window} {mode:<9} {counter.tokens:,} tokens "
+                f"{counter.tokens / counted / 1e6:.2f}M tok/s, rank {ranked:.2f}s, "
+                f"runs={runs} top={' '.join(top[0].terms)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
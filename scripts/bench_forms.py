@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Allow direct script execution from repo root without package installation.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from nta.ingest.havamal import DEFAULT_INPUT_PATH
+from nta.ingest.havamal import plan_havamal
+from nta.ingest.text import normalize_v0
+from nta.search.suffix import FormEntry
+from nta.search.suffix import FormIndex
+from nta.search.suffix import build_form_index
+
+
+PATTERNS = ["-inn", "-it", "-sk-", "sk-", "hestr", "-ligr", "-a-", "-ǫ-"]
+ENDINGS = ["", "inn", "it", "ar", "um", "anna", "sk", "ligr", "ir", "na", "ri", "ask"]
+
+
+def vocabulary(size: int) -> list[FormEntry]:
+    """Hávamál surfaces crossed with common Old Norse endings and numbered stems."""
+    stems = sorted(
+        {
+            normalize_v0(row["props"]["surface"])
+            for batch in plan_havamal(Path(DEFAULT_INPUT_PATH))
+            for row in batch.rows.nodes.get(("Token", "token_id"), {}).values()
+        }
+        - {""}
+    )
+    entries = []
+    variant = 0
+    while len(entries) < size:
+        for stem in stems:
+            for ending in ENDINGS:
+                orthography = f"{stem}{variant or ''}{ending}" if variant else stem + ending
+                entries.append(FormEntry(f"form:non:{len(entries)}", orthography, "non"))
+        variant += 1
+    return entries[:size]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the form suffix-array index.")
+    parser.add_argument("--forms", type=int, default=500_000, help="Vocabulary size.")
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    entries = vocabulary(args.forms)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "forms.ntaf"
+        start = time.perf_counter()
+        stats = build_form_index(entries, path)
+        built = time.perf_counter() - start
+        size = path.stat().st_size
+        print(
+            f"build: {stats['forms']:,} forms, {stats['suffixes']:,} suffixes, "
+            f"{size / 1e6:.1f} MB in {built:.1f}s"
+        )
+        start = time.perf_counter()
+        index = FormIndex(path)
+        print(f"open:  {(time.perf_counter() - start) * 1000:.2f} ms")
+        with index:
+            for pattern in PATTERNS:
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    count = index.count(pattern)
+                counted = (time.perf_counter() - start) / args.repeat
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    ids = index.form_ids(pattern)
+                listed = (time.perf_counter() - start) / args.repeat
+                print(
+                    f"{pattern:<8} {count:>9,} hits {len(ids):>9,} forms  "
+                    f"count {counted * 1000:7.3f} ms  form_ids {listed * 1000:8.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Allow direct script execution from repo root without package installation.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from nta.ingest.havamal import DEFAULT_INPUT_PATH
+from nta.ingest.havamal import plan_havamal
+from nta.ingest.normalize import NORMALIZATION_POLICIES
+from nta.ingest.normalize import normalization_policy
+from nta.ingest.text import normalize_v0
+
+
+def surfaces(copies: int) -> list[str]:
+    """Hávamál token surfaces, with manuscript letters mixed in so every step has work."""
+    base = [
+        row["props"]["surface"]
+        for batch in plan_havamal(Path(DEFAULT_INPUT_PATH))
+        for row in batch.rows.nodes.get(("Token", "token_id"), {}).values()
+    ]
+    marked = [surface.replace("ö", "ǫ").replace("æ", "ę") + "," for surface in base[::3]]
+    return (base + marked) * copies
+
+
+def _rate(label: str, count: int, seconds: float) -> None:
+    print(f"{label:<48} {count / seconds:>12,.0f} tokens/s  ({seconds:.3f}s)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark normalization policies.")
+    parser.add_argument(
+        "--copies", type=int, default=100, help="Hávamál copies (~5k surfaces each)."
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    tokens = surfaces(args.copies)
+
+    # The hard-coded v0 function is the baseline every policy is compared to.
+    start = time.perf_counter()
+    for surface in tokens:
+        normalize_v0(surface)
+    _rate("normalize_v0 (reference)", len(tokens), time.perf_counter() - start)
+
+    for policy_id in NORMALIZATION_POLICIES:
+        policy = normalization_policy(policy_id)
+        start = time.perf_counter()
+        for surface in tokens:
+            policy(surface)
+        _rate(f"{policy_id} per token", len(tokens), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        policy.normalize_many(tokens)
+        _rate(f"{policy_id} normalize_many", len(tokens), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
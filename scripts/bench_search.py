@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Allow direct script execution from repo root without package installation.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from nta.ingest.havamal import DEFAULT_INPUT_PATH
+from nta.ingest.havamal import plan_havamal
+from nta.search.bm25 import SearchDoc
+from nta.search.bm25 import SearchIndex
+from nta.search.bm25 import build_index
+from nta.search.build import docs_from_batches
+
+
+QUERIES = ["fé", "deyr fé", '"deyr fé"', "gáttir allar", '"um skoðask skyli"', "ok"]
+
+
+def scaled_docs(copies: int) -> list[SearchDoc]:
+    """Hávamál repeated ``copies`` times as distinct editions."""
+    base = list(docs_from_batches(plan_havamal(Path(DEFAULT_INPUT_PATH))))
+    return [
+        SearchDoc(
+            f"{doc.segment_id}#{copy}", f"{doc.edition_id}#{copy}", doc.text, doc.terms, doc.ref
+        )
+        for copy in range(copies)
+        for doc in base
+    ]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the local BM25 index.")
+    parser.add_argument(
+        "--copies", type=int, default=200, help="Hávamál copies (~1.1k segments each)."
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    docs = scaled_docs(args.copies)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.ntas"
+        start = time.perf_counter()
+        stats = build_index(docs, path)
+        print(
+            f"build: {stats['docs']:,} segments, {stats['postings']:,} postings, "
+            f"{path.stat().st_size / 1e6:.1f} MB in {time.perf_counter() - start:.2f}s"
+        )
+        start = time.perf_counter()
+        index = SearchIndex(path)
+        print(f"open: {(time.perf_counter() - start) * 1000:.2f} ms")
+        with index:
+            for query in QUERIES:
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    hits = index.search(query, limit=10)
+                elapsed = (time.perf_counter() - start) / args.repeat
+                print(f"{query!r:<24} {elapsed * 1000:8.2f} ms  top={hits[0].score if hits else 0:.2f}")
+
+
+if __name__ == "__main__":
+    main()
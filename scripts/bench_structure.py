@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Allow direct script execution from repo root without package installation.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from nta.ingest.segment import iter_segments
+from nta.ingest.structure import STRUCTURE_RULESETS
+from nta.ingest.structure import structure_rules
+from nta.ingest.text import tokenize_v0
+
+
+STANZA = [
+    "Gáttir allar,",
+    "áðr gangi fram,",
+    "um skoðask skyli,",
+    "um skyggnask skyli,",
+    "því at óvíst er at vita,",
+    "hvar óvinir",
+    "sitja á fleti fyrir.",
+]
+
+ROMAN = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"]
+
+
+def synthetic_lines(count: int) -> list[str]:
+    """Verse/strophe-marked lines, roughly one marker per eight lines."""
+    lines: list[str] = []
+    strophe = 0
+    while len(lines) < count:
+        strophe += 1
+        if strophe % 10 == 1:
+            lines.append(f"{ROMAN[(strophe // 10) % len(ROMAN)]}.")
+        lines.append(f"{strophe}.")
+        lines.extend(STANZA)
+    return lines[:count]
+
+
+def _rate(label: str, count: int, seconds: float) -> None:
+    print(f"{label:<28} {count / seconds:>12,.0f} lines/s  ({seconds:.3f}s)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark L1 structure detection.")
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--rules", choices=tuple(STRUCTURE_RULESETS), default="l1_v1")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    lines = synthetic_lines(args.lines)
+    rules = structure_rules(args.rules)
+
+    start = time.perf_counter()
+    segments = [text for _, text in iter_segments(lines, "line")]
+    _rate("line segmentation", len(lines), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in rules.iter_structured(segments):
+        pass
+    _rate(f"structure ({rules.name})", len(segments), time.perf_counter() - start)
+
+    # Tokenization is the next per-segment stage; detection should stay well below it.
+    start = time.perf_counter()
+    for text in segments:
+        tokenize_v0(text)
+    _rate("tokenize_v0 (reference)", len(segments), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
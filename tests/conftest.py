@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+import pytest
+
+from nta.graph.recording import RecordingDriver
+
+
+@pytest.fixture
+def recording_driver() -> RecordingDriver:
+    """A ``neo4j.Driver`` stand-in that records statements; see ``assert_statement_budget``."""
+    return RecordingDriver()
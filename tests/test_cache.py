@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from nta.ingest.adapters.base import RawSource
+from nta.ingest.adapters.verse_json import VerseJsonAdapter
+from nta.ingest.cache import SourceCache
+from nta.ingest.cache import cached_adapt
+
+
+POEM = (
+    '{"information": {"cover": ["Eddukvæði"], "writer": []},'
+    ' "poem": {"title": "Hávamál", "verses": [{"verse": "I.", "strophes":'
+    ' [{"strophe": "1.", "lines": ["Gáttir allar,", "\\u0000x y"]}]}]}}'
+)
+
+
+class _CountingAdapter(VerseJsonAdapter):
+    __slots__ = ("calls",)
+
+    def adapt(self, raw_source: RawSource):
+        self.calls = getattr(self, "calls", 0) + 1
+        return VerseJsonAdapter.adapt(self, raw_source)
+
+
+def _adapt(adapter, path: Path, cache: SourceCache):
+    raw_source = RawSource(source_id="ed", kind="json", origin=str(path))
+    output = cached_adapt(adapter, raw_source, cache, "verse_json", "v1", "p0", {"k": 1})
+    return output, list(output.segments)
+
+
+def test_cached_adapter_output_round_trips_and_skips_parsing(tmp_path: Path) -> None:
+    path = tmp_path / "poem.json"
+    path.write_text(POEM, encoding="utf-8")
+    cache = SourceCache(tmp_path / "cache")
+    adapter = _CountingAdapter(work_id="w", edition_id="ed", form_prefix="non")
+
+    first, first_segments = _adapt(adapter, path, cache)
+    second, second_segments = _adapt(adapter, path, cache)
+
+    assert adapter.calls == 1
+    assert second_segments == first_segments
+    assert second.edition == first.edition
+    assert second_segments[1].tokens[0].surface == "\x00x"
+
+    path.write_text(POEM.replace("allar", "allir"), encoding="utf-8")
+    _adapt(adapter, path, cache)
+    assert adapter.calls == 2
+
+
+def test_partial_consumption_leaves_no_cache_entry(tmp_path: Path) -> None:
+    path = tmp_path / "poem.json"
+    path.write_text(POEM, encoding="utf-8")
+    cache = SourceCache(tmp_path / "cache")
+    adapter = _CountingAdapter(work_id="w", edition_id="ed")
+
+    raw_source = RawSource(source_id="ed", kind="json", origin=str(path))
+    segments = iter(cached_adapt(adapter, raw_source, cache, "verse_json", "v1", None).segments)
+    next(segments)
+    segments.close()
+
+    assert not list((tmp_path / "cache").rglob("*.nac"))
+    assert not list((tmp_path / "cache").rglob("*.tmp"))
+
+
+def test_fetch_acquires_each_origin_once(tmp_path: Path) -> None:
+    cache = SourceCache(tmp_path)
+    calls = []
+
+    def acquire() -> bytes:
+        calls.append(1)
+        return "<html>Hávamál</html>".encode("utf-8")
+
+    data, raw = cache.fetch("https://example.org/h", acquire, kind="html")
+    again, raw_again = cache.fetch("https://example.org/h", acquire, kind="html")
+
+    assert data == again
+    assert len(calls) == 1
+    assert raw.source_id == raw_again.source_id
+    assert raw_again.kind == "html"
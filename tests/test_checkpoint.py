@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from nta.ingest.adapters.base import AdapterEditionMetadata
+from nta.ingest.adapters.base import AdapterOutput
+from nta.ingest.adapters.base import AdapterSegmentRecord
+from nta.ingest.adapters.base import AdapterWorkMetadata
+from nta.ingest.checkpoint import CheckpointJournal
+from nta.ingest.checkpoint import SegmentCheckpointer
+from nta.ingest.checkpoint import config_hash
+
+
+def test_config_hash_is_order_insensitive_and_value_sensitive() -> None:
+    a = config_hash(adapter="plaintext_v1", segment_mode="line")
+    b = config_hash(segment_mode="line", adapter="plaintext_v1")
+    c = config_hash(adapter="plaintext_v1", segment_mode="paragraph")
+    assert a == b
+    assert a != c
+
+
+def test_checkpointer_commits_on_batch_boundary_and_resumes(tmp_path: Path) -> None:
+    journal = CheckpointJournal(tmp_path)
+    first = SegmentCheckpointer(journal, "ed1", "cfg", every=2)
+    assert first.segment_done(1, 3) is False
+    assert first.segment_done(2, 4) is True
+    first.commit()
+    first.segment_done(3, 5)  # crash before the next commit
+
+    resumed = SegmentCheckpointer(journal, "ed1", "cfg", every=2, resume=True)
+    assert resumed.start_after == 2
+    assert resumed.should_skip(2)
+    assert not resumed.should_skip(3)
+    assert resumed.tokens == 7
+
+
+def test_checkpoint_is_scoped_to_config_hash(tmp_path: Path) -> None:
+    journal = CheckpointJournal(tmp_path)
+    checkpointer = SegmentCheckpointer(journal, "ed1", "cfg-a", every=1)
+    checkpointer.segment_done(1, 1)
+    checkpointer.finish()
+
+    other = SegmentCheckpointer(journal, "ed1", "cfg-b", every=1, resume=True)
+    assert other.resumed_from is None
+    assert other.start_after == 0
+
+    saved = journal.load("ed1", "cfg-a")
+    assert saved is not None
+    assert saved.completed is True
+    assert saved.last_ordinal == 1
+
+
+def test_plan_rejects_ordinal_zero_instead_of_skipping_it() -> None:
+    from nta.ingest.pipeline import plan_adapter_output
+
+    def output(first: int) -> AdapterOutput:
+        return AdapterOutput(
+            work=AdapterWorkMetadata("w", "Work"),
+            edition=AdapterEditionMetadata("ed", "Edition", language="non"),
+            segments=[AdapterSegmentRecord("x", ordinal, []) for ordinal in (first, first + 1)],
+        )
+
+    assert sum(batch.segments for batch in plan_adapter_output(output(1))) == 2
+    with pytest.raises(ValueError, match="1-based"):
+        list(plan_adapter_output(output(0)))
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+from nta.cli.main import main
+from nta.cli.main import resolve_command
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_resolve_command_prefers_longest_prefix() -> None:
+    resolved = resolve_command(["ingest", "plaintext", "--path", "x.txt"])
+    assert resolved is not None
+    path, command, rest = resolved
+    assert path == ("ingest", "plaintext")
+    assert command.module == "nta.ingest.plaintext"
+    assert rest == ["--path", "x.txt"]
+    assert resolve_command(["nope"]) is None
+
+
+def test_count_json_runs_without_importing_neo4j() -> None:
+    code = (
+        "import sys\n"
+        "from nta.cli.main import main\n"
+        "main(['--no-daemon', 'count', '--source', 'json'])\n"
+        "assert 'neo4j' not in sys.modules, 'neo4j imported eagerly'\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "at: " in result.stdout
+
+
+def test_unknown_command_returns_usage_error(capsys) -> None:
+    assert main(["--no-daemon", "bogus"]) == 2
+    assert "commands:" in capsys.readouterr().out
+
+
+def test_daemon_request_survives_commands_that_exit(recording_driver) -> None:
+    from nta.cli.daemon import _run_request
+    from nta.cli.main import run_command
+
+    request = {"op": "run", "argv": ["align", "collate", "--edition-id", "only-one"]}
+    response = _run_request(run_command, request, recording_driver)
+    assert response["code"] == 1
+    assert "at least two --edition-id" in response["stderr"]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import random
+
+from nta.align.collate import CollationOp
+from nta.align.collate import collation_ops
+from nta.align.collate import collation_rows
+from nta.align.collate import intern_keys
+from nta.align.collate import match_pairs
+from nta.ingest.normalize import normalization_policy
+
+BASE = "Deyr fé , deyja frændr , deyr sjalfr it sama".split()
+WITNESS = "Deyr fe deyia frændr , deyr siálfr et sama ok".split()
+
+
+def _lcs(a, b) -> int:
+    prev = [0] * (len(b) + 1)
+    for x in a:
+        cur = [0]
+        for j, y in enumerate(b):
+            cur.append(prev[j] + 1 if x == y else max(prev[j + 1], cur[j]))
+        prev = cur
+    return prev[-1]
+
+
+def test_witnesses_align_into_agreements_and_variants() -> None:
+    vocab: dict[str, int] = {}
+    policy = normalization_policy("on_folded_v1")
+    base = intern_keys(BASE, policy, vocab)
+    witness = intern_keys(WITNESS, policy, vocab)
+
+    ops = collation_ops(match_pairs(base, witness), len(base), len(witness))
+    assert [(op.kind, op.base_start, op.witness_start) for op in ops] == [
+        ("equal", 0, 0),  # fé/fe agree once accents are folded
+        ("substitution", 2, 2),  # ", deyja" / "deyia": one pair plus an omission
+        ("equal", 4, 3),
+        ("substitution", 7, 6),  # sjalfr it / siálfr et
+        ("equal", 9, 8),
+        ("addition", 10, 9),
+    ]
+
+    base_ids = [f"b{i}" for i in range(len(BASE))]
+    witness_ids = [f"w{j}" for j in range(len(WITNESS))]
+    (rows,) = collation_rows(ops, base_ids, witness_ids, "ed-a", "ed-b", "c1")
+    groups = rows.relationships
+    keys = ("collation",)
+    assert len(groups[("AGREES_WITH", "Token", "token_id", "Token", "token_id", keys)]) == 6
+    variants = groups[("VARIANT_OF", "Token", "token_id", "Token", "token_id", keys)]
+    assert variants[("b8", "w7", "c1")] == {"collation": "c1", "unit": 3, "type": "substitution"}
+    assert len(variants) == 3
+    assert groups[("VARIANT_OF", "Token", "token_id", "Edition", "edition_id", keys)] == {
+        ("b3", "ed-b", "c1"): {"collation": "c1", "unit": 1, "type": "omission"},
+        ("w9", "ed-a", "c1"): {"collation": "c1", "unit": 5, "type": "addition"},
+    }
+
+    # A collation under another policy keeps its own edges.
+    (other,) = collation_rows(ops, base_ids, witness_ids, "ed-a", "ed-b", "c2")
+    assert rows.update(other) == len(other)
+
+
+def test_matching_is_consistent_and_optimal_between_anchors() -> None:
+    rng = random.Random(7)
+    for _ in range(500):
+        # A three-letter alphabet leaves few unique anchors: mostly Myers.
+        a = [rng.randrange(3) for _ in range(rng.randrange(25))]
+        b = [rng.randrange(3) for _ in range(rng.randrange(25))]
+        pairs = match_pairs(a, b)
+        assert all(a[i] == b[j] for i, j in pairs)
+        assert all(p[0] < q[0] and p[1] < q[1] for p, q in zip(pairs, pairs[1:]))
+        ops = collation_ops(pairs, len(a), len(b))
+        assert ops == [] or (ops[0].base_start, ops[0].witness_start) == (0, 0)
+        assert all(
+            (x.base_end, x.witness_end) == (y.base_start, y.witness_start)
+            for x, y in zip(ops, ops[1:])
+        )
+    a = [1, 2, 3, 2, 1, 2, 3, 1]
+    b = [2, 1, 3, 2, 2, 1, 3]
+    assert len(match_pairs(a, b)) == _lcs(a, b)
+
+    # Long, mostly identical witnesses: anchors carry it, the edit cap is never hit.
+    base = [rng.randrange(5000) for _ in range(50_000)]
+    witness = base[:20_000] + [9999] + base[20_010:]
+    ops = collation_ops(match_pairs(base, witness, max_edits=50), len(base), len(witness))
+    assert [op.kind for op in ops] == ["equal", "substitution", "equal"]
+    assert ops[1] == CollationOp("substitution", 20_000, 20_010, 20_000, 20_001)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+
+import pytest
+
+from nta.cli.main import main
+from nta.reports.collocations import CollocationCounter
+from nta.reports.collocations import CountMinSketch
+from nta.reports.collocations import SketchCounter
+from nta.reports.collocations import SpillingCounter
+from nta.reports.collocations import log_likelihood
+
+
+SEGMENTS = [
+    ["deyr", "fé", "deyja", "frændr"],
+    ["deyr", "sjalfr", "it", "sama"],
+    ["deyr", "fé", "ok", "fé"],
+    ["ek", "veit", "einn", "at", "aldri", "deyr"],
+]
+
+
+def _counts(counter: CollocationCounter) -> dict[tuple[str, ...], int]:
+    return dict(counter.grams.items())
+
+
+def test_bigrams_stay_inside_segments_and_spill_exactly(tmp_path: Path) -> None:
+    with CollocationCounter(2) as memory:
+        memory.add_all(SEGMENTS)
+        expected = _counts(memory)
+    assert expected[("deyr", "fé")] == 2
+    assert ("frændr", "deyr") not in expected  # no pair across segments
+    assert memory.tokens == 18 and memory.total == 14
+
+    spilling = SpillingCounter(max_entries=2, spill_dir=str(tmp_path))
+    with CollocationCounter(2, grams=spilling) as counter:
+        counter.add_all(SEGMENTS)
+        assert len(spilling.runs) >= 3
+        assert _counts(counter) == expected
+        assert list(counter.grams.items()) == sorted(expected.items())
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_window_pairs_and_marginals() -> None:
+    with CollocationCounter(2, window=2) as counter:
+        counter.add(["a", "b", "c"])
+        assert _counts(counter) == {("a", "b"): 1, ("a", "c"): 1, ("b", "c"): 1}
+        assert counter.left == {"a": 2, "b": 1}
+        assert counter.right == {"b": 1, "c": 2}
+        assert counter.total == 3
+    with pytest.raises(ValueError):
+        CollocationCounter(3, window=2)
+
+
+def test_scores_rank_collocations() -> None:
+    # Independent table: G² is zero and PMI is zero.
+    assert log_likelihood(10, 10, 10, 10) == pytest.approx(0.0)
+    assert log_likelihood(20, 0, 0, 20) == pytest.approx(4 * 20 * math.log(2))
+
+    with CollocationCounter(2) as counter:
+        counter.add_all(SEGMENTS)
+        top = counter.top("llr", limit=2, min_count=2)
+        assert [row.terms for row in top] == [("deyr", "fé")]
+        row = top[0]
+        assert row.count == 2
+        assert row.pmi == pytest.approx(math.log2(2 * 14 / (3 * 3)))
+        assert counter.top("count", limit=1, min_count=1)[0].terms == ("deyr", "fé")
+
+    # "x y" occurs, but far less often than its frequent parts predict.
+    with CollocationCounter(2) as counter:
+        counter.add_all([["x", "x"]] * 20 + [["y", "y"]] * 20 + [["x", "y"], ["a", "b"]] * 2)
+        rows = counter.top("llr", limit=10, min_count=2)
+        assert rows[-1].terms == ("x", "y")
+        assert rows[-1].pmi < 0 and rows[-1].llr < 0
+        assert rows[-2].terms == ("a", "b") and rows[-2].llr > 0
+
+    with CollocationCounter(3) as trigrams:
+        trigrams.add_all(SEGMENTS)
+        assert trigrams.top("pmi", limit=1, min_count=1)[0].llr is None
+        with pytest.raises(ValueError):
+            trigrams.top("llr")
+
+
+def test_sketch_counts_never_undercount() -> None:
+    sketch = CountMinSketch(width=64, depth=3)
+    for index in range(500):
+        sketch.add(("k", str(index % 50)))
+    assert all(sketch.estimate(("k", str(index))) >= 10 for index in range(50))
+    assert CountMinSketch.for_error(0.01, 0.01).width == 272
+
+    exact = CollocationCounter(2)
+    approx = CollocationCounter(2, grams=SketchCounter(CountMinSketch(1024, 4), capacity=4))
+    for counter in (exact, approx):
+        counter.add_all(SEGMENTS * 25)
+    exact_counts = _counts(exact)
+    for gram, estimate in approx.grams.items():
+        assert estimate >= exact_counts[gram]
+    assert approx.top("count", limit=1)[0].terms == ("deyr", "fé")
+
+
+def test_cli_reports_collocations_from_jsonl(tmp_path: Path, capsys) -> None:
+    rows = tmp_path / "segs.jsonl"
+    rows.write_text(
+        "".join(
+            json.dumps({"segment_id": f"ed:seg{i}", "text": " ".join(terms)}) + "\n"
+            for i, terms in enumerate(SEGMENTS * 3)
+        ),
+        encoding="utf-8",
+    )
+    argv = ["report", "collocations", "--jsonl", str(rows), "--min-count", "3"]
+    code = main([*argv, "--measure", "count", "--format", "jsonl"])
+    assert code == 0
+    first = json.loads(capsys.readouterr().out.splitlines()[0])
+    assert first["terms"] == ["deyr", "fé"] and first["count"] == 6
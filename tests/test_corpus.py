@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from nta.ingest.checkpoint import CheckpointJournal
+from nta.ingest.corpus import discover_sources
+from nta.ingest.corpus import format_status_table
+from nta.ingest.corpus import ingest_corpus
+from nta.ingest.corpus import load_manifest
+from nta.ingest.corpus import plan_source
+from nta.model.hll import HyperLogLog
+
+
+class _CountingRepo:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.segments: set[str] = set()
+        self.sketches: dict[str, dict[str, HyperLogLog]] = {}
+
+    def write_rows(self, rows, batch_size=1000) -> int:
+        with self.lock:
+            for label, _, node_rows in rows.node_groups():
+                if label == "Segment":
+                    self.segments.update(row["key"] for row in node_rows)
+        return 1
+
+    def merge_edition_sketches(self, edition_id, sketches) -> None:
+        with self.lock:
+            stored = self.sketches.setdefault(edition_id, {})
+            for name, sketch in sketches.items():
+                stored[name] = stored[name] | sketch if name in stored else sketch
+
+    def flush(self) -> None:
+        pass
+
+
+def _write_corpus(root: Path) -> None:
+    (root / "a.txt").write_text("ek sá\nþú sást\nhann sá\n", encoding="utf-8")
+    (root / "sub").mkdir()
+    (root / "sub" / "b.txt").write_text("einn\n\ntveir þrír\n", encoding="utf-8")
+    (root / "notes.md").write_text("ignored", encoding="utf-8")
+
+
+def test_discovery_and_manifest_resolve_defaults(tmp_path: Path) -> None:
+    _write_corpus(tmp_path)
+    sources = discover_sources(tmp_path, {"language_stage": "on"})
+    assert [Path(s.path).name for s in sources] == ["a.txt", "b.txt"]
+    assert sources[0].edition_id == "a:on:plaintext"
+
+    manifest = tmp_path / "corpus.jsonl"
+    manifest.write_text(
+        '{"path": "a.txt", "edition_id": "ed-a", "language_stage": "own"}\n',
+        encoding="utf-8",
+    )
+    (source,) = load_manifest(manifest)
+    assert source.kind == "plaintext"
+    assert source.path == str(tmp_path / "a.txt")
+    assert (source.edition_id, source.language_stage) == ("ed-a", "own")
+
+    with pytest.raises(ValueError):
+        discover_sources(tmp_path)
+
+
+def test_json_sources_get_their_own_editions(tmp_path: Path) -> None:
+    poem = (
+        '{"poem": {"title": "Kvæði", "verses": '
+        '[{"verse": "I.", "strophes": [{"strophe": "1.", "lines": ["Deyr fé"]}]}]}}'
+    )
+    for name in ("a.json", "b.json"):
+        (tmp_path / name).write_text(poem, encoding="utf-8")
+    sources = discover_sources(tmp_path)
+    assert [s.edition_id for s in sources] == ["a:havamal_json", "b:havamal_json"]
+
+    segments = set()
+    for source in sources:
+        (batch,) = plan_source(source, 10)
+        assert batch.edition_id == source.edition_id
+        (work_id,) = batch.rows.nodes[("Work", "work_id")]
+        assert work_id == source.work_id
+        segments.update(batch.rows.nodes[("Segment", "segment_id")])
+    assert segments == {"a:havamal_json:vI.:s1.:l0", "b:havamal_json:vI.:s1.:l0"}
+
+
+def test_ingest_corpus_writes_every_source_and_reports_totals(tmp_path: Path) -> None:
+    _write_corpus(tmp_path)
+    sources = discover_sources(tmp_path, {"language_stage": "on"})
+    repo = _CountingRepo()
+
+    statuses = ingest_corpus(
+        sources, repo, workers=2, writers=2, queue_size=1, batch_segments=1
+    )
+
+    assert [s.status for s in statuses] == ["ok", "ok"]
+    assert [(s.segments, s.tokens) for s in statuses] == [(3, 6), (2, 3)]
+    assert len(repo.segments) == 5
+    # Per-batch sketches fold into one per edition; a.txt repeats "sá".
+    surfaces = sorted(sketches["surfaces"].count() for sketches in repo.sketches.values())
+    assert surfaces == [3, 5]
+    assert "TOTAL (2 files, 0 failed)" in format_status_table(statuses)
+
+
+def test_ingest_corpus_resume_skips_committed_segments(tmp_path: Path) -> None:
+    _write_corpus(tmp_path)
+    sources = discover_sources(tmp_path, {"language_stage": "on"})[:1]
+    journal = CheckpointJournal(tmp_path / "journal")
+
+    ingest_corpus(sources, _CountingRepo(), workers=1, batch_segments=2, journal=journal)
+    repo = _CountingRepo()
+    (status,) = ingest_corpus(
+        sources, repo, workers=1, batch_segments=2, journal=journal, resume=True
+    )
+
+    assert (status.status, status.segments) == ("ok", 0)
+    assert repo.segments == set()
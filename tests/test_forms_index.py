@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import pytest
+
+from nta.search.forms_query import run as search_run
+from nta.search.suffix import FormEntry
+from nta.search.suffix import FormIndex
+from nta.search.suffix import build_form_index
+from nta.search.suffix import parse_affix
+
+
+FORMS = {
+    "f1": ("hestrinn", "non"),
+    "f2": ("barnit", "non"),
+    "f3": ("Óðinn", "non"),
+    "f4": ("fiskr", "non"),
+    "f5": ("skip", "non"),
+    "f6": ("askinn", "isl"),
+    "f7": ("inn", "non"),
+    "f8": ("ǫnd", "non"),
+}
+
+
+def _index(tmp_path: Path) -> Path:
+    path = tmp_path / "forms.ntaf"
+    entries = [FormEntry(form_id, text, lang) for form_id, (text, lang) in FORMS.items()]
+    stats = build_form_index(entries + [FormEntry("empty", "")], path)
+    assert stats["forms"] == len(FORMS)
+    return path
+
+
+def test_affix_searches_map_back_to_form_ids(tmp_path: Path) -> None:
+    assert parse_affix("-sk-") == ("infix", "sk")
+    with pytest.raises(ValueError):
+        parse_affix("--")
+
+    with FormIndex(_index(tmp_path)) as index:
+        assert index.form_ids("-inn") == ["f6", "f1", "f7", "f3"]
+        assert index.form_ids("-inn", language="isl") == ["f6"]
+        assert index.form_ids("-it") == ["f2"]
+        assert index.form_ids("sk-") == ["f5"]
+        assert index.form_ids("-sk-") == ["f6", "f4", "f5"]
+        assert index.form_ids("inn") == ["f7"]
+        # Keys are NFC and case-folded, on both sides.
+        assert index.form_ids("ÓÐINN") == ["f3"]
+        assert index.search("-ð-")[0].orthography == "Óðinn"
+        assert index.form_ids("ǫ-") == ["f8"]
+        assert index.form_ids("-n-") == ["f6", "f2", "f1", "f7", "f3", "f8"]
+        assert index.count("-n-") == 10
+        assert index.form_ids("-x-") == []
+
+
+def test_search_feeds_form_ids_to_attestation_query(
+    tmp_path: Path, recording_driver, capsys
+) -> None:
+    args = argparse.Namespace(
+        pattern="-inn",
+        index=str(_index(tmp_path)),
+        language=None,
+        limit=None,
+        jsonl=True,
+        attestations=False,
+        chunk_size=3,
+    )
+    search_run(args, driver=recording_driver)
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [row["orthography"] for row in rows] == ["askinn", "hestrinn", "inn", "Óðinn"]
+
+    search_run(argparse.Namespace(**{**vars(args), "attestations": True}), recording_driver)
+    assert [statement.parameters["form_ids"] for statement in recording_driver.statements] == [
+        3,
+        1,
+    ]
+    assert all("UNWIND $form_ids" in statement.query for statement in recording_driver.statements)
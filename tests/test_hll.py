@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import pytest
+
+from nta.graph.rows import RowSet
+from nta.ingest.pipeline import batch_sketches
+from nta.model.hll import HyperLogLog
+from nta.reports.distinct import merge_sketch_rows
+
+
+def _sketch(values) -> HyperLogLog:
+    sketch = HyperLogLog()
+    sketch.update(values)
+    return sketch
+
+
+def test_estimates_stay_within_error_bound() -> None:
+    for n in (0, 7, 1000, 50_000):
+        sketch = _sketch(f"form{i}" for i in range(n))
+        assert abs(sketch.count() - n) <= 3 * sketch.standard_error * n + 1
+    # Duplicates do not count twice.
+    assert _sketch(["ok", "ok", "OK"]).count() == 2
+
+
+def test_merge_is_a_union_and_round_trips_through_lists() -> None:
+    a = _sketch(f"w{i}" for i in range(0, 6000))
+    b = _sketch(f"w{i}" for i in range(4000, 10_000))
+    union = a | b
+    assert abs(union.count() - 10_000) <= 3 * union.standard_error * 10_000
+    # Max-merge is idempotent, so re-writing a batch cannot inflate counts.
+    assert (union | b).registers == union.registers
+    stored = HyperLogLog.from_list(union.to_list())
+    assert stored.precision == union.precision and stored.count() == union.count()
+    with pytest.raises(ValueError):
+        a.merge(HyperLogLog(precision=10))
+
+
+def test_batch_sketches_follow_token_traversals() -> None:
+    rows = RowSet()
+    for index, surface in enumerate(["Deyr", "fé", "deyr"]):
+        form_id = f"f:{surface}"
+        rows.merge_node("Token", "token_id", f"t{index}", {"surface": surface})
+        rows.merge_relationship(
+            "INSTANCE_OF_FORM", ("Token", "token_id", f"t{index}"), ("Form", "form_id", form_id)
+        )
+        rows.merge_relationship(
+            "REALIZES", ("Form", "form_id", form_id), ("Lemma", "lemma_id", surface.lower())
+        )
+    sketches = batch_sketches(rows)
+    assert {name: sketch.count() for name, sketch in sketches.items()} == {
+        "forms": 3,
+        "lemmas": 2,
+        "surfaces": 3,
+    }
+
+
+def test_merge_sketch_rows_groups_without_touching_tokens() -> None:
+    rows = [
+        {
+            "edition_id": "a",
+            "language_stage": "non",
+            "centuries": [12, 13],
+            "forms": _sketch(["x", "y"]).to_list(),
+            "lemmas": _sketch(["x"]).to_list(),
+            "surfaces": _sketch(["x", "y"]).to_list(),
+        },
+        {
+            "edition_id": "b",
+            "language_stage": "non",
+            "centuries": [13],
+            "forms": _sketch(["y", "z"]).to_list(),
+            "lemmas": _sketch(["z"]).to_list(),
+            "surfaces": _sketch(["y", "z"]).to_list(),
+        },
+        {"edition_id": "c", "language_stage": "isl", "centuries": [], "forms": None},
+    ]
+    (total,) = merge_sketch_rows(rows)
+    assert (total.editions, total.forms, total.lemmas, total.unsketched) == (3, 3, 2, 1)
+
+    by_century = {
+        row.group: (row.editions, row.forms) for row in merge_sketch_rows(rows, "century")
+    }
+    assert by_century == {12: (1, 2), 13: (2, 3), None: (1, 0)}
+    by_stage = [row.group for row in merge_sketch_rows(rows, "language_stage")]
+    assert by_stage == ["isl", "non"]
+
+    rows[2]["centuries"] = [9, -1]
+    assert [row.group for row in merge_sketch_rows(rows, "century")] == [-1, 9, 12, 13]
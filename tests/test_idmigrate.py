@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from nta.graph import idmigrate
+from nta.graph.recording import RecordingDriver
+from nta.ingest.pipeline import resolve_id_scheme
+from nta.model import ids
+
+
+V2 = ids.id_scheme("v2")
+
+
+def test_edition_mapping_renames_segments_tokens_and_analyses() -> None:
+    segments = [{"id": "ed:s:1", "position": 1}, {"id": "ed:s:2", "position": None}]
+
+    def fetch_tokens(segment_ids):
+        assert segment_ids == ["ed:s:1", "ed:s:2"]
+        return [
+            {"segment_id": "ed:s:1", "id": "ed:s:1:t:0", "position": 0,
+             "analysis_ids": ["ed:s:1:t:0:placeholder"]},
+            {"segment_id": "ed:s:2", "id": "ed:s:2:t:0", "position": 0, "analysis_ids": []},
+        ]
+
+    mappings = list(idmigrate.plan_edition_mappings("ed", segments, fetch_tokens, V2))
+    by_old = {m.old: m.new for m in mappings}
+
+    # The second segment has no position and falls back to its rank (2).
+    assert by_old["ed:s:2"] == ids.segment_id_v2("ed", 2)
+    assert by_old["ed:s:1:t:0"] == ids.token_id_v2(ids.segment_id_v2("ed", 1), 0)
+    assert by_old["ed:s:1:t:0:placeholder"] == by_old["ed:s:1:t:0"] + ":placeholder"
+    assert not any(m.conflict for m in mappings)
+
+
+def test_vocabulary_collisions_are_reported_not_applied(tmp_path: Path) -> None:
+    rows = [
+        {"id": "form:a", "language": "non", "text": "orð"},
+        {"id": "form:b", "language": "NON", "text": "orð"},
+        {"id": "form:c", "language": "non", "text": "ást"},
+        {"id": ids.form_id_v2("non", "já"), "language": "non", "text": "já"},
+    ]
+    taken = {ids.form_id_v2("non", "ást")}
+    mappings = idmigrate.plan_vocabulary_mappings(
+        "Form", rows, V2.form_id, existing=lambda new_ids: taken & set(new_ids)
+    )
+    report = idmigrate.write_mapping(tmp_path / "map.jsonl.gz", mappings)
+    written = list(idmigrate.read_mapping(tmp_path / "map.jsonl.gz"))
+
+    assert [(m.old, m.conflict) for m in written] == [
+        ("form:b", "duplicate target"),
+        ("form:a", None),
+        ("form:c", "target exists"),
+    ]
+    assert report.counts == {"Form": 1} and report.conflicts == {"Form": 2}
+    assert report.bytes_before == len("form:a") and report.bytes_after == 17
+
+
+def _graph(edition_scheme=None, form_id=None, id_base=None) -> RecordingDriver:
+    def responder(query, params):
+        if "e.id_scheme" in query:
+            edition = {"id_scheme": edition_scheme, "id_base": id_base}
+            return [] if edition_scheme is None else [edition]
+        return [] if form_id is None else [{"form_id": form_id}]
+
+    return RecordingDriver(responder)
+
+
+def test_ingest_keeps_the_stored_and_vocabulary_id_scheme() -> None:
+    v2_form = V2.form_id("non", "deyr")
+    assert resolve_id_scheme(_graph(), "ed") == "v1"
+    assert resolve_id_scheme(_graph(), "ed", "v2") == "v2"
+    assert resolve_id_scheme(_graph("v2", v2_form), "ed") == "v2"
+    assert resolve_id_scheme(_graph(form_id=v2_form), "new") == "v2"
+    assert resolve_id_scheme(_graph("", "non:deyr"), "old") == "v1"
+
+    with pytest.raises(ValueError, match="Edition ed uses ID scheme v2"):
+        resolve_id_scheme(_graph("v2", v2_form), "ed", "v1")
+    with pytest.raises(ValueError, match="Form vocabulary uses ID scheme v1"):
+        resolve_id_scheme(_graph(form_id="non:deyr"), "new", "v2")
+
+    rebuilt = _graph("v1", "non:deyr", id_base="ed~r2")
+    with pytest.raises(ValueError, match="nta edition rebuild"):
+        resolve_id_scheme(rebuilt, "ed")
+    assert resolve_id_scheme(rebuilt, "ed", rebuild=True) == "v1"
@@ -39,3 +39,19 @@ def test_claim_id_is_deterministic_and_changes_with_statement() -> None:
     assert a != c
     assert a.startswith("claim:")
 
+
+def test_v2_ids_are_compact_and_keep_case_distinct() -> None:
+    segment = ids.segment_id_v2("edition:havamal", 1234)
+    token = ids.token_id_v2(segment, 7)
+    assert segment == ids.segment_id_v2("edition:havamal", 1234)
+    assert token.startswith(segment + ".") and token.endswith(".7")
+    assert len(segment) <= 12 < len(ids.segment_id("edition:havamal", 1234))
+
+    form = ids.form_id_v2("Old Norse", "Nóregr")
+    assert form == ids.form_id_v2(" old norse ", "Nóregr")
+    assert form != ids.form_id_v2("Old Norse", "nóregr")
+    assert len(form) == 17 and form.startswith("f")
+    assert ids.lemma_id_v2("Old Norse", "Nóregr").startswith("l")
+    assert ids.form_id_scheme(form) == "v2"
+    assert ids.form_id_scheme(ids.form_id("Old Norse", "Nóregr")) == "v1"
+    assert ids.form_id_scheme("non:deyr") == "v1"
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import io
+
+from nta.graph.recording import RecordingDriver
+from nta.reports import inflections
+
+
+def _by_lemma(query: str, params) -> list[dict]:
+    if query is inflections.BATCH_FEATURE_COUNTS_QUERY:
+        return []
+    return [
+        {"lemma_id": lemma_id, "rows": [{"surface": lemma_id.upper(), "freq": 1}]}
+        for lemma_id in params["lemma_ids"]
+        if lemma_id != "missing"
+    ]
+
+
+PARAMS = {"from_year": None, "to_year": None, "edition_ids": None, "limit": 5}
+
+
+def test_batch_report_chunks_lemmas_and_keeps_input_order() -> None:
+    driver = RecordingDriver(_by_lemma)
+    lemma_ids = [f"l{i}" for i in range(7)] + ["missing"]
+
+    reports = list(inflections.batch_report(driver, iter(lemma_ids), PARAMS, chunk_size=3, workers=2))
+
+    assert [report["lemma_id"] for report in reports] == lemma_ids
+    assert reports[-1] == {"lemma_id": "missing", "top_forms": [], "features": [], "examples": []}
+    # Three queries per chunk of three lemmas, never one per lemma.
+    assert len(driver.statements) == 9
+    assert {statement.parameters["lemma_ids"] for statement in driver.statements} == {3, 2}
+    assert {statement.query for statement in driver.statements} == {
+        inflections.BATCH_TOP_FORMS_BY_SOURCE_FALLBACK_QUERY,
+        inflections.BATCH_FEATURE_COUNTS_QUERY,
+        inflections.BATCH_EXAMPLES_QUERY,
+    }
+
+
+def test_csv_output_is_long_format() -> None:
+    reports = inflections.batch_report(RecordingDriver(_by_lemma), ["a", "b"], PARAMS)
+    out = io.StringIO()
+
+    assert inflections.write_csv(reports, out) == 2
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith("lemma_id,section,")
+    assert lines[1].startswith("a,top_forms,,,,A,")
+    assert len(lines) == 5
+
+
+def test_lemma_queries_skip_retired_realizes_links() -> None:
+    from nta.graph.query import QUERIES
+
+    queries = [value for name, value in vars(inflections).items() if name.endswith("_QUERY")]
+    queries.append(QUERIES["lemma_attestations"].cypher)
+    for query in queries:
+        if "REALIZES" in query:
+            assert "WHERE coalesce(r.is_active, true)" in query, query
+
+
+def test_year_filters_resolve_through_century_buckets() -> None:
+    seen: list[tuple[str, dict]] = []
+
+    def responder(query: str, params) -> list[dict]:
+        seen.append((query, dict(params)))
+        if query is inflections.EDITIONS_IN_YEARS_QUERY:
+            return [{"edition_id": "saga"}, {"edition_id": "edda"}]
+        if "queryNodes" in query:
+            return [{"edition_id": "edda"}]
+        return []
+
+    args = argparse.Namespace(
+        lemma_id=["l1"],
+        lemma_ids=None,
+        format=None,
+        from_year=-50,
+        to_year=1250,
+        source_like="edda",
+        source_match="prefix",
+        limit=5,
+    )
+    inflections.run(args, driver=RecordingDriver(responder))
+
+    query, params = seen[0]
+    assert query is inflections.EDITIONS_IN_YEARS_QUERY
+    assert (params["from_century"], params["to_century"]) == (-1, 12)
+    reports = [params for query, params in seen if "lemma_id" in params]
+    assert len(reports) == 3
+    assert all(params["edition_ids"] == ["edda"] for params in reports)
+    for query in (inflections.TOP_FORMS_QUERY, inflections.BATCH_EXAMPLES_QUERY):
+        assert "date_hi" not in query and "date_lo" not in query
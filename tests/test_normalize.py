@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from nta.ingest import normalize
+from nta.ingest.normalize import POLICY_V0
+from nta.ingest.normalize import NormalizationPolicy
+from nta.ingest.normalize import NormalizationStep
+from nta.ingest.normalize import normalization_policy
+from nta.ingest.normalize import register_policy
+from nta.ingest.text import NORMALIZATION_POLICY_V0
+from nta.ingest.text import normalize_v0
+
+SURFACES = ['  "Hávamál"...  ', " \t halló   \n  heimur \r ", "“Nóregr”", "-- ", "sǫgu,"]
+
+
+def test_default_policy_matches_normalize_v0() -> None:
+    policy = normalization_policy()
+    assert policy.policy_id == NORMALIZATION_POLICY_V0 == POLICY_V0.policy_id
+    assert policy.normalize_many(SURFACES) == [normalize_v0(s) for s in SURFACES]
+
+
+def test_old_norse_policies() -> None:
+    standard = normalization_policy("on_standard_v1")
+    assert standard.normalize_many(["sǫgu,", "Ęgir", "⁊", "ꝥ", "hvaſ"]) == [
+        "sögu",
+        "Ægir",
+        "ok",
+        "þat",
+        "hvas",
+    ]
+    folded = normalization_policy("on_folded_v1")
+    assert folded.normalize_many(["Þórr", "Óðinn", "sǫgu", "Ægir", "hǫnd."]) == [
+        "thorr",
+        "odinn",
+        "sogu",
+        "aegir",
+        "hond",
+    ]
+    # Adjacent character maps fuse into one translate table.
+    assert len(folded._stages) == 7
+
+
+def test_registry_is_versioned(monkeypatch) -> None:
+    monkeypatch.setattr(normalize, "NORMALIZATION_POLICIES", dict(normalize.NORMALIZATION_POLICIES))
+    monkeypatch.setattr(normalize, "_COMPILED", dict(normalize._COMPILED))
+    steps = (NormalizationStep("lower"),)
+    policy = NormalizationPolicy("test_lower", 1, steps)
+    register_policy(policy)
+    register_policy(policy)
+    assert normalization_policy("test_lower_v1")("ÁS") == "ás"
+    with pytest.raises(ValueError, match="bump its version"):
+        register_policy(NormalizationPolicy("test_lower", 1, (NormalizationStep("strip"),)))
+
+    with pytest.raises(ValueError, match="Unknown normalization policy"):
+        normalization_policy("nope_v9")
+    with pytest.raises(ValueError, match="single characters"):
+        NormalizationPolicy("bad", 1, (NormalizationStep("map", mapping={"ab": "c"}),)).compile()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import pytest
+
+from nta.graph.rows import RowSet
+from nta.ingest.pipeline import plan_edition_period
+from nta.model.periods import DATE_MAX
+from nta.model.periods import DATE_MIN
+from nta.model.periods import edition_period
+
+
+def test_edition_period_normalizes_bounds_like_the_old_coalesce() -> None:
+    undated = edition_period(None, None)
+    assert (undated.date_lo, undated.date_hi, undated.undated) == (DATE_MIN, DATE_MAX, True)
+    assert undated.centuries == ()
+
+    single = edition_period(None, 1220)
+    assert (single.date_lo, single.date_hi, single.centuries) == (1220, 1220, (12,))
+    assert edition_period(-50, 30).centuries == (-1, 0)
+    assert edition_period(1150, 1320).centuries == (11, 12, 13)
+
+    with pytest.warns(UserWarning, match="after date_end"):
+        reversed_range = edition_period(1300, 1200)
+    assert (reversed_range.date_lo, reversed_range.date_hi) == (1200, 1300)
+
+
+def test_plan_edition_period_links_century_buckets() -> None:
+    rows = RowSet()
+    plan_edition_period(rows, "ed", 1190, 1210)
+
+    edition = rows.nodes[("Edition", "edition_id")]["ed"]["props"]
+    assert edition == {"date_lo": 1190, "date_hi": 1210, "undated": False}
+    assert set(rows.nodes[("Century", "century")]) == {11, 12}
+    ((rel_type, *_, links),) = rows.relationship_groups()
+    assert rel_type == "IN_CENTURY" and [link["end"] for link in links] == [11, 12]
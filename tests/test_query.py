@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+
+from nta.graph.query import QueryService
+
+
+ROWS = [{"segment_id": f"s{i // 2}", "token_id": f"t{i}", "surface": "orð"} for i in range(5)]
+
+
+def _page(params) -> list[dict]:
+    after = params["after"]
+    start = 0
+    if after is not None:
+        key = (after["segment_id"], after["token_id"])
+        start = next(i for i, r in enumerate(ROWS) if (r["segment_id"], r["token_id"]) > key)
+    return ROWS[start : start + params["limit"]]
+
+
+def test_paginate_uses_keyset_cursor_from_last_row(recording_driver, monkeypatch) -> None:
+    cursors = []
+    configs = []
+    session = recording_driver.session
+
+    def responder(query: str, params) -> list[dict]:
+        cursors.append(params["after"])
+        return _page(params)
+
+    recording_driver.responder = responder
+    monkeypatch.setattr(
+        recording_driver, "session", lambda **config: configs.append(config) or session(**config)
+    )
+    service = QueryService(recording_driver, fetch_size=100)
+
+    rows = list(service.paginate("form_attestations", page_size=2, form_id="f1"))
+
+    assert [row["token_id"] for row in rows] == [f"t{i}" for i in range(5)]
+    assert cursors == [
+        None,
+        {"segment_id": "s0", "token_id": "t1"},
+        {"segment_id": "s1", "token_id": "t3"},
+    ]
+    assert configs == [{"fetch_size": 2}]
+    assert recording_driver.sessions == 1
+
+
+def test_stream_requires_params_and_rejects_keyset_queries(recording_driver) -> None:
+    service = QueryService(recording_driver)
+    with pytest.raises(ValueError):
+        list(service.stream("top_surfaces"))
+    with pytest.raises(ValueError):
+        list(service.stream("form_attestations", form_id="f1"))
+    with pytest.raises(ValueError):
+        list(service.paginate("form_attestations"))
+
+
+def test_fulltext_query_treats_user_text_as_terms() -> None:
+    from nta.graph.fulltext import fulltext_query
+
+    assert fulltext_query("Hávamál (Gudni") == "hávamál AND gudni*"
+    assert fulltext_query("Gáttir allar,", "phrase") == '"gáttir allar"'
+    assert fulltext_query("ǫl AND þú", "all") == "ǫl AND and AND þú"
+    with pytest.raises(ValueError):
+        fulltext_query(" -- ")
+
+
+def test_matching_edition_ids_passes_the_lucene_query(recording_driver) -> None:
+    from nta.graph.fulltext import matching_edition_ids
+
+    recording_driver.responder = lambda query, params: [{"edition_id": params["query"]}]
+    with recording_driver.session() as session:
+        assert matching_edition_ids(session, "Hávamál (Gudni") == ["hávamál AND gudni*"]
+
+
+def test_search_queries_prepare_lucene_query(recording_driver) -> None:
+    calls = []
+    recording_driver.responder = lambda query, params: calls.append(params) or []
+    list(QueryService(recording_driver).stream("segment_search", text="gáttir all"))
+    assert calls[0]["query"] == "gáttir AND all*"
+    assert calls[0]["limit"] == 100
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import pytest
+
+from nta.graph.rebuild import EditionCounts
+from nta.graph.rebuild import RebuildIds
+from nta.graph.rebuild import add_arguments
+from nta.graph.rebuild import retire
+from nta.graph.rebuild import run
+from nta.graph.rebuild import stage_batches
+from nta.graph.rebuild import swap
+from nta.graph.rebuild import validate_stage
+from nta.graph.rebuild import write_staged
+from nta.graph.recording import RecordingDriver
+from nta.graph.rows import RowSet
+from nta.ingest.corpus import CorpusSource
+from nta.ingest.corpus import plan_source
+
+
+class _StagingRepo:
+    def __init__(self) -> None:
+        self.rows = RowSet()
+        self.sketch_labels: list[tuple[str, str]] = []
+
+    def write_rows(self, rows, batch_size=1000) -> int:
+        self.rows.update(rows)
+        return 1
+
+    def merge_edition_sketches(self, edition_id, sketches, label="Edition") -> None:
+        self.sketch_labels.append((label, edition_id))
+
+
+def _swap_responder(promoted: int = 1):
+    def responder(query: str, params) -> list[dict]:
+        return [{"retired": 1, "promoted": promoted, "work_ids": []}]
+
+    return responder
+
+
+def test_staged_rows_are_unreachable_until_swap(tmp_path: Path) -> None:
+    path = tmp_path / "saga.txt"
+    path.write_text("ek sá\nþú sást\n", encoding="utf-8")
+    ids = RebuildIds("saga", "r2")
+    source = CorpusSource("plaintext", str(path), "w", ids.staging_id, "s", "non")
+
+    repo = _StagingRepo()
+    batches = stage_batches(plan_source(source, batch_segments=1), ids.edition_id, ids.revision)
+    planned = write_staged(repo, ids.staging_id, batches)
+
+    assert (planned.segments, planned.tokens) == (2, 4)
+    assert ("Edition", "edition_id") not in repo.rows.nodes
+    staged = repo.rows.nodes[("StagedEdition", "edition_id")]["saga~r2"]["props"]
+    assert (staged["staging_for"], staged["revision"]) == ("saga", "r2")
+    rel_types = {group[0]: group for group in repo.rows.relationships}
+    assert "HAS_EDITION" not in rel_types
+    assert rel_types["HAS_SEGMENT"][1] == "StagedEdition"
+    assert all(key.startswith("saga~r2:") for key in repo.rows.nodes[("Segment", "segment_id")])
+    assert repo.sketch_labels == [("StagedEdition", "saga~r2")] * 2
+
+
+def test_validate_stage_guards_the_swap() -> None:
+    planned = EditionCounts(10, 100, exists=True)
+    live = EditionCounts(10, 120, exists=True)
+    assert validate_stage(planned, planned, live) == []
+    assert validate_stage(planned, planned, EditionCounts()) == []
+
+    problems = validate_stage(planned, EditionCounts(9, 90, True), live)
+    assert problems and "planned 10/100" in problems[0]
+    assert validate_stage(planned, planned, EditionCounts(10, 300, True), 0.5)
+    assert validate_stage(EditionCounts(), EditionCounts(exists=True), live)
+
+
+def test_swap_runs_in_one_transaction_and_retire_is_batched(recording_driver) -> None:
+    recording_driver.responder = _swap_responder()
+    assert swap(recording_driver, RebuildIds("saga", "r2"), "w") is True
+    queries = [statement.query for statement in recording_driver.statements]
+    assert "HAS_EDITION" in queries[0]
+    assert "REMOVE old:Edition" in queries[1]
+    assert "SET new:Edition" in queries[2]
+    assert len(queries) == 5
+    assert recording_driver.transactions == 1 and recording_driver.commits == 1
+
+    with pytest.raises(RuntimeError, match="Staged edition not found"):
+        swap(RecordingDriver(_swap_responder(promoted=0)), RebuildIds("saga", "r3"), "w")
+
+    recording_driver.reset()
+    retire(recording_driver, "RetiredEdition", "saga~retired-r2", rows=250)
+    query = recording_driver.statements[0].query
+    assert "IN TRANSACTIONS OF 250 ROWS" in query
+    assert "(:RetiredEdition {edition_id: $edition_id})" in query
+    with pytest.raises(ValueError):
+        retire(recording_driver, "Edition", "saga")
+
+
+def test_rebuild_keeps_the_live_work(tmp_path: Path) -> None:
+    path = tmp_path / "renamed-saga.txt"
+    path.write_text("ek sá\nþú sást\n", encoding="utf-8")
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    argv = ["--edition-id", "saga", "--path", str(path), "--language-stage", "non"]
+    promoted_under: list[str] = []
+
+    def responder(query: str, params) -> list[dict]:
+        if "collect(DISTINCT w.work_id)" in query:
+            return [{"work_ids": ["saga-work"]}]
+        if "count(DISTINCT e)" in query:
+            return [{"editions": 1, "segments": 2, "tokens": 4}]
+        if "SET new:Edition" in query:
+            promoted_under.append(params["work_id"])
+            return [{"promoted": 1}]
+        if "RETIRE" in query or "retired" in query:
+            return [{"retired": 0}]
+        return []
+
+    run(parser.parse_args(argv), driver=RecordingDriver(responder))
+    assert promoted_under == ["saga-work"]
+
+    with pytest.raises(SystemExit, match="belongs to Work saga-work"):
+        run(parser.parse_args([*argv, "--work-id", "other"]), RecordingDriver(responder))
+    with pytest.raises(RuntimeError, match="belongs to Work saga-work"):
+        swap(RecordingDriver(responder), RebuildIds("saga", "r3"), "other")
+    assert promoted_under == ["saga-work"]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from nta.graph.recording import RecordingDriver
+from nta.graph.remap import APPLY_QUERY
+from nta.graph.remap import Assignment
+from nta.graph.remap import plan_remap
+from nta.graph.remap import read_assignments
+from nta.graph.remap import remap
+
+GRAPH = {
+    "f:a": ["l:x"],
+    "f:b": ["l:x"],
+    "f:c": [],
+    "f:d": ["l:y", "l:z"],
+}
+LEMMAS = {"l:x", "l:y", "l:z"}
+
+
+def _fetch_active(rows):
+    return [
+        {
+            "form_id": row["form_id"],
+            "form_exists": row["form_id"] in GRAPH,
+            "lemma_exists": row["lemma_id"] in LEMMAS,
+            "active": GRAPH.get(row["form_id"], []),
+        }
+        for row in rows
+    ]
+
+
+def _responder(writes: list[list[dict]]):
+    def responder(query: str, params) -> list[dict]:
+        if query is APPLY_QUERY:
+            writes.append(params["rows"])
+            return []
+        return _fetch_active(params["rows"])
+
+    return responder
+
+
+def test_mapping_files_parse_tsv_and_jsonl(tmp_path: Path) -> None:
+    tsv = tmp_path / "map.tsv"
+    tsv.write_text("form_id\tlemma_id\tconfidence\nf:a\tl:y\t0.9\nf:c\tl:x\t\n", encoding="utf-8")
+    jsonl = tmp_path / "map.jsonl"
+    jsonl.write_text('{"form_id": "f:a", "lemma_id": "l:y", "confidence": 0.9}\n', encoding="utf-8")
+
+    assert list(read_assignments(tsv)) == [
+        Assignment("f:a", "l:y", 0.9),
+        Assignment("f:c", "l:x", None),
+    ]
+    assert list(read_assignments(jsonl)) == [Assignment("f:a", "l:y", 0.9)]
+
+
+def test_diff_classifies_each_assignment() -> None:
+    assignments = [
+        Assignment("f:a", "l:y"),
+        Assignment("f:b", "l:x"),
+        Assignment("f:c", "l:x"),
+        Assignment("f:d", "l:z"),
+        Assignment("f:a", "l:z"),
+        Assignment("f:zz", "l:x"),
+        Assignment("f:b", "l:new"),
+    ]
+    chunks = list(plan_remap(assignments, _fetch_active, chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    changes = [change for chunk in chunks for change in chunk]
+    assert [(c.kind, c.previous, c.conflict) for c in changes] == [
+        ("change", ("l:x",), None),
+        ("unchanged", ("l:x",), None),
+        ("add", (), None),
+        ("change", ("l:y",), None),
+        ("conflict", (), "duplicate form"),
+        ("conflict", (), "missing form"),
+        ("conflict", (), "duplicate form"),
+    ]
+
+
+def test_remap_writes_only_changes_per_chunk() -> None:
+    assignments = [
+        Assignment("f:a", "l:y", 0.8),
+        Assignment("f:b", "l:x"),
+        Assignment("f:c", "l:nope"),
+        Assignment("f:d", "l:z"),
+    ]
+    writes: list[list[dict]] = []
+    driver = RecordingDriver(_responder(writes))
+    report = remap(driver, assignments, chunk_size=2)
+    reads = [statement for statement in driver.statements if statement.query is not APPLY_QUERY]
+    assert len(reads) == 2
+    assert writes == [
+        [{"form_id": "f:a", "lemma_id": "l:y", "confidence": 0.8}],
+        [{"form_id": "f:d", "lemma_id": "l:z", "confidence": None}],
+    ]
+    assert report.applied == 2 and report.conflicts == {"missing lemma": 1}
+
+    writes.clear()
+    assert remap(RecordingDriver(_responder(writes)), assignments, dry_run=True).applied == 2
+    assert writes == []
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from nta.graph.recording import RecordingDriver
+from nta.graph.renormalize import RenormalizeJournal
+from nta.graph.renormalize import plan_normalizations
+from nta.graph.renormalize import renormalize
+from nta.graph.repo import Neo4jRepository
+from nta.ingest.normalize import normalization_policy
+from nta.model import ids
+
+POLICY = normalization_policy("on_standard_v1")
+TOKENS = [
+    {"id": f"t{i:02d}", "surface": s, "form_id": ids.form_id("non", s), "language": "non"}
+    for i, s in enumerate(["sǫgu", "ok", "⁊", "hǫnd", "Ęgir", "þat", "sǫgu"])
+]
+
+
+class _Fetch:
+    def __init__(self, fail_after: int | None = None) -> None:
+        self.calls: list[str] = []
+        self.fail_after = fail_after
+
+    def __call__(self, after: str, limit: int):
+        if self.fail_after is not None and len(self.calls) >= self.fail_after:
+            raise ConnectionError("lost connection")
+        self.calls.append(after)
+        rows = [row for row in TOKENS if row["id"] > after][:limit]
+        return rows, rows[-1]["id"] if rows else after
+
+
+def test_plan_writes_only_changed_tokens_in_the_surface_scheme() -> None:
+    form_id = ids.form_id_v2("non", "sǫgu")
+    v2 = {"id": "v2", "surface": "sǫgu", "form_id": form_id, "language": None}
+    rows = plan_normalizations(TOKENS[:3] + [v2], POLICY)
+    assert [(row["token_id"], row["orthography"]) for row in rows] == [
+        ("t00", "sögu"),
+        ("t02", "ok"),
+        ("v2", "sögu"),
+    ]
+    assert rows[0]["form_id"] == ids.form_id("non", "sögu")
+    assert rows[2]["form_id"] == ids.form_id_v2("UNKNOWN", "sögu")
+
+
+def test_plan_keeps_the_adapter_layout_of_v1_forms() -> None:
+    rows = plan_normalizations(
+        [
+            {"id": "p", "surface": "sǫgu", "form_id": "non:sǫgu", "language": "non"},
+            {"id": "h", "surface": "Hǫnd", "form_id": "non:Hǫnd", "language": "Old Norse"},
+            {"id": "i", "surface": "sǫgu", "form_id": "isl:sǫgu", "language": "isl"},
+        ],
+        POLICY,
+    )
+    assert [row["form_id"] for row in rows] == ["non:sögu", "non:Hönd", "isl:sögu"]
+
+
+def test_interrupted_job_resumes_from_its_cursor(tmp_path: Path) -> None:
+    journal = RenormalizeJournal(tmp_path)
+    driver = RecordingDriver()
+    repo = Neo4jRepository(driver)
+
+    with pytest.raises(ConnectionError):
+        renormalize(repo, _Fetch(fail_after=2), POLICY, journal, "all", page_size=3)
+    checkpoint = journal.load(POLICY.policy_id, "all")
+    assert (checkpoint.after, checkpoint.tokens, checkpoint.written) == ("t05", 6, 4)
+
+    fetch = _Fetch()
+    done = renormalize(repo, fetch, POLICY, journal, "all", page_size=3, resume=True)
+    assert fetch.calls == ["t05", "t06"]
+    assert (done.tokens, done.written, done.completed) == (7, 5, True)
+    # One UNWIND statement per page that had changes, tagged with the policy.
+    assert len(driver.statements) == 3
+    assert all("NORMALIZED_TO {policy: $policy}" in s.query for s in driver.statements)
+
+    # A completed job starts over rather than resuming past the end.
+    fetch = _Fetch()
+    renormalize(repo, fetch, POLICY, journal, "all", page_size=10, resume=True)
+    assert fetch.calls[0] == ""
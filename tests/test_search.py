@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from nta.ingest.plaintext import PlaintextOptions
+from nta.ingest.plaintext import plan_plaintext
+from nta.search.bm25 import SearchIndex
+from nta.search.bm25 import build_index
+from nta.search.build import docs_from_batches
+
+
+TEXT = "Deyr fé,\ndeyja frændr,\ndeyr sjalfr it sama;\nfé ok fé\n"
+
+
+def _index(tmp_path: Path) -> Path:
+    source = tmp_path / "poem.txt"
+    source.write_text(TEXT, encoding="utf-8")
+    options = PlaintextOptions(
+        path=str(source), work_id="w", edition_id="ed", source_label="s", language_stage="non"
+    )
+    path = tmp_path / "poem.ntas"
+    stats = build_index(docs_from_batches(plan_plaintext(options, batch_segments=2)), path)
+    assert stats["docs"] == 4
+    return path
+
+
+def test_bm25_ranks_with_graph_segment_ids(tmp_path: Path) -> None:
+    with SearchIndex(_index(tmp_path)) as index:
+        hits = index.search("FÉ")
+        assert [hit.segment_id for hit in hits] == ["ed:seg4", "ed:seg1"]
+        assert hits[0].score > hits[1].score
+        assert hits[1].text == "Deyr fé," and hits[1].ref == "1"
+        assert index.search("nothing here") == []
+
+
+def test_phrase_queries_require_adjacent_terms(tmp_path: Path) -> None:
+    with SearchIndex(_index(tmp_path)) as index:
+        assert [hit.segment_id for hit in index.search('"deyr fé"')] == ["ed:seg1"]
+        assert index.search('"fé deyr"') == []
+        # Loose terms rank; the phrase filters.
+        hits = index.search('deyja "it sama"')
+        assert [hit.segment_id for hit in hits] == ["ed:seg3"]
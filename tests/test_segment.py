@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+
+from nta.ingest.segment import iter_file_segments
+from nta.ingest.segment import split_segments
+
+
+def _legacy_split(text: str, mode: str) -> list[str]:
+    if mode == "line":
+        return [line.strip() for line in text.splitlines() if line.strip()]
+    normalized = text.replace("\r\n", "\n").replace("\r", "\n")
+    return [chunk.strip() for chunk in re.split(r"\n\s*\n+", normalized) if chunk.strip()]
+
+
+SAMPLES = [
+    "Gáttir allar,\náðr gangi fram,\n\n\num skoðask skyli,\n",
+    "  a  \r\n b\r\n \t \r\nc\rd\r\r\re",
+    "\n\n lead\n  \n\n trail \n\n",
+    "x y\x0cz\n\n\n",
+    "",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+@pytest.mark.parametrize("mode", ["line", "paragraph"])
+def test_split_segments_matches_legacy_whole_text_split(text: str, mode: str) -> None:
+    assert split_segments(text, mode) == _legacy_split(text, mode)
+
+
+@pytest.mark.parametrize("mode", ["line", "paragraph"])
+def test_file_segments_stream_with_stable_ordinals(tmp_path: Path, mode: str) -> None:
+    path = tmp_path / "sample.txt"
+    text = SAMPLES[0] + SAMPLES[1]
+    path.write_bytes(text.encode("utf-8"))
+
+    segments = list(iter_file_segments(path, mode))
+    assert [text for _, text in segments] == _legacy_split(text, mode)
+    assert [ordinal for ordinal, _ in segments] == list(range(1, len(segments) + 1))
+
+
+def test_unknown_mode_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        split_segments("a", "sentence")
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import pytest
+
+from nta.graph.recording import RecordingDriver
+from nta.graph.recording import assert_statement_budget
+from nta.graph.repo import Neo4jRepository
+from nta.ingest import havamal
+from nta.ingest import plaintext
+from nta.ingest.adapters.base import AdapterEditionMetadata
+from nta.ingest.adapters.base import AdapterOutput
+from nta.ingest.adapters.base import AdapterSegmentRecord
+from nta.ingest.adapters.base import AdapterTokenRecord
+from nta.ingest.adapters.base import AdapterWorkMetadata
+from nta.ingest.pipeline import ingest_adapter_output
+from nta.model.types import Form
+from nta.model.types import Token
+
+# Bulk ingest issues one UNWIND statement per node/relationship group per
+# batch, so these stay flat as sources grow; per-token writes blow them up.
+INGEST_PER_1K_TOKENS = 15
+MAX_ROWS = 1000
+
+
+def _adapter_output(segments: int, width: int) -> AdapterOutput:
+    return AdapterOutput(
+        work=AdapterWorkMetadata("w", "Work"),
+        edition=AdapterEditionMetadata("ed", "Edition", language="non"),
+        segments=[
+            AdapterSegmentRecord(
+                text="x",
+                ordinal=ordinal,
+                tokens=[AdapterTokenRecord(f"orð{i}", f"orð{i}", i) for i in range(width)],
+            )
+            for ordinal in range(1, segments + 1)
+        ],
+    )
+
+
+def test_ingest_adapter_output_stays_within_budget(recording_driver: RecordingDriver) -> None:
+    counts = ingest_adapter_output(
+        Neo4jRepository(recording_driver), _adapter_output(1200, 10), batch_segments=500
+    )
+    assert counts["tokens"] == 12_000
+    assert_statement_budget(
+        recording_driver,
+        tokens=counts["tokens"],
+        per_1k_tokens=INGEST_PER_1K_TOKENS,
+        max_rows=MAX_ROWS,
+    )
+    # Bulk writes are auto-commit statements, each its own transaction.
+    assert recording_driver.transactions == len(recording_driver.statements)
+
+
+def test_ingest_scripts_stay_within_budget(
+    recording_driver: RecordingDriver, tmp_path: Path
+) -> None:
+    _, tokens = havamal.ingest(
+        havamal.resolve_input_path(None), checkpoint_dir=tmp_path, driver=recording_driver
+    )
+    assert_statement_budget(recording_driver, tokens=tokens, per_1k_tokens=INGEST_PER_1K_TOKENS)
+
+    recording_driver.reset()
+    source = tmp_path / "poem.txt"
+    source.write_text("deyr fé deyja frændr\n" * 1000, encoding="utf-8")
+    parser = argparse.ArgumentParser()
+    plaintext.add_arguments(parser)
+    args = parser.parse_args(
+        [
+            "--path", str(source),
+            "--work-id", "w",
+            "--edition-id", "ed",
+            "--source-label", "s",
+            "--language-stage", "non",
+            "--checkpoint-dir", str(tmp_path),
+        ]
+    )
+    _, tokens = plaintext.ingest(args, driver=recording_driver)
+    assert_statement_budget(
+        recording_driver, tokens=tokens, per_1k_tokens=INGEST_PER_1K_TOKENS, max_rows=MAX_ROWS
+    )
+
+
+def test_per_token_writes_fail_the_budget(recording_driver: RecordingDriver) -> None:
+    repo = Neo4jRepository(recording_driver)
+    for position in range(50):
+        form = Form("f", "orð", "non")
+        repo.upsert_token_and_form(Token(f"t{position}", "s", "orð", position), form)
+    with pytest.raises(AssertionError, match="50 statements for 50 tokens"):
+        assert_statement_budget(recording_driver, tokens=50, per_1k_tokens=INGEST_PER_1K_TOKENS)
+
+    recording_driver.reset()
+    with recording_driver.session() as session:
+        session.execute_write(lambda tx: [tx.run("RETURN 1") for _ in range(3)])
+    assert recording_driver.transactions == 1 and recording_driver.commits == 1
+    assert all(statement.explicit for statement in recording_driver.statements)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from nta.ingest.structure import StructureRule
+from nta.ingest.structure import StructureRuleSet
+from nta.ingest.structure import structure_rules
+
+
+LINES = [
+    "Kapittel 2",
+    "I.",
+    "1. Gáttir allar,",
+    "áðr gangi fram,",
+    "2.",
+    "um skoðask skyli,",
+    "II.",
+    "Ivar kom.",
+]
+
+
+def test_l1_rules_emit_refs_and_fields_in_one_pass() -> None:
+    segments = list(structure_rules("l1_v1").iter_structured(LINES))
+
+    assert [(s.ordinal, s.ref, s.text) for s in segments] == [
+        (1, "2.I.1.0", "Gáttir allar,"),
+        (2, "2.I.1.1", "áðr gangi fram,"),
+        (3, "2.I.2.0", "um skoðask skyli,"),
+        (4, "2.II.0", "Ivar kom."),
+    ]
+    assert (segments[2].chapter, segments[2].verse, segments[2].strophe) == ("2", "I", "2")
+    assert segments[3].strophe is None
+
+
+def test_rule_sets_compile_to_one_pattern_and_validate_groups() -> None:
+    compiled = structure_rules("l1_v1")
+    assert compiled is structure_rules("l1_v1")
+    assert compiled.match("12. text") == ("strophe", "12", "text")
+    assert compiled.match("1.5 litres") is None
+
+    with pytest.raises(ValueError):
+        StructureRuleSet("bad", (StructureRule("verse", r"\d+"),)).compile()
+    with pytest.raises(ValueError):
+        structure_rules("l9")
+
+
+def test_plaintext_plan_carries_structure_fields(tmp_path) -> None:
+    from nta.ingest.plaintext import PlaintextOptions
+    from nta.ingest.plaintext import plan_plaintext
+
+    path = tmp_path / "poem.txt"
+    path.write_text("\n".join(LINES), encoding="utf-8")
+    options = PlaintextOptions(
+        path=str(path), work_id="w", edition_id="ed", source_label="s",
+        language_stage="non", structure="l1_v1",
+    )
+    (batch,) = plan_plaintext(options)
+    segments = batch.rows.nodes[("Segment", "segment_id")]
+
+    assert batch.segments == 4
+    assert segments["ed:seg3"]["props"]["ref"] == "2.I.2.0"
+    assert segments["ed:seg1"]["props"]["chapter"] == "2"
+    assert segments["ed:seg2"]["props"]["line_index"] == 1
+    assert "line" not in segments["ed:seg2"]["props"]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from nta.ingest.adapters.base import RawSource
+from nta.ingest.adapters.tei import TeiAdapter
+
+
+TEI = """<?xml version="1.0" encoding="UTF-8"?>
+<TEI xmlns="http://www.tei-c.org/ns/1.0">
+  <teiHeader>
+    <fileDesc><titleStmt><title>Hávamál</title></titleStmt></fileDesc>
+    <encodingDesc><p>Header prose is not a segment.</p></encodingDesc>
+  </teiHeader>
+  <text xml:lang="non">
+    <body>
+      <div type="poem" n="I">
+        <lg type="stanza" n="1">
+          <l n="1">Gáttir <hi>allar</hi>,<note>ed. note</note></l>
+          <l>áðr gangi fram</l>
+        </lg>
+        <lg type="stanza">
+          <l>Gefendr heilir!</l>
+        </lg>
+      </div>
+      <div><p>Prosa<lb/>text</p></div>
+    </body>
+  </text>
+</TEI>
+"""
+
+
+def test_tei_adapter_streams_segments_with_markup_refs(tmp_path: Path) -> None:
+    path = tmp_path / "havamal.xml"
+    path.write_text(TEI, encoding="utf-8")
+
+    adapter = TeiAdapter(work_id="havamal", edition_id="ed")
+    output = adapter.adapt(RawSource(source_id="ed", kind="tei_xml", origin=str(path)))
+    segments = list(output.segments)
+
+    assert output.work.title == "Hávamál"
+    assert output.edition.language == "non"
+    assert [s.text for s in segments] == [
+        "Gáttir allar,",
+        "áðr gangi fram",
+        "Gefendr heilir!",
+        "Prosa text",
+    ]
+    assert [s.ref for s in segments] == ["I.1.1", "I.1.2", "I.2.1", "2.1"]
+    assert [(s.verse, s.strophe, s.line) for s in segments[:3]] == [
+        ("I", "1", "1"),
+        ("I", "1", "2"),
+        ("I", "2", "1"),
+    ]
+    assert segments[3].line is None
+    assert [t.surface for t in segments[0].tokens] == ["Gáttir", "allar"]
+    assert [s.ordinal for s in segments] == [1, 2, 3, 4]
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import gzip
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+
+import pytest
+
+from nta.graph.rows import RowSet
+from nta.graph.transfer import NODE_KEYS
+from nta.graph.transfer import export_records
+from nta.graph.transfer import import_records
+from nta.graph.transfer import read_export
+from nta.graph.transfer import write_export
+from nta.ingest.plaintext import PlaintextOptions
+from nta.ingest.plaintext import plan_plaintext
+
+CREATED = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class _RowSetReader:
+    """SubgraphReader over planned rows, standing in for a database."""
+
+    def __init__(self, rows: RowSet, features: dict[str, list[tuple[str, str]]]) -> None:
+        self.rows = rows
+        self.features = features
+        self.segment_pages: list[str] = []
+
+    def _node(self, label: str, key) -> dict:
+        row = self.rows.nodes.get((label, NODE_KEYS[label]), {}).get(key, {})
+        return {NODE_KEYS[label]: key, **row.get("create", {}), **row.get("props", {})}
+
+    def _rels(self, rel_type: str, start_label: str):
+        for (kind, sl, _, el, _, _), group in self.rows.relationships.items():
+            if kind == rel_type and sl == start_label:
+                for (start, end, *_), props in group.items():
+                    yield start, el, end, props
+
+    def edition(self, edition_id):
+        works = [
+            {"work_id": start, "work": self._node("Work", start), "props": props}
+            for start, _, end, props in self._rels("HAS_EDITION", "Work")
+            if end == edition_id
+        ]
+        edition = self._node("Edition", edition_id)
+        return [{"edition": edition, **work} for work in works]
+
+    def segments(self, edition_id, after, limit):
+        self.segment_pages.append(after)
+        ids = sorted(end for start, _, end, _ in self._rels("HAS_SEGMENT", "Edition"))
+        return [
+            {"id": key, "node": self._node("Segment", key), "props": {}}
+            for key in ids
+            if key > after
+        ][:limit]
+
+    def expand(self, hop, keys):
+        wanted = set(keys)
+        out = []
+        for rel_type in hop.types:
+            if rel_type == "HAS_FEATURE":
+                for analysis_id in wanted:
+                    for key, value in self.features.get(analysis_id, ()):
+                        node = {"key": key, "value": value, "lemma_guess": None}
+                        out.append(
+                            {
+                                "start": analysis_id,
+                                "type": rel_type,
+                                "props": {},
+                                "labels": ["Feature"],
+                                "node": node,
+                            }
+                        )
+                continue
+            for start, end_label, end, props in self._rels(rel_type, hop.label):
+                if start in wanted:
+                    out.append(
+                        {
+                            "start": start,
+                            "type": rel_type,
+                            "props": props,
+                            "labels": [end_label],
+                            "node": self._node(end_label, end),
+                        }
+                    )
+        return out
+
+
+class _RecordingRepo:
+    def __init__(self) -> None:
+        self.rows = RowSet()
+        self.features: list[dict] = []
+        self.writes = 0
+
+    def write_rows(self, rows, batch_size=1000) -> int:
+        self.writes += 1
+        self.rows.update(rows)
+        return 1
+
+    def merge_analysis_features(self, rows, batch_size=1000) -> int:
+        self.features.extend(rows)
+        return 1
+
+
+def _planned(tmp_path: Path) -> RowSet:
+    source = tmp_path / "poem.txt"
+    source.write_text("Deyr fé,\ndeyja frændr,\ndeyr sjalfr it sama;\n", encoding="utf-8")
+    options = PlaintextOptions(
+        path=str(source), work_id="w", edition_id="ed", source_label="s", language_stage="non"
+    )
+    rows = RowSet()
+    for batch in plan_plaintext(options, batch_segments=1):
+        rows.update(batch.rows)
+    analysis = ("MorphAnalysis", "analysis_id", "ed:seg1:t0:m")
+    rows.merge_node(*analysis, on_create={"created_at": CREATED, "pos": "VERB"})
+    rows.merge_relationship("HAS_ANALYSIS", ("Token", "token_id", "ed:seg1:t0"), analysis)
+    rows.merge_relationship(
+        "ALIGNED_TO",
+        ("Segment", "segment_id", "ed:seg1"),
+        ("Segment", "segment_id", "other:seg9"),
+        {"method": "manual"},
+    )
+    for policy in ("diplomatic", "normalized"):
+        rows.merge_relationship(
+            "NORMALIZED_TO",
+            ("Token", "token_id", "ed:seg1:t0"),
+            ("Form", "form_id", "non:deyr"),
+            {"policy": policy},
+            keys=("policy",),
+        )
+    return rows
+
+
+def test_export_import_round_trips_an_edition(tmp_path: Path) -> None:
+    original = _planned(tmp_path)
+    reader = _RowSetReader(original, {"ed:seg1:t0:m": [("mood", "ind"), ("tense", "pres")]})
+    path = tmp_path / "ed.jsonl.gz"
+
+    exported = write_export(path, "ed", export_records(reader, "ed", page_size=2), page_size=2)
+    assert reader.segment_pages == ["", "ed:seg2", "ed:seg3"]  # keyset, not offsets
+    assert exported.nodes["Token"] == 8 and exported.nodes["Feature"] == 2
+
+    header, records = read_export(path)
+    assert header["edition_id"] == "ed"
+    repo = _RecordingRepo()
+    imported = import_records(repo, records, batch_rows=10)
+    assert imported == exported
+    assert repo.writes > 1
+
+    for group, nodes in original.nodes.items():
+        assert set(repo.rows.nodes[group]) == set(nodes), group
+    for group, rels in original.relationships.items():
+        assert repo.rows.relationships[group] == rels, group
+    # Parallel NORMALIZED_TO edges stay apart through the replay.
+    normalized = repo.rows.relationships[
+        ("NORMALIZED_TO", "Token", "token_id", "Form", "form_id", ("policy",))
+    ]
+    assert {key[2] for key in normalized} == {"diplomatic", "normalized"}
+    # ALIGNED_TO targets are referenced, not copied.
+    assert "other:seg9" not in repo.rows.nodes[("Segment", "segment_id")]
+    analysis = repo.rows.nodes[("MorphAnalysis", "analysis_id")]["ed:seg1:t0:m"]
+    assert analysis["props"]["created_at"] == CREATED
+    assert sorted((row["key"], row["value"]) for row in repo.features) == [
+        ("mood", "ind"),
+        ("tense", "pres"),
+    ]
+
+
+def test_truncated_export_fails_after_replay(tmp_path: Path) -> None:
+    path = tmp_path / "ed.jsonl.gz"
+    write_export(path, "ed", export_records(_RowSetReader(_planned(tmp_path), {}), "ed"))
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        lines = fh.readlines()
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        fh.writelines(lines[:-1])
+
+    _, records = read_export(path)
+    with pytest.raises(ValueError, match="Truncated"):
+        import_records(_RecordingRepo(), records)
+    with pytest.raises(ValueError):
+        export_records(_RowSetReader(RowSet(), {}), "missing").__next__()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from nta.ingest.adapters.base import RawSource
+from nta.ingest.adapters.verse_json import VerseJsonAdapter
+from nta.ingest.adapters.verse_json import read_header
+from nta.ingest.havamal import EDITION_ID
+from nta.ingest.havamal import plan_havamal
+from nta.ingest.jsonstream import iter_json_path
+from nta.model import ids
+
+
+DOC = {
+    "poem": {
+        "verses": [
+            {
+                "verse": "I.",
+                "strophes": [{"strophe": "1.", "lines": ["Gáttir allar,", "áðr gangi fram"]}],
+            },
+            {"verse": "II.", "strophes": [{"strophe": "2.", "lines": ["Gefendr heilir!"]}]},
+        ],
+        "title": "Hávamál",
+    },
+    "information": {"cover": ["Eddukvæði"], "writer": ["GUÐNI JÓNSSON"], "pages": 1.25e3},
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_json_path_streams_items_and_siblings_at_any_chunk_size(chunk_size: int) -> None:
+    text = json.dumps(DOC, ensure_ascii=False, indent=1)
+    events = list(iter_json_path(io.StringIO(text), ("poem", "verses"), chunk_size))
+
+    assert [value for kind, _, value in events if kind == "item"] == DOC["poem"]["verses"]
+    fields = {path: value for kind, path, value in events if kind == "field"}
+    assert fields == {("poem", "title"): "Hávamál", ("information",): DOC["information"]}
+
+
+def test_iter_json_path_reads_numbers_split_across_chunks() -> None:
+    text = '{"poem":{"verses":[2.5, -1e3, 40]},"n":12}'
+    for chunk_size in range(1, len(text) + 1):
+        events = list(iter_json_path(io.StringIO(text), ("poem", "verses"), chunk_size))
+        assert [value for _, _, value in events] == [2.5, -1e3, 40, 12], chunk_size
+
+
+def test_verse_json_adapter_reads_trailing_header_and_keeps_verse_ids(tmp_path: Path) -> None:
+    path = tmp_path / "poem.json"
+    path.write_text(json.dumps(DOC, ensure_ascii=False), encoding="utf-8")
+
+    assert read_header(path, chunk_size=5).cover == ("Eddukvæði",)
+
+    adapter = VerseJsonAdapter(work_id="w", edition_id="ed", form_prefix="non", chunk_size=5)
+    output = adapter.adapt(RawSource(source_id="ed", kind="json", origin=str(path)))
+    segments = list(output.segments)
+
+    assert output.edition.title == "Hávamál"
+    assert [s.segment_id for s in segments] == [
+        "ed:vI.:s1.:l0",
+        "ed:vI.:s1.:l1",
+        "ed:vII.:s2.:l0",
+    ]
+    assert [s.ordinal for s in segments] == [1, 2, 3]
+    first = segments[0].tokens[0]
+    assert (first.token_id, first.form_id) == ("ed:vI.:s1.:l0:t0", "non:Gáttir")
+
+
+def test_havamal_plans_v2_keys_in_a_v2_graph(tmp_path: Path) -> None:
+    path = tmp_path / "poem.json"
+    path.write_text(json.dumps(DOC, ensure_ascii=False), encoding="utf-8")
+
+    batch = next(plan_havamal(path, id_scheme="v2"))
+    edition = batch.rows.nodes[("Edition", "edition_id")][EDITION_ID]["props"]
+    segment_ids = list(batch.rows.nodes[("Segment", "segment_id")])
+    token_ids = list(batch.rows.nodes[("Token", "token_id")])
+    form_ids = set(batch.rows.nodes[("Form", "form_id")])
+
+    assert edition["id_scheme"] == "v2"
+    assert segment_ids == [ids.segment_id_v2(EDITION_ID, ordinal) for ordinal in (1, 2, 3)]
+    assert token_ids[0] == ids.token_id_v2(segment_ids[0], 0)
+    assert ids.form_id_v2("non", "Gáttir") in form_ids
+    assert {ids.form_id_scheme(form_id) for form_id in form_ids} == {"v2"}
+    assert not any(":" in key for key in [*segment_ids, *token_ids])
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import gc
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nta.graph import buffer as buffer_module
+from nta.graph.buffer import DEFAULT_MAX_PENDING
+from nta.graph.buffer import WriteBehindBuffer
+from nta.graph.repo import Neo4jRepository
+from nta.ingest.pipeline import write_batches
+from nta.ingest.plaintext import PlaintextOptions
+from nta.ingest.plaintext import plan_plaintext
+
+
+class _RecordingRepo:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, tuple[Any, ...], list[dict[str, Any]]]] = []
+
+    def write_rows(self, rows, batch_size=1000) -> int:
+        statements = 0
+        for label, key, node_rows in rows.node_groups():
+            statements += self.merge_nodes(label, key, node_rows)
+        for rel_type, sl, sk, el, ek, keys, rel_rows in rows.relationship_groups():
+            statements += self.merge_relationships(rel_type, sl, sk, el, ek, rel_rows, keys=keys)
+        return statements
+
+    def merge_nodes(self, label, key, rows, batch_size=1000) -> int:
+        self.calls.append(("nodes", (label, key), list(rows)))
+        return 1
+
+    def merge_relationships(
+        self,
+        rel_type,
+        start_label,
+        start_key,
+        end_label,
+        end_key,
+        rows,
+        batch_size=1000,
+        keys=(),
+    ) -> int:
+        self.calls.append(
+            ("rels", (rel_type, start_label, start_key, end_label, end_key, *keys), list(rows))
+        )
+        return 1
+
+
+def test_buffer_coalesces_repeated_upserts_and_merges_properties() -> None:
+    repo = _RecordingRepo()
+    buffer = WriteBehindBuffer(repo, max_age_seconds=None)
+    for _ in range(3):
+        buffer.merge_node("Form", "form_id", "f1", {"orthography": "ok"})
+        buffer.merge_relationship(
+            "REALIZES", ("Form", "form_id", "f1"), ("Lemma", "lemma_id", "l1")
+        )
+    buffer.merge_node("Form", "form_id", "f1", {"language": "on"})
+
+    assert buffer.pending == 2
+    buffer.flush()
+
+    assert [call[0] for call in repo.calls] == ["nodes", "rels"]
+    assert repo.calls[0][2] == [
+        {"key": "f1", "props": {"orthography": "ok", "language": "on"}, "create": {}}
+    ]
+    assert repo.calls[1][2] == [{"start": "f1", "end": "l1", "props": {}}]
+    assert buffer.stats["enqueued"] == 7
+    assert buffer.stats["statements"] == 2
+
+
+def test_buffer_keeps_one_normalized_to_edge_per_policy() -> None:
+    repo = _RecordingRepo()
+    buffer = WriteBehindBuffer(repo, max_age_seconds=None)
+    for policy in ("diplomatic", "normalized", "diplomatic"):
+        buffer.merge_relationship(
+            "NORMALIZED_TO",
+            ("Token", "token_id", "t1"),
+            ("Form", "form_id", "f1"),
+            {"policy": policy},
+            keys=("policy",),
+        )
+    assert buffer.pending == 2
+    buffer.flush()
+
+    ((kind, group, rows),) = repo.calls
+    assert group == ("NORMALIZED_TO", "Token", "token_id", "Form", "form_id", "policy")
+    assert [row["props"]["policy"] for row in rows] == ["diplomatic", "normalized"]
+
+
+def test_merge_relationships_puts_key_properties_in_the_pattern(recording_driver) -> None:
+    repo = Neo4jRepository(recording_driver)
+    rows = [{"start": "t1", "end": "f1", "props": {"policy": "p"}}]
+    repo.merge_relationships(
+        "NORMALIZED_TO", "Token", "token_id", "Form", "form_id", rows, keys=("policy",)
+    )
+    repo.merge_relationships("REALIZES", "Form", "form_id", "Lemma", "lemma_id", rows)
+    first, second = (statement.shape for statement in recording_driver.statements)
+    assert "MERGE (a)-[r:NORMALIZED_TO {policy: row.props.policy}]->(b)" in first
+    assert "MERGE (a)-[r:REALIZES]->(b)" in second
+    with pytest.raises(ValueError):
+        repo.merge_relationships("T", "A", "a", "B", "b", rows, keys=("bad key",))
+
+
+def test_buffer_flushes_on_size_and_age() -> None:
+    now = [0.0]
+    repo = _RecordingRepo()
+    buffer = WriteBehindBuffer(repo, max_pending=2, max_age_seconds=10.0, clock=lambda: now[0])
+    buffer.merge_node("Token", "token_id", "t1")
+    assert repo.calls == []
+    buffer.merge_node("Token", "token_id", "t2")
+    assert buffer.stats["flushes"] == 1
+
+    buffer.merge_node("Token", "token_id", "t3")
+    now[0] = 11.0
+    buffer.merge_node("Token", "token_id", "t4")
+    assert buffer.stats["flushes"] == 2
+    assert buffer.pending == 0
+
+
+def test_buffer_flushes_on_context_exit_even_after_error() -> None:
+    repo = _RecordingRepo()
+    try:
+        with WriteBehindBuffer(repo, max_age_seconds=None) as buffer:
+            buffer.merge_node("Lemma", "lemma_id", "l1", {"headword": "ok"})
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert len(repo.calls) == 1
+    assert buffer.pending == 0
+
+
+def test_dropped_buffer_is_still_flushed_at_exit() -> None:
+    repo = _RecordingRepo()
+    buffer = WriteBehindBuffer(repo, max_age_seconds=None)
+    buffer.merge_node("Lemma", "lemma_id", "l1")
+    del buffer
+    gc.collect()
+
+    buffer_module._flush_open_buffers()
+    assert [call[0] for call in repo.calls] == ["nodes"]
+    assert not buffer_module._OPEN_BUFFERS
+
+
+class _Checkpoints:
+    def __init__(self, driver) -> None:
+        self.driver = driver
+        self.done: list[tuple[int, int]] = []
+
+    def batch_done(self, last_ordinal: int, segments: int, tokens: int) -> None:
+        self.done.append((last_ordinal, len(self.driver.statements)))
+
+    def finish(self) -> None:
+        pass
+
+
+@pytest.mark.parametrize("max_pending", [1, DEFAULT_MAX_PENDING])
+def test_write_batches_coalesce_across_batches_and_checkpoint_after_flush(
+    tmp_path: Path, recording_driver, max_pending: int
+) -> None:
+    path = tmp_path / "saga.txt"
+    path.write_text("ok sá\nok þú\nok\n", encoding="utf-8")
+    options = PlaintextOptions(
+        path=str(path), work_id="w", edition_id="ed", source_label="s", language_stage="non"
+    )
+    checkpoints = _Checkpoints(recording_driver)
+
+    counts = write_batches(
+        Neo4jRepository(recording_driver),
+        plan_plaintext(options, batch_segments=1),
+        checkpoints,
+        max_pending=max_pending,
+    )
+
+    assert counts == {"segments": 3, "tokens": 5}
+    assert [ordinal for ordinal, _ in checkpoints.done] == [1, 2, 3]
+    form_writes = [s for s in recording_driver.statements if "MERGE (n:Form" in s.query]
+    if max_pending == 1:
+        # Every batch flushes, and is checkpointed before the next one is written.
+        assert len(form_writes) == 3
+        assert checkpoints.done[0][1] < checkpoints.done[1][1] < checkpoints.done[2][1]
+    else:
+        # One flush for the whole file: "ok" is written once, not once per batch.
+        (form_write,) = form_writes
+        assert form_write.rows == 3
+        assert checkpoints.done[0][1] > 0